@@ -0,0 +1,73 @@
+"""Measure the throughput of many conversions with the same reader and NXDL.
+
+The same JSON map input is converted into many output files, once with
+separate calls of `convert` and once with the batch engine, which keeps the
+NXDL trees, template skeletons and reader classes of a worker warm.
+
+    python benchmarks/batch_conversion.py [directory] [--jobs 200] [--workers 1]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from pynxtools.dataconverter.batch import BatchJob, run_batch
+from pynxtools.dataconverter.convert import convert
+
+DATA_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "data", "dataconverter", "readers"
+)
+JSON_MAP_DIR = os.path.join(DATA_DIR, "json_map")
+
+
+def jobs_in(directory: str, n_jobs: int) -> list[BatchJob]:
+    return [
+        BatchJob(
+            input_file=(os.path.join(JSON_MAP_DIR, "data.json"),),
+            output=os.path.join(directory, f"{idx}.nxs"),
+            reader="json_map",
+            nxdl="NXtest",
+            options={"config_file": os.path.join(JSON_MAP_DIR, "data.config.json")},
+        )
+        for idx in range(n_jobs)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", nargs="?", default=None)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    logging.getLogger("pynxtools").setLevel(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        jobs = jobs_in(directory, args.jobs)
+
+        start = time.perf_counter()
+        for job in jobs:
+            try:
+                convert(job.input_file, job.reader, job.nxdl, job.output, **job.options)
+            except Exception:  # noqa: BLE001
+                pass
+        separate = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = list(run_batch(jobs, workers=args.workers))
+        batch = time.perf_counter() - start
+
+    print(f"{args.jobs} jobs, {args.workers} worker(s)")
+    print(
+        f"  separate convert calls: {separate:.2f} s, {args.jobs / separate:.1f} jobs/s"
+    )
+    print(f"  batch engine:           {batch:.2f} s, {args.jobs / batch:.1f} jobs/s")
+    print(
+        "  median job in batch:    "
+        f"{sorted(result.seconds for result in results)[len(results) // 2] * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
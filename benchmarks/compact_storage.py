@@ -0,0 +1,72 @@
+"""Measure file size and creation time of templates with many scalars, with and without compact storage.
+
+The template holds numeric scalars and short strings, e.g. ELN metadata or
+per-point motor positions, spread over groups. It is written with the
+default layout, with compact storage, and with compact storage into a file
+built in memory.
+
+    python benchmarks/compact_storage.py [directory] [--keys 100000] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.writer import Writer
+
+NXDL = os.path.join(
+    os.path.dirname(__file__), "..", "src", "pynxtools", "data", "NXtest.nxdl.xml"
+)
+KEYS_PER_GROUP = 1000
+
+LAYOUTS = {
+    "default": {},
+    "compact": {"compact_storage": True},
+    "compact, in memory": {"compact_storage": True, "in_memory": True},
+}
+
+
+def scalar_template(n_keys: int) -> Template:
+    """Floats, integers and short strings in groups of KEYS_PER_GROUP."""
+    template = Template()
+    for idx in range(n_keys):
+        path = f"/ENTRY[entry]/point_{idx // KEYS_PER_GROUP}/value_{idx}"
+        if idx % 3 == 0:
+            template[path] = float(idx)
+        elif idx % 3 == 1:
+            template[path] = idx
+        else:
+            template[path] = f"sample {idx}"
+    return template
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", nargs="?", default=None)
+    parser.add_argument("--keys", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.keys} scalar keys, a third of them strings")
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        path = os.path.join(directory, "scalars.nxs")
+        for layout, options in LAYOUTS.items():
+            timings = []
+            for _ in range(args.repeat):
+                template = scalar_template(args.keys)
+                start = time.perf_counter()
+                Writer(template, NXDL, path, **options).write()
+                os.sync()
+                timings.append(time.perf_counter() - start)
+            print(
+                f"  {layout:>18}: {statistics.median(timings):.2f} s (median), "
+                f"{os.path.getsize(path) / 1024**2:.1f} MiB"
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
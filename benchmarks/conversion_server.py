@@ -0,0 +1,90 @@
+"""Measure the latency of conversions through the conversion server.
+
+The same JSON map input is converted with a new `dataconverter` process per
+file and with `dataconverter_client` requests to a running server, whose
+worker has imported the converter and built the NXDL trees already.
+
+    python benchmarks/conversion_server.py [directory] [--runs 10]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from pynxtools.dataconverter.daemon import ConversionServer
+
+JSON_MAP_DIR = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "tests",
+    "data",
+    "dataconverter",
+    "readers",
+    "json_map",
+)
+INPUTS = [
+    os.path.join(JSON_MAP_DIR, "data.json"),
+    "--config",
+    os.path.join(JSON_MAP_DIR, "data.config.json"),
+    "--nxdl",
+    "NXtest",
+    "--skip-verify",
+]
+
+
+def timed_runs(command: list[str], outputs: list[str]) -> list[float]:
+    seconds = []
+    for output in outputs:
+        start = time.perf_counter()
+        subprocess.run(command + ["--output", output], check=True, capture_output=True)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", nargs="?", default=None)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        socket_path = os.path.join(directory, "benchmark.sock")
+        server = ConversionServer(socket_path)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            cli = [
+                sys.executable,
+                "-c",
+                "from pynxtools.dataconverter.cli import convert; convert()",
+                *INPUTS,
+            ]
+            client = [
+                sys.executable,
+                "-m",
+                "pynxtools.dataconverter.client",
+                "--socket",
+                socket_path,
+                "convert",
+                *INPUTS,
+            ]
+            outputs = [
+                os.path.join(directory, f"{idx}.nxs") for idx in range(args.runs)
+            ]
+            fresh = timed_runs(cli, outputs)
+            served = timed_runs(client, outputs)
+        finally:
+            server.shutdown()
+            thread.join()
+
+    print(f"{args.runs} conversions")
+    for name, seconds in (("new process", fresh), ("server + client", served)):
+        print(f"  {name:16} median {sorted(seconds)[len(seconds) // 2] * 1000:6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
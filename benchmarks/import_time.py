@@ -0,0 +1,60 @@
+"""Measure the import time of the command line entry points.
+
+Each module is imported in a new interpreter with `python -X importtime`;
+the fastest of several runs is reported together with the slowest modules
+it imports.
+
+    python benchmarks/import_time.py [--runs 5] [--top 5]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+
+ENTRY_POINTS = (
+    "pynxtools",
+    "pynxtools.cli",
+    "pynxtools.dataconverter.client",
+    "pynxtools.nexus.cli",
+    "pynxtools.dataconverter.cli",
+    "pynxtools.annotator.cli",
+    "pynxtools.eln_mapper.cli",
+    "pynxtools.dataconverter.convert",
+)
+
+IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """The self and cumulative import time in us of each imported module."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    return {
+        match.group(4): (int(match.group(1)), int(match.group(2)))
+        for match in map(IMPORT_TIME.match, stderr.splitlines())
+        if match
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    for module in ENTRY_POINTS:
+        runs = [import_times(module) for _ in range(args.runs)]
+        fastest = min(runs, key=lambda times: times[module][1])
+        print(f"{module:34} {fastest[module][1] / 1000:7.1f} ms")
+        slowest = sorted(fastest.items(), key=lambda item: -item[1][0])
+        for name, (own, _) in slowest[: args.top]:
+            print(f"    {name:30} {own / 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
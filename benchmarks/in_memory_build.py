@@ -0,0 +1,65 @@
+"""Compare the write time of a metadata-heavy NeXus file written directly and built in memory.
+
+The template holds many scalar fields with units and a description each, as
+for ELN metadata or per-point motor positions. It is written once directly
+to the output path and once built in memory with the HDF5 core driver and
+stored with one sequential write. Use a directory on the file system of
+interest, e.g. a network file system.
+
+    python benchmarks/in_memory_build.py [directory] [--fields 50000] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.writer import Writer
+
+NXDL = os.path.join(
+    os.path.dirname(__file__), "..", "src", "pynxtools", "data", "NXtest.nxdl.xml"
+)
+FIELDS_PER_GROUP = 1000
+
+
+def metadata_template(n_fields: int) -> Template:
+    """Scalar fields with @units and @description in groups of FIELDS_PER_GROUP."""
+    template = Template()
+    for idx in range(n_fields):
+        path = f"/ENTRY[entry]/motors_{idx // FIELDS_PER_GROUP}/position_{idx}"
+        template[path] = float(idx)
+        template[f"{path}/@units"] = "mm"
+        template[f"{path}/@description"] = f"position {idx} of the scan"
+    return template
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", nargs="?", default=None)
+    parser.add_argument("--fields", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.fields} scalar fields with 2 attributes each")
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        path = os.path.join(directory, "metadata.nxs")
+        for in_memory in (False, True):
+            timings = []
+            for _ in range(args.repeat):
+                template = metadata_template(args.fields)
+                start = time.perf_counter()
+                Writer(template, NXDL, path, in_memory=in_memory).write()
+                os.sync()
+                timings.append(time.perf_counter() - start)
+            layout = "in memory" if in_memory else "direct"
+            print(
+                f"  {layout:>9}: {statistics.median(timings):.2f} s (median), "
+                f"{os.path.getsize(path) / 1024**2:.1f} MiB"
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compare slice read latencies of NXdata signals chunked by access pattern and by h5py.
+
+For an image stack and a spectrum map, the signal is written once with the chunk
+shape that the writer infers from its @interpretation, using the chunk byte
+target of the storage profile of the directory, and once with h5py
+auto-chunking. Each file is read along the typical access patterns of the data.
+
+    python benchmarks/nxdata_chunking.py [directory] [--repeat 5] [--compress]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import h5py
+import numpy as np
+
+from pynxtools.dataconverter.chunk import (
+    access_pattern_priority,
+    prioritized_axes_heuristic,
+)
+from pynxtools.nexus.storage import get_storage_profile
+
+# name: (shape, @interpretation, {access pattern: selections})
+WORKLOADS = {
+    "image stack": (
+        (200, 512, 512),
+        "image",
+        {
+            "single image": [np.index_exp[idx] for idx in range(0, 200, 20)],
+            "pixel trace": [np.index_exp[:, idx, idx] for idx in range(0, 512, 64)],
+        },
+    ),
+    "spectrum map": (
+        (128, 128, 1024),
+        "spectrum",
+        {
+            "single spectrum": [np.index_exp[idx, idx] for idx in range(0, 128, 16)],
+            "energy slice": [np.index_exp[:, :, idx] for idx in range(0, 1024, 128)],
+        },
+    ),
+}
+
+
+def read_latency(path: str, selections: list, repeat: int) -> float:
+    """Median seconds per selection, each read with a cold chunk cache."""
+    timings = []
+    for _ in range(repeat):
+        for selection in selections:
+            with h5py.File(path, "r") as h5file:
+                dataset = h5file["entry/data/data"]
+                start = time.perf_counter()
+                dataset[selection]
+                timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", nargs="?", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compress", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        profile = get_storage_profile(directory)
+        print(f"storage profile {profile.name}, chunk byte target {profile.byte_size}")
+        for name, (shape, interpretation, patterns) in WORKLOADS.items():
+            data = rng.integers(0, 100, shape, dtype=np.uint16).astype(np.float32)
+            priority = access_pattern_priority(data.ndim, interpretation)
+            layouts = {
+                "h5py auto": True,
+                "access pattern": prioritized_axes_heuristic(
+                    data, priority, byte_size=profile.byte_size
+                ),
+            }
+            print(f"{name} {shape}, @interpretation {interpretation}")
+            for layout, chunks in layouts.items():
+                path = os.path.join(directory, "signal.nxs")
+                with h5py.File(path, "w") as h5file:
+                    dataset = h5file.create_dataset(
+                        "entry/data/data",
+                        data=data,
+                        chunks=chunks,
+                        compression="gzip" if args.compress else None,
+                        compression_opts=1 if args.compress else None,
+                    )
+                    chunks = dataset.chunks
+                latencies = ", ".join(
+                    f"{pattern} {read_latency(path, selections, args.repeat) * 1e3:.2f} ms"
+                    for pattern, selections in patterns.items()
+                )
+                print(f"  {layout:>14} {chunks}: {latencies}")
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
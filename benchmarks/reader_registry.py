@@ -0,0 +1,100 @@
+"""Measure the lookup of readers with the reader registry.
+
+Times `dataconverter get-readers` in a new process, reader lookups in one
+process compared with executing the reader module per lookup as before the
+registry, and repeated `convert` calls of the JSON map reader. The first
+lookup imports the reader module and its dependencies.
+
+    python benchmarks/reader_registry.py [directory] [--lookups 200] [--runs 20]
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pynxtools.dataconverter.readers as readers_package
+from pynxtools.dataconverter.convert import (
+    convert,
+    get_names_of_all_readers,
+    get_reader,
+)
+
+JSON_MAP_DIR = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "tests",
+    "data",
+    "dataconverter",
+    "readers",
+    "json_map",
+)
+
+
+def exec_reader_module(reader_name: str):
+    """The lookup before the registry: the module is executed every time."""
+    path = os.path.join(readers_package.__path__[0], reader_name, "reader.py")
+    spec = importlib.util.spec_from_file_location("reader.py", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module.READER
+
+
+def per_call(function, n_calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        function()
+    return (time.perf_counter() - start) / n_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", nargs="?", default=None)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    logging.getLogger("pynxtools").setLevel(logging.CRITICAL)
+
+    start = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from pynxtools.dataconverter.cli import convert; convert(['get-readers'])",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    print(f"dataconverter get-readers: {time.perf_counter() - start:.2f} s")
+
+    names = per_call(get_names_of_all_readers, args.lookups)
+    first = per_call(lambda: get_reader("json_map"), 1)
+    registry = per_call(lambda: get_reader("json_map"), args.lookups)
+    executed = per_call(lambda: exec_reader_module("json_map"), args.lookups)
+    print(f"reader names:              {names * 1e6:8.1f} us per call")
+    print(f"first reader lookup:       {first * 1e6:8.1f} us")
+    print(f"reader lookup (registry):  {registry * 1e6:8.1f} us per call")
+    print(f"reader lookup (exec):      {executed * 1e6:8.1f} us per call")
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        outputs = iter(range(args.runs))
+        seconds = per_call(
+            lambda: convert(
+                (os.path.join(JSON_MAP_DIR, "data.json"),),
+                "json_map",
+                "NXtest",
+                os.path.join(directory, f"{next(outputs)}.nxs"),
+                config_file=os.path.join(JSON_MAP_DIR, "data.config.json"),
+                skip_verify=True,
+            ),
+            args.runs,
+        )
+    print(f"convert in one process:    {seconds * 1000:8.1f} ms per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Report which storage profile is fastest on the file system of a directory.
+
+Every profile writes the same image stack, chunked with its chunk byte target,
+and reads it back as whole images and as thin slabs across all images.
+
+    python benchmarks/storage_profiles.py [directory] [--frames 256] [--repeat 3]
+
+Use the fastest profile via `--storage-profile` or the environment variable
+PYNXTOOLS_STORAGE_PROFILE if it differs from the detected one.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from pynxtools.dataconverter.chunk import prioritized_axes_heuristic
+from pynxtools.nexus.storage import (
+    STORAGE_PROFILES,
+    StorageProfile,
+    detect_storage_profile,
+    open_hdf5,
+)
+
+
+def run_profile(
+    profile: StorageProfile, directory: str, data: np.ndarray
+) -> dict[str, float]:
+    """Seconds to write data and to read it along two access patterns."""
+    path = os.path.join(directory, f"benchmark_{profile.name}.h5")
+    chunks = prioritized_axes_heuristic(
+        data, tuple(range(data.ndim)), byte_size=profile.byte_size
+    )
+    timings = {}
+    try:
+        start = time.perf_counter()
+        with open_hdf5(path, "w", profile=profile) as h5file:
+            h5file.create_dataset("data", data=data, chunks=chunks)
+            for idx in range(64):  # metadata of many small objects
+                h5file.attrs[f"attribute_{idx}"] = idx
+            h5file.flush()
+            os.fsync(h5file.id.get_vfd_handle())
+        timings["write"] = time.perf_counter() - start
+
+        with open_hdf5(path, "r", profile=profile) as h5file:
+            dataset = h5file["data"]
+            start = time.perf_counter()
+            for frame in range(0, data.shape[0], max(1, data.shape[0] // 32)):
+                dataset[frame]
+            timings["read images"] = time.perf_counter() - start
+            start = time.perf_counter()
+            for row in range(0, data.shape[1], max(1, data.shape[1] // 8)):
+                dataset[:, row, :]
+            timings["read slabs"] = time.perf_counter() - start
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", nargs="?", default=None)
+    parser.add_argument("--frames", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        rng = np.random.default_rng(0)
+        data = rng.integers(0, 1000, (args.frames, 512, 512), dtype=np.uint16)
+        print(
+            f"{data.nbytes / 1024**2:.0f} MiB in {directory}, "
+            f"detected profile: {detect_storage_profile(directory)}"
+        )
+        totals = {}
+        for name, profile in STORAGE_PROFILES.items():
+            runs = [run_profile(profile, directory, data) for _ in range(args.repeat)]
+            medians = {
+                step: statistics.median(run[step] for run in runs) for step in runs[0]
+            }
+            totals[name] = sum(medians.values())
+            print(
+                f"{name:>8}: "
+                + ", ".join(
+                    f"{step} {seconds:.3f} s" for step, seconds in medians.items()
+                )
+            )
+        print(f"fastest profile: {min(totals, key=totals.get)}")
+
+
+if __name__ == "__main__":
+    main()
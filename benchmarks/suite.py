@@ -0,0 +1,374 @@
+"""Run the benchmark suite and check the timings for regressions.
+
+The suite times building NeXus trees and templates from NXDL files, Template
+operations, the validation of dicts and HDF5 files at increasing key counts,
+writing with and without compression, traversing and annotating the bundled
+ARPES file and the field statistics of the NOMAD parser. Synthetic data is
+generated from NXtest for every run, and for other application definitions
+with the seeded generator of `pynxtools.dataconverter.synthetic`.
+
+Each run is appended to a history file. Every benchmark is compared with the
+median of its previous runs on the same machine, and the suite exits with 1
+if one of them is slower than that by more than the threshold.
+
+    python benchmarks/suite.py [--filter REGEX] [--history PATH] [--threshold 0.25]
+                               [--baseline-runs 5] [--repeat 5] [--no-save]
+"""
+
+import argparse
+import datetime
+import io
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+import h5py
+import numpy as np
+
+from pynxtools.annotator.annotator import Annotator
+from pynxtools.dataconverter.helpers import generate_template_from_nxdl
+from pynxtools.dataconverter.synthetic import generate_synthetic_template
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.validation import (
+    validate_dict_against,
+    validate_hdf_group_against,
+)
+from pynxtools.dataconverter.writer import Writer
+from pynxtools.nexus.handler import NexusFileHandler, NexusVisitor
+from pynxtools.nexus.nexus_tree import generate_tree_from
+from pynxtools.nexus.utils import get_nxdl_root_and_path
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "pynxtools", "data")
+NXTEST = os.path.join(DATA_DIR, "NXtest.nxdl.xml")
+ARPES_FILE = os.path.join(DATA_DIR, "201805_WSe2_arpes.nxs")
+HISTORY = os.path.join(os.path.dirname(__file__), "..", ".benchmarks", "history.jsonl")
+
+KEY_COUNTS = (100, 1_000, 10_000)
+# validating files is slower, 10 000 keys take about 20 s
+HDF_KEY_COUNTS = (100, 1_000, 3_000)
+
+# name: setup(directory, param) returning the function to time
+BENCHMARKS: dict[str, Callable[[str], Callable[[], Any]]] = {}
+
+
+class Skipped(Exception):
+    """A benchmark cannot run in this environment."""
+
+
+def benchmark(name: str, params: tuple = ()) -> Callable:
+    """Register a setup function, once per parameter as name[param]."""
+
+    def register(setup: Callable) -> Callable:
+        if not params:
+            BENCHMARKS[name] = setup
+        for param in params:
+            BENCHMARKS[f"{name}[{param}]"] = lambda directory, param=param: setup(
+                directory, param
+            )
+        return setup
+
+    return register
+
+
+def nxtest_data(n_keys: int) -> dict[str, Any]:
+    """About n_keys keys of NXtest in NXODD_name groups of 18 keys each."""
+    data: dict[str, Any] = {
+        "/ENTRY[entry]/definition": "NXtest",
+        "/ENTRY[entry]/definition/@version": "1.0",
+        "/ENTRY[entry]/program_name": "benchmark",
+    }
+    for idx in range(max(1, (n_keys - len(data)) // 18)):
+        group = f"/ENTRY[entry]/NXODD_name[odd{idx}_name]"
+        data[f"{group}/anamethatRENAMES[anamethatrenames]"] = idx
+        data[f"{group}/float_value"] = np.linspace(0, 1, 16)
+        data[f"{group}/float_value/@units"] = "eV"
+        data[f"{group}/number_value"] = np.arange(16)
+        data[f"{group}/number_value/@units"] = "eV"
+        data[f"{group}/bool_value"] = True
+        data[f"{group}/int_value"] = idx
+        data[f"{group}/int_value/@units"] = "m"
+        data[f"{group}/posint_value"] = idx + 1
+        data[f"{group}/posint_value/@units"] = "m"
+        data[f"{group}/char_value"] = f"value {idx}"
+        data[f"{group}/date_value"] = "2024-01-01T00:00:00+00:00"
+        data[f"{group}/type"] = "1st type"
+        data[f"{group}/type/@array"] = [0, 1, 2]
+        data[f"{group}/data"] = np.arange(16)
+        data[f"{group}/@group_attribute"] = "attribute"
+        data[f"{group}/@signal"] = "data"
+        data[f"{group}/@AXISNAME_indices[energy_indices]"] = np.uint64(0)
+    return data
+
+
+def write_nxtest(path: str, n_keys: int):
+    Writer(Template(nxtest_data(n_keys)), NXTEST, path).write()
+
+
+@benchmark("nxdl_tree", ("NXsimple", "NXtest", "NXmpes"))
+def nxdl_tree(directory: str, nxdl: str):
+    return lambda: generate_tree_from(nxdl)
+
+
+@benchmark("template_generation", ("NXsimple", "NXtest", "NXmpes"))
+def template_generation(directory: str, nxdl: str):
+    root, _ = get_nxdl_root_and_path(nxdl)
+    return lambda: generate_template_from_nxdl(root, Template())
+
+
+@benchmark("template_setitem", KEY_COUNTS)
+def template_setitem(directory: str, n_keys: int):
+    data = nxtest_data(n_keys)
+
+    def fill():
+        template = Template()
+        for key, value in data.items():
+            template[key] = value
+
+    return fill
+
+
+@benchmark("template_getitem", KEY_COUNTS)
+def template_getitem(directory: str, n_keys: int):
+    template = Template(nxtest_data(n_keys))
+    keys = list(template.keys())
+
+    def get():
+        for key in keys:
+            template[key]
+
+    return get
+
+
+@benchmark("template_update", KEY_COUNTS)
+def template_update(directory: str, n_keys: int):
+    other = Template(nxtest_data(n_keys))
+    return lambda: Template().update(other)
+
+
+@benchmark("validate_dict", KEY_COUNTS)
+def validate_dict(directory: str, n_keys: int):
+    data = nxtest_data(n_keys)
+    tree = generate_tree_from("NXtest")
+    return lambda: validate_dict_against("NXtest", data, tree=tree)
+
+
+@benchmark("validate_synthetic", ("NXarpes", "NXmpes"))
+def validate_synthetic(directory: str, nxdl: str):
+    data = generate_synthetic_template(nxdl, seed=0, n_entries=10)
+    tree = generate_tree_from(nxdl)
+    return lambda: validate_dict_against(nxdl, data, tree=tree)
+
+
+@benchmark("validate_hdf", HDF_KEY_COUNTS)
+def validate_hdf(directory: str, n_keys: int):
+    path = os.path.join(directory, f"validate_{n_keys}.nxs")
+    write_nxtest(path, n_keys)
+
+    def validate():
+        with h5py.File(path, "r") as h5file:
+            validate_hdf_group_against("NXtest", h5file["entry"], path)
+
+    return validate
+
+
+@benchmark("write", ("uncompressed", "gzip"))
+def write(directory: str, compression: str):
+    path = os.path.join(directory, f"write_{compression}.nxs")
+    data = Template(nxtest_data(100))
+    rng = np.random.default_rng(0)
+    for idx in range(8):
+        # a smooth signal with noise, which compresses like measured data
+        values = np.cumsum(rng.normal(size=2**17))
+        data[f"/ENTRY[entry]/NXODD_name[odd{idx}_name]/float_value"] = (
+            values if compression == "uncompressed" else {"compress": values}
+        )
+    return lambda: Writer(data, NXTEST, path).write()
+
+
+class CountingVisitor(NexusVisitor):
+    """Counts the nodes and attributes of a traversal."""
+
+    def __init__(self):
+        self.nodes = 0
+
+    def on_group(self, hdf_path, hdf_node):
+        self.nodes += 1
+
+    def on_field(self, hdf_path, hdf_node):
+        self.nodes += 1
+
+    def on_attribute(self, hdf_path, attr_name, attr_value, parent):
+        self.nodes += 1
+
+    def on_complete(self, root):
+        pass
+
+
+@benchmark("traverse_arpes", ("datasets", "metadata_only"))
+def traverse_arpes(directory: str, mode: str):
+    metadata_only = mode == "metadata_only"
+    return lambda: NexusFileHandler(ARPES_FILE, metadata_only=metadata_only).process(
+        CountingVisitor()
+    )
+
+
+@benchmark("annotate_arpes")
+def annotate_arpes(directory: str):
+    logger = logging.getLogger("benchmarks.annotate")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.handlers[:] = [logging.StreamHandler(io.StringIO())]
+
+    def annotate():
+        logger.handlers[0].stream = io.StringIO()
+        NexusFileHandler(ARPES_FILE).process(Annotator(logger))
+
+    return annotate
+
+
+@benchmark("nomad_field_stats", ("contiguous", "chunked"))
+def nomad_field_stats(directory: str, layout: str):
+    try:
+        from pynxtools.nomad.parsers import parser
+    except ImportError as exc:
+        raise Skipped("nomad-lab is not installed") from exc
+    path = os.path.join(directory, f"stats_{layout}.h5")
+    with h5py.File(path, "w") as h5file:
+        h5file.create_dataset(
+            "values",
+            data=np.random.default_rng(0).normal(size=2**22),
+            chunks=(2**16,) if layout == "chunked" else None,
+        )
+    get_stats = (
+        parser._get_field_stats_iuf_chunked
+        if layout == "chunked"
+        else parser._get_field_stats_iuf_contiguous
+    )
+
+    def stats():
+        with h5py.File(path, "r") as h5file:
+            get_stats(h5file["values"])
+
+    return stats
+
+
+def time_function(function: Callable, repeat: int, min_time: float) -> dict:
+    """The minimum and median seconds per call of `repeat` timing loops."""
+    timer = timeit.Timer(function)
+    number = 1
+    while (elapsed := timer.timeit(number)) < min_time:
+        number *= max(2, min(10, int(min_time / max(elapsed, 1e-9))))
+    seconds = [elapsed / number] + [
+        time / number for time in timer.repeat(repeat - 1, number)
+    ]
+    return {
+        "min": min(seconds),
+        "median": statistics.median(seconds),
+        "number": number,
+    }
+
+
+def machine() -> str:
+    """Timings are only compared between runs on the same machine."""
+    return (
+        f"{platform.node()}-{platform.machine()}-"
+        f"py{sys.version_info.major}.{sys.version_info.minor}"
+    )
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def read_history(path: str) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def baselines(history: list[dict], n_runs: int) -> dict[str, float]:
+    """The median of the minimum time of each benchmark in its last n_runs runs."""
+    timings: dict[str, list[float]] = {}
+    for run in history:
+        if run["machine"] == machine():
+            for name, result in run["results"].items():
+                timings.setdefault(name, []).append(result["min"])
+    return {name: statistics.median(times[-n_runs:]) for name, times in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="Run the matching benchmarks.")
+    parser.add_argument("--history", default=HISTORY)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--baseline-runs", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+    logging.getLogger("pynxtools").setLevel(logging.CRITICAL)
+
+    history = read_history(args.history)
+    previous = baselines(history, args.baseline_runs)
+    results = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, setup in BENCHMARKS.items():
+            if not re.search(args.filter, name):
+                continue
+            try:
+                function = setup(directory)
+            except Skipped as exc:
+                print(f"{name:36} skipped: {exc}")
+                continue
+            result = results[name] = time_function(function, args.repeat, args.min_time)
+            line = f"{name:36} {result['min'] * 1e3:10.3f} ms"
+            if name in previous:
+                change = result["min"] / previous[name] - 1
+                line += f" {change:+8.1%}"
+                if change > args.threshold:
+                    regressions.append(name)
+                    line += "  REGRESSION"
+            print(line)
+
+    if not args.no_save and results:
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, "a", encoding="utf-8") as file:
+            run = {
+                "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "commit": git_commit(),
+                "machine": machine(),
+                "results": results,
+            }
+            file.write(json.dumps(run) + "\n")
+
+    if regressions:
+        print(
+            f"{len(regressions)} benchmarks are more than {args.threshold:.0%} "
+            f"slower than the median of their last {args.baseline_runs} runs: "
+            f"{', '.join(regressions)}"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Count the HDF5 metadata operations and time of the writer for a synthetic template.
+
+The template holds NXdata groups with fields, their units and attributes,
+group attributes and internal links, some of which point to other links. The
+benchmark counts the calls of the HDF5 functions which open objects, create
+groups and datasets, and test, open, create or delete attributes while the
+writer stores the template.
+
+    python benchmarks/write_planner.py [directory] [--groups 200] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import h5py
+import numpy as np
+
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.writer import Writer
+
+NXDL = os.path.join(
+    os.path.dirname(__file__), "..", "src", "pynxtools", "data", "NXtest.nxdl.xml"
+)
+
+# module, function name of the counted HDF5 metadata operations
+METADATA_OPERATIONS = (
+    (h5py.h5o, "open"),
+    (h5py.h5g, "_path_valid"),
+    (h5py.h5g, "create"),
+    (h5py.h5d, "create"),
+    (h5py.h5a, "exists"),
+    (h5py.h5a, "open"),
+    (h5py.h5a, "create"),
+    (h5py.h5a, "delete"),
+)
+
+
+@contextmanager
+def count_metadata_operations():
+    """Count the calls of METADATA_OPERATIONS by "module.function"."""
+    counts: Counter = Counter()
+    originals = [
+        (module, name, getattr(module, name)) for module, name in METADATA_OPERATIONS
+    ]
+
+    def counted(label, function):
+        def wrapper(*args, **kwargs):
+            counts[label] += 1
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    for module, name, function in originals:
+        setattr(module, name, counted(f"{module.__name__}.{name}", function))
+    try:
+        yield counts
+    finally:
+        for module, name, function in originals:
+            setattr(module, name, function)
+
+
+def synthetic_template(n_groups: int) -> Template:
+    """NXdata groups with units, attributes and chains of internal links."""
+    template = Template()
+    template["/ENTRY[entry]/definition"] = "NXtest"
+    template["/ENTRY[entry]/definition/@version"] = "1.0"
+    for idx in range(n_groups):
+        group = f"/ENTRY[entry]/NXODD_name[odd_{idx}]"
+        # a link to a link, sorted before the link it depends on
+        template[f"{group}/int_value"] = {"link": f"/entry/odd_{idx}/posint_value"}
+        template[f"{group}/posint_value"] = {"link": f"/entry/odd_{idx}/number_value"}
+        template[f"{group}/float_value"] = np.linspace(0, 1, 64)
+        template[f"{group}/float_value/@units"] = "eV"
+        template[f"{group}/float_value/@long_name"] = "energy"
+        template[f"{group}/number_value"] = np.arange(64)
+        template[f"{group}/number_value/@units"] = "eV"
+        template[f"{group}/bool_value"] = True
+        template[f"{group}/char_value"] = "value"
+        template[f"{group}/@signal"] = "float_value"
+        template[f"{group}/@axes"] = "number_value"
+    return template
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", nargs="?", default=None)
+    parser.add_argument("--groups", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    timings = []
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        path = os.path.join(directory, "planner.nxs")
+        for _ in range(args.repeat):
+            writer = Writer(synthetic_template(args.groups), NXDL, path)
+            with count_metadata_operations() as counts:
+                start = time.perf_counter()
+                writer.write()
+                timings.append(time.perf_counter() - start)
+        with h5py.File(path, "r") as h5file:
+            chained = h5file[f"/entry/odd_{args.groups - 1}"].get("int_value")
+            if chained is None:
+                print("the links to links were not written")
+
+    print(
+        f"{args.groups} NXdata groups, {len(synthetic_template(args.groups).keys())} keys"
+    )
+    for label, count in sorted(counts.items()):
+        print(f"  {label:>16}: {count}")
+    print(f"  {'total':>16}: {sum(counts.values())}")
+    print(f"  write time {statistics.median(timings) * 1e3:.1f} ms (median)")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,14 +16,12 @@
 # limitations under the License.
 #
 
+import functools
 import logging
 import os
 import re
 from datetime import datetime
 
-from pynxtools._build_wrapper import get_vcs_version
-from pynxtools.definitions.dev_tools.globals.nxdl import get_nxdl_version
-
 LOGGER_LEVELS_TO_HIGHLIGHT = (logging.WARNING, logging.ERROR)
 
 MAIN_BRANCH_NAME = "fairmat"
@@ -80,20 +78,30 @@ def format_version(version: str) -> str:
     )
 
 
+@functools.cache
 def get_nexus_version() -> str:
     """
     The version of the Nexus standard and the NeXus Definition language
-    based on git tags and commits
+    based on git tags and commits.
+
+    The version is looked up once per process. Only a git checkout of the
+    definitions is asked with `git describe`, installed packages read the
+    version written at build time.
     """
-    version = get_vcs_version()
+    definitions = os.path.join(os.path.dirname(__file__), "definitions")
+    if os.path.exists(os.path.join(definitions, ".git")):
+        from pynxtools._build_wrapper import get_vcs_version
 
-    if version is not None:
-        return format_version(version)
+        version = get_vcs_version()
+        if version is not None:
+            return format_version(version)
 
     version_file = os.path.join(os.path.dirname(__file__), "nexus-version.txt")
 
     if not os.path.exists(version_file):
         # We are in the limbo, just get the nxdl version from nexus definitions
+        from pynxtools.definitions.dev_tools.globals.nxdl import get_nxdl_version
+
         return format_version(get_nxdl_version())
 
     with open(version_file, encoding="utf-8") as vfile:
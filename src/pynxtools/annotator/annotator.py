@@ -45,6 +45,7 @@ from typing import Any, Literal
 
 import h5py
 
+from pynxtools.nexus.descriptors import FieldDescriptor, is_field
 from pynxtools.nexus.handler import NexusVisitor
 from pynxtools.nexus.nexus_tree import NexusField, NexusNode, generate_tree_from
 from pynxtools.nexus.nxdata import (
@@ -75,6 +76,9 @@ class Annotator(NexusVisitor):
     concept:
         If set, collect all HDF5 paths whose schema IS-A the given NXDL
         concept path (``-c`` mode).  Results are logged in `on_complete`.
+    resolver:
+        Optional schema resolver, e.g. one shared with other visitors of a
+        `CompositeVisitor`.  A private resolver is created if omitted.
     """
 
     def __init__(
@@ -82,12 +86,13 @@ class Annotator(NexusVisitor):
         logger,
         documentation: str | None = None,
         concept: str | None = None,
+        resolver: NexusSchemaResolver | None = None,
     ) -> None:
         self.logger = logger
         self.documentation = documentation
         self.concept = concept
         self._concept_matches: list[str] = []
-        self._resolver = NexusSchemaResolver()
+        self._resolver = resolver if resolver is not None else NexusSchemaResolver()
         # NXdata inspection results keyed by HDF5 group path
         self._nxdata_cache: dict[str, NXdataInfo] = {}
 
@@ -266,7 +271,9 @@ class Annotator(NexusVisitor):
                     + (f", {axes_count} axis dataset(s)" if axes_count else ""),
                 )
 
-    def _annotate_field(self, hdf_path: str, hdf_node: h5py.Dataset) -> None:
+    def _annotate_field(
+        self, hdf_path: str, hdf_node: h5py.Dataset | FieldDescriptor
+    ) -> None:
         """Emit a structured block for a FIELD node."""
         depth = self._depth(hdf_path)
         ind = "  " * depth
@@ -282,11 +289,15 @@ class Annotator(NexusVisitor):
         # same NXdata group and keeps all detection logic in nexus.nxdata.
         nxdata_hint = self._nxdata_role(hdf_node, name, det)
 
-        val = (
-            str(decode_if_string(hdf_node[()])).split("\n")
-            if len(hdf_node.shape) <= 1
-            else str(decode_if_string(hdf_node[0])).split("\n")
-        )
+        if isinstance(hdf_node, FieldDescriptor) and not hdf_node.loadable:
+            # Metadata-only traversal: do not read bulk data for the preview
+            val = [f"<{hdf_node.nbytes} bytes, not loaded>"]
+        else:
+            val = (
+                str(decode_if_string(hdf_node[()])).split("\n")
+                if len(hdf_node.shape) <= 1
+                else str(decode_if_string(hdf_node[0])).split("\n")
+            )
         self._detail(
             det, "Value", f"{val[0]}{'...' if len(val) > 1 else ''}", level=10
         )  # DEBUG
@@ -401,7 +412,7 @@ class Annotator(NexusVisitor):
         if in_schema:
             opt_label = attr_node.optionality.upper()
             schema_tag = f"  [{opt_label}]" if opt_label else ""
-        elif attr_name == "units" and isinstance(parent, h5py.Dataset):
+        elif attr_name == "units" and is_field(parent):
             # @units on a field is valid whenever the field carries a unit category
             # in NXDL (e.g. NX_ENERGY). No explicit <attribute name="units"> child
             # exists in the schema XML — the constraint is expressed as the field
@@ -33,12 +33,9 @@ Legacy entry points (``read_nexus``, ``dataconverter``, ``generate_eln``,
 ``validate_nexus``) remain installed and emit a deprecation warning.
 """
 
-import click
+import importlib
 
-from pynxtools.annotator.cli import read
-from pynxtools.dataconverter.cli import convert, validate
-from pynxtools.eln_mapper.cli import generate_eln
-from pynxtools.nexus.cli import inspect_appdef
+import click
 
 
 class _LazyNomadGroup(click.Group):
@@ -69,7 +66,32 @@ class _LazyNomadGroup(click.Group):
         return self._resolve().get_command(ctx, cmd_name)
 
 
-@click.group()
+class _LazyGroup(click.Group):
+    """Group whose sub-commands are imported when they are used.
+
+    Each sub-command module imports what its commands need, e.g. h5py or
+    the converter, so that ``pynx read`` does not pay for ``pynx convert``.
+    """
+
+    lazy_commands: dict[str, str] = {
+        "read": "pynxtools.annotator.cli:read",
+        "convert": "pynxtools.dataconverter.cli:convert",
+        "validate": "pynxtools.dataconverter.cli:validate",
+        "generate-eln": "pynxtools.eln_mapper.cli:generate_eln",
+        "inspect-appdef": "pynxtools.nexus.cli:inspect_appdef",
+    }
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return [*self.lazy_commands, *super().list_commands(ctx)]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_commands:
+            module, name = self.lazy_commands[cmd_name].split(":")
+            return getattr(importlib.import_module(module), name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=_LazyGroup)
 def pynx():
     """pynxtools NeXus file tools.
 
@@ -77,9 +99,4 @@ def pynx():
     """
 
 
-pynx.add_command(read, name="read")
-pynx.add_command(convert, name="convert")
-pynx.add_command(validate, name="validate")
-pynx.add_command(generate_eln, name="generate-eln")
-pynx.add_command(inspect_appdef, name="inspect-appdef")
 pynx.add_command(_LazyNomadGroup(), name="nomad")
@@ -0,0 +1,301 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Batch conversion of many (inputs, reader, nxdl, output) jobs.
+
+The jobs are read from a manifest and run in a pool of worker processes.
+Each worker keeps a `ConversionCache`, so that the NXDL trees, template
+skeletons and reader classes are built once per worker instead of once per
+job. A manifest is one of
+
+- a CSV file with a header row, e.g. `input_file,output,reader,nxdl`,
+- a JSON lines file with one job object per line,
+- a YAML file with a list of jobs, or a mapping with `jobs` and `defaults`.
+
+Each job names its `output` and its `input_file`, a list of paths, or in CSV
+files, paths separated by ";". `reader` and `nxdl` can be given as defaults
+for all jobs. All other keys are passed as options to `convert`, e.g.
+`skip_verify` or `config_file`; CSV cells are parsed as YAML scalars.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import yaml
+
+from pynxtools.dataconverter.convert import ConversionCache, ValidationFailed, convert
+from pynxtools.dataconverter.helpers import collector
+
+logger = logging.getLogger("pynxtools")
+
+INPUT_FILE_SEPARATOR = ";"
+
+
+@dataclass
+class BatchJob:
+    """One conversion of a batch.
+
+    Args:
+        input_file (tuple[str, ...]): The input files of the reader.
+        output (str): The path of the NeXus file to write.
+        reader (str): The name of the reader.
+        nxdl (str): The name of the application definition, e.g. NXmpes.
+        options (dict): Further keyword arguments of `convert`.
+    """
+
+    input_file: tuple[str, ...]
+    output: str
+    reader: str
+    nxdl: str
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class JobResult:
+    """The outcome of a `BatchJob`.
+
+    Args:
+        output (str): The output path of the job.
+        status (str): "success" if the file was written, "invalid" if the
+            data did not pass the validation, "failed" if the conversion
+            raised an error.
+        seconds (float): The wall time of the job.
+        valid (bool | None): The result of the validation, None if the job
+            skipped it or failed before.
+        messages (list[str]): The warnings and errors logged during the job,
+            e.g. validation problems.
+        error (str | None): The error of invalid and failed jobs.
+    """
+
+    output: str
+    status: str
+    seconds: float
+    valid: bool | None = None
+    messages: list[str] = field(default_factory=list)
+    error: str | None = None
+
+
+def _normalize_job(
+    entry: dict[str, Any], defaults: dict[str, Any] | None = None
+) -> BatchJob:
+    """Build a job from a manifest entry, completed by the defaults."""
+    options = {key.replace("-", "_"): value for key, value in entry.items()}
+    for key, value in (defaults or {}).items():
+        options.setdefault(key.replace("-", "_"), value)
+
+    input_file = options.pop("input_file", ())
+    if isinstance(input_file, str):
+        input_file = [
+            path.strip()
+            for path in input_file.split(INPUT_FILE_SEPARATOR)
+            if path.strip()
+        ]
+    missing = [key for key in ("output", "reader", "nxdl") if not options.get(key)]
+    if missing:
+        raise ValueError(f"The job {entry} has no {', '.join(missing)}.")
+    return BatchJob(
+        input_file=tuple(input_file),
+        output=str(options.pop("output")),
+        reader=options.pop("reader"),
+        nxdl=options.pop("nxdl"),
+        options=options,
+    )
+
+
+def _parse_csv(text: str) -> list[dict[str, Any]]:
+    """The rows of a CSV manifest, with their cells parsed as YAML scalars."""
+    entries = []
+    for row in csv.DictReader(io.StringIO(text)):
+        entry: dict[str, Any] = {}
+        for key, value in row.items():
+            if key is None or value is None or not value.strip():
+                continue
+            if key.strip() in ("input_file", "input-file", "output"):
+                entry[key.strip()] = value.strip()
+            else:
+                entry[key.strip()] = yaml.safe_load(value)
+        entries.append(entry)
+    return entries
+
+
+def read_manifest(
+    manifest: str, defaults: dict[str, Any] | None = None
+) -> list[BatchJob]:
+    """
+    Read the jobs of a batch from a CSV, JSON lines or YAML manifest.
+
+    The format is chosen by the file extension: .csv, .jsonl (or .ndjson),
+    and .yaml (or .yml).
+
+    Args:
+        manifest (str): The path of the manifest.
+        defaults (dict | None): Values for keys that a job does not set, e.g.
+            the reader and nxdl of all jobs. Defaults given in a YAML manifest
+            take precedence over these.
+
+    Returns:
+        list[BatchJob]: The jobs in the order of the manifest.
+
+    Raises:
+        ValueError: If the format is not supported or a job misses its
+            output, reader or nxdl.
+    """
+    with open(manifest, encoding="utf-8") as file:
+        text = file.read()
+
+    extension = os.path.splitext(manifest)[1].lower()
+    defaults = dict(defaults or {})
+    if extension == ".csv":
+        entries = _parse_csv(text)
+    elif extension in (".jsonl", ".ndjson"):
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    elif extension in (".yaml", ".yml"):
+        content = yaml.safe_load(text) or []
+        if isinstance(content, dict):
+            defaults.update(content.get("defaults") or {})
+            content = content.get("jobs") or []
+        entries = content
+    else:
+        raise ValueError(
+            f"The manifest {manifest} is not a .csv, .jsonl or .yaml file."
+        )
+    return [_normalize_job(entry, defaults) for entry in entries]
+
+
+class _MessageHandler(logging.Handler):
+    """Keeps the messages logged during a job, by default warnings and errors."""
+
+    def __init__(self, level: int = logging.WARNING):
+        super().__init__(level=level)
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord):
+        self.messages.append(record.getMessage())
+
+
+def run_job(job: BatchJob, cache: ConversionCache | None = None) -> JobResult:
+    """
+    Convert the data of a job. Errors are reported in the result, not raised.
+
+    Args:
+        job (BatchJob): The job to run.
+        cache (ConversionCache | None): The cache shared with other jobs.
+            Defaults to None, i.e., everything is built for this job.
+
+    Returns:
+        JobResult: The status, timing and validation result of the job.
+    """
+    verify = not (job.options.get("skip_verify") or job.options.get("append"))
+    handler = _MessageHandler()
+    logger.addHandler(handler)
+    collector.clear()
+    start = time.perf_counter()
+    error = None
+    try:
+        convert(
+            job.input_file, job.reader, job.nxdl, job.output, cache=cache, **job.options
+        )
+        status = "success"
+    except ValidationFailed as exc:
+        status, error = "invalid", str(exc)
+    except Exception as exc:  # pylint: disable=broad-except
+        status, error = "failed", f"{type(exc).__name__}: {exc}"
+    finally:
+        logger.removeHandler(handler)
+    seconds = time.perf_counter() - start
+
+    valid = None
+    if verify and status != "failed":
+        valid = not collector.has_validation_problems()
+        if not valid and status == "success":
+            status = "invalid"
+    return JobResult(
+        output=job.output,
+        status=status,
+        seconds=seconds,
+        valid=valid,
+        messages=handler.messages,
+        error=error,
+    )
+
+
+# The cache of a worker process, see `_init_worker`
+_worker_cache: ConversionCache | None = None
+
+
+def _init_worker():
+    """Create the cache of a worker process."""
+    global _worker_cache
+    _worker_cache = ConversionCache()
+
+
+def _run_job_in_worker(job: BatchJob) -> JobResult:
+    return run_job(job, _worker_cache)
+
+
+def run_batch(
+    jobs: Iterable[BatchJob], workers: int = 1, cache: ConversionCache | None = None
+) -> Iterator[JobResult]:
+    """
+    Run the jobs of a batch and yield their results in the order of the jobs.
+
+    With one worker, the jobs run in this process and share `cache`.
+    Otherwise, they are distributed over a pool of worker processes, each
+    with its own cache.
+
+    Args:
+        jobs (Iterable[BatchJob]): The jobs to run.
+        workers (int): The number of worker processes. Defaults to 1.
+        cache (ConversionCache | None): The cache of the jobs if they run in
+            this process. Defaults to None, i.e., a new cache.
+
+    Yields:
+        JobResult: The result of each job.
+
+    Raises:
+        ValueError: If more than one job writes to the same output file.
+    """
+    jobs = list(jobs)
+    outputs = Counter(os.path.abspath(job.output) for job in jobs)
+    duplicates = sorted(path for path, count in outputs.items() if count > 1)
+    if duplicates:
+        raise ValueError(
+            f"More than one job writes to {', '.join(duplicates)}. "
+            "Each job needs its own output file."
+        )
+
+    if workers <= 1 or len(jobs) <= 1:
+        if cache is None:
+            cache = ConversionCache()
+        for job in jobs:
+            yield run_job(job, cache)
+        return
+
+    workers = min(workers, len(jobs))
+    # Several jobs per task amortize the transfer to the workers
+    chunksize = max(1, min(64, len(jobs) // (4 * workers)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        yield from pool.map(_run_job_in_worker, jobs, chunksize=chunksize)
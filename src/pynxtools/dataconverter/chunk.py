@@ -18,10 +18,25 @@
 
 """Configuration and utilities for customized chunking and compression."""
 
+import functools
+import importlib.util
 import logging
 import os
+from collections.abc import Mapping, Sequence
+from typing import Any
 
 import numpy as np
+import yaml
+
+from pynxtools.nexus.storage import (
+    CHUNK_CONFIG_DEFAULT,
+    CHUNK_CONFIG_GPFS,
+    CHUNK_CONFIG_HDD,
+    CHUNK_CONFIG_HFIVEPY,
+    CHUNK_CONFIG_LUSTRE,
+    CHUNK_CONFIG_SSD_NVM,
+    import_hdf5plugin,
+)
 
 logger = logging.getLogger("pynxtools")  # pylint: disable=C0103
 
@@ -42,13 +57,14 @@ PERFORMANT_COMPRESSION_FILTER = "blosc"
 # integer value 9 means aggressive compression
 # i.e. both compression strengths are strong for both compression algorithms
 
-try:
-    import blosc2
-    import hdf5plugin  # noqa: F401
-
-    BLOSC_NTHREADS = blosc2.set_nthreads(
-        min(max(int(os.cpu_count() / 2), 1), int(os.cpu_count()))
-    )
+# blosc2 takes long to import, so it is only imported when a dataset is
+# compressed with it, see `import_blosc2`
+HAS_BLOSC2 = (
+    importlib.util.find_spec("blosc2") is not None
+    and importlib.util.find_spec("hdf5plugin") is not None
+)
+if HAS_BLOSC2:
+    BLOSC_NTHREADS = min(max(int(os.cpu_count() / 2), 1), int(os.cpu_count()))
     # do not oversubscribe, cpu_count counts Intel hyperthreading cores as real cores
     # although these share specific resources, going with at most half the available
     # is also reasonable when inside a NOMAD deployment
@@ -56,58 +72,38 @@ try:
     # until there is a mechanism in NOMAD whereby such configurations can be passed
     # to the NOMAD plugins directly
 
+    # zstd and lz4 use the HDF5 filters registered by hdf5plugin
     COMPRESSION_FILTERS: list[str] = [
         DEFAULT_COMPRESSION_FILTER,
         PERFORMANT_COMPRESSION_FILTER,
+        "zstd",
+        "lz4",
     ]
-except ImportError:
+else:
     BLOSC_NTHREADS = 0
     COMPRESSION_FILTERS = [DEFAULT_COMPRESSION_FILTER]
 
 
-# compressed payload is served as a dict with at least one keyword "compress",
-# "strength" is optional keyword for that dictionary to overwrite
-# DEFAULT_COMPRESSION_STRENGTH
+@functools.cache
+def import_blosc2():
+    """blosc2, imported on first use and set to use `BLOSC_NTHREADS` threads."""
+    import blosc2
 
-# Use-case-specific configurations to optimize performance for chunked storage."""
-# https://github.com/h5py/h5py/blob/master/docs/high/file.rst
+    blosc2.set_nthreads(BLOSC_NTHREADS)
+    return blosc2
 
-# e.g. for h5py v3.15.1 https://github.com/h5py/h5py/blob/fad034c16f595cb24f4393bbd0dcd23c53bc9a33/h5py/tests/test_file2.py#L111
-CHUNK_CONFIG_HFIVEPY: dict[str, int | float] = {
-    "byte_size": 1 * 1024 * 1024,
-    "rdcc_nbytes": 1 * 1024 * 1024,  # 1 MiB before HDF2.0, will be 8 MiB for HDF2.0
-    "rdcc_nslots": 521,
-    "rdcc_w0": 0.75,
-}
 
-CHUNK_CONFIG_SSD_NVM: dict[str, int | float] = {
-    "byte_size": 1 * 1024 * 1024,
-    "rdcc_nbytes": 128 * 1024 * 1024,
-    "rdcc_nslots": 4093,
-    "rdcc_w0": 0.75,
-}
-CHUNK_CONFIG_HDD: dict[str, int | float] = {
-    "byte_size": 4 * 1024 * 1024,
-    "rdcc_nbytes": 256 * 1024 * 1024,
-    "rdcc_nslots": 1021,
-    "rdcc_w0": 0.75,
-}
-CHUNK_CONFIG_GPFS: dict[str, int | float] = {
-    "byte_size": 8 * 1024 * 1024,
-    "rdcc_nbytes": 256 * 1024 * 1024,
-    "rdcc_nslots": 521,
-    "rdcc_w0": 0.75,
-}
+# the writer selects the codec per dataset by sampling, see codec_selection.py
+AUTO_COMPRESSION_FILTER = "auto"
+COMPRESSION_FILTERS.append(AUTO_COMPRESSION_FILTER)
 
-CHUNK_CONFIG_LUSTRE: dict[str, int | float] = {
-    # set stripe size before creating a file!
-    "byte_size": 8 * 1024 * 1024,
-    "rdcc_nbytes": 256 * 1024 * 1024,
-    "rdcc_nslots": 521,
-    "rdcc_w0": 0.75,
-}
 
-CHUNK_CONFIG_DEFAULT = CHUNK_CONFIG_HFIVEPY
+# compressed payload is served as a dict with at least one keyword "compress",
+# "strength" is optional keyword for that dictionary to overwrite
+# DEFAULT_COMPRESSION_STRENGTH
+
+# The use-case-specific configurations CHUNK_CONFIG_* of the chunk cache and the
+# chunk size are defined with the storage profiles in pynxtools.nexus.storage.
 
 logger = logging.getLogger("pynxtools")  # pylint: disable=C0103
 
@@ -115,6 +111,7 @@ logger = logging.getLogger("pynxtools")  # pylint: disable=C0103
 def prioritized_axes_heuristic(
     data: np.ndarray,
     priority: tuple[int, ...],
+    byte_size: int | None = None,
 ) -> tuple[int, ...] | bool:
     """Define an explicit tuple[int] how to chunk data with shape
 
@@ -124,6 +121,9 @@ def prioritized_axes_heuristic(
     in increasing priority which axes should not be as strongly splitted into chunks.
     the later the index in priority, the more likely this axis will be splitted
     into fewer chunks, if any.
+    * byte_size, the upper bound for the size of a chunk, by default the byte_size
+    of CHUNK_CONFIG_DEFAULT, use the byte_size of a storage profile to adapt the
+    chunks to the file system, see pynxtools.nexus.storage.get_storage_profile
 
     Examples substantiating this heuristic:
     * Electron microscopy, a stack of 100,000 x 1024 x 1024 2D images, 4B int itemsize:
@@ -174,7 +174,9 @@ def prioritized_axes_heuristic(
         raise ValueError("chunk_shape not allowed for scalar datasets.")
         # also h5py by default would raise in such a case
     chunk_shape: list[float] = list(float(extent) for extent in shape)
-    max_byte_per_chunk: int = int(CHUNK_CONFIG_DEFAULT["byte_size"])
+    max_byte_per_chunk: int = int(
+        CHUNK_CONFIG_DEFAULT["byte_size"] if byte_size is None else byte_size
+    )
     byte_per_item: int = data.itemsize
 
     pdx = 0
@@ -259,8 +261,104 @@ def prioritized_axes_heuristic(
     return True
 
 
-def chunking_strategy(data) -> bool | tuple[int, ...]:
-    """Decide chunking strategy, check validity for explicit overwriting of the auto-chunking. Returns true for auto-chunking, otherwise returns explicit settings for the chunking."""
+# number of trailing dimensions which are read at once for each value of the
+# @interpretation attribute of NXdata signals, e.g. whole images
+INTERPRETATION_DIMS: dict[str, int] = {
+    "scalar": 0,
+    "scaler": 0,
+    "spectrum": 1,
+    "vertex": 1,
+    "image": 2,
+    "rgb-image": 3,
+    "rgba-image": 3,
+    "hsl-image": 3,
+    "hsla-image": 3,
+    "cmyk-image": 3,
+}
+
+
+def load_access_patterns(
+    patterns: str | os.PathLike | Mapping[str, Any] | None,
+) -> dict[str, Any]:
+    """Load the access pattern hints of an application definition.
+
+    An access pattern hint maps an NXDL path of a dataset, or of an NXdata
+    group for all of its signals, to the dimensions that users read at once:
+    * an @interpretation of NXdata, e.g. "image" for the last two dimensions
+    * a list of dimension indices or of axis names from the @axes of the group
+
+    Example of a hint file in YAML:
+    /ENTRY/DATA: image
+    /ENTRY/INSTRUMENT/DETECTOR/data: [energy]
+
+    Returns the hints keyed by NXDL path, empty for None."""
+    if patterns is None:
+        return {}
+    if not isinstance(patterns, Mapping):
+        with open(patterns, encoding="utf-8") as hint_file:
+            patterns = yaml.safe_load(hint_file) or {}
+    hints: dict[str, Any] = {}
+    for nxdl_path, pattern in patterns.items():
+        if not (
+            (isinstance(pattern, str) and pattern in INTERPRETATION_DIMS)
+            or (
+                isinstance(pattern, Sequence)
+                and not isinstance(pattern, str)
+                and all(isinstance(dim, (int, str)) for dim in pattern)
+            )
+        ):
+            raise ValueError(
+                f"Invalid access pattern {pattern!r} for {nxdl_path}, use one of "
+                f"{', '.join(INTERPRETATION_DIMS)} or a list of axes."
+            )
+        hints[nxdl_path] = pattern
+    return hints
+
+
+def access_pattern_priority(
+    ndim: int,
+    pattern: str | Sequence[int | str] | None,
+    axes: Sequence[str] = (),
+) -> tuple[int, ...] | None:
+    """Translate an access pattern into a priority for prioritized_axes_heuristic
+
+    Parameter:
+    * ndim, the number of dimensions of the dataset
+    * pattern, an @interpretation, dimension indices or axis names read at once,
+    None for a C-style access, i.e. reading along the last dimensions
+    * axes, the axis name of each dimension, e.g. from the @axes of NXdata
+
+    The dimensions read at once come last in the priority and are therefore
+    splitted last, all other dimensions keep their order.
+
+    Returns None if an axis of the pattern does not name a dimension."""
+    if pattern is None:
+        read_at_once = []
+    elif isinstance(pattern, str):
+        read_at_once = list(range(ndim - min(INTERPRETATION_DIMS[pattern], ndim), ndim))
+    else:
+        read_at_once = []
+        for axis in pattern:
+            if isinstance(axis, str):
+                if axis not in axes:
+                    logger.info(
+                        f"chunk strategy h5py auto used for unknown axis {axis}"
+                    )
+                    return None
+                axis = list(axes).index(axis)
+            if not -ndim <= axis < ndim:
+                logger.info(f"chunk strategy h5py auto used for invalid axis {axis}")
+                return None
+            read_at_once.append(axis % ndim)
+    return tuple(dim for dim in range(ndim) if dim not in read_at_once) + tuple(
+        dict.fromkeys(read_at_once)
+    )
+
+
+def chunking_strategy(
+    data, auto_chunks: bool | tuple[int, ...] = True
+) -> bool | tuple[int, ...]:
+    """Decide chunking strategy, check validity for explicit overwriting of the auto-chunking. Returns auto_chunks, by default true for auto-chunking, otherwise returns explicit settings for the chunking."""
     if isinstance(data, dict):
         if "compress" in data.keys() and "chunks" in data.keys():
             if isinstance(data["compress"], np.ndarray) and isinstance(
@@ -271,4 +369,4 @@ def chunking_strategy(data) -> bool | tuple[int, ...]:
                 ):
                     if len(np.shape(data["compress"])) == len(data["chunks"]):
                         return data["chunks"]
-    return True
+    return auto_chunks
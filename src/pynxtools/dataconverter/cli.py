@@ -22,7 +22,8 @@ Exposes two top-level symbols consumed by the ``pynx`` group:
 ``convert``
     Click group for all conversion-related sub-commands (``pynx convert``).
     Invoking it without a sub-command runs the conversion directly.
-    Sub-commands: ``generate-template``, ``get-readers``, ``reader-info``.
+    Sub-commands: ``batch``, ``serve``, ``synth``, ``generate-template``,
+    ``get-readers``, ``reader-info``.
 
 ``validate``
     Standalone command to validate a NeXus HDF5 file (``pynx validate``).
@@ -32,23 +33,21 @@ import json
 import logging
 import os
 import sys
+import time
+from dataclasses import asdict
 from gettext import gettext
 from pathlib import Path
-from typing import Literal
 
 import click
 from click_default_group import DefaultGroup
 
-from pynxtools.dataconverter import helpers
-from pynxtools.dataconverter.convert import (
-    ValidationFailed,
-    get_names_of_all_readers,
-    get_reader,
-    parse_params_file,
-)
-from pynxtools.dataconverter.convert import convert as _convert
-from pynxtools.dataconverter.validate_file import validate as _validate
-from pynxtools.nexus.nexus_tree import generate_tree_from
+from pynxtools.dataconverter.profiling import PROFILE_FORMATS, ConversionStats
+from pynxtools.dataconverter.readers.registry import registry as reader_registry
+from pynxtools.dataconverter.storage import IN_MEMORY_THRESHOLD
+from pynxtools.nexus.storage import STORAGE_PROFILES
+
+# The converter, validation and NXDL trees are imported by the commands that
+# use them, so that e.g. `get-readers` starts quickly.
 
 logger = logging.getLogger("pynxtools")
 
@@ -106,7 +105,7 @@ def convert():
 @click.option(
     "--reader",
     default="json_map",
-    type=click.Choice(get_names_of_all_readers(), case_sensitive=False),
+    type=click.Choice(reader_registry.names(), case_sensitive=False),
     help=(
         "The reader to use. Examples are json_map or readers from a pynxtools plugin. "
         "default='json_map' This option is required if no '--params-file' is supplied."
@@ -145,6 +144,62 @@ def convert():
     default=False,
     help="Ignore all undocumented concepts during validation.",
 )
+@click.option(
+    "--compression-workers",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Number of threads that compress chunked datasets in parallel. "
+    "By default, the HDF5 library compresses the data on a single core.",
+)
+@click.option(
+    "--storage-profile",
+    type=click.Choice(["auto", *STORAGE_PROFILES]),
+    default="auto",
+    help="The chunk cache, metadata block size and alignment of the output file. "
+    "By default, the profile is detected from the file system of the output path "
+    "or taken from the environment variable PYNXTOOLS_STORAGE_PROFILE.",
+)
+@click.option(
+    "--access-patterns",
+    type=click.Path(exists=True, dir_okay=False, file_okay=True, readable=True),
+    default=None,
+    help="A YAML file that names the dimensions which users read at once for "
+    "datasets of the NXDL, e.g. '/ENTRY/DATA: image'. These datasets and the "
+    "signals of NXdata groups are chunked along their access pattern.",
+)
+@click.option(
+    "--compression-policy",
+    default="ratio:100",
+    help="How the codec of compressed payloads with the filter 'auto' is selected: "
+    "'ratio:<MB/s>' for the best compression ratio with at least this compression "
+    "throughput, 'speed:<ratio>' for the fastest codec with at least this "
+    "compression ratio. default='ratio:100'",
+)
+@click.option(
+    "--in-memory",
+    is_flag=True,
+    default=False,
+    help="Build the output file in memory and store it with one sequential write. "
+    "This is faster for files with many small datasets and attributes, "
+    "especially on network file systems. Files which are appended to or whose "
+    "values exceed --in-memory-threshold are written directly.",
+)
+@click.option(
+    "--in-memory-threshold",
+    type=click.IntRange(min=0),
+    default=IN_MEMORY_THRESHOLD // 1024**2,
+    callback=lambda ctx, param, value: value * 1024**2,
+    help="The estimated size of the values in MiB up to which --in-memory builds "
+    f"the file in memory. default={IN_MEMORY_THRESHOLD // 1024**2}",
+)
+@click.option(
+    "--compact-storage",
+    is_flag=True,
+    default=False,
+    help="Store the values of small fields inside their object header (compact "
+    "layout) and short strings as fixed-length UTF-8 instead of variable-length "
+    "strings. This reduces the size and write time of files with many scalars.",
+)
 @click.option(
     "--fail",
     is_flag=True,
@@ -174,6 +229,21 @@ def convert():
     default=None,
     help="A json config file for the reader",
 )
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write the wall time, CPU time and peak memory of the stages of the "
+    "conversion to this file, also if the conversion fails.",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(PROFILE_FORMATS),
+    default="json",
+    show_default=True,
+    help="The format of the --profile file: the stages and a summary as json or "
+    "a trace for chrome://tracing or Perfetto.",
+)
 # pylint: disable=too-many-arguments
 def run(
     files: tuple[str, ...],
@@ -188,12 +258,58 @@ def run(
     config_file: str,
     fail: bool,
     mapping: str | None,
+    profile: str | None,
+    profile_format: str,
     **kwargs,
 ):
     """Convert input files to a NeXus HDF5 file."""
+    stats = ConversionStats() if profile else None
+    try:
+        _run(
+            files,
+            input_file,
+            reader,
+            nxdl,
+            output,
+            params_file,
+            append,
+            ignore_undocumented,
+            skip_verify,
+            config_file,
+            fail,
+            mapping,
+            stats=stats,
+            **kwargs,
+        )
+    finally:
+        if stats is not None:
+            stats.write(profile, profile_format)
+            logger.info(f"Profile of {stats.total:.2f} s written to {profile}.")
+
+
+# pylint: disable=too-many-arguments
+def _run(
+    files: tuple[str, ...],
+    input_file: tuple[str, ...],
+    reader: str,
+    nxdl: str,
+    output: str,
+    params_file: str,
+    append: bool,
+    ignore_undocumented: bool,
+    skip_verify: bool,
+    config_file: str,
+    fail: bool,
+    mapping: str | None,
+    stats: ConversionStats | None,
+    **kwargs,
+):
+    from pynxtools.dataconverter.convert import ValidationFailed, parse_params_file
+    from pynxtools.dataconverter.convert import convert as _convert
+
     if params_file:
         try:
-            _convert(**parse_params_file(params_file))
+            _convert(**parse_params_file(params_file), stats=stats)
             return
         except TypeError as exc:
             sys.tracebacklimit = 0
@@ -240,6 +356,7 @@ def run(
             append=append,
             ignore_undocumented=ignore_undocumented,
             fail=fail,
+            stats=stats,
             **kwargs,
         )
     except FileNotFoundError as exc:
@@ -250,6 +367,153 @@ def run(
         ) from exc
 
 
+@convert.command("batch")
+@click.argument(
+    "manifest",
+    type=click.Path(exists=True, dir_okay=False, file_okay=True, readable=True),
+)
+@click.option(
+    "--reader",
+    default=None,
+    help="The reader of all jobs which do not name one.",
+)
+@click.option(
+    "--nxdl",
+    default=None,
+    help="The application definition of all jobs which do not name one.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    show_default="number of CPUs",
+    help="Number of worker processes. Each worker keeps the NXDL trees, "
+    "templates and reader classes of its jobs.",
+)
+@click.option(
+    "--report",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write the status, timing and validation messages of each job to this "
+    "JSON lines file.",
+)
+@click.option(
+    "--ignore-undocumented",
+    is_flag=True,
+    default=False,
+    help="Ignore all undocumented concepts during validation of all jobs.",
+)
+@click.option(
+    "--skip-verify",
+    is_flag=True,
+    default=False,
+    help="Skips the verification routine of all jobs.",
+)
+@click.option(
+    "--fail",
+    is_flag=True,
+    default=False,
+    help="Don't write the output file of jobs whose validation fails.",
+)
+def batch(
+    manifest: str,
+    reader: str | None,
+    nxdl: str | None,
+    workers: int,
+    report: str | None,
+    ignore_undocumented: bool,
+    skip_verify: bool,
+    fail: bool,
+):
+    """Convert the jobs of a manifest in a pool of worker processes.
+
+    MANIFEST: a CSV, JSON lines or YAML file with one job per row, line or
+    list item. Each job names its input_file (a list, or paths separated by
+    ";" in CSV files) and output, and, unless given as options, its reader
+    and nxdl. Other keys are passed to the conversion, e.g. config_file.
+    """
+    from pynxtools.dataconverter.batch import read_manifest, run_batch
+
+    defaults = {
+        key: value
+        for key, value in (
+            ("reader", reader),
+            ("nxdl", nxdl),
+            ("ignore_undocumented", ignore_undocumented),
+            ("skip_verify", skip_verify),
+            ("fail", fail),
+        )
+        if value
+    }
+    try:
+        jobs = read_manifest(manifest, defaults)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="MANIFEST") from exc
+
+    counts = {"success": 0, "invalid": 0, "failed": 0}
+    start = time.perf_counter()
+    report_file = open(report, "w", encoding="utf-8") if report else None
+    try:
+        for result in run_batch(jobs, workers=workers):
+            counts[result.status] += 1
+            click.echo(f"{result.status:>8} {result.seconds:8.2f} s  {result.output}")
+            if result.error:
+                click.echo(f"         {result.error}")
+            if report_file is not None:
+                report_file.write(json.dumps(asdict(result)) + "\n")
+    finally:
+        if report_file is not None:
+            report_file.close()
+    click.echo(
+        f"{len(jobs)} jobs in {time.perf_counter() - start:.2f} s: "
+        + ", ".join(f"{count} {status}" for status, count in counts.items())
+    )
+    if counts["failed"]:
+        raise click.ClickException(f"{counts['failed']} of {len(jobs)} jobs failed.")
+
+
+@convert.command("serve")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="The Unix socket to listen on. Defaults to $PYNXTOOLS_SOCKET, or "
+    "pynxtools-<user>.sock in $XDG_RUNTIME_DIR or the temporary directory.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes. Each worker keeps the NXDL trees, "
+    "templates and reader classes of its requests.",
+)
+@click.option(
+    "--max-jobs-per-worker",
+    type=click.IntRange(min=0),
+    default=100,
+    show_default=True,
+    help="Replace a worker by a new one after this many requests, "
+    "0 to keep the workers.",
+)
+def serve(socket_path: str | None, workers: int, max_jobs_per_worker: int):
+    """Serve conversions to `dataconverter_client` until stopped.
+
+    The server keeps its workers and their caches warm between requests, so
+    that the client skips the startup of the converter. It stops after the
+    queued requests on SIGTERM, Ctrl+C or `dataconverter_client shutdown`.
+    """
+    from pynxtools.dataconverter.client import ServerError
+    from pynxtools.dataconverter.daemon import ConversionServer
+
+    try:
+        server = ConversionServer(socket_path, workers, max_jobs_per_worker or None)
+    except (RuntimeError, ServerError) as exc:
+        raise click.ClickException(str(exc)) from exc
+    server.serve_forever()
+
+
 @convert.command("generate-template")
 @click.argument("nxdl")
 @click.option(
@@ -272,23 +536,17 @@ def generate_template(nxdl: str, required: bool, pythonic: bool, output: str):
 
     NXDL: application definition name, e.g. NXmpes
     """
+    from pynxtools.dataconverter.helpers import generate_template_from_tree
+    from pynxtools.nexus.nexus_tree import generate_tree_from
 
     def write_to_file(text):
         f = open(output, "w")
         f.write(text)
         f.close()
 
-    tree = generate_tree_from(nxdl)
-
     print_or_write = lambda txt: write_to_file(txt) if output else print(txt)
 
-    level: Literal["required", "recommended", "optional"] = "optional"
-    if required:
-        level = "required"
-    reqs = tree.required_fields_and_attrs_names(level=level)
-    template = {
-        helpers.convert_nxdl_path_dict_to_data_converter_dict(req): None for req in reqs
-    }
+    template = generate_template_from_tree(generate_tree_from(nxdl), required)
 
     if pythonic:
         print_or_write(str(template))
@@ -303,23 +561,109 @@ def generate_template(nxdl: str, required: bool, pythonic: bool, output: str):
     )
 
 
+def parse_symbol_sizes(ctx, param, values: tuple[str, ...]) -> dict[str, int]:
+    """Parse the NAME=SIZE values of --symbol."""
+    sizes = {}
+    for value in values:
+        name, _, size = value.partition("=")
+        if not name or not size.isdigit():
+            raise click.BadParameter(f"Expected NAME=SIZE, got {value}.")
+        sizes[name] = int(size)
+    return sizes
+
+
+@convert.command("synth")
+@click.argument("nxdl")
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="The NeXus file to write. Defaults to <nxdl>_synthetic.nxs.",
+)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option(
+    "--fraction",
+    type=click.FloatRange(0, 1),
+    default=1.0,
+    show_default=True,
+    help="The fraction of the optional and recommended concepts to fill.",
+)
+@click.option(
+    "--entries",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="The number of entries.",
+)
+@click.option(
+    "--instances",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="The number of instances of each variadic group and field.",
+)
+@click.option(
+    "--array-size",
+    type=click.IntRange(min=1),
+    default=16,
+    show_default=True,
+    help="The length of dimensions without a fixed length.",
+)
+@click.option(
+    "--symbol",
+    "symbol_sizes",
+    multiple=True,
+    callback=parse_symbol_sizes,
+    help="The length of the dimensions of an NXDL symbol as NAME=SIZE, "
+    "can be given multiple times.",
+)
+def synth(
+    nxdl: str,
+    output: str | None,
+    seed: int,
+    fraction: float,
+    entries: int,
+    instances: int,
+    array_size: int,
+    symbol_sizes: dict[str, int],
+):
+    """Write a NeXus file with synthetic data for an application definition.
+
+    NXDL: application definition name, e.g. NXmpes
+    """
+    from pynxtools.dataconverter.synthetic import write_synthetic_file
+
+    output = output or f"{nxdl}_synthetic.nxs"
+    write_synthetic_file(
+        nxdl,
+        output,
+        seed=seed,
+        fraction=fraction,
+        n_entries=entries,
+        n_instances=instances,
+        array_size=array_size,
+        symbol_sizes=symbol_sizes,
+    )
+    click.echo(f"Wrote synthetic {nxdl} data to {output}.")
+
+
 @convert.command("get-readers")
 def get_readers():
     """List all installed readers."""
-    readers = get_names_of_all_readers()
+    readers = reader_registry.names()
     logger.info(f"The following readers are currently installed: {readers}.")
 
 
 @convert.command("reader-info")
 @click.argument(
-    "reader", type=click.Choice(get_names_of_all_readers(), case_sensitive=False)
+    "reader", type=click.Choice(reader_registry.names(), case_sensitive=False)
 )
 def reader_info(reader: str):
     """Show supported NXDLs and file extensions for a reader.
 
     READER: name of the reader to inspect, e.g. json_map
     """
-    reader_cls = get_reader(reader)
+    reader_cls = reader_registry.get(reader)
     instance = reader_cls()  # type: ignore[operator]
     click.echo(f"Reader:  {reader}")
     click.echo(f"Class:   {reader_cls.__name__}")
@@ -353,8 +697,18 @@ def reader_info(reader: str):
     default=False,
     help="Ignore all undocumented concepts during validation.",
 )
-def validate(file: str, ignore_undocumented: bool = False):
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes which validate the entries of a file "
+    "with several entries in parallel.",
+)
+def validate(file: str, ignore_undocumented: bool = False, workers: int = 1):
     """Validate a NeXus HDF5 file against its application definition."""
+    from pynxtools.dataconverter.validate_file import validate as _validate
+
     ctx = click.get_current_context()
     if ctx.info_name == "validate_nexus":
         click.echo(
@@ -362,4 +716,4 @@ def validate(file: str, ignore_undocumented: bool = False):
             "Use 'pynx validate' instead.",
             err=True,
         )
-    _validate(file, ignore_undocumented)
+    _validate(file, ignore_undocumented, workers)
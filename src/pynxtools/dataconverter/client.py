@@ -0,0 +1,252 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Thin client of the conversion server started with `dataconverter serve`.
+
+The client forwards `convert`, `validate` and `generate-template` requests to
+the warm workers of the server over a Unix socket, so that it only imports
+click and the standard library. Each request is one line of JSON,
+`{"command": ..., "arguments": {...}}`, answered by one line of JSON,
+`{"ok": ..., "result": ..., "error": ...}`.
+
+    dataconverter_client convert data.json eln.yaml --reader <reader> --nxdl NXmpes
+"""
+
+import getpass
+import json
+import os
+import socket
+import stat
+import tempfile
+from typing import Any
+
+import click
+
+SOCKET_ENV = "PYNXTOOLS_SOCKET"
+
+
+class ServerError(Exception):
+    """The server is not reachable or could not handle a request."""
+
+
+def _private_directory() -> str:
+    """
+    A directory of the user in the temporary directory, which only the user
+    can access.
+
+    Raises:
+        ServerError: If the directory exists but belongs to another user or
+            can be accessed by others.
+    """
+    directory = os.path.join(tempfile.gettempdir(), f"pynxtools-{os.getuid()}")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & 0o077
+    ):
+        raise ServerError(
+            f"{directory} must be a directory which only the user can access. "
+            f"Set {SOCKET_ENV} or XDG_RUNTIME_DIR to use another socket."
+        )
+    return directory
+
+
+def default_socket_path() -> str:
+    """
+    The socket of the conversion server: the environment variable
+    PYNXTOOLS_SOCKET, or a socket of the user in the runtime directory. Without
+    a runtime directory, the socket is placed in a directory of the user in the
+    temporary directory, see `_private_directory`.
+    """
+    if path := os.environ.get(SOCKET_ENV):
+        return path
+    if directory := os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(directory, f"pynxtools-{getpass.getuser()}.sock")
+    return os.path.join(_private_directory(), "pynxtools.sock")
+
+
+def send_request(
+    command: str,
+    arguments: dict[str, Any] | None = None,
+    socket_path: str | None = None,
+) -> Any:
+    """
+    Send a request to the conversion server and wait for its result.
+
+    Args:
+        command (str): One of "convert", "validate", "generate-template",
+            "status" and "shutdown".
+        arguments (dict | None): The arguments of the command.
+        socket_path (str | None): The socket of the server. Defaults to
+            `default_socket_path()`.
+
+    Returns:
+        The result of the command.
+
+    Raises:
+        ServerError: If no server listens on the socket or the request failed.
+    """
+    socket_path = socket_path or default_socket_path()
+    request = json.dumps({"command": command, "arguments": arguments or {}})
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(socket_path)
+            conn.sendall(request.encode("utf-8") + b"\n")
+            with conn.makefile("r", encoding="utf-8") as stream:
+                line = stream.readline()
+    except (FileNotFoundError, ConnectionRefusedError) as exc:
+        raise ServerError(
+            f"No conversion server listens on {socket_path}. "
+            "Start one with 'dataconverter serve'."
+        ) from exc
+    if not line:
+        raise ServerError("The conversion server closed the connection.")
+    response = json.loads(line)
+    if not response["ok"]:
+        raise ServerError(response["error"])
+    return response["result"]
+
+
+def _expand_files(files: list[str]) -> list[str]:
+    """Absolute paths of the files, with directories replaced by their files."""
+    paths = []
+    for file in files:
+        if os.path.isdir(file):
+            for root, _, names in os.walk(file):
+                paths += [os.path.abspath(os.path.join(root, name)) for name in names]
+        else:
+            paths.append(os.path.abspath(file))
+    return paths
+
+
+def _send(ctx: click.Context, command: str, arguments: dict[str, Any]) -> Any:
+    """Send a request to the server of the group, fail the command on errors."""
+    try:
+        return send_request(command, arguments, ctx.obj)
+    except ServerError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+
+def _print_messages(result: dict[str, Any]):
+    for message in result.get("messages", []):
+        click.echo(message, err=True)
+
+
+@click.group()
+@click.option(
+    "--socket",
+    "socket_path",
+    default=None,
+    help=f"The socket of the server. Defaults to ${SOCKET_ENV} or a socket of the user.",
+)
+@click.pass_context
+def main(ctx: click.Context, socket_path: str | None):
+    """Forward requests to a conversion server (dataconverter serve)."""
+    ctx.obj = socket_path
+
+
+@main.command()
+@click.argument("files", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--reader", default="json_map", show_default=True)
+@click.option("--nxdl", required=True, help="The name of the application definition.")
+@click.option("--output", default="output.nxs", show_default=True)
+@click.option("-c", "--config", "config_file", default=None, type=click.Path())
+@click.option("--skip-verify", is_flag=True, default=False)
+@click.option("--fail", is_flag=True, default=False)
+@click.option("--ignore-undocumented", is_flag=True, default=False)
+@click.option("--append", is_flag=True, default=False)
+@click.pass_context
+def convert(
+    ctx: click.Context,
+    files: tuple[str, ...],
+    reader: str,
+    nxdl: str,
+    output: str,
+    config_file: str | None,
+    skip_verify: bool,
+    fail: bool,
+    ignore_undocumented: bool,
+    append: bool,
+):
+    """Convert input files to NeXus."""
+    arguments: dict[str, Any] = {
+        "input_file": _expand_files(list(files)),
+        "reader": reader,
+        "nxdl": nxdl,
+        "output": os.path.abspath(output),
+        "skip_verify": skip_verify,
+        "fail": fail,
+        "ignore_undocumented": ignore_undocumented,
+        "append": append,
+    }
+    if config_file:
+        arguments["config_file"] = os.path.abspath(config_file)
+    result = _send(ctx, "convert", arguments)
+    _print_messages(result)
+    if result["error"]:
+        click.echo(f"Error: {result['error']}", err=True)
+    if result["status"] == "failed" or (result["status"] == "invalid" and fail):
+        ctx.exit(1)
+    click.echo(f"The output file generated: {result['output']}.")
+
+
+@main.command()
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--ignore-undocumented", is_flag=True, default=False)
+@click.pass_context
+def validate(ctx: click.Context, file: str, ignore_undocumented: bool):
+    """Validate a NeXus file."""
+    result = _send(
+        ctx,
+        "validate",
+        {"file": os.path.abspath(file), "ignore_undocumented": ignore_undocumented},
+    )
+    _print_messages(result)
+
+
+@main.command("generate-template")
+@click.argument("nxdl")
+@click.option("--required", is_flag=True, default=False)
+@click.option("--output", default=None, type=click.Path())
+@click.pass_context
+def generate_template(
+    ctx: click.Context, nxdl: str, required: bool, output: str | None
+):
+    """Print the template of an application definition."""
+    template = _send(ctx, "generate-template", {"nxdl": nxdl, "required": required})
+    text = json.dumps(template, indent=4, sort_keys=True, ensure_ascii=False)
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        click.echo(text)
+
+
+@main.command()
+@click.pass_context
+def status(ctx: click.Context):
+    """Show the workers and queue of the server."""
+    click.echo(json.dumps(_send(ctx, "status", {}), indent=4))
+
+
+@main.command()
+@click.pass_context
+def shutdown(ctx: click.Context):
+    """Stop the server after the queued requests."""
+    click.echo(json.dumps(_send(ctx, "shutdown", {}), indent=4))
@@ -0,0 +1,337 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Per-dataset codec selection by compressing a sample of chunks.
+
+A compressed payload with `"filter": "auto"` lets the writer choose the codec:
+a few chunks, spread evenly over the chunk grid of the dataset, are compressed
+with every available candidate, i.e. deflate at several levels with and
+without shuffling, blosc2 with zstd or lz4 and byte or bit shuffling, and no
+compression. The candidate which serves the `CompressionPolicy` best is used
+for the whole dataset and logged. The file itself only declares the filter
+pipeline of the candidate, as for any other compressed dataset.
+
+The throughput of a candidate is its compression throughput on the sample,
+i.e. without the time HDF5 takes to write the compressed chunks, which is
+about the same for all candidates with the same compressed size.
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Literal
+
+import h5py
+import numpy as np
+
+from pynxtools.dataconverter.chunk import (
+    BLOSC_NTHREADS,
+    import_blosc2,
+    import_hdf5plugin,
+)
+from pynxtools.dataconverter.compression import (
+    FilterPipeline,
+    auto_chunk_shape,
+    read_chunk,
+    write_compressed_dataset,
+)
+from pynxtools.dataconverter.sources import (
+    as_array_source,
+    copy_source,
+    is_array_source,
+)
+
+logger = logging.getLogger("pynxtools")  # pylint: disable=C0103
+
+DEFAULT_SAMPLE_CHUNKS = 4
+# the blosc2 compressors which are tried
+BloscCname = Literal["zstd", "lz4"]
+BLOSC_CNAMES: tuple[BloscCname, ...] = ("zstd", "lz4")
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """How the codec of a dataset with "filter": "auto" is selected.
+
+    Args:
+        objective (str): "ratio" for the best compression ratio among the
+            codecs which compress at least `min_throughput`, "speed" for the
+            fastest codec which reaches at least `min_ratio`. If no codec
+            compresses to `min_ratio`, the data are stored uncompressed.
+        min_throughput (float): The compression throughput floor in MB/s.
+        min_ratio (float): The compression ratio floor.
+    """
+
+    objective: str = "ratio"
+    min_throughput: float = 100.0
+    min_ratio: float = 1.5
+
+    def __post_init__(self):
+        if self.objective not in ("ratio", "speed"):
+            raise ValueError(
+                f"Unknown compression policy {self.objective}, use ratio or speed."
+            )
+
+    @classmethod
+    def parse(cls, text: str) -> "CompressionPolicy":
+        """
+        A policy from "ratio:<MB/s>" or "speed:<ratio>", e.g. "ratio:200"
+        for the best ratio at 200 MB/s or more. The floor is optional.
+
+        Raises:
+            ValueError: If text is not a valid policy.
+        """
+        objective, _, floor = text.partition(":")
+        if not floor:
+            return cls(objective)
+        try:
+            value = float(floor)
+        except ValueError:
+            raise ValueError(
+                f"Invalid floor {floor!r} of the compression policy."
+            ) from None
+        if objective == "speed":
+            return cls(objective, min_ratio=value)
+        return cls(objective, min_throughput=value)
+
+
+@dataclass(frozen=True)
+class CodecCandidate:
+    """A codec which is tried on the sample chunks.
+
+    Args:
+        name (str): The name of the codec in the log, e.g. "gzip-5-shuffle".
+        pipeline (FilterPipeline | None): The filter pipeline for deflate.
+        blosc (tuple[BloscCname, int, int] | None): The cname, clevel and
+            shuffle filter for blosc2.
+    """
+
+    name: str
+    pipeline: FilterPipeline | None = None
+    blosc: tuple[BloscCname, int, int] | None = None
+
+    def encode(self, chunk: np.ndarray) -> bytes:
+        """Compress one chunk like the HDF5 filter of this candidate."""
+        if self.pipeline is not None:
+            return self.pipeline.encode(chunk)
+        if self.blosc is not None:
+            cname, clevel, shuffle = self.blosc
+            blosc2 = import_blosc2()
+            return blosc2.compress(
+                np.ascontiguousarray(chunk).tobytes(),
+                typesize=chunk.dtype.itemsize,
+                clevel=clevel,
+                filter=blosc2.Filter(shuffle),
+                codec=getattr(blosc2.Codec, cname.upper()),
+            )
+        return np.ascontiguousarray(chunk).tobytes()
+
+    def create_dataset(
+        self,
+        grp: h5py.Group,
+        name: str,
+        data,
+        chunks: tuple[int, ...],
+        max_workers: int = 0,
+    ) -> h5py.Dataset:
+        """Create the dataset with the filter pipeline of this candidate."""
+        if self.pipeline is not None:
+            return write_compressed_dataset(
+                grp, name, data, self.pipeline, chunks, max_workers
+            )
+        dcpl = None
+        if self.blosc is not None:
+            cname, clevel, shuffle = self.blosc
+            blosc_filter = import_hdf5plugin().Blosc2(
+                cname=cname, clevel=clevel, filters=shuffle
+            )
+            dcpl = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+            dcpl.set_filter(
+                blosc_filter.filter_id,
+                h5py.h5z.FLAG_OPTIONAL,
+                blosc_filter.filter_options,
+            )
+        if is_array_source(data):
+            return copy_source(grp, name, data, chunks, dcpl)
+        return grp.create_dataset(name, data=data, chunks=chunks, dcpl=dcpl)
+
+
+@dataclass(frozen=True)
+class CodecMeasurement:
+    """The compression ratio and compression throughput of a candidate on the sample."""
+
+    candidate: CodecCandidate
+    ratio: float
+    throughput: float = field(default=math.inf)
+
+
+def codec_candidates(itemsize: int) -> list[CodecCandidate]:
+    """The codecs available for values of the given size in bytes."""
+    shuffles: tuple[str | None, ...] = (None, "byte") if itemsize > 1 else (None,)
+    candidates = [CodecCandidate("none")]
+    for strength in (1, 5, 9):
+        for shuffle in shuffles:
+            candidates.append(
+                CodecCandidate(
+                    f"gzip-{strength}" + ("-shuffle" if shuffle else ""),
+                    pipeline=FilterPipeline("gzip", strength, shuffle),
+                )
+            )
+    if BLOSC_NTHREADS > 0:
+        hdf5plugin = import_hdf5plugin()
+        blosc_filters: tuple[tuple[int, str], ...] = (
+            ((hdf5plugin.Blosc2.SHUFFLE, "shuffle"),) if itemsize > 1 else ()
+        ) + ((hdf5plugin.Blosc2.BITSHUFFLE, "bitshuffle"),)
+        for cname in BLOSC_CNAMES:
+            for blosc_filter, label in blosc_filters:
+                candidates.append(
+                    CodecCandidate(
+                        f"blosc2-{cname}-5-{label}", blosc=(cname, 5, blosc_filter)
+                    )
+                )
+    return candidates
+
+
+def sample_selections(
+    shape: tuple[int, ...], chunks: tuple[int, ...], n_samples: int
+) -> list[tuple[slice, ...]]:
+    """The selections of up to n_samples chunks spread evenly over the chunk grid."""
+    grid = tuple(math.ceil(extent / chunk) for extent, chunk in zip(shape, chunks))
+    n_chunks = math.prod(grid)
+    selections = []
+    for index in np.unique(
+        np.linspace(0, n_chunks - 1, min(n_samples, n_chunks)).astype(int)
+    ):
+        position = np.unravel_index(index, grid)
+        selections.append(
+            tuple(
+                slice(pos * chunk, min((pos + 1) * chunk, extent))
+                for pos, chunk, extent in zip(position, chunks, shape)
+            )
+        )
+    return selections
+
+
+def measure_codecs(
+    data, chunks: tuple[int, ...], n_samples: int = DEFAULT_SAMPLE_CHUNKS
+) -> list[CodecMeasurement]:
+    """Compress sample chunks of data with every candidate."""
+    data = as_array_source(data)
+    dtype = np.dtype(data.dtype)
+    samples = [
+        read_chunk(data, selection, chunks, dtype)
+        for selection in sample_selections(data.shape, chunks, n_samples)
+    ]
+    n_bytes = sum(sample.nbytes for sample in samples)
+    measurements = []
+    for candidate in codec_candidates(dtype.itemsize):
+        if candidate.name == "none":
+            measurements.append(CodecMeasurement(candidate, 1.0))
+            continue
+        start = time.perf_counter()
+        compressed = sum(len(candidate.encode(sample)) for sample in samples)
+        seconds = time.perf_counter() - start
+        measurements.append(
+            CodecMeasurement(
+                candidate,
+                n_bytes / max(compressed, 1),
+                n_bytes / 1e6 / seconds if seconds > 0 else math.inf,
+            )
+        )
+    return measurements
+
+
+def select_codec(
+    measurements: list[CodecMeasurement], policy: CompressionPolicy
+) -> CodecMeasurement:
+    """The measurement of the candidate which serves the policy best."""
+    uncompressed = next(
+        measurement
+        for measurement in measurements
+        if measurement.candidate.name == "none"
+    )
+    if policy.objective == "ratio":
+        eligible = [
+            measurement
+            for measurement in measurements
+            if measurement.throughput >= policy.min_throughput
+        ]
+        return max(
+            eligible or [uncompressed],
+            key=lambda measurement: (measurement.ratio, measurement.throughput),
+        )
+    eligible = [
+        measurement
+        for measurement in measurements
+        if measurement.ratio >= policy.min_ratio
+        and measurement.candidate is not uncompressed.candidate
+    ]
+    return max(
+        eligible or [uncompressed],
+        key=lambda measurement: (measurement.throughput, measurement.ratio),
+    )
+
+
+def write_auto_compressed_dataset(
+    grp: h5py.Group,
+    name: str,
+    data,
+    chunks: bool | tuple[int, ...] = True,
+    policy: CompressionPolicy | None = None,
+    max_workers: int = 0,
+) -> h5py.Dataset:
+    """
+    Create a chunked dataset with the codec selected for a sample of its chunks.
+
+    Args:
+        grp (h5py.Group): The group in which to create the dataset.
+        name (str): The name of the dataset.
+        data: The numeric array-like payload or array source.
+        chunks (bool | tuple[int, ...], optional): The chunk shape, or True for
+            the h5py auto-chunking. The dataset is always chunked, i.e., False
+            is the same as True. Defaults to True.
+        policy (CompressionPolicy | None, optional): The selection policy.
+            Defaults to None, i.e., CompressionPolicy().
+        max_workers (int, optional): The number of compression threads for
+            deflate. Defaults to 0, i.e., compression by HDF5.
+
+    Returns:
+        h5py.Dataset: The created dataset.
+    """
+    policy = policy or CompressionPolicy()
+    data = as_array_source(data) if is_array_source(data) else np.asarray(data)
+    dtype = np.dtype(data.dtype)
+    if dtype.kind not in "biuf" or data.ndim == 0 or data.size == 0:
+        logger.info(
+            f"No codec selection for {name} of dtype {dtype}, it is compressed "
+            f"with the default filter instead."
+        )
+        return write_compressed_dataset(
+            grp, name, data, FilterPipeline(), chunks, max_workers
+        )
+    chunk_shape = (
+        auto_chunk_shape(data.shape, dtype) if isinstance(chunks, bool) else chunks
+    )
+    measurements = measure_codecs(data, chunk_shape)
+    selected = select_codec(measurements, policy)
+    logger.info(
+        f"Selected the codec {selected.candidate.name} for {name}, which "
+        f"compresses the sample with ratio {selected.ratio:.2f} at "
+        f"{selected.throughput:.0f} MB/s."
+    )
+    return selected.candidate.create_dataset(grp, name, data, chunk_shape, max_workers)
@@ -0,0 +1,147 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Compact storage of small fields.
+
+By default, every field gets an object header and a separate block for its
+values, which is chunked for arrays, and strings are stored with variable
+length in the global heap of the file. With a `CompactPolicy`, the writer
+stores the values of small numeric and string fields inside the object
+header (the compact layout of HDF5). Strings are converted to fixed-length
+UTF-8 whose width is the longest encoded value of the field.
+
+h5py reads fixed-length strings as bytes, `Dataset.asstr()` decodes them.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import h5py
+import numpy as np
+
+# HDF5 stores compact data in the object header, which is limited to 64 KiB
+MAX_COMPACT_BYTES = 65520
+
+
+@dataclass(frozen=True)
+class CompactPolicy:
+    """Which fields are stored compactly.
+
+    Args:
+        max_compact_bytes (int): The largest size in bytes of the values of a
+            field in compact layout, at most 65520. Defaults to 4096.
+        max_string_bytes (int): The longest UTF-8 encoded string, in bytes,
+            stored with fixed length. Fields with longer strings are written
+            as before. Defaults to 256.
+    """
+
+    max_compact_bytes: int = 4096
+    max_string_bytes: int = 256
+
+    def __post_init__(self):
+        if not 0 < self.max_compact_bytes <= MAX_COMPACT_BYTES:
+            raise ValueError(
+                f"The compact size limit must be between 1 and {MAX_COMPACT_BYTES} bytes."
+            )
+
+
+def _fixed_length_utf8(values: np.ndarray, max_bytes: int) -> np.ndarray | None:
+    """The strings in values as fixed-length bytes, None if any is too long."""
+    encoded = []
+    for value in values.flat:
+        if isinstance(value, str):
+            encoded.append(value.encode("utf-8"))
+        elif isinstance(value, bytes):
+            encoded.append(value)
+        else:
+            return None
+    width = max((len(value) for value in encoded), default=0)
+    if width > max_bytes:
+        return None
+    return np.array(encoded, dtype=f"S{max(width, 1)}").reshape(values.shape)
+
+
+def compact_values(data: Any, policy: CompactPolicy) -> tuple[np.ndarray, Any] | None:
+    """
+    The values of a field and their HDF5 type if they are stored compactly.
+
+    Returns:
+        tuple[np.ndarray, Any] | None: The values and their dtype in the file,
+            or None if the field is not stored compactly, e.g. because it is
+            too large, empty or of an unsupported type.
+    """
+    try:
+        values = np.asarray(data)
+    except (TypeError, ValueError):
+        return None
+    if values.size == 0:
+        return None
+    if values.dtype.kind in "UO":
+        values = _fixed_length_utf8(values, policy.max_string_bytes)
+        if values is None:
+            return None
+        dtype = h5py.string_dtype("utf-8", values.dtype.itemsize)
+    elif values.dtype.kind in "biufcS":
+        dtype = values.dtype
+    else:
+        return None
+    if values.nbytes > policy.max_compact_bytes:
+        return None
+    return values, dtype
+
+
+def write_compact_dataset(
+    grp: h5py.Group, name: str, data: Any, policy: CompactPolicy
+) -> h5py.Dataset | None:
+    """
+    Create a dataset in compact layout if the policy applies to data.
+
+    h5py ignores the layout of a creation property list for scalar datasets,
+    so the dataset is created with the low-level API.
+
+    Args:
+        grp (h5py.Group): The group in which to create the dataset.
+        name (str): The name of the dataset.
+        data: The values of the field.
+        policy (CompactPolicy): Which fields are stored compactly.
+
+    Returns:
+        h5py.Dataset | None: The created dataset, None if the field is not
+            stored compactly and nothing was created.
+
+    Raises:
+        ValueError: If grp has a member of the given name, as for
+            `h5py.Group.create_dataset`.
+    """
+    compact = compact_values(data, policy)
+    if compact is None:
+        return None
+    values, dtype = compact
+    tid = h5py.h5t.py_create(dtype, logical=True)
+    if values.ndim == 0:
+        space = h5py.h5s.create(h5py.h5s.SCALAR)
+    else:
+        space = h5py.h5s.create_simple(values.shape)
+    dcpl = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+    dcpl.set_layout(h5py.h5d.COMPACT)
+    lcpl = h5py.h5p.create(h5py.h5p.LINK_CREATE)
+    lcpl.set_char_encoding(h5py.h5t.CSET_UTF8)
+    dsid = h5py.h5d.create(
+        grp.id, name.encode("utf-8"), tid, space, dcpl=dcpl, lcpl=lcpl
+    )
+    dsid.write(h5py.h5s.ALL, h5py.h5s.ALL, values, mtype=tid)
+    return h5py.Dataset(dsid)
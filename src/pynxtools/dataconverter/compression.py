@@ -0,0 +1,313 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Filter pipelines and parallel compression with direct chunk writes.
+
+HDF5 runs the filter pipeline of a dataset chunk by chunk on the thread
+that writes the data. For large payloads, `write_compressed_dataset` can
+instead split the array along the chunk grid of the dataset, encode the
+chunks in a thread pool and store the encoded chunks with
+`h5py.h5d.DatasetID.write_direct_chunk`. The compressors used here release
+the GIL, so encoding scales with the number of cores while HDF5 only copies
+finished chunks into the file.
+
+The dataset declares the same filter pipeline that HDF5 would have applied
+itself. The file is therefore read back by the standard filters: deflate and
+shuffle are built into HDF5, while zstd, lz4 and bitshuffle are the
+registered filters shipped with hdf5plugin.
+"""
+
+import itertools
+import logging
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import h5py
+import numpy as np
+
+from pynxtools.dataconverter.chunk import import_hdf5plugin
+from pynxtools.dataconverter.sources import (
+    as_array_source,
+    copy_source,
+    is_array_source,
+)
+
+logger = logging.getLogger("pynxtools")  # pylint: disable=C0103
+
+# the registered ids of the HDF5 filters of hdf5plugin, which is only imported
+# when a pipeline uses one of them, see https://github.com/HDFGroup/hdf5_plugins/
+# blob/master/docs/RegisteredFilterPlugins.md
+ZSTD_FILTER_ID: int = 32015
+LZ4_FILTER_ID: int = 32004
+BITSHUFFLE_FILTER_ID: int = 32008
+
+# codecs which can be requested via the "filter" keyword of a compressed payload
+# in addition to "blosc", "gzip" corresponds to the HDF5 deflate filter
+PIPELINE_COMPRESSION_FILTERS: tuple[str, ...] = ("gzip", "zstd", "lz4")
+SHUFFLE_MODES: tuple[str, ...] = ("byte", "bit")
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.block as lz4_block
+except ImportError:
+    lz4_block = None
+
+# codecs that can be encoded in Python, i.e., used with direct chunk writes
+PARALLEL_COMPRESSION_FILTERS: list[str] = ["gzip"]
+if zstandard is not None:
+    PARALLEL_COMPRESSION_FILTERS.append("zstd")
+if lz4_block is not None:
+    PARALLEL_COMPRESSION_FILTERS.append("lz4")
+
+# names of the in-memory files of auto_chunk_shape, HDF5 does not open two files
+# with the same name at the same time
+_auto_chunk_files = itertools.count()
+
+# constants of the bitshuffle filter, see bitshuffle/src/bitshuffle_core.h
+_BSHUF_TARGET_BLOCK_SIZE_B = 8192
+_BSHUF_MIN_RECOMMEND_BLOCK = 128
+_BSHUF_BLOCKED_MULT = 8
+
+
+def _byte_shuffle(buffer: np.ndarray, itemsize: int) -> np.ndarray:
+    """Transpose the bytes of the elements like the HDF5 shuffle filter."""
+    if itemsize == 1:
+        return buffer
+    return buffer.reshape(-1, itemsize).T.ravel()
+
+
+def _bitshuffle_block_size(itemsize: int) -> int:
+    """The block size (in elements) which the bitshuffle filter uses by default."""
+    block_size = _BSHUF_TARGET_BLOCK_SIZE_B // itemsize
+    block_size = (block_size // _BSHUF_BLOCKED_MULT) * _BSHUF_BLOCKED_MULT
+    return max(block_size, _BSHUF_MIN_RECOMMEND_BLOCK)
+
+
+def _bit_transpose(blocks: np.ndarray) -> np.ndarray:
+    """Bit-transpose blocks of shape (n_blocks, n_elements, itemsize)."""
+    bits = np.unpackbits(blocks, axis=2, bitorder="little")
+    return np.packbits(bits.transpose(0, 2, 1), axis=2, bitorder="little").ravel()
+
+
+def _bitshuffle(buffer: np.ndarray, itemsize: int) -> np.ndarray:
+    """
+    Transpose the bits of the elements like the bitshuffle filter without
+    compression: full blocks first, then the remainder rounded down to a
+    multiple of eight elements, the last elements are copied unchanged.
+    """
+    n_elements = buffer.size // itemsize
+    block_size = _bitshuffle_block_size(itemsize)
+    n_full = n_elements // block_size
+    n_last = (n_elements % block_size) // _BSHUF_BLOCKED_MULT * _BSHUF_BLOCKED_MULT
+
+    parts = []
+    end = n_full * block_size * itemsize
+    if n_full:
+        parts.append(_bit_transpose(buffer[:end].reshape(n_full, block_size, itemsize)))
+    if n_last:
+        start, end = end, end + n_last * itemsize
+        parts.append(_bit_transpose(buffer[start:end].reshape(1, n_last, itemsize)))
+    parts.append(buffer[end:])
+    return np.concatenate(parts)
+
+
+def _lz4_compress(buffer: bytes) -> bytes:
+    """Encode a chunk like the HDF5 lz4 filter with a single block."""
+    n_bytes = len(buffer)
+    compressed = lz4_block.compress(buffer, store_size=False)
+    if not compressed or len(compressed) >= n_bytes:
+        # the filter stores incompressible blocks verbatim
+        compressed = buffer
+    return (
+        n_bytes.to_bytes(8, "big")
+        + n_bytes.to_bytes(4, "big")
+        + len(compressed).to_bytes(4, "big")
+        + compressed
+    )
+
+
+@dataclass(frozen=True)
+class FilterPipeline:
+    """A filter pipeline for chunked datasets, i.e., an optional shuffle and a codec.
+
+    Args:
+        codec (str): One of `PIPELINE_COMPRESSION_FILTERS`.
+        strength (int): Compression level from 0 to 9. It is ignored for lz4.
+        shuffle (str | None): "byte" for the HDF5 shuffle filter, "bit" for the
+            bitshuffle filter, or None for no shuffling.
+    """
+
+    codec: str = "gzip"
+    strength: int = 9
+    shuffle: str | None = None
+
+    def __post_init__(self):
+        if self.codec not in PIPELINE_COMPRESSION_FILTERS:
+            raise ValueError(
+                f"Unknown compression filter {self.codec}, "
+                f"use one of {PIPELINE_COMPRESSION_FILTERS}."
+            )
+        if self.shuffle is not None and self.shuffle not in SHUFFLE_MODES:
+            raise ValueError(
+                f"Unknown shuffle mode {self.shuffle}, use one of {SHUFFLE_MODES}."
+            )
+
+    @property
+    def parallelizable(self) -> bool:
+        """Whether the chunks of this pipeline can be encoded in Python."""
+        return self.codec in PARALLEL_COMPRESSION_FILTERS
+
+    def create_plist(self) -> h5py.h5p.PropDCID:
+        """Returns a dataset creation property list which declares the pipeline."""
+        if self.codec != "gzip" or self.shuffle == "bit":
+            import_hdf5plugin()
+        dcpl = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+        if self.shuffle == "byte":
+            dcpl.set_shuffle()
+        elif self.shuffle == "bit":
+            dcpl.set_filter(BITSHUFFLE_FILTER_ID, h5py.h5z.FLAG_OPTIONAL, (0, 0))
+        if self.codec == "gzip":
+            dcpl.set_deflate(self.strength)
+        elif self.codec == "zstd":
+            dcpl.set_filter(ZSTD_FILTER_ID, h5py.h5z.FLAG_OPTIONAL, (self.strength,))
+        else:
+            dcpl.set_filter(LZ4_FILTER_ID, h5py.h5z.FLAG_OPTIONAL, (0,))
+        return dcpl
+
+    def encode(self, chunk: np.ndarray) -> bytes:
+        """Encode one full, C-contiguous chunk as the pipeline stores it in the file."""
+        buffer = chunk.reshape(-1).view(np.uint8)
+        if self.shuffle == "byte":
+            buffer = _byte_shuffle(buffer, chunk.dtype.itemsize)
+        elif self.shuffle == "bit":
+            buffer = _bitshuffle(buffer, chunk.dtype.itemsize)
+        raw = buffer.tobytes()
+        if self.codec == "gzip":
+            return zlib.compress(raw, self.strength)
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=self.strength).compress(raw)
+        return _lz4_compress(raw)
+
+
+def read_chunk(
+    data, selection: tuple[slice, ...], chunk_shape: tuple[int, ...], dtype
+) -> np.ndarray:
+    """Read the selection from data and pad it with zeros to the full chunk shape."""
+    block = np.ascontiguousarray(data[selection], dtype=dtype)
+    if block.shape == chunk_shape:
+        return block
+    chunk = np.zeros(chunk_shape, dtype=dtype)
+    chunk[tuple(slice(0, extent) for extent in block.shape)] = block
+    return chunk
+
+
+def auto_chunk_shape(shape: tuple[int, ...], dtype) -> tuple[int, ...]:
+    """The chunk shape which the h5py auto-chunking gives a dataset of this shape."""
+    with h5py.File(
+        f"auto-chunk-{next(_auto_chunk_files)}", "w", driver="core", backing_store=False
+    ) as h5file:
+        return h5file.create_dataset("data", shape, dtype, chunks=True).chunks
+
+
+def write_compressed_dataset(
+    grp: h5py.Group,
+    name: str,
+    data,
+    pipeline: FilterPipeline,
+    chunks: bool | tuple[int, ...] = True,
+    max_workers: int = 0,
+) -> h5py.Dataset:
+    """
+    Create a chunked dataset with the given filter pipeline and write data to it.
+
+    With `max_workers` > 0 and a numeric payload whose codec can be encoded in
+    Python, the chunks are compressed in a thread pool and stored with direct
+    chunk writes. At most two chunks per worker are held in memory at the same
+    time, so `data` can be a `np.memmap` or an `h5py.Dataset` larger than the
+    available memory. Otherwise, HDF5 applies the pipeline itself. Array
+    sources are then copied in slabs, and the stored chunks of an
+    `h5py.Dataset` with the same chunk shape and pipeline verbatim
+    (see sources.py).
+
+    Args:
+        grp (h5py.Group): The group in which to create the dataset.
+        name (str): The name of the dataset.
+        data: The array-like payload.
+        pipeline (FilterPipeline): The filter pipeline of the dataset.
+        chunks (bool | tuple[int, ...], optional): The chunk shape, or True for
+            the h5py auto-chunking. Defaults to True.
+        max_workers (int, optional): The number of compression threads.
+            Defaults to 0, i.e., compression by HDF5.
+
+    Returns:
+        h5py.Dataset: The created dataset.
+    """
+    if is_array_source(data):
+        data = as_array_source(data)
+        if isinstance(data, h5py.Dataset) and data.chunks is not None:
+            # chunks stored with the same pipeline are copied verbatim
+            max_workers = 0
+    dtype = np.dtype(data.dtype) if hasattr(data, "dtype") else None
+    direct = (
+        max_workers > 0
+        and dtype is not None
+        and dtype.kind in "biufc"
+        and len(np.shape(data)) > 0
+    )
+    if direct and not pipeline.parallelizable:
+        logger.info(
+            f"No Python encoder available for {pipeline.codec} compression of "
+            f"{name}, it is compressed by HDF5 instead."
+        )
+        direct = False
+    if not direct:
+        if is_array_source(data):
+            return copy_source(grp, name, data, chunks, pipeline.create_plist())
+        return grp.create_dataset(
+            name, data=data, chunks=chunks, dcpl=pipeline.create_plist()
+        )
+
+    dataset = grp.create_dataset(
+        name,
+        shape=np.shape(data),
+        dtype=dtype,
+        chunks=chunks,
+        dcpl=pipeline.create_plist(),
+    )
+    chunk_shape = dataset.chunks
+
+    def encode(selection: tuple[slice, ...]) -> bytes:
+        return pipeline.encode(read_chunk(data, selection, chunk_shape, dtype))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: deque = deque()
+        for selection in dataset.iter_chunks():
+            offset = tuple(dim.start for dim in selection)
+            pending.append((offset, executor.submit(encode, selection)))
+            if len(pending) >= 2 * max_workers:
+                offset, future = pending.popleft()
+                dataset.id.write_direct_chunk(offset, future.result())
+        while pending:
+            offset, future = pending.popleft()
+            dataset.id.write_direct_chunk(offset, future.result())
+    return dataset
@@ -17,78 +17,103 @@
 #
 """This script runs the conversion routine using a selected reader and write out a NeXus file."""
 
-import glob
-import importlib.util
 import logging
 import os
+from typing import cast
 
 import lxml.etree as ET
 import yaml
 
-from pynxtools.dataconverter import helpers
+from pynxtools.dataconverter import helpers, profiling
+from pynxtools.dataconverter.profiling import ConversionStats
 from pynxtools.dataconverter.readers.base.reader import BaseReader
+from pynxtools.dataconverter.readers.registry import registry as reader_registry
+from pynxtools.dataconverter.storage import IN_MEMORY_THRESHOLD
 from pynxtools.dataconverter.template import Template
 from pynxtools.dataconverter.validation import validate_dict_against
 from pynxtools.dataconverter.writer import Writer
-from pynxtools.nexus.nexus_tree import generate_tree_from
+from pynxtools.nexus.nexus_tree import NexusNode, generate_tree_from
 
 logger = logging.getLogger("pynxtools")
 
 
-from importlib.metadata import entry_points
-
-
 class ValidationFailed(Exception):
     pass
 
 
-def get_reader(reader_name) -> BaseReader:
+def get_reader(reader_name) -> type[BaseReader]:
     """Helper function to get the reader object from it's given name"""
-    path_prefix = (
-        f"{os.path.dirname(__file__)}{os.sep}" if os.path.dirname(__file__) else ""
-    )
-    path = os.path.join(path_prefix, "readers", reader_name, "reader.py")
-    spec = importlib.util.spec_from_file_location("reader.py", path)
-    try:
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)  # type: ignore[attr-defined]
-    except FileNotFoundError as exc:
-        # pylint: disable=unexpected-keyword-arg
-        importlib_module = entry_points(group="pynxtools.reader")
-        if importlib_module and reader_name in map(
-            lambda ep: ep.name, importlib_module
-        ):
-            return importlib_module[reader_name].load()
-        raise ValueError(f"The reader, {reader_name}, was not found.") from exc
-    return module.READER  # type: ignore[attr-defined]
+    return reader_registry.get(reader_name)
 
 
 def get_names_of_all_readers() -> list[str]:
     """Helper function to populate a list of all available readers"""
-    path_prefix = (
-        f"{os.path.dirname(__file__)}{os.sep}" if os.path.dirname(__file__) else ""
-    )
-    files = glob.glob(os.path.join(path_prefix, "readers", "*", "reader.py"))
-    all_readers = []
-    for file in files:
-        if f"{os.sep}base{os.sep}" not in file:
-            index_of_readers_folder_name = file.rindex(f"readers{os.sep}") + len(
-                f"readers{os.sep}"
-            )
-            index_of_last_path_sep = file.rindex(os.sep)
-            all_readers.append(
-                file[index_of_readers_folder_name:index_of_last_path_sep]
+    return reader_registry.names()
+
+
+class ConversionCache:
+    """
+    NXDL trees, template skeletons and reader classes reused across conversions.
+
+    A single call of `convert` parses the NXDL, generates the template, loads
+    the reader module and builds the NeXus trees for validation and writing.
+    With a cache, each of them is built once per NXDL or reader, e.g. by every
+    worker of a batch conversion.
+    """
+
+    def __init__(self):
+        self.readers: dict[str, type[BaseReader]] = {}
+        self.nxdls: dict[str, tuple[ET._Element, str]] = {}
+        self.templates: dict[str, Template] = {}
+        self.trees: dict[str, NexusNode] = {}
+        # The writer keeps None for NXDLs whose concepts are resolved from XML
+        self.writer_trees: dict[str, NexusNode | None] = {}
+
+    def get_reader(self, reader_name: str) -> type[BaseReader]:
+        """The reader class of the given name, loaded once."""
+        if reader_name not in self.readers:
+            self.readers[reader_name] = get_reader(reader_name)
+        return self.readers[reader_name]
+
+    def get_nxdl_root_and_path(self, nxdl: str) -> tuple[ET._Element, str]:
+        """The XML root and file path of the NXDL, parsed once."""
+        if nxdl not in self.nxdls:
+            self.nxdls[nxdl] = helpers.get_nxdl_root_and_path(nxdl=nxdl)
+        return self.nxdls[nxdl]
+
+    def get_template(self, nxdl: str) -> Template:
+        """A new template of the NXDL, copied from a skeleton generated once."""
+        if nxdl not in self.templates:
+            template = Template()
+            helpers.generate_template_from_nxdl(
+                self.get_nxdl_root_and_path(nxdl)[0], template
             )
-    plugins = list(map(lambda ep: ep.name, entry_points(group="pynxtools.reader")))
-    return sorted(all_readers + plugins)
+            self.templates[nxdl] = template
+        return Template(self.templates[nxdl])
+
+    def get_tree(self, nxdl: str) -> NexusNode:
+        """The NexusNode tree of the NXDL for validation, built once."""
+        if nxdl not in self.trees:
+            self.trees[nxdl] = generate_tree_from(nxdl)
+        return self.trees[nxdl]
 
+    def clear(self):
+        """Forget everything, e.g. after readers or definitions were updated."""
+        self.readers.clear()
+        self.nxdls.clear()
+        self.templates.clear()
+        self.trees.clear()
+        self.writer_trees.clear()
 
+
+@profiling.profiled("transfer data into template")
 def transfer_data_into_template(
     input_file,
     reader,
     nxdl_name,
     nxdl_root: ET._Element | None = None,
     skip_verify: bool = False,
+    cache: ConversionCache | None = None,
     **kwargs,
 ):
     """Transfer parse and merged data from input experimental file, config file and eln.
@@ -111,6 +136,11 @@ def transfer_data_into_template(
         If the dataconverter is configured with append = True,
         verification is currently always skipped, use validate
         on the resulting HDF5 file instead
+    cache : ConversionCache, optional
+        Reuses the template, reader class and NeXus tree of earlier
+        conversions with the same NXDL and reader.
+    stats : ConversionStats, optional
+        Records the wall time, CPU time and peak memory of the stages.
 
     Returns
     -------
@@ -118,11 +148,15 @@ def transfer_data_into_template(
         Template filled with data from raw file and eln file.
 
     """
-    if nxdl_root is None:
-        nxdl_root, _ = helpers.get_nxdl_root_and_path(nxdl=nxdl_name)
+    profiling.phase("template generation")
+    if cache is not None:
+        template = cache.get_template(nxdl_name)
+    else:
+        if nxdl_root is None:
+            nxdl_root, _ = helpers.get_nxdl_root_and_path(nxdl=nxdl_name)
 
-    template = Template()
-    helpers.generate_template_from_nxdl(nxdl_root, template)
+        template = Template()
+        helpers.generate_template_from_nxdl(nxdl_root, template)
 
     if isinstance(input_file, str):
         input_file = (input_file,)
@@ -133,7 +167,7 @@ def transfer_data_into_template(
         f" {bulletpoint.join((' ', *input_file))}"
     )
 
-    data_reader = get_reader(reader)
+    data_reader = cache.get_reader(reader) if cache is not None else get_reader(reader)
     if not (
         nxdl_name in data_reader.supported_nxdls or "*" in data_reader.supported_nxdls
     ):
@@ -145,17 +179,23 @@ def transfer_data_into_template(
     fail = kwargs.pop("fail", False)
     append = kwargs.pop("append", False)
 
-    data = data_reader().read(  # type: ignore[operator]
-        template=Template(template), file_paths=input_file, **kwargs
+    profiling.phase("read", reader=reader)
+    data = cast(
+        Template,
+        data_reader().read(
+            template=Template(template), file_paths=input_file, **kwargs
+        ),
     )
     entry_names = data.get_all_entry_names()
     for entry_name in entry_names:
         helpers.write_nexus_def_to_entry(data, entry_name, nxdl_name)
     if not append and not skip_verify:
+        profiling.phase("validation")
         valid = validate_dict_against(
             nxdl_name,
             data,
             ignore_undocumented=ignore_undocumented,
+            tree=cache.get_tree(nxdl_name) if cache is not None else None,
         )
 
         if fail and not valid:
@@ -167,6 +207,7 @@ def transfer_data_into_template(
 
 
 # pylint: disable=too-many-arguments,too-many-locals,W1203
+@profiling.profiled("convert")
 def convert(
     input_file: tuple[str, ...],
     reader: str,
@@ -197,18 +238,62 @@ def convert(
     ignore_undocumented : bool, default False
         If True, all undocumented items are ignored in the validation.
     append : bool, default False
-        If True, allows adding instances. Currently, resizing existent datasets
-        (e.g. using chunked storage layout) is not supported
+        If True, allows adding instances. Existent datasets are only resized
+        for appendable payloads, i.e. {"append": array, "axis": 0}, which extend
+        datasets that were created by an appendable payload before.
         It is the users responsibility to prepare the template dictionary
         such that one does not instantiate any HDF5 object type that already
         exists. If happening nonetheless, the HDF5 libraries ValueError is caught
         and the program emits a log message warning that the instance has not been
         added. This is in an attempt to prevent an invalidating of the file.
+    compression_workers : int, default 0
+        Number of threads that compress chunked datasets in parallel using
+        direct chunk writes. With 0, the HDF5 library compresses the data.
+    storage_profile : str, optional
+        The storage profile of the output file, one of "auto", "hfivepy",
+        "ssd_nvm", "hdd", "gpfs" or "lustre". By default, the profile is
+        detected from the file system of the output path.
+    access_patterns : str, optional
+        A YAML file that names the dimensions which users read at once for
+        datasets of the NXDL. These datasets and the signals of NXdata groups
+        are chunked along their access pattern.
+    compression_policy : str, optional
+        How the codec of compressed payloads with "filter": "auto" is selected:
+        "ratio:<MB/s>" for the best compression ratio above a compression throughput
+        floor, "speed:<ratio>" for the fastest codec above a ratio floor.
+        By default, "ratio:100".
+    in_memory : bool, default False
+        If True, a new output file is built in memory with the HDF5 core
+        driver and stored with one sequential write, unless its values are
+        estimated to take more than in_memory_threshold bytes.
+    in_memory_threshold : int, default 512 MiB
+        The size in bytes up to which files are built in memory.
+    compact_storage : bool, default False
+        If True, small fields are stored in compact layout and short strings
+        as fixed-length UTF-8.
+    cache : ConversionCache, optional
+        Reuses the parsed NXDL, template, reader class and NeXus trees of
+        earlier conversions, e.g. in batch conversions.
+    stats : ConversionStats, optional
+        Records the wall time, CPU time and peak memory of the stages, see
+        `profile_conversion`.
     Returns
     -------
     None.
     """
-    nxdl_root, nxdl_f_path = helpers.get_nxdl_root_and_path(nxdl)
+    cache = kwargs.pop("cache", None)
+    with profiling.stage("NXDL load", nxdl=nxdl):
+        if cache is not None:
+            nxdl_root, nxdl_f_path = cache.get_nxdl_root_and_path(nxdl)
+        else:
+            nxdl_root, nxdl_f_path = helpers.get_nxdl_root_and_path(nxdl)
+    compression_workers = kwargs.pop("compression_workers", 0)
+    storage_profile = kwargs.pop("storage_profile", None)
+    access_patterns = kwargs.pop("access_patterns", None)
+    compression_policy = kwargs.pop("compression_policy", None)
+    in_memory = kwargs.pop("in_memory", False)
+    in_memory_threshold = kwargs.pop("in_memory_threshold", IN_MEMORY_THRESHOLD)
+    compact_storage = kwargs.pop("compact_storage", False)
 
     data = transfer_data_into_template(
         input_file=input_file,
@@ -216,23 +301,63 @@ def convert(
         nxdl_name=nxdl,
         nxdl_root=nxdl_root,
         skip_verify=skip_verify,
+        cache=cache,
         **kwargs,
     )
+    profiling.phase("root attributes")
     helpers.add_default_root_attributes(
         data=data,
         filename=os.path.basename(output),
         append=kwargs.get("append", False),
     )
+    profiling.phase("write", output=output)
     Writer(
         data=data,
         nxdl_f_path=nxdl_f_path,
         output_path=output,
         append=kwargs.get("append", False),
+        compression_workers=compression_workers,
+        storage_profile=storage_profile,
+        access_patterns=access_patterns,
+        compression_policy=compression_policy,
+        in_memory=in_memory,
+        in_memory_threshold=in_memory_threshold,
+        compact_storage=compact_storage,
+        definition_trees=cache.writer_trees if cache is not None else None,
     ).write()
 
     logger.info(f"The output file generated: {output}.")
 
 
+def profile_conversion(
+    input_file: tuple[str, ...], reader: str, nxdl: str, output: str, **kwargs
+) -> ConversionStats:
+    """Convert like `convert` and return the measurements of its stages.
+
+    Parameters
+    ----------
+    input_file : tuple[str]
+        Tuple of files or file
+    reader: str
+        Name of reader such as xps
+    nxdl : str
+        Root name of nxdl file, e.g. NXmpes for NXmpes.nxdl.xml
+    output : str
+        Output file name.
+    **kwargs
+        Further arguments of `convert`.
+
+    Returns
+    -------
+    ConversionStats
+        The wall time, CPU time and peak memory of the stages, e.g. the
+        NXDL load, template generation, reading, validation and writing.
+    """
+    stats = ConversionStats()
+    convert(input_file, reader, nxdl, output, stats=stats, **kwargs)
+    return stats
+
+
 def parse_params_file(params_file):
     """Parses the parameters from a given dictionary and returns them"""
     params = yaml.load(params_file, Loader=yaml.SafeLoader)["dataconverter"]
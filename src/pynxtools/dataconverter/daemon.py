@@ -0,0 +1,239 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""A conversion server that keeps its workers warm between requests.
+
+Each invocation of `dataconverter` imports h5py, lxml, pint and the readers,
+looks up the version of the definitions and builds the NXDL trees, which
+takes longer than the conversion of small files. `ConversionServer` does
+this once: it listens on a Unix socket and runs the `convert`, `validate`
+and `generate-template` requests of `client.send_request` in a pool of
+worker processes. Each worker keeps a `ConversionCache` and is replaced
+after a number of requests to bound its memory. Requests wait in the queue
+of the pool until a worker is free.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import threading
+from dataclasses import asdict
+from typing import Any
+
+from pynxtools.dataconverter import batch
+from pynxtools.dataconverter.batch import BatchJob, _MessageHandler, run_job
+from pynxtools.dataconverter.client import default_socket_path
+from pynxtools.dataconverter.helpers import generate_template_from_tree
+from pynxtools.dataconverter.validate_file import validate
+
+logger = logging.getLogger("pynxtools")
+
+WORKER_COMMANDS = ("convert", "validate", "generate-template")
+
+
+def _run_in_worker(command: str, arguments: dict[str, Any]) -> Any:
+    """Run a request in a worker process, with the cache of `batch._init_worker`."""
+    cache = batch._worker_cache
+    if command == "convert":
+        arguments = dict(arguments)
+        job = BatchJob(
+            input_file=tuple(arguments.pop("input_file", ())),
+            output=arguments.pop("output"),
+            reader=arguments.pop("reader"),
+            nxdl=arguments.pop("nxdl"),
+            options=arguments,
+        )
+        return asdict(run_job(job, cache))
+
+    if command == "validate":
+        handler = _MessageHandler(level=logging.INFO)
+        logger.addHandler(handler)
+        try:
+            # the server's workers already validate files in parallel
+            valid = validate(
+                arguments["file"],
+                arguments.get("ignore_undocumented", False),
+                workers=1,
+            )
+        finally:
+            logger.removeHandler(handler)
+        return {"valid": valid, "messages": handler.messages}
+
+    if command == "generate-template":
+        return generate_template_from_tree(
+            cache.get_tree(arguments["nxdl"]),  # type: ignore[union-attr]
+            arguments.get("required", False),
+        )
+
+    raise ValueError(f"Unknown command {command}.")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads one request per connection and writes its response."""
+
+    server: "_UnixServer"
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        response = self.server.conversion_server.handle(line)
+        self.wfile.write(response + b"\n")
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    # Wait for the requests in progress when the server is closed
+    daemon_threads = False
+    block_on_close = True
+
+    def __init__(self, socket_path: str, conversion_server: "ConversionServer"):
+        self.conversion_server = conversion_server
+        super().__init__(socket_path, _RequestHandler)
+
+
+class ConversionServer:
+    """
+    Serves conversion requests on a Unix socket with a pool of warm workers.
+
+    Args:
+        socket_path (str | None): The socket to listen on. Defaults to
+            `client.default_socket_path()`.
+        workers (int): The number of worker processes. Defaults to 1.
+        max_jobs_per_worker (int | None): The number of requests after which
+            a worker is replaced by a new one, which bounds the memory of
+            caches and leaks of readers. None keeps the workers. Defaults
+            to 100.
+
+    Raises:
+        RuntimeError: If another server listens on the socket.
+    """
+
+    def __init__(
+        self,
+        socket_path: str | None = None,
+        workers: int = 1,
+        max_jobs_per_worker: int | None = 100,
+    ):
+        self.socket_path = socket_path or default_socket_path()
+        self.workers = workers
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.queued = 0
+        self.completed = 0
+
+        if os.path.exists(self.socket_path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                try:
+                    conn.connect(self.socket_path)
+                except OSError:
+                    os.remove(self.socket_path)  # left over by a crashed server
+                else:
+                    raise RuntimeError(
+                        f"A conversion server already listens on {self.socket_path}."
+                    )
+
+        # New workers are forked from a server process that has imported the
+        # converter, so that replacing a worker does not repeat the imports.
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        self._pool = context.Pool(
+            workers,
+            initializer=batch._init_worker,
+            maxtasksperchild=max_jobs_per_worker,
+        )
+        self._server = _UnixServer(self.socket_path, self)
+
+    def status(self) -> dict[str, Any]:
+        """The workers, queued and completed requests of the server."""
+        with self._lock:
+            return {
+                "socket": self.socket_path,
+                "pid": os.getpid(),
+                "workers": self.workers,
+                "max_jobs_per_worker": self.max_jobs_per_worker,
+                "queued": self.queued,
+                "completed": self.completed,
+            }
+
+    def handle(self, line: bytes) -> bytes:
+        """Answer a request line with a response line."""
+        try:
+            request = json.loads(line)
+            command = request["command"]
+            arguments = request.get("arguments") or {}
+            if command == "status":
+                result = self.status()
+            elif command == "shutdown":
+                self.shutdown()
+                result = self.status()
+            elif command in WORKER_COMMANDS:
+                result = self._run(command, arguments)
+            else:
+                raise ValueError(f"Unknown command {command}.")
+        except Exception as exc:  # pylint: disable=broad-except
+            response = {"ok": False, "result": None, "error": str(exc)}
+        else:
+            response = {"ok": True, "result": result, "error": None}
+        return json.dumps(response, default=str).encode("utf-8")
+
+    def _run(self, command: str, arguments: dict[str, Any]) -> Any:
+        """Queue a request for the workers and wait for its result."""
+        if self._stopped.is_set():
+            raise RuntimeError("The conversion server is shutting down.")
+        with self._lock:
+            self.queued += 1
+        try:
+            return self._pool.apply_async(_run_in_worker, (command, arguments)).get()
+        finally:
+            with self._lock:
+                self.queued -= 1
+                self.completed += 1
+
+    def serve_forever(self):
+        """
+        Serve requests until `shutdown` is called, SIGTERM or SIGINT is
+        received, then finish the queued requests and remove the socket.
+        """
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: self.shutdown())
+
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        logger.info(
+            f"Serving conversions on {self.socket_path} with {self.workers} worker(s)."
+        )
+        try:
+            self._stopped.wait()
+        finally:
+            self._server.shutdown()
+            # Waits for the requests that are handled, then the pool is closed
+            self._server.server_close()
+            self._pool.close()
+            self._pool.join()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            logger.info("The conversion server stopped.")
+
+    def shutdown(self):
+        """Stop accepting requests; `serve_forever` returns once all are done."""
+        self._stopped.set()
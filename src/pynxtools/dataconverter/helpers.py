@@ -34,6 +34,13 @@ from ase.data import chemical_symbols
 
 from pynxtools import get_nexus_version, get_nexus_version_hash
 from pynxtools.dataconverter.chunk import COMPRESSION_FILTERS
+from pynxtools.dataconverter.sources import (
+    DEFAULT_COPY_BUFFER_BYTES,
+    as_array_source,
+    is_array_source,
+    iter_slabs,
+)
+from pynxtools.dataconverter.streaming import is_append_payload, is_stream_payload
 
 # TODO: nxdl_utils is legacy XML-walking infrastructure. These imports should be
 # removed as helpers.py XML-walking functions are replaced by NexusNode-based equivalents.
@@ -669,6 +676,28 @@ def convert_nxdl_path_dict_to_data_converter_dict(path) -> str:
     return data_converter_path
 
 
+def generate_template_from_tree(
+    tree: NexusNode, required: bool = False
+) -> dict[str, None]:
+    """
+    The conversion template of an application definition, i.e. the data
+    converter style paths of its fields and attributes with None as values.
+
+    Args:
+        tree (NexusNode): The tree of the application definition, see
+            `generate_tree_from`.
+        required (bool, optional): Only include the required fields and
+            attributes. Defaults to False.
+    """
+    level: Literal["required", "recommended", "optional"] = (
+        "required" if required else "optional"
+    )
+    return {
+        convert_nxdl_path_dict_to_data_converter_dict(path): None
+        for path in tree.required_fields_and_attrs_names(level=level)
+    }
+
+
 def convert_data_converter_dict_to_nxdl_path(path) -> str:
     """
     Helper function to convert data converter style path to NXDL style path:
@@ -743,6 +772,13 @@ def is_valid_data_type(value: Any, accepted_types: Sequence) -> bool:
 def is_valid_data_type_hdf(hdf_node: h5py.Dataset, accepted_types: Sequence) -> bool:
     """Checks whether the given value or its children are of an accepted type."""
     if hdf_node.dtype != np.dtype("O"):
+        if (
+            str in accepted_types
+            and hdf_node.dtype.kind == "S"
+            and h5py.check_string_dtype(hdf_node.dtype) is not None
+        ):
+            # fixed-length strings, e.g. of fields in compact storage
+            return True
         # standard numeric / fixed dtypes
         return any(np.issubdtype(hdf_node.dtype, t) for t in accepted_types)
 
@@ -854,6 +890,46 @@ def is_valid_data_field(value: Any, nxdl_type: str, path: str) -> Any:
 
         return value
 
+    def validate_array_source(value: Any, nxdl_type: str, path: str) -> Any:
+        """Validate an array source by its dtype without reading all of its values."""
+        accepted_types = NEXUS_TO_PYTHON_DATA_TYPES[nxdl_type]
+        source = as_array_source(value)
+        if isinstance(source, h5py.Dataset) and source.dtype == np.dtype("O"):
+            valid = is_valid_data_type_hdf(source, accepted_types)
+        else:
+            # integers are accepted for floats like for arrays, but not converted
+            valid = any(np.issubdtype(source.dtype, t) for t in accepted_types) or (
+                accepted_types[0] is float and source.dtype.kind in "iu"
+            )
+        if not valid:
+            collector.collect_and_log(
+                path, ValidationProblem.InvalidType, accepted_types, nxdl_type
+            )
+
+        if nxdl_type == "NX_POSINT" and source.dtype.kind in "iu":
+            if isinstance(source, h5py.Dataset):
+                positive = is_positive_int_hdf(source)
+            elif source.ndim == 0:
+                positive = bool(source > 0)
+            else:
+                positive = all(
+                    bool(np.all(source[selection] > 0))
+                    for selection in iter_slabs(
+                        source.shape,
+                        (1,) * source.ndim,
+                        source.dtype.itemsize,
+                        DEFAULT_COPY_BUFFER_BYTES,
+                    )
+                )
+            if not positive:
+                collector.collect_and_log(
+                    path, ValidationProblem.IsNotPosInt, source[(0,) * source.ndim]
+                )
+        return value
+
+    if is_array_source(value):
+        return validate_array_source(value, nxdl_type, path)
+
     if isinstance(value, dict) and "compress" in value:
         compressed_value = value["compress"]
         if "filter" in value:
@@ -873,18 +949,51 @@ def is_valid_data_field(value: Any, nxdl_type: str, path: str) -> Any:
                     )
 
         # Apply standard validation to compressed value
-        value["compress"] = validate_data_value(compressed_value, nxdl_type, path)
+        if is_array_source(compressed_value):
+            validate_array_source(compressed_value, nxdl_type, path)
+        else:
+            value["compress"] = validate_data_value(compressed_value, nxdl_type, path)
+
+        return value
+
+    if is_append_payload(value):
+        value["append"] = validate_data_value(value["append"], nxdl_type, path)
+        return value
 
+    if is_stream_payload(value):
+        # The values of a stream are only produced while writing,
+        # so only its declared dtype can be checked.
+        accepted_types = NEXUS_TO_PYTHON_DATA_TYPES[nxdl_type]
+        if value.get("dtype") is None or not any(
+            np.issubdtype(np.dtype(value["dtype"]), dtype) for dtype in accepted_types
+        ):
+            collector.collect_and_log(
+                path, ValidationProblem.InvalidType, accepted_types, nxdl_type
+            )
         return value
 
     return validate_data_value(value, nxdl_type, path)
 
 
-def is_valid_data_field_hdf(hdf_node: h5py.Dataset, nxdl_type: str, path: str):
-    """Checks whether value of hdf_node is valid according to the type defined in the NXDL."""
+def is_valid_data_field_hdf(
+    hdf_node: h5py.Dataset, nxdl_type: str, path: str, check_values: bool = True
+):
+    """Checks whether value of hdf_node is valid according to the type defined in the NXDL.
+
+    With check_values=False only the dtype is checked, and no data is read.
+    """
     # validating i.e. reading only not converting !
     accepted_types = NEXUS_TO_PYTHON_DATA_TYPES[nxdl_type]
 
+    if not check_values:
+        if hdf_node.dtype != np.dtype("O") and not any(
+            np.issubdtype(hdf_node.dtype, t) for t in accepted_types
+        ):
+            collector.collect_and_log(
+                path, ValidationProblem.InvalidType, accepted_types, nxdl_type
+            )
+        return
+
     if not is_valid_data_type_hdf(hdf_node, accepted_types):
         collector.collect_and_log(
             path, ValidationProblem.InvalidType, accepted_types, nxdl_type
@@ -956,6 +1065,20 @@ def is_valid_enum(
     if isinstance(value, dict) and "compress" in value:
         value = value["compress"]
 
+    if is_append_payload(value):
+        value = value["append"]
+
+    if is_stream_payload(value):
+        # Values of a stream are not known before writing
+        return
+
+    if is_array_source(value):
+        # Only sources that fit into the copy buffer are read for the comparison
+        source = as_array_source(value)
+        if source.size * source.dtype.itemsize > DEFAULT_COPY_BUFFER_BYTES:
+            return
+        value = source[()]
+
     if nxdl_enum is not None:
         if (
             isinstance(value, np.ndarray)
@@ -0,0 +1,276 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Per-stage profiling of conversions.
+
+A `ConversionStats` records the wall time, CPU time and peak resident memory
+of the stages of a conversion, e.g. loading the NXDL, reading each input
+file, the phases of the validation and the passes of the writer, together
+with metrics such as the bytes written. The conversion code marks its stages
+with `stage` and `phase`, which do nothing unless a `ConversionStats` is
+recording, so that conversions without profiling do not pay for it.
+
+    stats = ConversionStats()
+    convert(input_file, reader, nxdl, output, stats=stats)
+    stats.write("profile.json")
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore[assignment]
+
+PROFILE_FORMATS = ("json", "chrome")
+
+
+def peak_rss() -> int | None:
+    """The peak resident memory of this process in bytes, None if unknown."""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+@dataclass
+class StageStats:
+    """The measurements of one stage of a conversion.
+
+    Args:
+        name (str): The name of the stage, e.g. "read" or "validation".
+        start (float): The start in seconds after the start of the recording.
+        depth (int): The nesting level, 0 for top-level stages.
+        wall (float): The wall time in seconds.
+        cpu (float): The CPU time of the process in seconds.
+        peak_rss (int | None): The peak resident memory of the process in
+            bytes at the end of the stage, None if unknown.
+        metrics (dict): Further measurements, e.g. the input file of a
+            reader stage or the bytes written by the writer.
+    """
+
+    name: str
+    start: float
+    depth: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak_rss: int | None = None
+    metrics: dict[str, Any] = field(default_factory=dict)
+
+
+class ConversionStats:
+    """
+    The stages of one or more conversions, in the order they started.
+
+    Stages are recorded with `stage` as context managers. A stage can be
+    divided into consecutive phases with `phase`; a phase ends when the next
+    one starts or when its stage ends.
+    """
+
+    def __init__(self):
+        self.stages: list[StageStats] = []
+        self._origin = time.perf_counter()
+        # open stages: (stats, wall start, cpu start, is a phase)
+        self._open: list[tuple[StageStats, float, float, bool]] = []
+
+    def _start(self, name: str, metrics: dict[str, Any], is_phase: bool):
+        now = time.perf_counter()
+        stats = StageStats(
+            name=name,
+            start=now - self._origin,
+            depth=len(self._open),
+            metrics=dict(metrics),
+        )
+        self.stages.append(stats)
+        self._open.append((stats, now, time.process_time(), is_phase))
+
+    def _stop(self):
+        stats, wall, cpu, _ = self._open.pop()
+        stats.wall = time.perf_counter() - wall
+        stats.cpu = time.process_time() - cpu
+        stats.peak_rss = peak_rss()
+
+    def _stop_phase(self):
+        if self._open and self._open[-1][3]:
+            self._stop()
+
+    @contextlib.contextmanager
+    def stage(self, name: str, **metrics) -> Iterator[StageStats]:
+        """Record the enclosed code as a stage with the given metrics."""
+        self._start(name, metrics, is_phase=False)
+        depth = len(self._open)
+        try:
+            yield self.stages[-1]
+        finally:
+            while len(self._open) > depth:
+                self._stop()  # phases of this stage
+            self._stop()
+
+    def phase(self, name: str, **metrics):
+        """End the current phase of the innermost stage and start the next."""
+        self._stop_phase()
+        self._start(name, metrics, is_phase=True)
+
+    def add_metric(self, name: str, value: float):
+        """Add a value to a metric of the innermost stage."""
+        if self._open:
+            metrics = self._open[-1][0].metrics
+            metrics[name] = metrics.get(name, 0) + value
+
+    @property
+    def total(self) -> float:
+        """The wall time of all top-level stages in seconds."""
+        return sum(stage.wall for stage in self.stages if stage.depth == 0)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """The number, wall time and CPU time of the stages by name."""
+        summary: dict[str, dict[str, float]] = {}
+        for stage in self.stages:
+            entry = summary.setdefault(stage.name, {"count": 0, "wall": 0, "cpu": 0})
+            entry["count"] += 1
+            entry["wall"] += stage.wall
+            entry["cpu"] += stage.cpu
+        return summary
+
+    def to_dict(self) -> dict[str, Any]:
+        """The stages and their summary as a JSON-serializable dict."""
+        return {
+            "total": self.total,
+            "peak_rss": max(
+                (stage.peak_rss for stage in self.stages if stage.peak_rss),
+                default=None,
+            ),
+            "stages": [asdict(stage) for stage in self.stages],
+            "summary": self.summary(),
+        }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """
+        The stages as complete events of the Chrome trace event format, which
+        can be opened with chrome://tracing or https://ui.perfetto.dev.
+        """
+        pid = os.getpid()
+        tid = threading.get_ident()
+        return {
+            "traceEvents": [
+                {
+                    "name": stage.name,
+                    "ph": "X",
+                    "ts": stage.start * 1e6,
+                    "dur": stage.wall * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {
+                        "cpu": stage.cpu,
+                        "peak_rss": stage.peak_rss,
+                        **stage.metrics,
+                    },
+                }
+                for stage in self.stages
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write(self, path: str, profile_format: str = "json"):
+        """
+        Write the stages to a file.
+
+        Args:
+            path (str): The path of the file.
+            profile_format (str): "json" for `to_dict`, "chrome" for
+                `to_chrome_trace`. Defaults to "json".
+
+        Raises:
+            ValueError: If the format is not one of PROFILE_FORMATS.
+        """
+        if profile_format not in PROFILE_FORMATS:
+            raise ValueError(
+                f"Unknown profile format {profile_format}, "
+                f"use one of {', '.join(PROFILE_FORMATS)}."
+            )
+        content = self.to_dict() if profile_format == "json" else self.to_chrome_trace()
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(content, file, indent=2, default=str)
+
+
+# The stats which record the stages of the current conversion
+_recording: ContextVar[ConversionStats | None] = ContextVar(
+    "pynxtools_conversion_stats", default=None
+)
+
+
+@contextlib.contextmanager
+def recording(stats: ConversionStats | None) -> Iterator[ConversionStats | None]:
+    """Record the stages of the enclosed code in stats, if given."""
+    if stats is None:
+        yield _recording.get()
+        return
+    token = _recording.set(stats)
+    try:
+        yield stats
+    finally:
+        _recording.reset(token)
+
+
+def stage(name: str, **metrics) -> contextlib.AbstractContextManager:
+    """Record the enclosed code as a stage, if stats are recording."""
+    stats = _recording.get()
+    if stats is None:
+        return contextlib.nullcontext()
+    return stats.stage(name, **metrics)
+
+
+def phase(name: str, **metrics):
+    """Start the next phase of the innermost stage, if stats are recording."""
+    stats = _recording.get()
+    if stats is not None:
+        stats.phase(name, **metrics)
+
+
+def add_metric(name: str, value: float):
+    """Add a value to a metric of the innermost stage, if stats are recording."""
+    stats = _recording.get()
+    if stats is not None:
+        stats.add_metric(name, value)
+
+
+def profiled(name: str) -> Callable:
+    """
+    Record calls of the decorated function as a stage. The function accepts
+    the keyword argument `stats`, a `ConversionStats` to record into.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, stats: ConversionStats | None = None, **kwargs):
+            with recording(stats), stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
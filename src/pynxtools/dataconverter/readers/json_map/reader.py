@@ -37,11 +37,11 @@ will emit a ``DeprecationWarning`` and will be removed in a future release.
 import json
 import logging
 import pickle
+import sys
 import warnings
 from typing import Any
 
 import numpy as np
-import xarray
 import yaml
 from mergedeep import merge
 
@@ -83,9 +83,11 @@ def get_val_nested_keystring_from_dict(keystring, data):
         return get_val_nested_keystring_from_dict(
             keystring[keystring.find("/") + 1 :], data[current_key]
         )
-    if isinstance(data[current_key], xarray.DataArray):
+    # The data only holds xarray objects if xarray was imported, e.g. by pickle
+    xarray = sys.modules.get("xarray")
+    if xarray is not None and isinstance(data[current_key], xarray.DataArray):
         return data[current_key].values
-    if isinstance(data[current_key], xarray.core.dataset.Dataset):
+    if xarray is not None and isinstance(data[current_key], xarray.Dataset):
         raise NotImplementedError(
             "Xarray datasets are not supported. You can only use xarray dataarrays."
         )
@@ -24,6 +24,7 @@ import re
 from collections.abc import Callable
 from typing import Any, Union
 
+from pynxtools.dataconverter import profiling
 from pynxtools.dataconverter.readers.base.reader import BaseReader
 from pynxtools.dataconverter.readers.utils import (
     is_boolean,
@@ -526,7 +527,8 @@ class MultiFormatReader(BaseReader):
 
         # 1. Objects — before file dispatch so handlers can build on them.
         if objects is not None:
-            template.update(self.handle_objects(objects))
+            with profiling.stage("handle objects"):
+                template.update(self.handle_objects(objects))
 
         # 2. Files — dispatch each input file to its registered handler.
         def get_processing_order(path: str) -> tuple[int, str | int]:
@@ -545,33 +547,37 @@ class MultiFormatReader(BaseReader):
             if not os.path.exists(file_path):
                 logger.warning(f"File {file_path} does not exist, ignoring entry.")
                 continue
-            template.update(self.extensions.get(extension, lambda _: {})(file_path))
+            with profiling.stage("read file", file=file_path, extension=extension):
+                template.update(self.extensions.get(extension, lambda _: {})(file_path))
 
         # 3. Static data not derived from input files.
-        template.update(self.setup_template())
+        with profiling.stage("setup_template"):
+            template.update(self.setup_template())
 
         # 4. Config file.
         if self.config_file is not None:
-            self.config_dict = parse_flatten_json(
-                self.config_file, create_link_dict=False
-            )
+            with profiling.stage("parse config", file=self.config_file):
+                self.config_dict = parse_flatten_json(
+                    self.config_file, create_link_dict=False
+                )
 
         # 5. Post-processing.
-        post_result = self.post_process()
+        with profiling.stage("post_process"):
+            post_result = self.post_process()
         if post_result:
             template.update(post_result)
 
         # 6. Fill template from config dict via @-token callbacks.
         if self.config_dict:
             suppress_warning = kwargs.pop("suppress_warning", False)
-            template.update(
-                fill_from_config(
+            with profiling.stage("fill_from_config"):
+                filled = fill_from_config(
                     self.config_dict,
                     self.get_entry_names(),
                     self.callbacks,
                     suppress_warning=suppress_warning,
                 )
-            )
+            template.update(filled)
 
         template.remove_none_values()
 
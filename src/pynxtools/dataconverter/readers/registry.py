@@ -0,0 +1,127 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""The registry of the built-in and plugin readers of a process.
+
+Built-in readers are the packages `pynxtools.dataconverter.readers.<name>`
+with a `reader.py` module, plugin readers are the entry points of the
+`pynxtools.reader` group. Both are discovered once, on the first lookup
+that needs them, and a reader module is imported only when its class is
+requested. Call `refresh` after installing or removing a plugin to
+discover the readers again.
+"""
+
+import importlib
+import os
+from importlib.metadata import EntryPoint, entry_points
+
+from pynxtools.dataconverter.readers.base.reader import BaseReader
+
+READERS_DIR = os.path.dirname(__file__)
+READERS_PACKAGE = __package__
+ENTRY_POINT_GROUP = "pynxtools.reader"
+
+
+class ReaderRegistry:
+    """
+    Discovers the readers once and keeps their classes once loaded.
+
+    Args:
+        readers_dir (str): The directory of the built-in reader packages.
+        package (str): The package name of `readers_dir`.
+        group (str): The entry point group of plugin readers.
+    """
+
+    def __init__(
+        self,
+        readers_dir: str = READERS_DIR,
+        package: str = READERS_PACKAGE,
+        group: str = ENTRY_POINT_GROUP,
+    ):
+        self.readers_dir = readers_dir
+        self.package = package
+        self.group = group
+        self._builtins: list[str] | None = None
+        self._plugins: dict[str, EntryPoint] | None = None
+        self._classes: dict[str, type[BaseReader]] = {}
+
+    @property
+    def builtins(self) -> list[str]:
+        """The names of the built-in readers, including the base reader."""
+        if self._builtins is None:
+            with os.scandir(self.readers_dir) as entries:
+                self._builtins = sorted(
+                    entry.name
+                    for entry in entries
+                    if entry.is_dir()
+                    and os.path.isfile(os.path.join(entry.path, "reader.py"))
+                )
+        return self._builtins
+
+    @property
+    def plugins(self) -> dict[str, EntryPoint]:
+        """The entry points of the plugin readers by name."""
+        if self._plugins is None:
+            self._plugins = {ep.name: ep for ep in entry_points(group=self.group)}
+        return self._plugins
+
+    def names(self) -> list[str]:
+        """The names of all readers but the base reader, sorted."""
+        return sorted(
+            [name for name in self.builtins if name != "base"] + list(self.plugins)
+        )
+
+    def get(self, reader_name: str) -> type[BaseReader]:
+        """
+        The reader class of the given name, imported on the first lookup.
+
+        Built-in readers take precedence over plugins of the same name, and
+        plugins are only discovered if no built-in reader matches.
+
+        Args:
+            reader_name (str): The name of the reader, e.g. "example".
+
+        Returns:
+            type[BaseReader]: The reader class.
+
+        Raises:
+            ValueError: If there is no reader of the given name.
+        """
+        if reader_name not in self._classes:
+            if reader_name in self.builtins:
+                module = importlib.import_module(f"{self.package}.{reader_name}.reader")
+                reader = module.READER
+            elif reader_name in self.plugins:
+                reader = self.plugins[reader_name].load()
+            else:
+                raise ValueError(f"The reader, {reader_name}, was not found.")
+            self._classes[reader_name] = reader
+        return self._classes[reader_name]
+
+    def refresh(self):
+        """
+        Forget the discovered readers and loaded classes, so that the next
+        lookups discover the readers again. Imported modules are kept by
+        Python, so changes of their code need a new process.
+        """
+        self._builtins = None
+        self._plugins = None
+        self._classes.clear()
+        importlib.invalidate_caches()
+
+
+registry = ReaderRegistry()
@@ -0,0 +1,200 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Bounded-memory copies of array sources into the output file.
+
+Readers that forward data from another HDF5 file or from a memory-mapped
+file can put the `h5py.Dataset`, the `np.memmap`, or any other object that
+exposes its values via the buffer protocol (e.g. an `mmap.mmap`) into the
+template instead of an array. The writer then copies such an array source
+slab by slab along the chunk grid of the output dataset, holding at most
+`max_buffer_bytes` of values in memory.
+
+Chunked `h5py.Dataset` sources whose chunk shape, dtype and filter pipeline
+match the output dataset are copied chunk by chunk with
+`read_direct_chunk`/`write_direct_chunk`, i.e. without decompressing and
+recompressing the data.
+"""
+
+import itertools
+import logging
+import math
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+import h5py
+import numpy as np
+
+from pynxtools.nexus.storage import register_filters_of
+
+logger = logging.getLogger("pynxtools")  # pylint: disable=C0103
+
+# upper bound for the values held in memory while copying a source
+DEFAULT_COPY_BUFFER_BYTES = 64 * 1024**2
+
+
+def is_array_source(value: Any) -> bool:
+    """Whether value is an array source which should be copied slab by slab."""
+    if isinstance(value, (h5py.Dataset, np.memmap)):
+        return True
+    if isinstance(
+        value,
+        (str, bytes, bytearray, np.ndarray, np.generic, Mapping, list, tuple),
+    ):
+        return False
+    try:
+        memoryview(value)
+    except TypeError:
+        return False
+    return True
+
+
+def as_array_source(value: Any) -> h5py.Dataset | np.ndarray:
+    """Returns an indexable view of an array source without reading its values."""
+    if isinstance(value, (h5py.Dataset, np.ndarray)):
+        return value
+    return np.asarray(memoryview(value))
+
+
+def filters_of(dcpl: h5py.h5p.PropDCID) -> tuple[tuple[int, int, tuple], ...]:
+    """The filter pipeline of a dataset creation property list as a comparable tuple."""
+    return tuple(tuple(dcpl.get_filter(idx)[:3]) for idx in range(dcpl.get_nfilters()))
+
+
+def can_copy_chunks(source: h5py.Dataset, target: h5py.Dataset) -> bool:
+    """Whether the stored chunks of source can be written verbatim into target."""
+    return (
+        source.chunks is not None
+        and source.chunks == target.chunks
+        and source.shape == target.shape
+        and source.dtype == target.dtype
+        and filters_of(source.id.get_create_plist())
+        == filters_of(target.id.get_create_plist())
+    )
+
+
+def iter_slabs(
+    shape: tuple[int, ...], chunks: tuple[int, ...], itemsize: int, max_bytes: int
+) -> Iterator[tuple[slice, ...]]:
+    """
+    Selections which cover shape in chunk-aligned slabs of at most max_bytes.
+
+    Slabs span whole rows of chunks along the first axis. If a single row of
+    chunks exceeds max_bytes, the selections are the single chunks instead.
+
+    Args:
+        shape (tuple[int, ...]): The shape of the dataset.
+        chunks (tuple[int, ...]): The chunk shape of the dataset.
+        itemsize (int): The size of one value in bytes.
+        max_bytes (int): The upper bound for the size of a slab.
+    """
+    row_bytes = chunks[0] * math.prod(shape[1:]) * itemsize
+    if row_bytes <= max_bytes:
+        step = chunks[0] * max(1, max_bytes // max(row_bytes, 1))
+        for start in range(0, shape[0], step):
+            yield (slice(start, min(start + step, shape[0])),) + tuple(
+                slice(0, extent) for extent in shape[1:]
+            )
+        return
+    for offset in itertools.product(
+        *(range(0, extent, chunk) for extent, chunk in zip(shape, chunks))
+    ):
+        yield tuple(
+            slice(start, min(start + chunk, extent))
+            for start, chunk, extent in zip(offset, chunks, shape)
+        )
+
+
+def _copy_chunks(source: h5py.Dataset, target: h5py.Dataset):
+    """Copy all allocated chunks of source verbatim into target."""
+    for idx in range(source.id.get_num_chunks()):
+        offset = source.id.get_chunk_info(idx).chunk_offset
+        filter_mask, chunk = source.id.read_direct_chunk(offset)
+        target.id.write_direct_chunk(offset, chunk, filter_mask)
+
+
+def copy_source(
+    grp: h5py.Group,
+    name: str,
+    source: Any,
+    chunks: bool | tuple[int, ...] = True,
+    dcpl: h5py.h5p.PropDCID | None = None,
+    max_buffer_bytes: int = DEFAULT_COPY_BUFFER_BYTES,
+) -> h5py.Dataset:
+    """
+    Create a chunked dataset from an array source with bounded memory.
+
+    Without an explicit filter pipeline, a chunked `h5py.Dataset` source keeps
+    its chunk shape and filter pipeline in the output file, so that its
+    stored chunks are copied verbatim.
+
+    Args:
+        grp (h5py.Group): The group in which to create the dataset.
+        name (str): The name of the dataset.
+        source: The array source, see `is_array_source`.
+        chunks (bool | tuple[int, ...], optional): The chunk shape, or True
+            for the chunk shape of the source or the h5py auto-chunking.
+            Defaults to True.
+        dcpl (h5py.h5p.PropDCID | None, optional): A dataset creation property
+            list which declares the filter pipeline of the output dataset.
+            Defaults to None.
+        max_buffer_bytes (int, optional): The upper bound for the values held
+            in memory. Defaults to DEFAULT_COPY_BUFFER_BYTES.
+
+    Returns:
+        h5py.Dataset: The created dataset.
+    """
+    source = as_array_source(source)
+    if isinstance(source, h5py.Dataset):
+        # the source and its pipeline may use the filters of hdf5plugin
+        register_filters_of(source)
+    if source.ndim == 0 or source.size == 0:
+        return grp.create_dataset(name, data=source[()])
+
+    source_chunks = source.chunks if isinstance(source, h5py.Dataset) else None
+    inherited = False
+    if chunks is True and source_chunks is not None:
+        chunks = source_chunks
+        if dcpl is None:
+            dcpl = source.id.get_create_plist()
+            inherited = True
+
+    try:
+        target = grp.create_dataset(
+            name, shape=source.shape, dtype=source.dtype, chunks=chunks, dcpl=dcpl
+        )
+    except (ValueError, RuntimeError) as exc:
+        if not inherited:
+            raise
+        # e.g. a filter of the source which is not available for writing
+        logger.info(
+            f"Unable to keep the filter pipeline of {source.name} for {name} "
+            f"({exc}), the values are copied uncompressed."
+        )
+        target = grp.create_dataset(
+            name, shape=source.shape, dtype=source.dtype, chunks=chunks
+        )
+
+    if isinstance(source, h5py.Dataset) and can_copy_chunks(source, target):
+        _copy_chunks(source, target)
+        return target
+
+    for selection in iter_slabs(
+        target.shape, target.chunks, target.dtype.itemsize, max_buffer_bytes
+    ):
+        target[selection] = source[selection]
+    return target
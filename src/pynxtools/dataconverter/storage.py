@@ -0,0 +1,78 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Files built in memory and stored with one sequential write.
+
+Files with many small objects can be built in memory with the HDF5 core
+driver, see `open_in_memory`, and stored with one sequential write of their
+file image, see `write_file_image`. The settings of the storage profile of
+the target path (see `pynxtools.nexus.storage`) apply to them as well.
+"""
+
+import os
+from typing import Any
+
+import h5py
+
+from pynxtools.nexus.storage import StorageProfile, get_storage_profile
+
+# files whose values are estimated to be larger are not built in memory
+IN_MEMORY_THRESHOLD = 512 * 1024**2
+# the increment by which the memory of a file built in memory grows
+CORE_BLOCK_SIZE = 4 * 1024**2
+
+
+def open_in_memory(
+    path: Any, profile: str | StorageProfile | None = None, **kwargs
+) -> h5py.File:
+    """
+    Create an HDF5 file in memory with the core driver, for a file at path.
+
+    Nothing is written to path, the file image is stored with
+    `write_file_image` once the file is complete.
+
+    Args:
+        path: The path at which the file will be stored. It is also the name
+            of the file in memory, e.g. for virtual datasets with sources in it.
+        profile (str | StorageProfile | None, optional): The storage profile of
+            path, see `get_storage_profile`. Defaults to None.
+        **kwargs: Further arguments of `h5py.File`, which take precedence over
+            the settings of the profile.
+    """
+    return h5py.File(
+        path,
+        "w",
+        driver="core",
+        backing_store=False,
+        block_size=CORE_BLOCK_SIZE,
+        **{**get_storage_profile(path, profile).file_kwargs(), **kwargs},
+    )
+
+
+def write_file_image(h5file: h5py.File, path: str | os.PathLike) -> int:
+    """
+    Store an open HDF5 file, e.g. one built with `open_in_memory`, at path
+    with one sequential write of its file image.
+
+    Returns:
+        int: The number of bytes written.
+    """
+    h5file.flush()
+    image = h5file.id.get_file_image()
+    with open(path, "wb") as target:
+        target.write(image)
+    return len(image)
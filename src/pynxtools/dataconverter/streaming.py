@@ -0,0 +1,336 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Streaming payloads, i.e., datasets that are written slab by slab.
+
+Readers can place data that do not fit into memory into the template as a
+streaming payload instead of an array:
+
+```
+template["/ENTRY[entry]/events/time_of_flight"] = {
+    "stream": iterator_of_slabs,
+    "shape": (None,),  # None: the length along axis is not known in advance
+    "dtype": np.float32,
+    "axis": 0,
+}
+```
+
+The writer creates a resizable, chunked dataset and appends the slabs in the
+order in which the iterator produces them. Slabs are collected until a chunk
+along `axis` is filled, so at most one chunk and one slab are held in memory.
+A slab either has the declared shape except along `axis`, or lacks `axis`
+and then counts as a single item. The optional keys "chunks", "filter",
+"strength" and "shuffle" work as for compressed payloads.
+
+Validation only sees the declared "dtype" and "shape"; the values themselves
+are not checked as they are not available before writing.
+
+Appendable payloads extend a dataset over several runs of the writer in
+append mode, e.g. one batch of a time-resolved measurement per run:
+
+```
+template["/ENTRY[entry]/DATA[data]/intensity"] = {
+    "append": batch,  # shape (n_frames, 512, 512)
+    "axis": 0,
+}
+```
+
+The first run creates the dataset with an unlimited extent along `axis`,
+every later run resizes it and writes the batch behind the existing values.
+"""
+
+import copy
+import logging
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import h5py
+import numpy as np
+
+from pynxtools.dataconverter.compression import (
+    PIPELINE_COMPRESSION_FILTERS,
+    SHUFFLE_MODES,
+    FilterPipeline,
+)
+from pynxtools.dataconverter.sources import is_array_source
+from pynxtools.nexus.storage import register_filters_of
+
+logger = logging.getLogger("pynxtools")  # pylint: disable=C0103
+
+
+def is_stream_payload(value: Any) -> bool:
+    """Whether value is a streaming payload of the template."""
+    return isinstance(value, Mapping) and "stream" in value
+
+
+def is_append_payload(value: Any) -> bool:
+    """Whether value is an appendable payload of the template."""
+    return isinstance(value, Mapping) and "append" in value
+
+
+def deepcopy_keeping_sources(value: Any) -> Any:
+    """
+    Deep-copy value, but share the iterators of all nested streaming payloads
+    and all array sources (see sources.py).
+
+    Generators cannot be copied, and a copied iterator would be consumed
+    independently of the one that is written. Copying an `h5py.Dataset` or a
+    `np.memmap` would read all of its values into memory.
+    """
+    memo: dict[int, Any] = {}
+    pending = [value]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, Mapping):
+            if is_stream_payload(current):
+                memo[id(current["stream"])] = current["stream"]
+            pending.extend(current.values())
+        elif is_array_source(current):
+            memo[id(current)] = current
+    return copy.deepcopy(value, memo)
+
+
+def _create_resizable_dataset(
+    grp: h5py.Group, name: str, spec: "StreamSpec"
+) -> h5py.Dataset:
+    """Create an empty, chunked dataset with an unlimited extent along spec.axis."""
+    initial_shape = tuple(
+        0 if idx == spec.axis else extent for idx, extent in enumerate(spec.shape)
+    )
+    maxshape = tuple(
+        None if idx == spec.axis else extent for idx, extent in enumerate(spec.shape)
+    )
+    return grp.create_dataset(
+        name,
+        shape=initial_shape,
+        maxshape=maxshape,
+        dtype=spec.dtype,
+        chunks=spec.chunks,
+        dcpl=spec.pipeline.create_plist() if spec.pipeline is not None else None,
+    )
+
+
+def _as_slab(values: Any, dataset: h5py.Dataset, dtype: np.dtype, axis: int):
+    """
+    Convert values to an array that can be appended to dataset along axis.
+
+    Raises:
+        ValueError: If the shape does not match the dataset off the axis.
+    """
+    slab = np.asarray(values, dtype=dtype)
+    if slab.ndim == dataset.ndim - 1:
+        slab = np.expand_dims(slab, axis)
+    if (
+        slab.ndim != dataset.ndim
+        or slab.shape[:axis] + slab.shape[axis + 1 :]
+        != dataset.shape[:axis] + dataset.shape[axis + 1 :]
+    ):
+        raise ValueError(
+            f"Values of shape {slab.shape} cannot be appended along axis {axis} "
+            f"to {dataset.name} of shape {dataset.shape}."
+        )
+    return slab
+
+
+def _extend(dataset: h5py.Dataset, block: np.ndarray, axis: int):
+    """Resize dataset along axis and write block behind the existing values."""
+    start = dataset.shape[axis]
+    dataset.resize(start + block.shape[axis], axis=axis)
+    selection = [slice(None)] * dataset.ndim
+    selection[axis] = slice(start, start + block.shape[axis])
+    dataset[tuple(selection)] = block
+
+
+@dataclass(frozen=True)
+class StreamSpec:
+    """The declared layout of a streaming payload.
+
+    Args:
+        shape (tuple[int | None, ...]): The declared shape. The extent along
+            `axis` can be None if it is not known in advance.
+        dtype (np.dtype): The declared dtype of all values.
+        axis (int): The axis along which the slabs are appended.
+        chunks (bool | tuple[int, ...]): The chunk shape, or True for h5py auto-chunking.
+        pipeline (FilterPipeline | None): The compression of the dataset, if any.
+    """
+
+    shape: tuple[int | None, ...]
+    dtype: np.dtype
+    axis: int = 0
+    chunks: bool | tuple[int, ...] = True
+    pipeline: FilterPipeline | None = None
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any]) -> "StreamSpec":
+        """Parse the declared layout of a streaming payload.
+
+        Raises:
+            ValueError: If the shape, dtype or axis are missing or inconsistent.
+        """
+        if "shape" not in payload or "dtype" not in payload:
+            raise ValueError("A streaming payload needs to declare shape and dtype.")
+        shape = tuple(
+            None if extent is None else int(extent) for extent in payload["shape"]
+        )
+        if not shape:
+            raise ValueError("A streaming payload cannot be a scalar.")
+        axis = int(payload.get("axis", 0))
+        if not -len(shape) <= axis < len(shape):
+            raise ValueError(f"Axis {axis} is out of bounds for shape {shape}.")
+        axis %= len(shape)
+        if any(extent is None for idx, extent in enumerate(shape) if idx != axis):
+            raise ValueError(
+                f"Only the extent along the streaming axis {axis} can be None."
+            )
+
+        pipeline = None
+        if any(key in payload for key in ("filter", "strength", "shuffle")):
+            codec = payload.get("filter", "gzip")
+            strength = payload.get("strength", 9)
+            shuffle = payload.get("shuffle")
+            pipeline = FilterPipeline(
+                codec if codec in PIPELINE_COMPRESSION_FILTERS else "gzip",
+                strength if isinstance(strength, int) and 0 <= strength <= 9 else 9,
+                shuffle if shuffle in SHUFFLE_MODES else None,
+            )
+
+        chunks = payload.get("chunks", True)
+        return cls(
+            shape=shape,
+            dtype=np.dtype(payload["dtype"]),
+            axis=axis,
+            chunks=tuple(chunks) if isinstance(chunks, (list, tuple)) else True,
+            pipeline=pipeline,
+        )
+
+    @property
+    def extent(self) -> int | None:
+        """The declared extent along the streaming axis."""
+        return self.shape[self.axis]
+
+
+def write_stream(
+    grp: h5py.Group, name: str, payload: Mapping[str, Any]
+) -> h5py.Dataset:
+    """
+    Create a resizable dataset and append the slabs of a streaming payload.
+
+    Args:
+        grp (h5py.Group): The group in which to create the dataset.
+        name (str): The name of the dataset.
+        payload (Mapping[str, Any]): The streaming payload.
+
+    Raises:
+        ValueError: If a slab does not match the declared shape.
+
+    Returns:
+        h5py.Dataset: The written dataset.
+    """
+    spec = StreamSpec.from_payload(payload)
+    axis = spec.axis
+    dataset = _create_resizable_dataset(grp, name, spec)
+    rows_per_write = dataset.chunks[axis]
+
+    written = 0
+    pending: list[np.ndarray] = []
+    n_pending = 0
+
+    def flush():
+        nonlocal written, pending, n_pending
+        if not n_pending:
+            return
+        block = pending[0] if len(pending) == 1 else np.concatenate(pending, axis)
+        _extend(dataset, block, axis)
+        written += n_pending
+        pending, n_pending = [], 0
+
+    stream: Iterable = payload["stream"]
+    for slab in stream:
+        slab = _as_slab(slab, dataset, spec.dtype, axis)
+        pending.append(slab)
+        n_pending += slab.shape[axis]
+        if n_pending >= rows_per_write:
+            flush()
+    flush()
+
+    if spec.extent is not None and written != spec.extent:
+        logger.warning(
+            f"Stream for {dataset.name} declared {spec.extent} items along axis "
+            f"{axis} but provided {written}."
+        )
+    return dataset
+
+
+def write_appendable(
+    grp: h5py.Group, name: str, payload: Mapping[str, Any]
+) -> tuple[h5py.Dataset, bool]:
+    """
+    Append the values of an appendable payload to a dataset.
+
+    The dataset is created with an unlimited extent along the axis of the payload
+    if it does not exist yet. Otherwise, it is resized and the values are
+    written behind the existing ones.
+
+    Args:
+        grp (h5py.Group): The group which contains the dataset.
+        name (str): The name of the dataset.
+        payload (Mapping[str, Any]): The appendable payload.
+
+    Raises:
+        ValueError: If the existing object cannot be extended by the values.
+
+    Returns:
+        tuple[h5py.Dataset, bool]: The dataset, and whether it existed before.
+    """
+    values = np.asarray(payload["append"])
+    axis = int(payload.get("axis", 0))
+    existing = grp.get(name)
+    if existing is None:
+        if values.ndim == 0:
+            raise ValueError(f"A scalar cannot be appended to {name}.")
+        shape = tuple(
+            None if idx == axis % values.ndim else extent
+            for idx, extent in enumerate(values.shape)
+        )
+        spec = StreamSpec.from_payload(
+            {
+                **payload,
+                "shape": shape,
+                "dtype": payload.get("dtype", values.dtype),
+            }
+        )
+        dataset = _create_resizable_dataset(grp, name, spec)
+        _extend(dataset, _as_slab(values, dataset, spec.dtype, spec.axis), spec.axis)
+        return dataset, False
+
+    if not isinstance(existing, h5py.Dataset) or existing.ndim == 0:
+        raise ValueError(f"{existing.name} is not a dataset that can be extended.")
+    if not -existing.ndim <= axis < existing.ndim:
+        raise ValueError(
+            f"Axis {axis} is out of bounds for {existing.name} of shape "
+            f"{existing.shape}."
+        )
+    axis %= existing.ndim
+    if existing.maxshape[axis] is not None:
+        raise ValueError(
+            f"{existing.name} was not created as resizable along axis {axis}."
+        )
+    # the dataset may have been compressed with a filter of hdf5plugin
+    register_filters_of(existing)
+    _extend(existing, _as_slab(values, existing, existing.dtype, axis), axis)
+    return existing, True
@@ -0,0 +1,684 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Synthetic data for any application definition.
+
+The generator walks the NeXus tree of an application definition and fills
+its concepts with values of the right type: items of enumerations, units
+from `NXUnitSet.get_default_unit` and arrays whose dimensions named by the same
+NXDL symbol have the same length. Entries and the instances of variadic
+concepts can be multiplied to build large inputs for benchmarks and soak
+tests. The same seed and options always give the same data.
+
+    template = generate_synthetic_template("NXmpes", seed=1, n_entries=10)
+    write_synthetic_file("NXmpes", "synthetic.nxs", fraction=0.5)
+"""
+
+import datetime
+import logging
+import os
+import re
+from typing import Any
+
+import numpy as np
+
+from pynxtools.dataconverter.helpers import (
+    add_default_root_attributes,
+    convert_data_dict_path_to_hdf5_path,
+    write_nexus_def_to_entry,
+)
+from pynxtools.dataconverter.template import Template
+from pynxtools.nexus.nexus_tree import (
+    NexusAttribute,
+    NexusChoice,
+    NexusDefinition,
+    NexusField,
+    NexusGroup,
+    NexusLink,
+    NexusNode,
+    generate_tree_from,
+)
+from pynxtools.nexus.utils import RESERVED_SUFFIXES, get_nxdl_root_and_path
+from pynxtools.units import NXUnitSet
+
+logger = logging.getLogger("pynxtools")
+
+DEFAULT_ARRAY_SIZE = 16
+
+# Dimension expressions such as "nx+1" in NXDL files
+SYMBOL_EXPRESSION = re.compile(r"^\s*(\w+)\s*([+-])\s*(\d+)\s*$")
+
+START_TIME = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+# Units of NX_TRANSFORMATION fields by their transformation type
+TRANSFORMATION_UNITS = {"translation": "m", "rotation": "degree"}
+
+# Types of the enumeration items of numeric concepts
+ITEM_TYPES = {
+    "NX_INT": np.int64,
+    "NX_POSINT": np.int64,
+    "NX_UINT": np.uint64,
+    "NX_FLOAT": np.float64,
+    "NX_NUMBER": np.float64,
+}
+
+
+def instance_name(concept: str, index: int) -> str:
+    """
+    A name of an instance of a concept, e.g. "entry" and "entry1" for
+    "ENTRY" or "odd_name" and "odd1_name" for "ODD_name". The index is
+    appended to the first uppercase part, which the instance may rename.
+
+    Args:
+        concept (str): The name of the concept.
+        index (int): The index of the instance, 0 for the first one.
+
+    Returns:
+        str: The instance name.
+    """
+    suffix = str(index) if index else ""
+    return re.sub(
+        r"[A-Z]+", lambda match: match.group().lower() + suffix, concept, count=1
+    ).lower()
+
+
+def has_valid_items(node: NexusField | NexusAttribute) -> bool:
+    """
+    Whether a value of the type of a node can be one of its enumeration
+    items. The validator compares values with the items as they are written
+    in the NXDL file, e.g. numbers with the strings of scalar items.
+
+    Args:
+        node (NexusField | NexusAttribute): The node.
+
+    Returns:
+        bool: True if the node has no enumeration or an item of its type.
+    """
+    if not node.items:
+        return True
+    item = node.items[0]
+    if node.dtype in ITEM_TYPES:
+        return isinstance(item, list)
+    if node.dtype in ("NX_CHAR", "NX_DATE_TIME"):
+        return isinstance(item, str) or all(isinstance(part, str) for part in item)
+    return True
+
+
+class _Generator:
+    """Fills a template from a NeXus tree, see `generate_synthetic_template`."""
+
+    def __init__(
+        self,
+        seed: int,
+        fraction: float,
+        n_entries: int,
+        n_instances: int,
+        array_size: int,
+        symbol_sizes: dict[str, int],
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.fraction = fraction
+        self.n_entries = n_entries
+        self.n_instances = n_instances
+        self.array_size = array_size
+        self.symbol_sizes = dict(symbol_sizes)
+        self.template = Template()
+        self.n_values = 0
+        # the key segments of the fields in each group by their names
+        self.fields: dict[str, dict[str, str]] = {}
+        # the keys of the AXISNAME_indices attributes in each group and
+        # whether they are required
+        self.indices: dict[str, list[tuple[str, bool]]] = {}
+        # template paths of the generated groups and fields by their concept
+        # path, e.g. /NXentry/NXinstrument/NXdetector/data, and their HDF5 path
+        self.targets: dict[str, str] = {}
+        # (template path, NXDL target) of the links, resolved at the end
+        self.links: list[tuple[str, str]] = []
+        # template paths of the groups and fields with a required value
+        # which cannot be valid
+        self.invalid: set[str] = set()
+
+    def is_included(self, node: NexusNode) -> bool:
+        if node.optionality == "required":
+            return True
+        if isinstance(node, (NexusField, NexusAttribute)) and not has_valid_items(node):
+            return False
+        return self.fraction >= 1 or bool(self.rng.random() < self.fraction)
+
+    def n_instances_of(self, node: NexusNode) -> int:
+        if not node.variadic:
+            return 1
+        if isinstance(node, NexusGroup) and node.nx_class == "NXentry":
+            count = self.n_entries
+        elif isinstance(node, NexusAttribute):
+            count = 1
+        else:
+            count = self.n_instances
+        if isinstance(node, NexusGroup) and node.occurrence_limits[1] is not None:
+            count = min(count, node.occurrence_limits[1])
+        return count
+
+    def symbol_size(self, symbol: str) -> int:
+        if symbol in self.symbol_sizes:
+            return self.symbol_sizes[symbol]
+        if match := SYMBOL_EXPRESSION.match(symbol):
+            size = self.symbol_size(match.group(1))
+            offset = int(match.group(3))
+            return max(1, size + offset if match.group(2) == "+" else size - offset)
+        return self.symbol_sizes.setdefault(symbol, self.array_size)
+
+    def shape_of(self, node: NexusField | NexusAttribute) -> tuple[int, ...]:
+        if node.shape is None:
+            # signals and axes are arrays even if their rank is not given
+            in_nxdata = (
+                isinstance(node, NexusField)
+                and isinstance(node.parent, NexusGroup)
+                and node.parent.nx_class == "NXdata"
+            )
+            numeric = node.dtype not in ("NX_CHAR", "NX_DATE_TIME", "NX_BOOLEAN")
+            return (self.array_size,) if in_nxdata and numeric else ()
+        symbols = node.dim_symbols or (None,) * len(node.shape)
+        return tuple(
+            length
+            if length is not None
+            else self.symbol_size(symbol)
+            if symbol is not None
+            else self.array_size
+            for length, symbol in zip(node.shape, symbols)
+        )
+
+    def value_of(self, node: NexusField | NexusAttribute, name: str) -> Any:
+        """A value of the type, enumeration and shape of the node."""
+        if node.items:
+            item = node.items[int(self.rng.integers(len(node.items)))]
+            if node.dtype not in ITEM_TYPES:
+                return item
+            try:
+                return np.asarray(item, dtype=ITEM_TYPES[node.dtype])[()]
+            except ValueError:
+                return item
+        shape = self.shape_of(node)
+        size = int(np.prod(shape)) if shape else 1
+        rng = self.rng
+        dtype = node.dtype
+        if dtype == "NX_CHAR":
+            values = np.array(
+                [f"{name} {number}" for number in rng.integers(10**6, size=size)]
+            )
+        elif dtype == "NX_DATE_TIME":
+            values = np.array(
+                [
+                    (START_TIME + datetime.timedelta(seconds=int(seconds))).isoformat()
+                    for seconds in rng.integers(10**8, size=size)
+                ]
+            )
+        elif dtype == "NX_BOOLEAN":
+            values = rng.integers(2, size=size).astype(bool)
+        elif dtype == "NX_INT":
+            values = rng.integers(-1000, 1000, size=size, dtype=np.int64)
+        elif dtype == "NX_POSINT":
+            values = rng.integers(1, 1000, size=size, dtype=np.int64)
+        elif dtype == "NX_UINT":
+            values = rng.integers(0, 1000, size=size, dtype=np.uint64)
+        elif dtype in ("NX_COMPLEX", "NX_PCOMPLEX", "NX_CCOMPLEX"):
+            values = rng.normal(size=size) + 1j * rng.normal(size=size)
+        elif dtype == "NX_BINARY":
+            return rng.bytes(size)
+        elif dtype == "NX_QUATERNION":
+            return rng.normal(size=shape + (4,) if shape else (4,))
+        else:  # NX_FLOAT, NX_NUMBER, NX_CHAR_OR_NUMBER
+            values = rng.normal(size=size)
+        if not shape:
+            value = values[0]
+            return value.item() if dtype in ("NX_CHAR", "NX_DATE_TIME") else value
+        return values.reshape(shape)
+
+    def add_entity(self, node: NexusField | NexusAttribute, path: str, name: str):
+        self.template[path] = self.value_of(node, name)
+        self.n_values += 1
+
+    def add_unit(self, node: NexusField, path: str):
+        """Add a unit of the unit category of a field, after its attributes."""
+        if node.unit is None or node.unit == "NX_UNITLESS":
+            return
+        if node.unit == "NX_TRANSFORMATION":
+            unit = TRANSFORMATION_UNITS.get(
+                self.template.get(f"{path}/@transformation_type"), ""
+            )
+        else:
+            unit = NXUnitSet.get_default_unit(node.unit)
+        # dimensionless quantities and NX_ANY have an empty unit
+        self.template[f"{path}/@units"] = (
+            "" if unit in (None, "dimensionless") else unit
+        )
+
+    def walk(self, node: NexusNode, path: str, concept_path: str):
+        """Add the children of node, a group or field at path, to the template."""
+        for child in node.children:
+            if isinstance(child, NexusChoice):
+                if child.children and self.is_included(child):
+                    choice = child.children[int(self.rng.integers(len(child.children)))]
+                    self.add_group(
+                        choice, f"{path}/{choice.name}[{child.name}]", concept_path
+                    )
+                continue
+            if self.is_filled_by_converter(node, child) or not self.is_included(child):
+                continue
+            if isinstance(child, NexusLink):
+                self.links.append((f"{path}/{child.name}", child.target))
+            elif isinstance(child, NexusAttribute):
+                if child.name == "units":
+                    # the unit of a field without a unit category, e.g. NX_ANY
+                    if f"{path}/@units" not in self.template:
+                        self.template[f"{path}/@units"] = ""
+                    continue
+                name = instance_name(child.name, 0) if child.variadic else child.name
+                segment = f"{child.name}[{name}]" if child.variadic else child.name
+                self.add_entity(child, f"{path}/@{segment}", name)
+                if not has_valid_items(child):
+                    self.invalid.add(path)
+                if name.endswith("_indices"):
+                    self.indices.setdefault(path, []).append(
+                        (f"{path}/@{segment}", child.optionality == "required")
+                    )
+            elif isinstance(child, NexusField):
+                for index in range(self.n_instances_of(child)):
+                    name, field_path = self.segment(child, path, index)
+                    self.add_entity(child, field_path, name)
+                    self.fields.setdefault(path, {})[name] = field_path[len(path) + 1 :]
+                    self.register(field_path, f"{concept_path}/{child.name}")
+                    self.walk(child, field_path, f"{concept_path}/{child.name}")
+                    self.add_unit(child, field_path)
+                    if not has_valid_items(child) or field_path in self.invalid:
+                        self.drop_invalid(child, field_path)
+            elif isinstance(child, NexusGroup):
+                if child.variadic and child.name in node.get_all_direct_children_names(
+                    node_type="field"
+                ):
+                    # e.g. an unnamed NXdata group in an NXdata group, which
+                    # cannot be told apart from its DATA fields
+                    continue
+                for index in range(self.n_instances_of(child)):
+                    _, group_path = self.segment(child, path, index)
+                    self.add_group(child, group_path, concept_path)
+
+    def is_filled_by_converter(self, node: NexusNode, child: NexusNode) -> bool:
+        """
+        Whether the converter fills a child, i.e. the attributes of the root
+        and the definition of each entry, see `add_default_root_attributes`
+        and `write_nexus_def_to_entry`.
+        """
+        if isinstance(node, NexusDefinition):
+            return isinstance(child, NexusAttribute)
+        return (
+            isinstance(node, NexusGroup)
+            and node.nx_class == "NXentry"
+            and child.name == "definition"
+        )
+
+    def add_group(self, node: NexusGroup, path: str, parent_concept_path: str):
+        concept_path = f"{parent_concept_path}/{node.nx_class}"
+        self.register(path, concept_path)
+        self.register(path, f"{parent_concept_path}/{node.name}")
+        n_values = self.n_values
+        self.walk(node, path, concept_path)
+        self.add_associated_fields(node, path)
+        if node.nx_class == "NXdata" and self.fields.get(path):
+            self.point_to_fields(node, path)
+        if not self.drop_unassociated_fields(node, path) or path in self.invalid:
+            if self.drop_invalid(node, path):
+                return
+        if self.n_values == n_values or (
+            node.nx_class == "NXdata" and not self.fields.get(path)
+        ):
+            self.add_base_class_field(node, path)
+
+    def add_base_class_field(self, node: NexusGroup, path: str):
+        """Fill a group without values with a field of its base class."""
+        if node.nx_class == "NXdata":
+            signal = node.search_add_child_for("signal")
+            if signal is not None and signal.items:
+                # point_to_fields adds the enumerated signal
+                self.point_to_fields(node, path)
+                return
+        names = [
+            name
+            for name in node.get_all_direct_children_names(node_type="field")
+            if not name.endswith(RESERVED_SUFFIXES)
+        ]
+        if not names:
+            self.template[path] = None
+            return
+        name = next((name for name in ("DATA", "description") if name in names), None)
+        self.add_field(node, path, name or names[0])
+        if node.nx_class == "NXdata":
+            self.point_to_fields(node, path)
+
+    def add_associated_fields(self, node: NexusGroup, path: str):
+        """Add the fields named by reserved suffixes, e.g. x for x_errors."""
+        for name in list(self.fields.get(path, ())):
+            suffix = next((s for s in RESERVED_SUFFIXES if name.endswith(s)), None)
+            if suffix is None or name[: -len(suffix)] in self.fields[path]:
+                continue
+            # only a named concept is found under the name of the field
+            child = node.search_add_child_for(name[: -len(suffix)])
+            if isinstance(child, NexusField) and not child.variadic:
+                self.add_field(node, path, child.name)
+
+    def drop_unassociated_fields(self, node: NexusGroup, path: str) -> bool:
+        """
+        Drop the fields named by reserved suffixes without their associated
+        field, e.g. x_errors without x. Returns False if such a field cannot
+        be dropped.
+        """
+        fields = self.fields.get(path, {})
+        named = {name for name, segment in fields.items() if name == segment}
+        # the signal and axes of an NXdata group are not found by the other
+        # fields, and their errors are not checked
+        hidden = set()
+        if node.nx_class == "NXdata" and f"{path}/@signal" in self.template:
+            hidden.add(self.template[f"{path}/@signal"])
+            hidden.update(np.atleast_1d(self.template.get(f"{path}/@axes", [])))
+        checked = True
+        for name, segment in list(fields.items()):
+            suffix = next((s for s in RESERVED_SUFFIXES if name.endswith(s)), None)
+            if suffix is None or name in {f"{field}_errors" for field in hidden}:
+                continue
+            if name[: -len(suffix)] in (named if name in hidden else named - hidden):
+                continue
+            child = node.search_add_child_for(segment.split("[", 1)[0])
+            if name in hidden or (
+                child is not None and child.optionality == "required"
+            ):
+                checked = False
+                continue
+            self.drop(f"{path}/{segment}")
+            del fields[name]
+        return checked
+
+    def add_field(self, node: NexusGroup, path: str, name: str) -> str | None:
+        """Add a field of the base class of a group, return its instance name."""
+        child = node.search_add_child_for(name)
+        if child is None and node.nx_class == "NXdata":
+            # e.g. a signal named by an enumeration, as an instance of DATA
+            child = node.search_add_child_for("DATA")
+            field_name, field_path = name, f"{path}/DATA[{name}]"
+        elif isinstance(child, NexusField):
+            field_name, field_path = self.segment(child, path, 0)
+        else:
+            return None
+        self.add_entity(child, field_path, field_name)
+        # the attributes, without a concept path as links do not target them
+        self.walk(child, field_path, "")
+        self.add_unit(child, field_path)
+        self.fields.setdefault(path, {})[field_name] = field_path[len(path) + 1 :]
+        return field_name
+
+    def resize_field(self, path: str, shape: tuple[int, ...]):
+        """Repeat or cut the values of a field to a shape."""
+        if np.shape(self.template[path]) != shape:
+            self.template[path] = np.resize(self.template[path], shape)
+
+    def signal_of(self, path: str, indexed: set[str]) -> str | None:
+        """
+        The numeric field of most dimensions of an NXdata group which no
+        reserved suffix or AXISNAME_indices attribute refers to.
+        """
+        fields = self.fields.get(path, {})
+        bases = {
+            name[: -len(suffix)]
+            for name in fields
+            for suffix in RESERVED_SUFFIXES
+            if name.endswith(suffix)
+        }
+        values = {
+            name: np.asarray(self.template[f"{path}/{segment}"])
+            for name, segment in fields.items()
+            # the validator finds the signal under its name or as DATA
+            if segment in (name, f"DATA[{name}]")
+            and name not in bases | indexed
+            and not name.endswith(RESERVED_SUFFIXES)
+        }
+        candidates = {
+            name: value for name, value in values.items() if value.dtype.kind in "iufc"
+        }
+        if "data" in candidates:
+            return "data"
+        if candidates:
+            return max(candidates, key=lambda name: candidates[name].ndim)
+        return None
+
+    def point_to_fields(self, node: NexusGroup, path: str):
+        """Let the signal and axes attributes of an NXdata group name its fields."""
+        fields = self.fields.setdefault(path, {})
+        indices = self.indices.get(path, [])
+        # the axes named by AXISNAME_indices attributes of a fixed name
+        indexed = {
+            key.rsplit("@", 1)[-1].removesuffix("_indices")
+            for key, _ in indices
+            if "[" not in key.rsplit("@", 1)[-1]
+        }
+        signal = self.template.get(f"{path}/@signal")
+        signal_node = node.search_add_child_for("signal")
+        if signal_node is not None and signal_node.items:
+            if signal not in signal_node.items:
+                signal = signal_node.items[0]
+            if signal not in fields:
+                self.add_field(node, path, signal)
+        elif signal not in fields:
+            signal = self.signal_of(path, indexed) or self.add_field(node, path, "data")
+        if signal not in fields:
+            return
+        self.template[f"{path}/@signal"] = signal
+        signal_path = f"{path}/{fields[signal]}"
+        if np.ndim(self.template[signal_path]) == 0:
+            self.resize_field(signal_path, (self.array_size,))
+        shape = np.shape(self.template[signal_path])
+
+        axes = self.template.get(f"{path}/@axes")
+        axes_node = node.search_add_child_for("axes")
+        if axes_node is not None and axes_node.items:
+            axes = axes_node.items[0]
+            if len(shape) < np.size(axes):
+                # each axis spans the dimension of its position
+                shape += (self.array_size,) * (np.size(axes) - len(shape))
+                self.resize_field(signal_path, shape)
+            for index, axis in enumerate(np.atleast_1d(axes)):
+                if axis not in fields:
+                    self.add_field(node, path, axis)
+                if axis in fields:
+                    self.resize_field(f"{path}/{fields[axis]}", (shape[index],))
+            self.template[f"{path}/@axes"] = axes
+        elif axes is not None and not all(
+            axis in fields or axis == "." for axis in np.atleast_1d(axes)
+        ):
+            # "." marks a dimension without an axis
+            self.template[f"{path}/@axes"] = ["."] * max(1, len(shape))
+
+        # the dimension of the signal which each axis spans
+        axes = [
+            str(axis) for axis in np.atleast_1d(self.template.get(f"{path}/@axes", []))
+        ]
+        for key, required in indices:
+            if "[" in key.rsplit("@", 1)[-1]:
+                # name an AXISNAME_indices attribute after a one-dimensional field
+                axis = next(
+                    (
+                        name
+                        for name, segment in fields.items()
+                        if name not in indexed | {signal}
+                        and np.ndim(self.template[f"{path}/{segment}"]) == 1
+                    ),
+                    None,
+                )
+                if axis is None and required:
+                    axis = self.add_field(node, path, "AXISNAME")
+                if axis is not None:
+                    indexed.add(axis)
+                    value = self.template[key]
+                    del self.template[key]
+                    key = f"{path}/@AXISNAME_indices[{axis}_indices]"
+                    self.template[key] = value
+            else:
+                axis = key.rsplit("@", 1)[-1].removesuffix("_indices")
+                if required and axis not in fields:
+                    self.add_field(node, path, axis)
+            if axis is None or axis not in fields:
+                del self.template[key]
+                continue
+            axis_path = f"{path}/{fields[axis]}"
+            length = np.shape(self.template[axis_path])
+            if axis in axes:
+                index = axes.index(axis)
+            elif len(length) == 1 and length[0] in shape:
+                index = shape.index(length[0])
+            elif required:
+                index = 0
+                self.resize_field(axis_path, (shape[0],))
+            else:
+                del self.template[key]
+                continue
+            self.template[key] = np.asarray(self.template[key]).dtype.type(index)
+        if f"{path}/@auxiliary_signals" in self.template:
+            del self.template[f"{path}/@auxiliary_signals"]
+
+    def drop_invalid(self, node: NexusGroup | NexusField, path: str) -> bool:
+        """
+        Drop an optional group or field which cannot be valid, or let its
+        parent be invalid if it is required. Returns True if it is dropped.
+        """
+        parent_path = path.rsplit("/", 1)[0]
+        if node.optionality == "required":
+            self.invalid.add(parent_path)
+            return False
+        logger.debug(f"{path} is not generated, it cannot be valid.")
+        self.drop(path)
+        if isinstance(node, NexusField):
+            name = path.rsplit("/", 1)[-1].rsplit("[", 1)[-1].rstrip("]")
+            self.fields[parent_path].pop(name, None)
+        return True
+
+    def drop(self, path: str):
+        """Remove a generated group or field with its attributes and children."""
+        keys = [
+            key
+            for key in self.template.keys()
+            if key == path or key.startswith(f"{path}/")
+        ]
+        for key in keys:
+            del self.template[key]
+        self.n_values -= sum(not key.endswith("/@units") for key in keys)
+        self.targets = {
+            concept_path: target
+            for concept_path, target in self.targets.items()
+            if target != path and not target.startswith(f"{path}/")
+        }
+        self.links = [link for link in self.links if not link[0].startswith(f"{path}/")]
+
+    def segment(self, node: NexusNode, path: str, index: int) -> tuple[str, str]:
+        """The instance name and the template path of an instance of node."""
+        if not node.variadic:
+            return node.name, f"{path}/{node.name}"
+        # skip the names of non-variadic siblings, e.g. "data" for DATA
+        taken = {
+            sibling.name
+            for sibling in node.parent.children
+            if sibling is not node and not sibling.variadic
+        }
+        if instance_name(node.name, 0) in taken:
+            index += 1
+        while (name := instance_name(node.name, index)) in taken:
+            index += 1
+        return name, f"{path}/{node.name}[{name}]"
+
+    def register(self, path: str, concept_path: str):
+        self.targets.setdefault(concept_path, path)
+        self.targets.setdefault(convert_data_dict_path_to_hdf5_path(path), path)
+
+    def resolve_links(self):
+        """Link to the first instance of each target, drop unresolved links."""
+        for path, target in self.links:
+            target_path = self.targets.get("/" + target.strip("/"))
+            if target_path is None:
+                logger.debug(f"Link {path} to {target} is not generated.")
+                continue
+            hdf5_path = convert_data_dict_path_to_hdf5_path(target_path)
+            self.template[path] = {"link": hdf5_path}
+            self.template[f"{target_path}/@target"] = hdf5_path
+
+
+def generate_synthetic_template(
+    nxdl: str,
+    seed: int = 0,
+    fraction: float = 1.0,
+    n_entries: int = 1,
+    n_instances: int = 1,
+    array_size: int = DEFAULT_ARRAY_SIZE,
+    symbol_sizes: dict[str, int] | None = None,
+) -> Template:
+    """
+    Fill a template with synthetic data for an application definition.
+
+    Args:
+        nxdl (str): The name of the application definition, e.g. "NXmpes".
+        seed (int, optional): The seed of the random values. Defaults to 0.
+        fraction (float, optional): The fraction of the optional and recommended
+            concepts which are filled; required concepts of filled groups are
+            always filled. Defaults to 1.0.
+        n_entries (int, optional): The number of entries. Defaults to 1.
+        n_instances (int, optional): The number of instances of each variadic
+            group and field, bounded by the maxOccurs of groups. Defaults to 1.
+        array_size (int, optional): The length of dimensions without a fixed
+            length, unless their symbol is given in symbol_sizes.
+            Defaults to DEFAULT_ARRAY_SIZE.
+        symbol_sizes (dict[str, int] | None, optional): The length of the
+            dimensions of each NXDL symbol, e.g. {"nE": 1000}. Defaults to None.
+
+    Returns:
+        Template: The data, with undocumented keys for the instances.
+    """
+    if not 0 <= fraction <= 1:
+        raise ValueError(f"The fraction must be between 0 and 1, got {fraction}.")
+    generator = _Generator(
+        seed, fraction, n_entries, n_instances, array_size, symbol_sizes or {}
+    )
+    generator.walk(generate_tree_from(nxdl), "", "")
+    generator.resolve_links()
+    for entry_name in generator.template.get_all_entry_names():
+        write_nexus_def_to_entry(generator.template, entry_name, nxdl)
+    return generator.template
+
+
+def write_synthetic_file(nxdl: str, output: str, **kwargs) -> Template:
+    """
+    Write synthetic data for an application definition to a NeXus file.
+
+    Args:
+        nxdl (str): The name of the application definition, e.g. "NXmpes".
+        output (str): The path of the NeXus file.
+        **kwargs: The options of `generate_synthetic_template`.
+
+    Returns:
+        Template: The written data.
+    """
+    from pynxtools.dataconverter.writer import Writer
+
+    template = generate_synthetic_template(nxdl, **kwargs)
+    add_default_root_attributes(template, os.path.basename(output))
+    _, nxdl_f_path = get_nxdl_root_and_path(nxdl)
+    Writer(data=template, nxdl_f_path=nxdl_f_path, output_path=output).write()
+    return template
@@ -23,6 +23,7 @@ import logging
 import re
 
 from pynxtools.dataconverter import helpers
+from pynxtools.dataconverter.streaming import deepcopy_keeping_sources
 
 logger = logging.getLogger("pynxtools")
 
@@ -33,10 +34,10 @@ class Template(dict):
     def __init__(self, template=None, overwrite_keys: bool = True, **kwargs):
         super().__init__(**kwargs)
         if isinstance(template, Template):
-            self.optional: dict = copy.deepcopy(template["optional"])
-            self.recommended: dict = copy.deepcopy(template["recommended"])
-            self.required: dict = copy.deepcopy(template["required"])
-            self.undocumented: dict = copy.deepcopy(template["undocumented"])
+            self.optional: dict = deepcopy_keeping_sources(template["optional"])
+            self.recommended: dict = deepcopy_keeping_sources(template["recommended"])
+            self.required: dict = deepcopy_keeping_sources(template["required"])
+            self.undocumented: dict = deepcopy_keeping_sources(template["undocumented"])
             self.optional_parents: list = copy.deepcopy(template["optional_parents"])
             self.lone_groups: dict = copy.deepcopy(template["lone_groups"])
         else:
@@ -47,7 +48,7 @@ class Template(dict):
             self.optional_parents: list = []  # type: ignore[no-redef]
             self.lone_groups: list = []  # type: ignore[no-redef, assignment]
             if isinstance(template, dict):
-                self.undocumented: dict = copy.deepcopy(template)  # type: ignore[no-redef]
+                self.undocumented: dict = deepcopy_keeping_sources(template)  # type: ignore[no-redef]
 
         self.overwrite_keys = overwrite_keys
 
@@ -17,17 +17,23 @@
 #
 """Verifies a nxs file"""
 
+import functools
 import logging
 import os
 import sys
 import xml.etree.ElementTree as ET
-from typing import Union
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any, Union, cast
 
 import click
-from h5py import File, is_hdf5
+import h5py
+from h5py import is_hdf5
 
 from pynxtools.dataconverter import helpers
 from pynxtools.dataconverter.validation import validate_hdf_group_against
+from pynxtools.nexus.handler import NexusFileHandler, NexusVisitor
+from pynxtools.nexus.storage import open_hdf5
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -45,7 +51,7 @@ def _get_def_map(file: str) -> dict[str, str]:
                         NXDL (NeXus Definition Language) application definitions.
     """
     def_map: dict[str, str] = {}
-    with File(file, "r") as h5file:
+    with open_hdf5(file, "r") as h5file:
         for entry_name, dataset in h5file.items():
             if (
                 helpers.decode_if_bytes(dataset.attrs.get("NX_class")) == "NXentry"
@@ -62,13 +68,150 @@ def _get_def_map(file: str) -> dict[str, str]:
     return def_map
 
 
-def validate(file: str, ignore_undocumented: bool = False):
+class _RecordHandler(logging.Handler):
+    """Keeps the records logged while an entry is validated in a worker."""
+
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord):
+        # the arguments of a message are not always picklable
+        record.msg, record.args = record.getMessage(), None
+        record.exc_info = None
+        self.records.append(record)
+
+
+def _logging_levels() -> dict[str, int]:
+    """The levels set on the root logger and the other loggers of this process."""
+    levels = {
+        name: logger.level
+        for name, logger in logging.Logger.manager.loggerDict.items()
+        if isinstance(logger, logging.Logger) and logger.level != logging.NOTSET
+    }
+    levels["root"] = logging.getLogger().level
+    return levels
+
+
+@contextmanager
+def _recorded_logs(levels: dict[str, int]) -> Iterator[list[logging.LogRecord]]:
+    """
+    Record the messages of all loggers at the given levels, instead of
+    handling them in this process, and restore the loggers afterwards.
+    """
+    root = logging.getLogger()
+    loggers = [root] + [
+        logger
+        for logger in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger)
+    ]
+    saved = [
+        (logger, logger.handlers, logger.propagate, logger.level) for logger in loggers
+    ]
+    handler = _RecordHandler()
+    for logger in loggers:
+        logger.handlers, logger.propagate = [], True
+    root.handlers = [handler]
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+    try:
+        yield handler.records
+    finally:
+        for logger, handlers, propagate, level in saved:
+            logger.handlers, logger.propagate = handlers, propagate
+            logger.setLevel(level)
+
+
+class _EntryValidationVisitor(NexusVisitor):
+    """
+    Validates each entry of a file as a whole when the traversal reaches it,
+    so that `NexusFileHandler.process_parallel` validates one entry per task.
+    The messages are recorded and logged by `validate` in the order of the
+    entries.
+    """
+
+    def __init__(
+        self,
+        file: str,
+        def_map: dict[str, str],
+        ignore_undocumented: bool,
+        levels: dict[str, int],
+    ):
+        self.file = file
+        self.def_map = def_map
+        self.ignore_undocumented = ignore_undocumented
+        self.levels = levels
+        self.results: dict[str, tuple[bool, list[logging.LogRecord]]] = {}
+
+    def prune(self, hdf_path: str, hdf_node: h5py.Group | h5py.Dataset) -> bool:
+        if not hdf_path:
+            return False
+        nxdl = self.def_map.get(hdf_path)
+        if nxdl is not None:
+            with _recorded_logs(self.levels) as records:
+                is_valid = validate_hdf_group_against(
+                    nxdl, hdf_node, self.file, self.ignore_undocumented
+                )
+            self.results[hdf_path] = (is_valid, records)
+        return True
+
+    def on_group(self, hdf_path: str, hdf_node: h5py.Group) -> None:
+        pass
+
+    def on_field(self, hdf_path: str, hdf_node: h5py.Dataset) -> None:
+        pass
+
+    def on_attribute(
+        self,
+        hdf_path: str,
+        attr_name: str,
+        attr_value: Any,
+        parent: h5py.Group | h5py.Dataset,
+    ) -> None:
+        pass
+
+    def on_complete(self, root: h5py.File) -> None:
+        pass
+
+    def merge(self, other: NexusVisitor) -> None:
+        if not isinstance(other, _EntryValidationVisitor):
+            raise TypeError(
+                f"Cannot merge {type(other).__name__} into _EntryValidationVisitor."
+            )
+        self.results.update(other.results)
+
+
+def _validate_serially(
+    file: str, def_map: dict[str, str], ignore_undocumented: bool
+) -> Iterator[tuple[bool, list[logging.LogRecord]]]:
+    """Validate the entries in this process, their messages are logged directly."""
+    with open_hdf5(file, "r") as h5file:
+        for entry, nxdl in def_map.items():
+            yield (
+                validate_hdf_group_against(
+                    nxdl, h5file[entry], file, ignore_undocumented
+                ),
+                [],
+            )
+
+
+def validate(file: str, ignore_undocumented: bool = False, workers: int = 1) -> bool:
     """
     Validate a NeXus HDF5 file against its declared application definitions.
 
+    With several workers, the entries are validated in a pool of worker
+    processes by `NexusFileHandler.process_parallel`, one entry per task.
+    The messages of each entry are then logged in the order of the entries,
+    as if they were validated one after another.
+
     Args:
         file (str): Path to the NeXus HDF5 file.
         ignore_undocumented (bool): If True, ignore undocumented concepts during validation.
+        workers (int): The number of worker processes, at most one per entry.
+            Defaults to 1, i.e., the entries are validated in this process.
+
+    Returns:
+        bool: True if all entries are valid.
 
     Raises:
         click.FileError: If the file does not exist, is not a file, or is not a valid HDF5 file.
@@ -87,22 +230,40 @@ def validate(file: str, ignore_undocumented: bool = False):
     if not def_map:
         logger.warning(f"Could not find any valid entry in file {file}")
 
-    with File(file, "r") as h5file:
-        for entry, nxdl in def_map.items():
-            is_valid = validate_hdf_group_against(
-                nxdl,
-                h5file[entry],
-                file,
-                ignore_undocumented,
-            )
+    results: Iterable[tuple[bool, list[logging.LogRecord]]]
+    workers = min(workers, len(def_map))
+    if workers > 1:
+        visitor = cast(
+            _EntryValidationVisitor,
+            NexusFileHandler(file).process_parallel(
+                functools.partial(
+                    _EntryValidationVisitor,
+                    file,
+                    def_map,
+                    ignore_undocumented,
+                    _logging_levels(),
+                ),
+                max_workers=workers,
+            ),
+        )
+        results = [visitor.results[entry] for entry in def_map]
+    else:
+        results = _validate_serially(file, def_map, ignore_undocumented)
 
-            if is_valid:
-                logger.info(
-                    f"The entry `{entry}` in file `{file}` is valid"
-                    f" according to the `{nxdl}` application definition.",
-                )
-            else:
-                logger.warning(
-                    f"Invalid: The entry `{entry}` in file `{file}` is NOT valid"
-                    f" according to the `{nxdl}` application definition.",
-                )
+    # a file without entries to validate is not valid
+    all_valid = bool(def_map)
+    for (entry, nxdl), (is_valid, records) in zip(def_map.items(), results):
+        for record in records:
+            logging.getLogger(record.name).handle(record)
+        if is_valid:
+            logger.info(
+                f"The entry `{entry}` in file `{file}` is valid"
+                f" according to the `{nxdl}` application definition.",
+            )
+        else:
+            all_valid = False
+            logger.warning(
+                f"Invalid: The entry `{entry}` in file `{file}` is NOT valid"
+                f" according to the `{nxdl}` application definition.",
+            )
+    return all_valid
@@ -33,6 +33,7 @@ import h5py
 import lxml.etree as ET
 import numpy as np
 
+from pynxtools.dataconverter import profiling
 from pynxtools.dataconverter.helpers import (
     Collector,
     ValidationProblem,
@@ -50,7 +51,14 @@ from pynxtools.dataconverter.helpers import (
     path_in_data_dict,
     split_class_and_name_of,
 )
+from pynxtools.dataconverter.sources import as_array_source, is_array_source
+from pynxtools.dataconverter.streaming import (
+    deepcopy_keeping_sources,
+    is_append_payload,
+    is_stream_payload,
+)
 from pynxtools.definitions.dev_tools.utils.nxdl_utils import get_nx_namefit
+from pynxtools.nexus.descriptors import FieldDescriptor
 from pynxtools.nexus.handler import NexusFileHandler, NexusVisitor
 from pynxtools.nexus.nexus_tree import (
     NexusField,
@@ -61,7 +69,8 @@ from pynxtools.nexus.nexus_tree import (
 )
 from pynxtools.nexus.nxdata import inspect_nxdata
 from pynxtools.nexus.schema_resolver import NexusSchemaResolver, resolve_path
-from pynxtools.units import NXUnitSet, ureg
+from pynxtools.nexus.storage import open_hdf5, register_filters_of
+from pynxtools.units import NXUnitSet
 
 logger = logging.getLogger(__file__)
 
@@ -195,6 +204,8 @@ class ValidationVisitor(NexusVisitor):
     * ``on_broken_link`` - emits a ``BrokenLink`` problem for soft or external
       links whose target cannot be resolved.  The link type (``h5py.SoftLink``
       vs ``h5py.ExternalLink``) is available via the *link* argument.
+    * ``prune`` - skips every subtree outside the target entry, so other
+      entries of the same file are not read.
 
     Usage::
 
@@ -211,6 +222,7 @@ class ValidationVisitor(NexusVisitor):
         appdef: str,
         entry_name: str,
         ignore_undocumented: bool = False,
+        resolver: NexusSchemaResolver | None = None,
     ) -> None:
         """
         Args:
@@ -219,10 +231,13 @@ class ValidationVisitor(NexusVisitor):
                 (e.g. ``"/entry"``).
             ignore_undocumented: When ``True`` undocumented fields and groups
                 are silently skipped; only required concepts are checked.
+            resolver: Optional schema resolver shared with other visitors
+                (see :class:`~pynxtools.nexus.handler.CompositeVisitor`).
+                A private resolver is created if omitted.
         """
         collector.clear()
 
-        self._resolver = NexusSchemaResolver()
+        self._resolver = resolver if resolver is not None else NexusSchemaResolver()
         appdef_node = self._resolver.tree_for(appdef)
         self._tree: NexusNode = appdef_node.search_add_child_for("ENTRY")
         self._appdef_node: NexusNode = appdef_node
@@ -284,6 +299,13 @@ class ValidationVisitor(NexusVisitor):
         self._report_missing()
         self._check_symbol_consistency()
 
+    def prune(self, hdf_path: str, hdf_node: h5py.Group | h5py.Dataset) -> bool:
+        """Skip every subtree that neither contains nor lies within the entry."""
+        if self._entry_relative(hdf_path) is not None:
+            return False
+        entry_stripped = self._entry_name.lstrip("/")
+        return not (hdf_path == "" or entry_stripped.startswith(hdf_path + "/"))
+
     def on_broken_link(self, hdf_path: str, link) -> None:
         """Log a broken soft or external link as a validation problem."""
         rel = self._entry_relative(hdf_path)
@@ -719,7 +741,7 @@ class ValidationVisitor(NexusVisitor):
     def _handle_field(
         self,
         path: str,
-        dataset: h5py.Dataset,
+        dataset: h5py.Dataset | FieldDescriptor,
         hint: Literal["axis", "signal"] | None = None,
     ) -> None:
         """
@@ -727,7 +749,8 @@ class ValidationVisitor(NexusVisitor):
 
         Args:
             path (str): Path to the dataset.
-            dataset (h5py.Dataset): Dataset object.
+            dataset (h5py.Dataset | FieldDescriptor): Dataset object, or its
+                descriptor in metadata-only traversal.
             hint (str):
                 If the field is in an NXdata group, this is used to figure out
                 if it is an AXISNAME or a DATA.
@@ -767,19 +790,23 @@ class ValidationVisitor(NexusVisitor):
             # NXcollection found in parents, stop checking
             return
 
+        # In metadata-only traversal, large values are checked by dtype only
+        check_values = not isinstance(dataset, FieldDescriptor) or dataset.loadable
         is_valid_data_field_hdf(
             dataset,
             node.dtype,
             full_path,
+            check_values=check_values,
         )
 
-        is_valid_enum_hdf(
-            dataset,
-            node.items,
-            node.open_enum,
-            full_path,
-            self._data,
-        )
+        if check_values:
+            is_valid_enum_hdf(
+                dataset,
+                node.items,
+                node.open_enum,
+                full_path,
+                self._data,
+            )
 
         units = dataset.attrs.get("units")
         units_path = f"{full_path}/@units"
@@ -952,8 +979,12 @@ def validate_hdf_group_against(
     return not collector.has_validation_problems()
 
 
+@profiling.profiled("validate")
 def validate_dict_against(
-    appdef: str, mapping: MutableMapping[str, Any], ignore_undocumented: bool = False
+    appdef: str,
+    mapping: MutableMapping[str, Any],
+    ignore_undocumented: bool = False,
+    tree: NexusNode | None = None,
 ) -> bool:
     """
     Validates a mapping against the NeXus tree for application definition `appdef`.
@@ -968,6 +999,9 @@ def validate_dict_against(
             Ignore all undocumented keys in the verification
             and just check if the required fields are properly set.
             Defaults to False.
+        tree (NexusNode | None, optional):
+            The NeXus tree of `appdef`, e.g. to reuse it across validations.
+            If None, it is generated from the NXDL. Defaults to None.
 
     Returns:
         bool: True if the mapping is valid according to `appdef`, False otherwise.
@@ -1280,7 +1314,7 @@ def validate_dict_against(
         if not isinstance(keys, dict):
             return keys
 
-        resolved_keys = copy.deepcopy(keys)
+        resolved_keys = deepcopy_keeping_sources(keys)
         for key, value in keys.copy().items():
             if isinstance(value, dict) and "link" in value:
                 link_value = value["link"]
@@ -1317,12 +1351,13 @@ def validate_dict_against(
                         )
                     else:
                         link_key = link_path  # activate flag
-                        with h5py.File(file_path, "r") as hdf_file:
+                        with open_hdf5(file_path, "r") as hdf_file:
                             ext_node = hdf_file.visititems(get_node)
 
                             if ext_node is not None and isinstance(
                                 ext_node, h5py.Dataset
                             ):
+                                register_filters_of(ext_node)
                                 dataset = decode_if_bytes(ext_node[()])
 
                                 # Resolve external field links to the dataset value so field
@@ -1409,6 +1444,8 @@ def validate_dict_against(
                 isinstance(variant_value, Mapping)
                 and not all(k.startswith("@") for k in variant_value)
                 and "compress" not in list(variant_value.keys())
+                and not is_stream_payload(variant_value)
+                and not is_append_payload(variant_value)
             ):
                 # A field should not have a dict of keys that are _not_ all attributes,
                 # i.e. there should be no sub-fields or sub-groups.
@@ -1552,17 +1589,29 @@ def validate_dict_against(
 
             # Record dimension sizes for NXDL symbol consistency checks.
             value = keys.get(variant)
+            if isinstance(value, np.ndarray):
+                shape = value.shape
+            elif is_array_source(value):
+                shape = as_array_source(value).shape
+            elif is_stream_payload(value) and "shape" in value:
+                # streams are validated against their declared shape
+                shape = tuple(value["shape"])
+            elif is_append_payload(value) and np.ndim(value["append"]) > 0:
+                # the extent along the appended axis is only known in the file
+                shape = list(np.shape(value["append"]))
+                shape[int(value.get("axis", 0)) % len(shape)] = None
+                shape = tuple(shape)
+            else:
+                shape = None
             if (
                 node.dim_symbols is not None
-                and isinstance(value, np.ndarray)
-                and value.ndim == len(node.dim_symbols)
+                and shape is not None
+                and len(shape) == len(node.dim_symbols)
             ):
                 sym_map = dict_symbol_registry.setdefault(prev_path, {})
                 for dim_idx, sym in enumerate(node.dim_symbols):
-                    if sym is not None:
-                        sym_map.setdefault(sym, []).append(
-                            (variant, value.shape[dim_idx])
-                        )
+                    if sym is not None and shape[dim_idx] is not None:
+                        sym_map.setdefault(sym, []).append((variant, shape[dim_idx]))
 
     def handle_attribute(node: NexusNode, keys: Mapping[str, Any], prev_path: str):
         full_path = f"{prev_path}/@{node.name}"
@@ -2044,9 +2093,13 @@ def validate_dict_against(
     # with NXDL symbolic dimensions are processed.  Checked after recurse_tree.
     dict_symbol_registry: dict[str, dict[str, list[tuple[str, int]]]] = {}
 
-    tree = generate_tree_from(appdef)
+    profiling.phase("NeXus tree")
+    if tree is None:
+        tree = generate_tree_from(appdef)
     collector.clear()
+    profiling.phase("instance names")
     find_instance_name_conflicts(mapping)
+    profiling.phase("required concepts")
     nested_keys = build_nested_dict_from(mapping)
     not_visited = list(mapping)
     keys = _follow_link(nested_keys, "")
@@ -2063,6 +2116,7 @@ def validate_dict_against(
                     field_to_size,
                 )
 
+    profiling.phase("undocumented keys")
     for not_visited_key in not_visited:
         if mapping.get(not_visited_key) is None:
             # This value is not really set. Skip checking its validity.
@@ -0,0 +1,235 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Virtual datasets which select, concatenate or stack datasets of other files.
+
+Building a virtual dataset only needs the shape and dtype of its sources.
+`VirtualDatasetBuilder` reads them once per (file, path) and keeps a bounded
+number of source files open, so that virtual datasets over thousands of
+sources (e.g. one file per detector frame) open every source file once.
+"""
+
+import logging
+import os
+import re
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import h5py
+import numpy as np
+
+from pynxtools.nexus.storage import open_hdf5
+
+logger = logging.getLogger("pynxtools")  # pylint: disable=C0103
+
+_SLICE_PATTERN = re.compile(r"^(-?\d*):(-?\d*)(?::(-?\d*))?$")
+
+
+@dataclass(frozen=True)
+class SourceMetadata:
+    """The layout of a source dataset of a virtual dataset.
+
+    Args:
+        shape (tuple[int, ...]): The shape of the source dataset.
+        dtype (np.dtype): The dtype of the source dataset.
+        chunks (tuple[int, ...] | None): The chunk shape, None if not chunked.
+    """
+
+    shape: tuple[int, ...]
+    dtype: np.dtype
+    chunks: tuple[int, ...] | None = None
+
+
+def parse_selection(selection: Any) -> tuple:
+    """
+    Convert a selection to an index tuple, e.g. "0:100, 1, ::2" to
+    (slice(0, 100), 1, slice(None, None, 2)).
+
+    Args:
+        selection: A string with comma-separated indices, slices and "...",
+            or an index (tuple) like np.index_exp[0:100, 1].
+
+    Raises:
+        ValueError: If a string selection cannot be parsed.
+    """
+    if not isinstance(selection, str):
+        return selection if isinstance(selection, tuple) else (selection,)
+    index: list[Any] = []
+    for item in (item.strip() for item in selection.split(",")):
+        if item == "...":
+            index.append(Ellipsis)
+        elif re.fullmatch(r"-?\d+", item):
+            index.append(int(item))
+        elif match := _SLICE_PATTERN.match(item):
+            index.append(
+                slice(*(int(bound) if bound else None for bound in match.groups()))
+            )
+        else:
+            raise ValueError(f"Invalid selection {item!r} in {selection!r}.")
+    return tuple(index)
+
+
+class VirtualDatasetBuilder:
+    """Builds virtual layouts and caches the metadata of their sources.
+
+    Args:
+        output_file (h5py.File | None): The file being written. Sources in this
+            file are read through it instead of being opened again.
+        max_open_files (int): The number of source files which are kept open
+            for further lookups. Defaults to 64.
+    """
+
+    def __init__(self, output_file: h5py.File | None = None, max_open_files: int = 64):
+        self.output_file = output_file
+        self.max_open_files = max_open_files
+        self._metadata: dict[tuple[str, str], SourceMetadata] = {}
+        self._open_files: OrderedDict[str, h5py.File] = OrderedDict()
+        self.files_opened = 0
+
+    def _file(self, file: str) -> h5py.File:
+        """The source file, opened at most once while it stays in the pool."""
+        if self.output_file is not None and (
+            file == self.output_file.filename
+            or os.path.realpath(file) == os.path.realpath(self.output_file.filename)
+        ):
+            return self.output_file
+        if file in self._open_files:
+            self._open_files.move_to_end(file)
+            return self._open_files[file]
+        h5file = open_hdf5(file, "r")
+        self.files_opened += 1
+        self._open_files[file] = h5file
+        if len(self._open_files) > self.max_open_files:
+            _, evicted = self._open_files.popitem(last=False)
+            evicted.close()
+        return h5file
+
+    def metadata(self, file: str, path: str) -> SourceMetadata:
+        """
+        The shape, dtype and chunk shape of the dataset at path in file.
+
+        Raises:
+            KeyError: If there is no dataset at path.
+        """
+        key = (file, path)
+        if key not in self._metadata:
+            dataset = self._file(file)[path]
+            if not isinstance(dataset, h5py.Dataset):
+                raise KeyError(f"{file}:{path} is not a dataset.")
+            self._metadata[key] = SourceMetadata(
+                dataset.shape, dataset.dtype, dataset.chunks
+            )
+        return self._metadata[key]
+
+    def source(self, file: str, path: str, selection: Any = None) -> h5py.VirtualSource:
+        """A virtual source for the dataset at path in file, optionally sliced."""
+        metadata = self.metadata(file, path)
+        vsource = h5py.VirtualSource(
+            file, path, shape=metadata.shape, dtype=metadata.dtype
+        )
+        if selection is not None:
+            vsource = vsource[parse_selection(selection)]
+        return vsource
+
+    def sliced_layout(self, file: str, path: str, selection: Any) -> h5py.VirtualLayout:
+        """A layout which exposes a hyperslab of one source dataset."""
+        vsource = self.source(file, path, selection)
+        layout = h5py.VirtualLayout(
+            shape=vsource.shape or (1,), dtype=self.metadata(file, path).dtype
+        )
+        layout[...] = vsource
+        return layout
+
+    def stacked_layout(
+        self,
+        sources: Sequence[tuple[str, str]],
+        axis: int = 0,
+        stack: bool = False,
+        selection: Any = None,
+    ) -> h5py.VirtualLayout:
+        """
+        A layout which concatenates or stacks several source datasets.
+
+        Args:
+            sources (Sequence[tuple[str, str]]): The (file, path) of all sources.
+            axis (int, optional): The axis along which the sources are
+                concatenated or, with `stack`, inserted. Defaults to 0.
+            stack (bool, optional): Whether the sources are stacked along a new
+                axis instead of concatenated along an existing one.
+                Defaults to False.
+            selection (optional): A selection applied to every source before
+                combining them. Defaults to None.
+
+        Raises:
+            ValueError: If the sources cannot be combined along axis.
+
+        Returns:
+            h5py.VirtualLayout: The layout with the native dtype of the sources.
+        """
+        vsources = [self.source(file, path, selection) for file, path in sources]
+        if not vsources:
+            raise ValueError("A virtual dataset needs at least one source.")
+        dtype = np.result_type(
+            *(self.metadata(file, path).dtype for file, path in sources)
+        )
+        shape = vsources[0].shape
+        ndim = len(shape) + 1 if stack else len(shape)
+        if not -ndim <= axis < ndim:
+            raise ValueError(f"Axis {axis} is out of bounds for sources of {shape}.")
+        axis %= ndim
+
+        def other_extents(vsource_shape: tuple[int, ...]) -> tuple[int, ...]:
+            if stack:
+                return vsource_shape
+            return vsource_shape[:axis] + vsource_shape[axis + 1 :]
+
+        for (file, path), vsource in zip(sources, vsources):
+            if len(vsource.shape) != len(shape) or other_extents(
+                vsource.shape
+            ) != other_extents(shape):
+                raise ValueError(
+                    f"{file}:{path} of shape {vsource.shape} cannot be "
+                    f"{'stacked' if stack else 'concatenated'} with shape {shape} "
+                    f"along axis {axis}."
+                )
+
+        if stack:
+            layout_shape = shape[:axis] + (len(vsources),) + shape[axis:]
+        else:
+            total = sum(vsource.shape[axis] for vsource in vsources)
+            layout_shape = shape[:axis] + (total,) + shape[axis + 1 :]
+        layout = h5py.VirtualLayout(shape=layout_shape, dtype=dtype)
+
+        offset = 0
+        for vsource in vsources:
+            index: list[Any] = [slice(None)] * len(layout_shape)
+            if stack:
+                index[axis] = offset
+                offset += 1
+            else:
+                index[axis] = slice(offset, offset + vsource.shape[axis])
+                offset += vsource.shape[axis]
+            layout[tuple(index)] = vsource
+        return layout
+
+    def close(self):
+        """Close all source files opened by the builder."""
+        while self._open_files:
+            _, h5file = self._open_files.popitem()
+            h5file.close()
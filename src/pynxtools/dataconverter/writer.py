@@ -22,31 +22,72 @@
 import copy
 import importlib.util
 import logging
+import math
 import os
 import sys
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
 
-import blosc2
 import h5py
-import hdf5plugin
 import lxml.etree as ET
 import numpy as np
 
-from pynxtools.dataconverter import helpers
+from pynxtools.dataconverter import helpers, profiling
 from pynxtools.dataconverter.chunk import (
+    AUTO_COMPRESSION_FILTER,
     BLOSC_NTHREADS,
-    CHUNK_CONFIG_DEFAULT,
     COMPRESSION_FILTERS,
     DEFAULT_COMPRESSION_FILTER,
     DEFAULT_COMPRESSION_STRENGTH,
+    INTERPRETATION_DIMS,
     PERFORMANT_COMPRESSION_FILTER,
+    access_pattern_priority,
     chunking_strategy,
+    import_blosc2,
+    import_hdf5plugin,
+    load_access_patterns,
+    prioritized_axes_heuristic,
+)
+from pynxtools.dataconverter.codec_selection import (
+    CompressionPolicy,
+    write_auto_compressed_dataset,
+)
+from pynxtools.dataconverter.compact import CompactPolicy, write_compact_dataset
+from pynxtools.dataconverter.compression import (
+    PIPELINE_COMPRESSION_FILTERS,
+    SHUFFLE_MODES,
+    FilterPipeline,
+    write_compressed_dataset,
 )
 from pynxtools.dataconverter.exceptions import InvalidDictProvided
+from pynxtools.dataconverter.sources import (
+    as_array_source,
+    copy_source,
+    is_array_source,
+)
+from pynxtools.dataconverter.storage import (
+    IN_MEMORY_THRESHOLD,
+    open_in_memory,
+    write_file_image,
+)
+from pynxtools.dataconverter.streaming import (
+    StreamSpec,
+    is_append_payload,
+    is_stream_payload,
+    write_appendable,
+    write_stream,
+)
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.virtual import VirtualDatasetBuilder
 from pynxtools.definitions.dev_tools.utils.nxdl_utils import (
     NxdlAttributeNotFoundError,
     get_node_at_nxdl_path,
     get_nxdl_element_type,
 )
+from pynxtools.nexus.nexus_tree import NexusNode, generate_tree_from
+from pynxtools.nexus.storage import StorageProfile, get_storage_profile
 
 logger = logging.getLogger("pynxtools")  # pylint: disable=C0103
 
@@ -67,11 +108,208 @@ def is_not_data_empty(value) -> bool:
     return False
 
 
+def estimate_nbytes(value: Any) -> float:
+    """
+    The number of bytes of the values which the writer stores for value.
+
+    Links and virtual datasets store no values, streams of unknown extent
+    are estimated as infinitely large.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, dict):
+        if is_stream_payload(value):
+            try:
+                spec = StreamSpec.from_payload(value)
+            except ValueError:
+                return 0
+            if spec.extent is None:
+                return math.inf
+            return math.prod(spec.shape) * spec.dtype.itemsize
+        for key in ("compress", "append"):
+            if key in value:
+                return estimate_nbytes(value[key])
+        return 0
+    if is_array_source(value):
+        source = as_array_source(value)
+        return math.prod(source.shape) * source.dtype.itemsize
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    try:
+        return np.asarray(value).nbytes
+    except (TypeError, ValueError):
+        return 0
+
+
 def get_namespace(element) -> str:
     """Extracts the namespace for elements in the NXDL"""
     return element.tag[element.tag.index("{") : element.tag.rindex("}") + 1]
 
 
+@dataclass(frozen=True)
+class ConceptPlan:
+    """How the writer creates the HDF5 node for one NXDL concept path.
+
+    Args:
+        concept_type (str | None): The NXDL element type of the concept
+            (e.g. "group", "field"), or None if the path does not resolve to
+            an NXDL concept (e.g. a user-defined, undocumented path).
+        nx_class (str | None): The NX_class to write for a group concept.
+    """
+
+    concept_type: str | None = None
+    nx_class: str | None = None
+
+
+UNDOCUMENTED_CONCEPT = ConceptPlan()
+
+
+@dataclass
+class NodeWrite:
+    """Everything that the writer stores at one HDF5 object of the data.
+
+    Args:
+        path (str): The data converter path of the object.
+        value (Any): The value of the field, link or payload at path, None
+            for objects of which the data only hold attributes, e.g. groups.
+        units (Any): The value of the @units of a field.
+        attributes (list[tuple[str, str, Any]]): The key, name and value of
+            every other non-empty attribute of the object.
+    """
+
+    path: str
+    value: Any = None
+    units: Any = None
+    attributes: list[tuple[str, str, Any]] = field(default_factory=list)
+
+    @property
+    def is_link(self) -> bool:
+        """Whether the value is written in the final pass, i.e. it is a link,
+        a virtual dataset or another dictionary that is no payload."""
+        return isinstance(self.value, dict) and not (
+            "compress" in self.value
+            or is_stream_payload(self.value)
+            or is_append_payload(self.value)
+        )
+
+
+@dataclass
+class CreatedNode:
+    """The members and attributes which the writer created in a new object.
+
+    For objects created during a write, the writer answers whether a member
+    or attribute exists from this record instead of asking HDF5.
+    """
+
+    members: set[str] = field(default_factory=set)
+    attributes: set[str] = field(default_factory=set)
+
+
+def plan_node_writes(data) -> dict[str, NodeWrite]:
+    """
+    Group the non-empty entries of the data by the HDF5 object they belong to.
+
+    Every key is parsed once: fields, links and payloads become the value
+    of their object, @units and the other attributes are attached to the
+    object at their parent path.
+
+    Args:
+        data (dict): The data converter dictionary, e.g. a Template.
+
+    Returns:
+        dict[str, NodeWrite]: The objects by data converter path, in the order
+            in which their first key appears in the data.
+    """
+    plan: dict[str, NodeWrite] = {}
+    for key, value in data.items():
+        if not is_not_data_empty(value):
+            continue
+        separator = key.rindex("/")
+        last = key[separator + 1 :]
+        if last[0] != "@":
+            if (node := plan.get(key)) is None:
+                node = plan[key] = NodeWrite(key)
+            node.value = value
+            continue
+        path = key[:separator] or "/"
+        if (node := plan.get(path)) is None:
+            node = plan[path] = NodeWrite(path)
+        if last == "@units":
+            node.units = value
+        else:
+            name = helpers.get_name_from_data_dict_entry(last)[1:]
+            node.attributes.append((key, name, value))
+    return plan
+
+
+def order_links(links: list[NodeWrite], output_path: str) -> list[NodeWrite]:
+    """
+    Order links such that every link follows the links it points to.
+
+    Links into the output file, including the sources of virtual datasets in
+    it, depend on the link at their target or at an ancestor of it. Links
+    without such dependencies keep their order. Links in a cycle are logged
+    and left in the position where the cycle is found.
+
+    Args:
+        links (list[NodeWrite]): The objects whose value is a link.
+        output_path (str): The path of the output file, which is the file of
+            links without a file name.
+
+    Returns:
+        list[NodeWrite]: The links in a topological order.
+    """
+    by_hdf5_path = {
+        helpers.convert_data_dict_path_to_hdf5_path(link.path): link for link in links
+    }
+
+    def dependencies(link: NodeWrite) -> list[NodeWrite]:
+        if "link" not in link.value:
+            return []
+        files, targets = split_link(link.value, output_path)
+        if not isinstance(targets, list):
+            files, targets = [files], [targets]
+        found = []
+        for file, target in zip(files, targets):
+            if file != output_path:
+                continue
+            target = "/" + target.strip("/")
+            while target:
+                if (dependency := by_hdf5_path.get(target)) is not None:
+                    found.append(dependency)
+                    break
+                target = target[: target.rindex("/")]
+        return found
+
+    ordered: list[NodeWrite] = []
+    # path -> False while its dependencies are visited, True once it is ordered
+    visited: dict[str, bool] = {}
+    for root in links:
+        stack = [(root, iter(dependencies(root)))]
+        visited.setdefault(root.path, False)
+        while stack:
+            link, pending = stack[-1]
+            if visited[link.path]:
+                stack.pop()
+                continue
+            for dependency in pending:
+                state = visited.get(dependency.path)
+                if state is None:
+                    visited[dependency.path] = False
+                    stack.append((dependency, iter(dependencies(dependency))))
+                    break
+                if state is False:
+                    logger.warning(
+                        f"The links {link.path} and {dependency.path} "
+                        "are part of a cycle of links."
+                    )
+            else:
+                visited[link.path] = True
+                ordered.append(link)
+                stack.pop()
+    return ordered
+
+
 def split_link(data, output_path):
     """Handle the special syntax used in the reader for the dataset links.
 
@@ -99,31 +337,30 @@ def split_link(data, output_path):
     return file, path
 
 
-def handle_shape_entries(data, file, path):
+def handle_shape_entries(data, file, path, builder=None):
     """slice generation via the key shape"""
-    new_shape = []
-    for dim, val in enumerate(data["shape"]):
-        if isinstance(val, slice):
-            start = val.start if val.start is not None else 0
-            stop = (
-                val.stop
-                if val.stop is not None
-                else h5py.File(file, "r")[path].shape[dim]
-            )
-            step = val.step if val.step is not None else 1
-            new_shape.append(int((stop - start) / step))
-    if not new_shape:
-        new_shape = [1]
-    layout = h5py.VirtualLayout(shape=tuple(new_shape), dtype=np.float64)
-    vsource = h5py.VirtualSource(file, path, shape=h5py.File(file, "r")[path].shape)[
-        data["shape"]
-    ]
-    layout[:] = vsource
-    return layout
+    if builder is None:
+        builder = VirtualDatasetBuilder()
+        try:
+            return builder.sliced_layout(file, path, data["shape"])
+        finally:
+            builder.close()
+    return builder.sliced_layout(file, path, data["shape"])
 
 
 # pylint: disable=too-many-locals, inconsistent-return-statements
-def handle_dicts_entries(data, grp, entry_name, output_path, path, append):
+def handle_dicts_entries(
+    data,
+    grp,
+    entry_name,
+    output_path,
+    path,
+    append,
+    compression_workers=0,
+    virtual_builder=None,
+    auto_chunks=True,
+    compression_policy=None,
+):
     """Handle function for dictionaries found as value of the nexus file.
 
     Several cases can be encountered:
@@ -131,31 +368,51 @@ def handle_dicts_entries(data, grp, entry_name, output_path, path, append):
     - Concatenate dataset in one virtual dataset
     - Internal links
     - External links
-    - compression label"""
+    - compression label
+    - streaming payloads (see streaming.py)
+    - appendable payloads, i.e., values appended to a resizable dataset
+
+    With compression_workers > 0, compressed datasets are encoded in that many
+    threads and written with direct chunk writes (see compression.py).
+    Virtual datasets look up their sources via virtual_builder, which caches
+    their metadata across calls (see virtual.py). Compressed datasets without
+    explicit chunks use auto_chunks, the chunk shape from the access pattern of
+    the dataset or True for h5py auto-chunking (see Writer._auto_chunks).
+    With "filter": "auto", the codec is selected under compression_policy by
+    compressing a sample of chunks (see codec_selection.py)."""
     if "link" in data:
         file, path = split_link(data, output_path)
-    # generate virtual datasets from slices
-    if "shape" in data.keys():
-        layout = handle_shape_entries(data, file, path)
-        grp.create_virtual_dataset(entry_name, layout)
-    # multiple datasets to concatenate
+    # datasets written slab by slab from an iterator
+    if is_stream_payload(data):
+        if entry_name not in grp:
+            write_stream(grp, entry_name, data)
+        elif append:
+            logger.info(f"Prevented the overwriting of dataset {path}")
+    # datasets extended along an axis in append mode
+    elif is_append_payload(data):
+        try:
+            write_appendable(grp, entry_name, data)
+        except ValueError as exc:
+            logger.warning(f"Unable to append to dataset {path}: {exc}")
+            return None
+    # multiple datasets to concatenate or stack, optionally sliced
     elif "link" in data.keys() and isinstance(data["link"], list):
-        total_length = 0
-        sources = []
-        for index, source_file in enumerate(file):
-            vsource = h5py.VirtualSource(
-                source_file,
-                path[index],
-                shape=h5py.File(source_file, "r")[path[index]].shape,
+        builder = virtual_builder or VirtualDatasetBuilder(grp.file)
+        try:
+            layout = builder.stacked_layout(
+                list(zip(file, path)),
+                axis=data.get("axis", 0),
+                stack=data.get("stack", False),
+                selection=data.get("shape"),
             )
-            total_length += vsource.shape[0]
-            sources.append(vsource)
-        layout = h5py.VirtualLayout(shape=total_length, dtype=np.float64)
-        offset = 0
-        for vsource in sources:
-            layout[offset : offset + vsource.shape[0]] = vsource
-            offset += vsource.shape[0]
+        finally:
+            if virtual_builder is None:
+                builder.close()
         grp.create_virtual_dataset(entry_name, layout, fillvalue=0)
+    # generate virtual datasets from slices
+    elif "shape" in data.keys():
+        layout = handle_shape_entries(data, file, path, virtual_builder)
+        grp.create_virtual_dataset(entry_name, layout)
     # internal and external links
     elif "link" in data.keys():
         if ":" not in data["link"]:
@@ -172,6 +429,11 @@ def handle_dicts_entries(data, grp, entry_name, output_path, path, append):
                 and data["filter"] == PERFORMANT_COMPRESSION_FILTER
             ):
                 compression_filter = PERFORMANT_COMPRESSION_FILTER
+            elif data.get("filter") in (
+                *PIPELINE_COMPRESSION_FILTERS,
+                AUTO_COMPRESSION_FILTER,
+            ):
+                compression_filter = data["filter"]
             else:  # fall-back to default
                 compression_filter = DEFAULT_COMPRESSION_FILTER
 
@@ -184,23 +446,41 @@ def handle_dicts_entries(data, grp, entry_name, output_path, path, append):
             else:
                 compression_strength = DEFAULT_COMPRESSION_STRENGTH
 
+            shuffle = (
+                data.get("shuffle") if data.get("shuffle") in SHUFFLE_MODES else None
+            )
+
             if entry_name not in grp:
                 try:
-                    if compression_filter == "gzip":
-                        compression_config = dict(
-                            compression=compression_filter,
-                            compression_opts=compression_strength,
+                    if compression_filter == AUTO_COMPRESSION_FILTER:
+                        write_auto_compressed_dataset(
+                            grp,
+                            entry_name,
+                            data["compress"],
+                            chunks=chunking_strategy(data, auto_chunks),
+                            policy=compression_policy,
+                            max_workers=compression_workers,
+                        )
+                    elif compression_filter == PERFORMANT_COMPRESSION_FILTER:
+                        grp.create_dataset(
+                            entry_name,
+                            data=data["compress"],
+                            chunks=chunking_strategy(data, auto_chunks),
+                            **import_hdf5plugin().Blosc2(
+                                cname="zstd", clevel=compression_strength
+                            ),
                         )
-                    else:  # by virtue of construction blosc
-                        compression_config = hdf5plugin.Blosc2(
-                            cname="zstd", clevel=DEFAULT_COMPRESSION_STRENGTH
+                    else:
+                        write_compressed_dataset(
+                            grp,
+                            entry_name,
+                            data["compress"],
+                            FilterPipeline(
+                                compression_filter, compression_strength, shuffle
+                            ),
+                            chunks=chunking_strategy(data, auto_chunks),
+                            max_workers=compression_workers,
                         )
-                    grp.create_dataset(
-                        entry_name,
-                        data=data["compress"],
-                        chunks=chunking_strategy(data),
-                        **compression_config,
-                    )
                 except ValueError:
                     logger.warning(f"ValueError caught upon creating_dataset {path}")
             else:
@@ -239,45 +519,152 @@ class Writer:
     """The writer class for writing a NeXus file in accordance with a given NXDL.
 
     Args:
-        data (dict): Dictionary containing the data to convert.
+        data (Template): Template containing the data to convert.
         nxdl_f_path (str): Path to the nxdl file to use during conversion.
         output_path (str): Path to the output NeXus file.
+        append (bool): Whether to add to an existing output file.
+        compression_workers (int): Number of threads that compress chunked
+            datasets in parallel. Defaults to 0, i.e., compression by HDF5.
+        storage_profile (str | StorageProfile | None): The storage profile of
+            the output file, see `pynxtools.nexus.storage.get_storage_profile`. Defaults to
+            None, i.e., the profile detected for the output path.
+        access_patterns (str | dict | None): A hint file, or its content, that
+            names the dimensions which users read at once for datasets of the
+            NXDL, see `chunk.load_access_patterns`. Defaults to None.
+        compression_policy (str | CompressionPolicy | None): How the codec of
+            compressed payloads with "filter": "auto" is selected, e.g.
+            "ratio:100" or "speed:2", see `codec_selection.CompressionPolicy`.
+            Defaults to None, i.e., the best ratio at 100 MB/s or more.
+        in_memory (bool): Whether to build a new output file in memory with the
+            HDF5 core driver and store it with one sequential write, which
+            avoids many small metadata writes for files with many small
+            objects. Defaults to False.
+        in_memory_threshold (int): Files whose values are estimated to take
+            more bytes are written directly to the output path, also with
+            in_memory. Defaults to 512 MiB.
+        compact_storage (bool | CompactPolicy): Whether to store small fields
+            in compact layout and short strings with fixed length, see
+            `compact.CompactPolicy`. Defaults to False.
+        definition_trees (dict | None): The NexusNode trees by NXDL name, which
+            the writer fills and reuses, e.g. shared by the writers of a batch
+            conversion. Defaults to None, i.e., the trees of this writer.
 
     Attributes:
-        data (dict): Dictionary containing the data to convert.
+        data (Template): Template containing the data to convert.
         nxdl_f_path (str): Path to the nxdl file to use during conversion.
         output_path (str): Path to the output NeXus file.
         output_nexus (h5py.File): The h5py file object to manipulate output file.
-        nxdl_data (dict): Stores xml data from given nxdl file to use during conversion.
+        storage_profile (StorageProfile): The chunk cache, metadata block size,
+            alignment and chunk byte target used for the output file.
+        access_patterns (dict): The access pattern hints keyed by NXDL path.
+        compression_policy (CompressionPolicy): The codec selection policy.
+        in_memory (bool): Whether the output file is built in memory.
+        compact_policy (CompactPolicy | None): Which fields are stored
+            compactly, None if compact storage is not used.
+        nxdl_data (ET._Element): The parsed nxdl file, loaded lazily for NXDL files
+            that are not part of the definitions.
         nxs_namespace (str): The namespace used in the NXDL tags. Helps search for XML children.
     """
 
     def __init__(
         self,
-        data: dict = None,
+        data: Template = None,
         nxdl_f_path: str = None,
         output_path: str = None,
         append: bool = False,
+        compression_workers: int = 0,
+        storage_profile: str | StorageProfile | None = None,
+        access_patterns: str | dict | None = None,
+        compression_policy: str | CompressionPolicy | None = None,
+        in_memory: bool = False,
+        in_memory_threshold: int = IN_MEMORY_THRESHOLD,
+        compact_storage: bool | CompactPolicy = False,
+        definition_trees: dict[str, NexusNode | None] | None = None,
     ):
         """Constructs the necessary objects required by the Writer class."""
         self.data = data
         self.nxdl_f_path = nxdl_f_path
         self.output_path = output_path
-        self.output_nexus = h5py.File(
-            self.output_path,
-            "a" if append else "w",
-            rdcc_nslots=CHUNK_CONFIG_DEFAULT["rdcc_nslots"],
-            rdcc_nbytes=CHUNK_CONFIG_DEFAULT["rdcc_nbytes"],
-            rdcc_w0=CHUNK_CONFIG_DEFAULT["rdcc_w0"],
+        self.storage_profile = get_storage_profile(output_path, storage_profile)
+        self.in_memory = in_memory and self._fits_in_memory(append, in_memory_threshold)
+        if self.in_memory:
+            self.output_nexus = open_in_memory(self.output_path, self.storage_profile)
+        else:
+            self.output_nexus = h5py.File(
+                self.output_path,
+                "a" if append else "w",
+                **self.storage_profile.file_kwargs(),
+            )
+        logger.debug(
+            f"Writing {self.output_path} with the storage profile "
+            f"{self.storage_profile.name}" + (" in memory." if self.in_memory else ".")
         )
         # using "r+" or "a" allow resizing a dataset that uses chunked data storage layout
-        # we currently do not implement this resizing though
+        # this is only done for appendable payloads, see streaming.write_appendable
         # create_{group,dataset} with an existent name throws a ValueError
         # as the HDF5 library prevents it
         # we catch such ValueError and warn via the logger
-        self.nxdl_data = ET.parse(self.nxdl_f_path).getroot()
-        self.nxs_namespace = get_namespace(self.nxdl_data)
         self.append = append
+        self.compression_workers = compression_workers
+        self.access_patterns = load_access_patterns(access_patterns)
+        if isinstance(compression_policy, str):
+            compression_policy = CompressionPolicy.parse(compression_policy)
+        self.compression_policy = compression_policy or CompressionPolicy()
+        if compact_storage is True:
+            compact_storage = CompactPolicy()
+        self.compact_policy = compact_storage or None
+        # Write plan: NXDL concept path -> ConceptPlan, filled once per concept
+        # from the NexusNode tree of the NXDL (see `_concept_plan_for`).
+        self._write_plan: dict[str, ConceptPlan] = {}
+        self._definition_trees: dict[str, NexusNode | None] = (
+            {} if definition_trees is None else definition_trees
+        )
+        self._nxdl_data: ET._Element | None = None
+        # Groups and datasets created or looked up during writing, keyed by
+        # their data converter path, so that every key resolves its parent once.
+        self._nodes: dict[str, h5py.Group | h5py.Dataset] = {}
+        self._undocumented_prefixes: frozenset[str] | None = None
+        # Shapes and dtypes of the sources of virtual datasets, read once per source
+        self._virtual_builder = VirtualDatasetBuilder(self.output_nexus)
+        # Paths of existing datasets that were extended by appendable payloads
+        self._extended_paths: set[str] = set()
+        # Objects created during this write by data converter path, whose
+        # members and attributes are known without asking HDF5
+        self._created: dict[str, CreatedNode] = {}
+        if not append:
+            self._created["/"] = CreatedNode()
+
+    def _fits_in_memory(self, append: bool, threshold: int) -> bool:
+        """Whether the output file can be built in memory, logs why not."""
+        if append:
+            logger.info(
+                f"{self.output_path} is written directly, as files are only "
+                "built in memory when they are created."
+            )
+            return False
+        if self.data is None:
+            return True
+        nbytes = sum(estimate_nbytes(value) for _, value in self.data.items())
+        if nbytes > threshold:
+            logger.info(
+                f"{self.output_path} is written directly, as its values take an "
+                f"estimated {nbytes / 1024**2:.0f} MiB, more than the threshold "
+                f"of {threshold / 1024**2:.0f} MiB for building it in memory."
+            )
+            return False
+        return True
+
+    @property
+    def nxdl_data(self) -> ET._Element:
+        """The parsed NXDL file, only loaded when a concept cannot be resolved from the NexusNode tree."""
+        if self._nxdl_data is None:
+            self._nxdl_data = ET.parse(self.nxdl_f_path).getroot()
+        return self._nxdl_data
+
+    @property
+    def nxs_namespace(self) -> str:
+        """The namespace used in the NXDL tags."""
+        return get_namespace(self.nxdl_data)
 
     def has_content_cued_for_compression(self) -> str:
         """Check if template has some data that require blosc storage."""
@@ -293,233 +680,527 @@ class Writer:
                         return DEFAULT_COMPRESSION_FILTER
         return "no_compression"
 
-    def __nxdl_to_attrs(self, path: str = "/") -> tuple[str | None, dict | None]:
+    def _definition_tree(self, nxdl_name: str) -> NexusNode | None:
         """
-        Resolve the NXDL concept at the given path and return a
-        ``(concept_type, attrs)`` tuple:
-
-        - concept_type is None if the path does not resolve to any NXDL
-          concept at all (e.g. a genuinely undocumented, user-defined path).
-        - concept_type is the NXDL element type (e.g. "group", "field") of
-          the resolved concept otherwise, together with its XML attributes
-          and the required attribute values that were requested in the NXDL
-          from the data.
+        Return the NexusNode tree of the definition `nxdl_name`, built once.
+
+        For the NXDL of this writer, None is returned if `nxdl_f_path` is not
+        the file that the definition name resolves to (e.g. a custom NXDL file
+        outside of the definitions); its concepts are then resolved from XML.
         """
-        nxdl_path = helpers.convert_data_converter_dict_to_nxdl_path(path)
+        if nxdl_name not in self._definition_trees:
+            try:
+                tree = generate_tree_from(nxdl_name)
+            except FileNotFoundError:
+                tree = None
+            if (
+                tree is not None
+                and nxdl_name != "NXroot"
+                and os.path.realpath(tree.nxdl_base)
+                != os.path.realpath(self.nxdl_f_path)
+            ):
+                tree = None
+            self._definition_trees[nxdl_name] = tree
+        return self._definition_trees[nxdl_name]
+
+    def _concept_plan_from_tree(self, tree: NexusNode, nxdl_path: str) -> ConceptPlan:
+        """Walk the NexusNode tree along the segments of `nxdl_path`."""
+        node = tree
+        for segment in nxdl_path.split("/")[1:]:
+            node = node.search_add_child_for(segment)
+            if node is None or node.nx_type in ("link", "choice"):
+                return UNDOCUMENTED_CONCEPT
+        return ConceptPlan(
+            concept_type=node.nx_type,
+            nx_class=getattr(node, "nx_class", None),
+        )
 
+    def _concept_plan_from_xml(self, nxdl_path: str) -> ConceptPlan:
+        """Resolve `nxdl_path` in the raw XML of a custom NXDL file."""
         try:
             elem = get_node_at_nxdl_path(nxdl_path, elem=copy.deepcopy(self.nxdl_data))
         except NxdlAttributeNotFoundError:
-            return None, None
+            return UNDOCUMENTED_CONCEPT
 
         concept_type = get_nxdl_element_type(elem)
+        return ConceptPlan(
+            concept_type=concept_type,
+            nx_class=elem.get("type") if concept_type == "group" else None,
+        )
 
-        attrs = dict(elem.attrib)
+    def _concept_plan_for(self, path: str) -> ConceptPlan:
+        """
+        Return the write plan entry of the NXDL concept at the given
+        data converter path.
 
-        # Remove the name attribute as we only use it to name the HDF5 entry
-        attrs.pop("name", None)
+        The plan is built once per NXDL concept path, i.e. all instances of a
+        concept (e.g. /ENTRY[entry1]/DATA[data] and /ENTRY[entry2]/DATA[data])
+        share one entry.
+        """
+        nxdl_path = helpers.convert_data_converter_dict_to_nxdl_path(path)
+        if (plan := self._write_plan.get(nxdl_path)) is not None:
+            return plan
 
-        # Fetch values for required attributes requested by the NXDL
-        for attr in elem.findall(f"{self.nxs_namespace}attribute"):
-            name = attr.get("name")
-            key = f"{path}/@{name}"
-            if key in self.data:
-                value = self.data[key]
-                attrs[name] = str(value) if isinstance(value, list) else value
+        # Top-level paths outside of the entry are NXroot concepts
+        if nxdl_path.count("/") == 1 and not nxdl_path.upper().startswith("/ENTRY"):
+            tree = self._definition_tree("NXroot")
+        else:
+            nxdl_name = os.path.basename(self.nxdl_f_path).removesuffix(".nxdl.xml")
+            tree = self._definition_tree(nxdl_name)
 
-        return concept_type, attrs
+        if tree is not None:
+            plan = self._concept_plan_from_tree(tree, nxdl_path)
+        else:
+            plan = self._concept_plan_from_xml(nxdl_path)
+        self._write_plan[nxdl_path] = plan
+        return plan
+
+    @staticmethod
+    def _index_undocumented_paths(undocumented_paths: Iterable[str]) -> frozenset[str]:
+        """
+        Return all undocumented paths together with all of their ancestor
+        paths, such that a group lies on an undocumented path if and only
+        if its path is in the returned set.
+        """
+        prefixes = set()
+        for path in undocumented_paths:
+            while path and path not in prefixes:
+                prefixes.add(path)
+                path = path[0 : path.rindex("/")]
+        return frozenset(prefixes)
+
+    def _has_member(self, group_path: str, grp: h5py.Group, name: str) -> bool:
+        """Whether the group at group_path has a member of the given name."""
+        if (created := self._created.get(group_path)) is not None:
+            return name in created.members
+        return name in grp
+
+    def _add_member(self, path: str, name: str, attributes: set[str] | None = None):
+        """
+        Record the member created at path. With attributes, the member itself
+        is a new object that holds exactly these attributes.
+        """
+        if (parent := self._created.get(path[0 : path.rindex("/")] or "/")) is not None:
+            parent.members.add(name)
+        if attributes is not None:
+            self._created[path] = CreatedNode(attributes=attributes)
+
+    def _get_node(self, path: str) -> h5py.Group | h5py.Dataset | None:
+        """Returns the group or dataset at the given data converter path, if it exists."""
+        if (node := self._nodes.get(path)) is None:
+            if path != "/":
+                created = self._created.get(path[0 : path.rindex("/")] or "/")
+                name = helpers.get_name_from_data_dict_entry(
+                    path[path.rindex("/") + 1 :]
+                )
+                if created is not None and name not in created.members:
+                    return None
+            node = self.output_nexus.get(
+                helpers.convert_data_dict_path_to_hdf5_path(path)
+            )
+            if node is not None:
+                self._nodes[path] = node
+        return node
+
+    def _create_group(
+        self, path: str, parent: h5py.Group, undocumented_prefixes: frozenset[str]
+    ) -> h5py.Group | None:
+        """Creates the group at the given path inside parent and writes its NX_class."""
+        name = helpers.get_name_from_data_dict_entry(path[path.rindex("/") + 1 :])
+        if self._has_member(path[0 : path.rindex("/")] or "/", parent, name):
+            if self.append:
+                logger.info(f"Prevented the overwriting of group {path}")
+            return None
+        try:
+            grp = parent.create_group(name)
+        except ValueError:
+            logger.warning(
+                f"ValueError upon create_group "
+                f"{helpers.convert_data_dict_path_to_hdf5_path(path)}"
+            )
+            return None
+
+        plan = self._concept_plan_for(path)
+        attributes: set[str] = set()
+
+        if plan.concept_type == "group":
+            if nx_class := plan.nx_class:
+                # the group is new, so it has no NX_class yet
+                grp.attrs["NX_class"] = nx_class
+                attributes.add("NX_class")
+            else:
+                # The NXDL schema requires every group element to
+                # declare a type, so this should be unreachable
+                # for a genuine group concept.
+                raise NxdlAttributeNotFoundError(
+                    f"Group '{path}' is defined in the NXDL but "
+                    "declares no 'type', so no NX_class attribute could "
+                    "be written for it."
+                )
+        elif plan.concept_type is None and path not in undocumented_prefixes:
+            raise NxdlAttributeNotFoundError(
+                f"Group '{path}' is required by the NXDL/application "
+                "definition but its NX_class could not be resolved."
+            )
+        # else: the concept at this path is documented but not a
+        # group (e.g. a field is being written as if it were a
+        # group); that structural mismatch is reported by
+        # validation, so there is no NX_class to write here.
+        self._nodes[path] = grp
+        self._add_member(path, name, attributes)
+        return grp
 
     def ensure_and_get_parent_node(
-        self, path: str, undocumented_paths
+        self, path: str, undocumented_paths: Iterable[str] | None = None
     ) -> h5py.Group | h5py.Dataset | None:
-        """Returns the parent if it exists for a given path, else attempts creating the parent group, if that fails return None."""
+        """
+        Returns the parent if it exists for a given path, else attempts creating
+        the parent group and all of its missing ancestors, if that fails return None.
+
+        Args:
+            path (str): The data converter path of the child.
+            undocumented_paths (Iterable[str], optional): Paths of the data which
+                are not documented in the NXDL. Missing groups on these paths
+                need no NXDL concept. Defaults to the undocumented paths of `data`.
+        """
         parent_path = path[0 : path.rindex("/")] or "/"
-        parent_path_hdf5 = helpers.convert_data_dict_path_to_hdf5_path(parent_path)
-        if not does_path_exist(parent_path, self.output_nexus):
-            parent = self.ensure_and_get_parent_node(parent_path, undocumented_paths)
-            if isinstance(parent, h5py.Group):
-                if parent_path_hdf5 not in parent:
-                    try:
-                        grp = parent.create_group(parent_path_hdf5)
-                    except ValueError:
-                        logger.warning(
-                            f"ValueError upon create_group {parent_path_hdf5}"
-                        )
-                        return None
-
-                    concept_type, attrs = self.__nxdl_to_attrs(parent_path)
-
-                    if concept_type == "group":
-                        if nx_class := attrs.get("type"):
-                            if "NX_class" not in grp.attrs:
-                                grp.attrs["NX_class"] = nx_class
-                            else:
-                                if self.append:
-                                    logger.info(
-                                        f"Prevented the overwriting of attribute {parent_path}/@NXclass"
-                                    )
-                        else:
-                            # The NXDL schema requires every group element to
-                            # declare a type, so this should be unreachable
-                            # for a genuine group concept.
-                            raise NxdlAttributeNotFoundError(
-                                f"Group '{parent_path}' is defined in the NXDL but "
-                                "declares no 'type', so no NX_class attribute could "
-                                "be written for it."
-                            )
-                    elif concept_type is None and not any(
-                        p == parent_path or p.startswith(f"{parent_path}/")
-                        for p in undocumented_paths
-                    ):
-                        raise NxdlAttributeNotFoundError(
-                            f"Group '{parent_path}' is required by the NXDL/application "
-                            "definition but its NX_class could not be resolved."
-                        )
-                    # else: the concept at this path is documented but not a
-                    # group (e.g. a field is being written as if it were a
-                    # group); that structural mismatch is reported by
-                    # validation, so there is no NX_class to write here.
-                    return grp
-                else:
-                    if self.append:
-                        logger.info(f"Prevented the overwriting of group {parent_path}")
-                    return None
-        return self.output_nexus[parent_path_hdf5]
+        if (parent := self._nodes.get(parent_path)) is not None:
+            return parent
 
-    def _put_data_into_hdf5(self):
-        """Store data in hdf5 in in-memory file or file."""
-
-        hdf5_links_for_later = []
-
-        def add_units_key(dataset, path):
-            units_key = f"{path}/@units"
-            if units_key in self.data.keys() and self.data[units_key] is not None:
-                if "units" not in dataset.attrs:
-                    dataset.attrs["units"] = self.data[units_key]
-                else:
-                    if self.append:
-                        logger.info(
-                            f"Prevented the overwriting of attribute {path}/@units"
-                        )
+        # Find the closest existing ancestor, bottom-up without recursion
+        missing: list[str] = []
+        current = parent_path
+        while (node := self._get_node(current)) is None:
+            missing.append(current)
+            current = current[0 : current.rindex("/")] or "/"
+        if not missing:
+            return node
 
-        for path, value in self.data.items():
-            try:
-                if path[path.rindex("/") + 1 :] == "@units":
-                    continue
+        if undocumented_paths is None:
+            if self._undocumented_prefixes is None:
+                self._undocumented_prefixes = self._index_undocumented_paths(
+                    self.data.undocumented.keys()
+                )
+            undocumented_prefixes = self._undocumented_prefixes
+        else:
+            undocumented_prefixes = self._index_undocumented_paths(undocumented_paths)
 
-                entry_name = helpers.get_name_from_data_dict_entry(
-                    path[path.rindex("/") + 1 :]
+        # Create the missing groups top-down
+        for group_path in reversed(missing):
+            if not isinstance(node, h5py.Group):
+                # Raises a KeyError since no group can be created below node
+                return self.output_nexus[
+                    helpers.convert_data_dict_path_to_hdf5_path(parent_path)
+                ]
+            node = self._create_group(group_path, node, undocumented_prefixes)
+        return node
+
+    def _access_pattern_for(
+        self, path: str, grp: h5py.Group
+    ) -> tuple[bool, str | list | None]:
+        """
+        Returns whether the dataset at path has a known access pattern, and
+        that pattern.
+
+        Hints for the NXDL path of the dataset or of its group take precedence.
+        Otherwise, the signals of NXdata are read along their @interpretation,
+        or along their last dimensions without one.
+        """
+        group_path = path[: path.rindex("/")]
+        for nxdl_path in (
+            helpers.convert_data_converter_dict_to_nxdl_path(path),
+            helpers.convert_data_converter_dict_to_nxdl_path(group_path),
+        ):
+            if nxdl_path in self.access_patterns:
+                return True, self.access_patterns[nxdl_path]
+
+        if helpers.decode_if_bytes(grp.attrs.get("NX_class")) != "NXdata":
+            return False, None
+        name = helpers.get_name_from_data_dict_entry(path[path.rindex("/") + 1 :])
+        signals = [self.data.get(f"{group_path}/@signal") or "data"]
+        auxiliary_signals = self.data.get(f"{group_path}/@auxiliary_signals")
+        if auxiliary_signals is not None:
+            signals.extend(np.atleast_1d(auxiliary_signals).tolist())
+        signals = [helpers.decode_if_bytes(signal) for signal in signals]
+        if name not in signals:
+            return False, None
+        interpretation = self.data.get(f"{path}/@interpretation")
+        if interpretation is not None:
+            interpretation = helpers.decode_if_bytes(interpretation)
+        return True, interpretation if interpretation in INTERPRETATION_DIMS else None
+
+    def _auto_chunks(
+        self, path: str, grp: h5py.Group, data: Any
+    ) -> bool | tuple[int, ...]:
+        """
+        The chunk shape of a dataset which users read along a known access
+        pattern, see `_access_pattern_for`, else True for h5py auto-chunking.
+
+        The chunk shape follows `prioritized_axes_heuristic` with the chunk byte
+        target of the storage profile. Axis names of the pattern are resolved
+        via the @axes and @AXISNAME_indices of the group.
+        """
+        if not isinstance(data, np.ndarray) or data.ndim < 2:
+            return True
+        known, pattern = self._access_pattern_for(path, grp)
+        if not known:
+            return True
+        group_path = path[: path.rindex("/")]
+        axes = np.atleast_1d(self.data.get(f"{group_path}/@axes", [])).tolist()
+        axes = [helpers.decode_if_bytes(axis) for axis in axes]
+        for axis in pattern if isinstance(pattern, (list, tuple)) else ():
+            indices = self.data.get(f"{group_path}/@{axis}_indices")
+            if isinstance(axis, str) and indices is not None and np.ndim(indices) == 0:
+                # @AXISNAME_indices takes precedence over the position in @axes
+                axes.extend([None] * (int(indices) + 1 - len(axes)))
+                axes[int(indices)] = axis
+        priority = access_pattern_priority(data.ndim, pattern, axes)
+        if priority is None:
+            return True
+        return prioritized_axes_heuristic(
+            data, priority, byte_size=self.storage_profile.byte_size
+        )
+
+    def _write_value(self, node: NodeWrite) -> h5py.Group | h5py.Dataset | None:
+        """Creates the field, payload or link of node inside its parent group."""
+        path, data = node.path, node.value
+        entry_name = helpers.get_name_from_data_dict_entry(path[path.rindex("/") + 1 :])
+        grp = self.ensure_and_get_parent_node(path)
+        if not isinstance(grp, (h5py.Group, h5py.Dataset)):
+            if not np.isscalar(data):
+                grp.create_dataset(entry_name, chunks=True, data=data)
+            else:
+                grp.create_dataset(entry_name, data=data)
+            logger.warning(f"Unable to get_parent_node {path}, skip adding children")
+            return None
+
+        if isinstance(data, dict):
+            # links, and chunked compressed data storage layout
+            if node.is_link:
+                dataset = handle_dicts_entries(
+                    data,
+                    grp,
+                    entry_name,
+                    self.output_path,
+                    path,
+                    append=self.append,
+                    virtual_builder=self._virtual_builder,
                 )
-                if is_not_data_empty(value):
-                    data = value
-                else:
-                    continue
+                if dataset is None:
+                    # If target of a link is invalid to be linked
+                    del self.data[path]
+                    return None
+            else:
+                extends = is_append_payload(data) and entry_name in grp
+                start = time.perf_counter()
+                dataset = handle_dicts_entries(
+                    data,
+                    grp,
+                    entry_name,
+                    self.output_path,
+                    path,
+                    append=self.append,
+                    compression_workers=self.compression_workers,
+                    auto_chunks=self._auto_chunks(path, grp, data.get("compress")),
+                    compression_policy=self.compression_policy,
+                )
+                if "compress" in data:
+                    profiling.add_metric(
+                        "compression_seconds", time.perf_counter() - start
+                    )
+                if dataset is None:
+                    return None
+                if extends:
+                    self._extended_paths.add(path)
+            self._nodes[path] = dataset
+            self._add_member(path, entry_name)
+            return dataset
 
-                if entry_name[0] != "@":
-                    grp = self.ensure_and_get_parent_node(
-                        path, self.data.undocumented.keys()
+        # use chunk-based storage layout also for data that are
+        # not compressed as it enables more memory efficient
+        # iterating over chunks e.g. in nomad/parsers/parser.py
+        if self._has_member(path[0 : path.rindex("/")] or "/", grp, entry_name):
+            if self.append:
+                logger.info(f"Prevented the overwriting of dataset {path}")
+            return None
+        try:
+            if is_array_source(data):
+                dataset = copy_source(grp, entry_name, data)
+            elif (
+                self.compact_policy is not None
+                and (
+                    compact := write_compact_dataset(
+                        grp, entry_name, data, self.compact_policy
                     )
-                    if isinstance(grp, (h5py.Group, h5py.Dataset)):
-                        if isinstance(data, dict):
-                            # links, and chunked compressed data storage layout
-                            if "compress" in data.keys():
-                                dataset = handle_dicts_entries(
-                                    data,
-                                    grp,
-                                    entry_name,
-                                    self.output_path,
-                                    path,
-                                    append=self.append,
-                                )
-                            else:
-                                hdf5_links_for_later.append(
-                                    [data, grp, entry_name, self.output_path, path]
-                                )
-                        else:  # use chunk-based storage layout also for data that are
-                            # not compressed as it enables more memory efficient
-                            # iterating over chunks e.g. in nomad/parsers/parser.py
-                            if entry_name not in grp:
-                                try:
-                                    if not np.isscalar(data):
-                                        dataset = grp.create_dataset(
-                                            entry_name, chunks=True, data=data
-                                        )
-                                    else:
-                                        dataset = grp.create_dataset(
-                                            entry_name, data=data
-                                        )
-                                except ValueError:
-                                    logger.warning(
-                                        f"ValueError caught upon create_dataset {path}"
-                                    )
-                            else:
-                                if self.append:
-                                    logger.info(
-                                        f"Prevented the overwriting of dataset {path}"
-                                    )
-                    else:
-                        if not np.isscalar(data):
-                            dataset = grp.create_dataset(
-                                entry_name, chunks=True, data=data
-                            )
-                        else:
-                            dataset = grp.create_dataset(entry_name, data=data)
-                        logger.warning(
-                            f"Unable to get_parent_node {path}, skip adding children"
-                        )
+                )
+                is not None
+            ):
+                dataset = compact
+            elif not np.isscalar(data):
+                dataset = grp.create_dataset(
+                    entry_name, chunks=self._auto_chunks(path, grp, data), data=data
+                )
+            else:
+                dataset = grp.create_dataset(entry_name, data=data)
+        except ValueError:
+            logger.warning(f"ValueError caught upon create_dataset {path}")
+            return None
+        self._nodes[path] = dataset
+        self._add_member(path, entry_name, set())
+        return dataset
+
+    def _write_attribute(
+        self,
+        node: h5py.Group | h5py.Dataset,
+        path: str,
+        key: str,
+        name: str,
+        value: Any,
+        overwrite: bool = False,
+    ):
+        """Writes the attribute name of the object at path unless it exists."""
+        if (created := self._created.get(path)) is not None:
+            exists = name in created.attributes
+        else:
+            exists = name in node.attrs
+        if exists and not overwrite:
+            if self.append:
+                logger.info(f"Prevented the overwriting of attribute {key}")
+            return
+        node.attrs[name] = value
+        if created is not None:
+            created.attributes.add(name)
+
+    def _write_node(self, node: NodeWrite):
+        """Creates the value of node, then writes its units and attributes."""
+        path = node.path
+        if node.value is not None:
+            try:
+                dataset = self._write_value(node)
             except InvalidDictProvided as exc:
-                print(str(exc))
+                if not node.is_link:
+                    print(str(exc))
+                    return
+                raise
             except Exception as exc:
+                if node.is_link:
+                    raise
                 raise OSError(
                     f"Unknown error occurred writing the path: {path} "
                     f"with the following message: {str(exc)}"
                 ) from exc
+            if dataset is None and node.is_link:
+                # the target of the link is invalid
+                return
+        try:
+            if node.value is not None:
+                if (dataset := self._nodes.get(path)) is None:
+                    dataset = self.output_nexus[
+                        helpers.convert_data_dict_path_to_hdf5_path(path)
+                    ]
+                if node.units is not None:
+                    self._write_attribute(
+                        dataset, path, f"{path}/@units", "units", node.units
+                    )
+            elif node.attributes:
+                dataset = self.ensure_and_get_parent_node(node.attributes[0][0])
+            else:
+                return
+            if not isinstance(dataset, (h5py.Group, h5py.Dataset)):
+                logger.warning(
+                    f"Unable to get_parent_node {path}, skip adding attribute to dataset_or_group"
+                )
+                return
+            for key, name, value in node.attributes:
+                # attributes of extended datasets describe all values
+                self._write_attribute(
+                    dataset, path, key, name, value, path in self._extended_paths
+                )
+        except Exception as exc:
+            raise OSError(
+                f"Unknown error occurred writing the path: {path}"
+                f", while writing the value: {node.value} "
+                f"with the following message: {str(exc)}"
+            ) from exc
 
-        for links in hdf5_links_for_later:
-            dataset = handle_dicts_entries(*links, append=self.append)
-            if dataset is None:
-                # If target of a link is invalid to be linked
-                del self.data[links[-1]]
+    def _put_data_into_hdf5(self):
+        """
+        Store data in hdf5 in in-memory file or file.
 
-        for path, value in self.data.items():
-            try:
-                if path[path.rindex("/") + 1 :] == "@units":
-                    continue
+        The keys of the data are grouped by their HDF5 object first, see
+        `plan_node_writes`, so that every object is created once together with
+        its units and attributes. Links are written in a final pass in which
+        every link follows the links it points to, together with the
+        attributes of objects below links.
+        """
+        profiling.phase("plan")
+        plan = plan_node_writes(self.data)
+        links = [node for node in plan.values() if node.is_link]
+        link_paths = frozenset(link.path for link in links)
+        below_links = []
+        profiling.phase("objects")
+        for node in plan.values():
+            if node.is_link:
+                continue
+            if node.value is None and self._is_below(node.path, link_paths):
+                below_links.append(node)
+                continue
+            self._write_node(node)
 
-                entry_name = helpers.get_name_from_data_dict_entry(
-                    path[path.rindex("/") + 1 :]
-                )
-                if is_not_data_empty(value):
-                    data = value
-                else:
-                    continue
+        profiling.phase("links")
+        for node in order_links(links, self.output_path):
+            self._write_node(node)
+        profiling.phase("attributes below links")
+        for node in below_links:
+            self._write_node(node)
 
-                if entry_name[0] != "@":
-                    path_hdf5 = helpers.convert_data_dict_path_to_hdf5_path(path)
+        profiling.phase("extended NXdata check")
+        self._check_extended_nxdata()
 
-                    add_units_key(self.output_nexus[path_hdf5], path)
-                else:
-                    dataset_or_group = self.ensure_and_get_parent_node(
-                        path, self.data.undocumented.keys()
-                    )
-                    if isinstance(dataset_or_group, (h5py.Group, h5py.Dataset)):
-                        if entry_name[1:] not in dataset_or_group.attrs:
-                            dataset_or_group.attrs[entry_name[1:]] = data
-                        else:
-                            if self.append:
-                                logger.info(
-                                    f"Prevented the overwriting of attribute {path}"
-                                )
-                    else:
+    @staticmethod
+    def _is_below(path: str, ancestors: frozenset[str]) -> bool:
+        """Whether path or one of its ancestors is in ancestors."""
+        while path:
+            if path in ancestors:
+                return True
+            path = path[0 : path.rindex("/")]
+        return False
+
+    def _check_extended_nxdata(self):
+        """Warn about NXdata groups whose axes no longer match an extended signal."""
+        checked: set[str] = set()
+        for path in self._extended_paths:
+            group = self._nodes[path].parent
+            if group.name in checked:
+                continue
+            checked.add(group.name)
+            if helpers.decode_if_bytes(group.attrs.get("NX_class")) != "NXdata":
+                continue
+            signal = helpers.decode_if_bytes(group.attrs.get("signal"))
+            if not isinstance(signal, str) or not isinstance(
+                group.get(signal), h5py.Dataset
+            ):
+                continue
+            signal_shape = group[signal].shape
+            axes = helpers.decode_if_bytes(group.attrs.get("axes", []))
+            axes = [axes] if isinstance(axes, str) else list(axes)
+            for dim, axis in enumerate(axes):
+                if not isinstance(group.get(axis), h5py.Dataset):
+                    continue
+                axis_shape = group[axis].shape
+                indices = np.atleast_1d(group.attrs.get(f"{axis}_indices", dim))
+                for axis_dim, signal_dim in enumerate(indices):
+                    if (
+                        axis_dim < len(axis_shape)
+                        and 0 <= signal_dim < len(signal_shape)
+                        and axis_shape[axis_dim] != signal_shape[signal_dim]
+                    ):
                         logger.warning(
-                            f"Unable to get_parent_node {path}, skip adding attribute to dataset_or_group"
+                            f"The axis {group[axis].name} has {axis_shape[axis_dim]} "
+                            f"values, but the signal {group[signal].name} has "
+                            f"{signal_shape[signal_dim]} along dimension {signal_dim}. "
+                            "Append the values of the axis together with the signal."
                         )
-            except Exception as exc:
-                raise OSError(
-                    f"Unknown error occurred writing the path: {path}"
-                    f", while writing the value: {value} "
-                    f"with the following message: {str(exc)}"
-                ) from exc
 
     def write(self):
         """Writes the NeXus file with previously validated data from the reader with NXDL attrs."""
@@ -528,12 +1209,29 @@ class Writer:
             logger.info(f"Compression filters supported {COMPRESSION_FILTERS}")
         if compression == PERFORMANT_COMPRESSION_FILTER:
             if not any("pytest" in arg for arg in sys.argv):
+                blosc2 = import_blosc2()
                 logger.info(
                     f"blosc2 is configured to use {blosc2.nthreads} threads on host with {blosc2.ncores} cores"
                 )
                 logger.info(blosc2.print_versions())
 
+        size_before = (
+            os.path.getsize(self.output_path)
+            if self.append and os.path.exists(self.output_path)
+            else 0
+        )
         try:
-            self._put_data_into_hdf5()
+            with profiling.stage("HDF5 objects"):
+                self._put_data_into_hdf5()
+            if self.in_memory:
+                with profiling.stage("store file image"):
+                    nbytes = write_file_image(self.output_nexus, self.output_path)
+                logger.debug(f"Stored {nbytes} bytes built in memory.")
         finally:
-            self.output_nexus.close()
+            with profiling.stage("close"):
+                self._virtual_builder.close()
+                self.output_nexus.close()
+        if os.path.exists(self.output_path):
+            profiling.add_metric(
+                "bytes_written", os.path.getsize(self.output_path) - size_before
+            )
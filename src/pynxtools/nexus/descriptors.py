@@ -0,0 +1,160 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Lightweight field descriptors for metadata-only traversal.
+
+When `NexusFileHandler` runs with ``metadata_only=True``, visitors receive a
+`FieldDescriptor` in ``on_field`` instead of the `h5py.Dataset`.  A descriptor
+exposes the dataset metadata (shape, dtype, chunk layout, filter pipeline and
+attributes) without reading the data.  Values are materialized lazily:
+
+- `FieldDescriptor.value` reads and caches the full value, but only if its
+  size is at most ``max_value_bytes``; larger values give ``None``.
+- Indexing (``descriptor[0]``, ``descriptor[10:20]``) reads the requested
+  selection explicitly.  Selecting the whole of a value above the threshold
+  (``descriptor[()]`` or ``descriptor[...]``) raises `ValueError`.
+
+This makes it possible to index the metadata of very large files without
+touching their bulk data.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Any
+
+import h5py
+import numpy as np
+
+#: Default size threshold (in bytes) up to which values are read on request.
+DEFAULT_MAX_VALUE_BYTES = 1024 * 1024
+
+
+class FieldDescriptor:
+    """Metadata of an HDF5 dataset with a lazy, size-limited value accessor.
+
+    The descriptor mirrors the read-only metadata interface of `h5py.Dataset`
+    (``name``, ``shape``, ``dtype``, ``ndim``, ``size``, ``nbytes``,
+    ``chunks``, ``attrs``, ``parent``, ``file``) so that most visitor code
+    works unchanged on both.
+
+    Parameters
+    ----------
+    path:
+        HDF5 path of the field relative to the traversal root, as passed to
+        the visitor hooks (no leading slash).
+    dataset:
+        The underlying dataset.  Only its metadata is read on construction.
+    max_value_bytes:
+        Values up to this size are read by `value` and by full selections.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dataset: h5py.Dataset,
+        max_value_bytes: int = DEFAULT_MAX_VALUE_BYTES,
+    ) -> None:
+        self.path = path
+        self.dataset = dataset
+        self.max_value_bytes = max_value_bytes
+
+        self.name: str = dataset.name
+        self.shape: tuple[int, ...] = dataset.shape
+        self.dtype: np.dtype = dataset.dtype
+        self.chunks: tuple[int, ...] | None = dataset.chunks
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the uncompressed value (variable-length items count as pointers)."""
+        return self.size * self.dtype.itemsize
+
+    @property
+    def loadable(self) -> bool:
+        """Whether the full value is small enough to be read by `value`."""
+        return self.nbytes <= self.max_value_bytes
+
+    @property
+    def parent(self) -> h5py.Group:
+        return self.dataset.parent
+
+    @property
+    def file(self) -> h5py.File:
+        return self.dataset.file
+
+    @cached_property
+    def filters(self) -> tuple[tuple[int, tuple[int, ...]], ...]:
+        """Filter pipeline as ordered ``(filter_id, client_values)`` pairs."""
+        dcpl = self.dataset.id.get_create_plist()
+        pipeline = []
+        for idx in range(dcpl.get_nfilters()):
+            filter_id, _, values, _ = dcpl.get_filter(idx)
+            pipeline.append((filter_id, tuple(values)))
+        return tuple(pipeline)
+
+    @cached_property
+    def attrs(self) -> dict[str, Any]:
+        """Attributes of the dataset, read once."""
+        return dict(self.dataset.attrs)
+
+    @cached_property
+    def value(self) -> Any | None:
+        """The full value if it fits into ``max_value_bytes``, else ``None``."""
+        if not self.loadable:
+            return None
+        return self.dataset[()]
+
+    def __getitem__(self, key: Any) -> Any:
+        """Read the selection *key* from the dataset.
+
+        Raises
+        ------
+        ValueError
+            If *key* selects the whole value and it exceeds ``max_value_bytes``.
+        """
+        if key is Ellipsis or (isinstance(key, tuple) and not key):
+            if not self.loadable:
+                raise ValueError(
+                    f"Value of {self.name} has {self.nbytes} bytes, more than "
+                    f"max_value_bytes={self.max_value_bytes}. Read a selection instead."
+                )
+            if key is not Ellipsis:
+                return self.value
+        return self.dataset[key]
+
+    def iter_chunks(self, sel: Any = None):
+        """Yield the chunk selections of the dataset, see `h5py.Dataset.iter_chunks`."""
+        return self.dataset.iter_chunks(sel)
+
+    def __repr__(self) -> str:
+        return (
+            f"<FieldDescriptor {self.name!r}: shape {self.shape}, "
+            f"dtype {self.dtype.str!r}, chunks {self.chunks}>"
+        )
+
+
+def is_field(hdf_node: Any) -> bool:
+    """Return whether *hdf_node* is a field, as a dataset or as its descriptor."""
+    return isinstance(hdf_node, (h5py.Dataset, FieldDescriptor))
@@ -46,16 +46,49 @@ Two optional hooks have default no-op implementations and may be overridden:
   target is a group with child ``"value"`` results in a call
   ``on_field("entry/ext/value", ...)``).
 
+A third optional hook, ``prune(hdf_path, hdf_node)``, lets a visitor skip a
+node together with its attributes and its whole subtree by returning ``True``.
+
+Multiple visitors
+-----------------
+`CompositeVisitor` fans every node out to several visitors during a single
+traversal, so that e.g. validation, annotation and NOMAD parsing share one
+round of HDF5 metadata reads.  Pruning is tracked per child visitor: a subtree
+pruned by one visitor is still dispatched to the others, and the handler only
+skips it entirely once *every* child has pruned it.  Children that hold a
+`NexusSchemaResolver` can be constructed with the same resolver instance to
+share appdef trees and per-node schema lookups.
+
+Parallel traversal
+------------------
+`NexusFileHandler.process_parallel` partitions the file into the subtrees at
+a given depth (by default one per NXentry) and walks them in a process pool,
+each worker with its own read-only file handle.  Partial visitors are combined
+with ``merge(other)`` in file order before ``on_complete`` is called once.
+
+Metadata-only traversal
+-----------------------
+With ``metadata_only=True`` the handler passes a
+`nexus.descriptors.FieldDescriptor` to ``on_field`` (and as the *parent* of
+field attributes) instead of the `h5py.Dataset`.  Descriptors carry path,
+shape, dtype, chunk layout, filter pipeline and attributes; values up to
+``max_value_bytes`` are read lazily on request, larger values only when a
+visitor explicitly indexes a selection.
+
 Link traversal
 --------------
 * **Soft links** - resolved via ``h5py``; broken links dispatch ``on_broken_link``
   and are otherwise skipped.
 * **Hard links** - followed transparently; a cycle guard prevents infinite
   recursion when a hard-linked descendant is an ancestor of itself.
-* **External links** - the external file is opened in a separate ``h5py.File``
-  context; broken external links dispatch ``on_broken_link`` and are skipped.
-  If a visitor needs to distinguish broken soft links from broken external links
-  it can inspect the type of the *link* argument passed to ``on_broken_link``.
+* **External links** - the external file is opened read-only through an
+  `ExternalFilePool` that lives for one ``process()`` call, so files linked many
+  times (e.g. one link per detector frame into a shared data file) are opened
+  once.  Relative link file names are resolved against the directory of the
+  file containing the link.  Broken external links dispatch ``on_broken_link``
+  and are skipped.  If a visitor needs to distinguish broken soft links from
+  broken external links it can inspect the type of the *link* argument passed
+  to ``on_broken_link``.
 
 Supported visitor use-cases:
 
@@ -75,11 +108,18 @@ from __future__ import annotations
 import logging
 import os
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Union
 
 import h5py
 
+from pynxtools.nexus.descriptors import DEFAULT_MAX_VALUE_BYTES, FieldDescriptor
+from pynxtools.nexus.storage import open_hdf5, register_filters_of
+
 logger = logging.getLogger("pynxtools")
 
 
@@ -105,6 +145,8 @@ class NexusVisitor(ABC):
       normal group/field hook; the node is then skipped.
     * External links additionally dispatch ``on_external_link`` *before*
       the handler opens the external file.
+    * ``prune`` is asked first for every node; returning ``True`` skips the
+      node, its attributes and all of its descendants.
     * After the full traversal, ``on_complete`` is called with the open root.
     """
 
@@ -120,9 +162,13 @@ class NexusVisitor(ABC):
     def on_field(
         self,
         hdf_path: str,
-        hdf_node: h5py.Dataset,
+        hdf_node: h5py.Dataset | FieldDescriptor,
     ) -> None:
-        """Called for every HDF5 dataset (field)."""
+        """Called for every HDF5 dataset (field).
+
+        *hdf_node* is a `FieldDescriptor` when the handler runs in
+        ``metadata_only`` mode.
+        """
 
     @abstractmethod
     def on_attribute(
@@ -172,6 +218,231 @@ class NexusVisitor(ABC):
         The default implementation does nothing.
         """
 
+    def prune(
+        self,
+        hdf_path: str,
+        hdf_node: h5py.Group | h5py.Dataset,
+    ) -> bool:
+        """Return ``True`` to skip *hdf_node*, its attributes and its subtree.
+
+        Called before ``on_group`` / ``on_field`` for every node.  The default
+        implementation visits everything.
+        """
+        return False
+
+    def merge(self, other: NexusVisitor) -> None:
+        """Fold the results of *other* into this visitor.
+
+        *other* is a visitor created by the same factory that processed a
+        disjoint subtree of the same file in
+        `NexusFileHandler.process_parallel`.  Visitors that do not support
+        partitioned processing keep the default, which raises.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support merging partial results "
+            "and cannot be used with NexusFileHandler.process_parallel."
+        )
+
+
+class CompositeVisitor(NexusVisitor):
+    """
+    Dispatch every node to several visitors within a single traversal.
+
+    Children are called in the order given.  Each child may prune subtrees
+    for itself only via its ``prune`` hook; the composite reports a node as
+    pruned to the handler only when every child has pruned it, so that
+    subtrees nobody is interested in are not read at all.
+
+    To share schema resolution between children, construct them with the same
+    `~pynxtools.nexus.schema_resolver.NexusSchemaResolver`::
+
+        resolver = NexusSchemaResolver()
+        visitor = CompositeVisitor(
+            [
+                ValidationVisitor(appdef, "/entry", resolver=resolver),
+                Annotator(logger, resolver=resolver),
+            ]
+        )
+        NexusFileHandler(filename).process(visitor)
+
+    Parameters
+    ----------
+    visitors:
+        The child visitors, dispatched in order.
+    """
+
+    def __init__(self, visitors: Sequence[NexusVisitor]) -> None:
+        self.visitors: list[NexusVisitor] = list(visitors)
+        # Root path of the subtree currently pruned by each child, or None.
+        # Traversal is depth-first, so a single root per child is sufficient.
+        self._pruned_at: list[str | None] = [None] * len(self.visitors)
+
+    @staticmethod
+    def _is_within(hdf_path: str, subtree: str) -> bool:
+        """Return ``True`` if *hdf_path* is *subtree* or one of its descendants."""
+        return (
+            subtree == "" or hdf_path == subtree or hdf_path.startswith(subtree + "/")
+        )
+
+    def _active(self, hdf_path: str) -> list[NexusVisitor]:
+        """Return the children that have not pruned *hdf_path*."""
+        active = []
+        for idx, visitor in enumerate(self.visitors):
+            subtree = self._pruned_at[idx]
+            if subtree is not None:
+                if self._is_within(hdf_path, subtree):
+                    continue
+                self._pruned_at[idx] = None
+            active.append(visitor)
+        return active
+
+    def prune(
+        self,
+        hdf_path: str,
+        hdf_node: h5py.Group | h5py.Dataset,
+    ) -> bool:
+        """Record per-child pruning; prune for the handler only if all children do."""
+        for idx, visitor in enumerate(self.visitors):
+            subtree = self._pruned_at[idx]
+            if subtree is not None and self._is_within(hdf_path, subtree):
+                continue
+            self._pruned_at[idx] = (
+                hdf_path if visitor.prune(hdf_path, hdf_node) else None
+            )
+        return all(subtree is not None for subtree in self._pruned_at)
+
+    def on_group(self, hdf_path: str, hdf_node: h5py.Group) -> None:
+        for visitor in self._active(hdf_path):
+            visitor.on_group(hdf_path, hdf_node)
+
+    def on_field(self, hdf_path: str, hdf_node: h5py.Dataset) -> None:
+        for visitor in self._active(hdf_path):
+            visitor.on_field(hdf_path, hdf_node)
+
+    def on_attribute(
+        self,
+        hdf_path: str,
+        attr_name: str,
+        attr_value: Any,
+        parent: h5py.Group | h5py.Dataset,
+    ) -> None:
+        for visitor in self._active(hdf_path):
+            visitor.on_attribute(hdf_path, attr_name, attr_value, parent)
+
+    def on_complete(self, root: h5py.File) -> None:
+        self._pruned_at = [None] * len(self.visitors)
+        for visitor in self.visitors:
+            visitor.on_complete(root)
+
+    def on_broken_link(
+        self,
+        hdf_path: str,
+        link: h5py.SoftLink | h5py.ExternalLink,
+    ) -> None:
+        for visitor in self._active(hdf_path):
+            visitor.on_broken_link(hdf_path, link)
+
+    def on_external_link(
+        self,
+        hdf_path: str,
+        link: h5py.ExternalLink,
+    ) -> None:
+        for visitor in self._active(hdf_path):
+            visitor.on_external_link(hdf_path, link)
+
+
+@dataclass
+class ExternalFileStats:
+    """Counters reported by an `ExternalFilePool`."""
+
+    opened: int = 0
+    hits: int = 0
+    evicted: int = 0
+
+
+class ExternalFilePool:
+    """
+    Bounded LRU pool of read-only HDF5 files targeted by external links.
+
+    Files are kept open between links so that a file referenced by many
+    external links is opened once.  Files that are currently being traversed
+    are pinned (see `acquire` / `release`) and never evicted, which keeps nested
+    external links safe even with a pool size of one; the pool may then
+    temporarily hold more than *max_open* files.
+
+    Parameters
+    ----------
+    max_open:
+        Maximum number of unpinned files kept open at the same time.
+    """
+
+    def __init__(self, max_open: int = 8) -> None:
+        if max_open < 1:
+            raise ValueError(f"max_open must be at least 1, got {max_open}.")
+        self.max_open = max_open
+        self.stats = ExternalFileStats()
+        self._files: OrderedDict[str, h5py.File] = OrderedDict()
+        self._pins: dict[str, int] = {}
+        # (directory of the linking file, link file name) -> path to open
+        self._resolved: dict[tuple[str, str], str] = {}
+
+    def resolve(self, filename: str, parent_file: str) -> str:
+        """Return the path to open for an external link *filename*.
+
+        Relative names are resolved against the directory of *parent_file*
+        (the file containing the link), falling back to the name as given
+        (i.e. relative to the working directory) when no such file exists.
+        Each (directory, file name) pair is resolved only once.
+        """
+        parent_dir = os.path.dirname(os.path.abspath(parent_file))
+        key = (parent_dir, filename)
+        if key not in self._resolved:
+            candidate = filename
+            if not os.path.isabs(filename):
+                relative_to_parent = os.path.join(parent_dir, filename)
+                if os.path.exists(relative_to_parent):
+                    candidate = relative_to_parent
+            self._resolved[key] = os.path.abspath(candidate)
+        return self._resolved[key]
+
+    def acquire(self, path: str) -> h5py.File:
+        """Return the open file at *path* and pin it until `release` is called.
+
+        Raises whatever ``h5py.File`` raises if the file cannot be opened.
+        """
+        ext_file = self._files.get(path)
+        if ext_file is None:
+            ext_file = open_hdf5(path, "r")
+            self.stats.opened += 1
+            self._files[path] = ext_file
+        else:
+            self.stats.hits += 1
+            self._files.move_to_end(path)
+        self._pins[path] = self._pins.get(path, 0) + 1
+        self._evict()
+        return ext_file
+
+    def release(self, path: str) -> None:
+        """Unpin a file obtained from `acquire`; it stays open for later links."""
+        self._pins[path] -= 1
+        if not self._pins[path]:
+            del self._pins[path]
+        self._evict()
+
+    def _evict(self) -> None:
+        """Close least recently used unpinned files beyond *max_open*."""
+        unpinned = [path for path in self._files if path not in self._pins]
+        for path in unpinned[: max(0, len(self._files) - self.max_open)]:
+            self._files.pop(path).close()
+            self.stats.evicted += 1
+
+    def close(self) -> None:
+        """Close every file in the pool."""
+        for ext_file in self._files.values():
+            ext_file.close()
+        self._files.clear()
+        self._pins.clear()
+
 
 class NexusFileHandler:
     """
@@ -185,12 +456,26 @@ class NexusFileHandler:
     is_open:
         When ``True``, *nxs_file* is treated as an already-open
         `h5py.File` object (or compatible) rather than a file path.
+    max_external_files:
+        Size of the `ExternalFilePool` used for external links during one
+        ``process()`` call.  After processing, the pool's open/hit/evict
+        counters are available as ``external_file_stats``.
+    metadata_only:
+        When ``True``, fields are dispatched as `FieldDescriptor` objects
+        instead of `h5py.Dataset`, so that no bulk data is read unless a
+        visitor asks for it.
+    max_value_bytes:
+        Size threshold for lazily reading full field values in
+        *metadata_only* mode (see `FieldDescriptor.value`).
     """
 
     def __init__(
         self,
         nxs_file: str | h5py.File | Path,
         is_open: bool = False,
+        max_external_files: int = 8,
+        metadata_only: bool = False,
+        max_value_bytes: int = DEFAULT_MAX_VALUE_BYTES,
     ) -> None:
         if nxs_file is None:
             local_dir = os.path.abspath(os.path.dirname(__file__))
@@ -201,6 +486,11 @@ class NexusFileHandler:
             )
         self._nxs_file = nxs_file
         self._is_in_memory = is_open
+        self._max_external_files = max_external_files
+        self._metadata_only = metadata_only
+        self._max_value_bytes = max_value_bytes
+        self._external_files: ExternalFilePool | None = None
+        self.external_file_stats = ExternalFileStats()
 
     def process(self, visitor: NexusVisitor) -> None:
         """Walk the NeXus file and dispatch each node to *visitor*.
@@ -210,26 +500,156 @@ class NexusFileHandler:
         every node and attribute, and finally calls ``on_complete`` before
         closing the file.
 
-        The ``_get_inherited_hdf_nodes`` LRU cache is cleared after processing
-        to avoid unbounded memory growth across successive calls.
+        The ``_get_inherited_hdf_nodes`` LRU cache and the legacy per-file
+        NX_class tables are cleared after processing to avoid unbounded memory
+        growth across successive calls.  External
+        files opened during the traversal are closed before returning.
+        """
+        from pynxtools.nexus.nexus import _get_inherited_hdf_nodes, _nx_class_tables
+
+        self._external_files = ExternalFilePool(self._max_external_files)
+        try:
+            if self._is_in_memory:
+                root = self._nxs_file
+                self._traverse(root, visitor)
+            else:
+                file_path = (
+                    self._nxs_file[0]
+                    if isinstance(self._nxs_file, list)
+                    else self._nxs_file
+                )
+                root = open_hdf5(file_path, "r")
+                try:
+                    self._traverse(root, visitor)
+                finally:
+                    root.close()
+                    _get_inherited_hdf_nodes.cache_clear()
+                    _nx_class_tables.clear()
+        finally:
+            self._external_files.close()
+            self.external_file_stats = self._external_files.stats
+            self._external_files = None
+            logger.debug(
+                "External files: %d opened, %d reused, %d evicted",
+                self.external_file_stats.opened,
+                self.external_file_stats.hits,
+                self.external_file_stats.evicted,
+            )
+
+    def process_parallel(
+        self,
+        visitor_factory: Callable[[], NexusVisitor],
+        partition_depth: int = 1,
+        max_workers: int | None = None,
+    ) -> NexusVisitor:
+        """Walk the file with independent subtrees processed in a process pool.
+
+        The file is partitioned into the subtrees rooted at *partition_depth*
+        (the default of ``1`` gives one partition per top-level group, i.e. per
+        NXentry).  The steps are:
+
+        1. The main process creates a visitor with *visitor_factory* and
+           dispatches all nodes above *partition_depth* to it.
+        2. For every partition, a worker process opens a read-only handle of
+           the file (closed again when the partition is done), creates a fresh
+           visitor, replays ``on_group`` for the root and all ancestors of the
+           partition (without attributes) so that path-dependent visitor
+           context can be rebuilt, visits the subtree and returns the visitor
+           to the main process.
+        3. The main process merges the partition visitors into its own visitor
+           with `NexusVisitor.merge`, in file order.
+        4. ``on_complete`` is called once on the merged visitor.
+
+        Visitors used here must implement ``merge``, and both *visitor_factory*
+        and the visitors it creates must be picklable after traversal.  Because
+        of the replay in step 2, ``merge`` must tolerate ancestor groups that
+        were seen by several partitions.
+
+        Parameters
+        ----------
+        visitor_factory:
+            Picklable zero-argument callable returning a new visitor, e.g. a
+            ``functools.partial`` of a visitor class.
+        partition_depth:
+            Depth (number of path segments) of the partition roots.
+        max_workers:
+            Number of worker processes; defaults to the number of CPUs.
+
+        Returns
+        -------
+        NexusVisitor
+            The merged visitor of the main process.
         """
-        from pynxtools.nexus.nexus import _get_inherited_hdf_nodes
+        from pynxtools.nexus.nexus import _get_inherited_hdf_nodes, _nx_class_tables
 
         if self._is_in_memory:
-            root = self._nxs_file
-            self._traverse(root, visitor)
-        else:
-            file_path = (
-                self._nxs_file[0]
-                if isinstance(self._nxs_file, list)
-                else self._nxs_file
+            raise ValueError("process_parallel requires a file path, not an open file.")
+        if partition_depth < 1:
+            raise ValueError(
+                f"partition_depth must be at least 1, got {partition_depth}."
             )
-            root = h5py.File(file_path, "r")
-            try:
-                self._traverse(root, visitor)
-            finally:
-                root.close()
-                _get_inherited_hdf_nodes.cache_clear()
+        file_path = (
+            self._nxs_file[0] if isinstance(self._nxs_file, list) else self._nxs_file
+        )
+
+        visitor = visitor_factory()
+        partitions: list[str] = []
+        self._external_files = ExternalFilePool(self._max_external_files)
+        root = open_hdf5(file_path, "r")
+        try:
+            self._full_visit(root, root, "", visitor, partitions, partition_depth)
+            if partitions:
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_partition_worker,
+                    initargs=(
+                        str(file_path),
+                        visitor_factory,
+                        {
+                            "max_external_files": self._max_external_files,
+                            "metadata_only": self._metadata_only,
+                            "max_value_bytes": self._max_value_bytes,
+                        },
+                    ),
+                ) as executor:
+                    for partial_visitor in executor.map(_process_partition, partitions):
+                        visitor.merge(partial_visitor)
+            visitor.on_complete(root)
+        finally:
+            root.close()
+            self._external_files.close()
+            self.external_file_stats = self._external_files.stats
+            self._external_files = None
+            _get_inherited_hdf_nodes.cache_clear()
+            _nx_class_tables.clear()
+        return visitor
+
+    def _process_partition(self, partition: str, visitor: NexusVisitor) -> None:
+        """Replay the ancestors of *partition* to *visitor*, then visit its subtree.
+
+        The file and the external files are opened for this partition only
+        and closed before returning, like in ``process()``.
+        """
+        from pynxtools.nexus.nexus import _get_inherited_hdf_nodes, _nx_class_tables
+
+        self._external_files = ExternalFilePool(self._max_external_files)
+        root = open_hdf5(self._nxs_file, "r")
+        try:
+            parts = partition.split("/")
+            parent: h5py.Group = root
+            for depth in range(len(parts)):
+                ancestor = "/".join(parts[:depth])
+                parent = root["/" + ancestor] if ancestor else root
+                if visitor.prune(ancestor, parent):
+                    return
+                visitor.on_group(ancestor, parent)
+            self._visit_child(root, parent, parts[-1], partition, visitor)
+        finally:
+            root.close()
+            self._external_files.close()
+            self._external_files = None
+            _get_inherited_hdf_nodes.cache_clear()
+            _nx_class_tables.clear()
 
     def _traverse(self, root: h5py.File, visitor: NexusVisitor) -> None:
         """Run the full traversal and call on_complete."""
@@ -257,17 +677,24 @@ class NexusFileHandler:
 
     def _traverse_external(
         self,
+        root: h5py.File,
         hdf_path: str,
         link: h5py.ExternalLink,
         visitor: NexusVisitor,
     ) -> None:
         """Open *link*'s target file and recursively visit its subtree.
 
+        *root* is the file containing the link; relative link file names are
+        resolved against its directory.  The external file is taken from the
+        handler's `ExternalFilePool` and stays open for later links into it.
+
         If the external file cannot be opened (missing, wrong format, etc.) the
         visitor's ``on_broken_link`` hook is called and traversal is skipped.
         """
+        pool = self._external_files
+        ext_path = pool.resolve(link.filename, root.filename)
         try:
-            ext_root = h5py.File(link.filename, "r")
+            ext_root = pool.acquire(ext_path)
         except Exception:
             visitor.on_broken_link(hdf_path, link)
             return
@@ -278,7 +705,7 @@ class NexusFileHandler:
                 return
             self._full_visit(ext_root, target, hdf_path, visitor)
         finally:
-            ext_root.close()
+            pool.release(ext_path)
 
     def _full_visit(
         self,
@@ -286,17 +713,29 @@ class NexusFileHandler:
         hdf_node: h5py.Group | h5py.Dataset,
         name: str,
         visitor: NexusVisitor,
+        partitions: list[str] | None = None,
+        partition_depth: int = 0,
     ) -> None:
         """Depth-first, cycle-safe traversal.
 
+        When *partitions* is given, children at depth *partition_depth* (root
+        children have depth 1) are appended to it instead of being visited.
+
         Dispatch order for each node:
 
+        0. ``visitor.prune`` - returning ``True`` skips the remaining steps
         1. ``visitor.on_field`` **or** ``visitor.on_group``
         2. ``visitor.on_attribute`` for every attribute (in h5py iteration order)
         3. Recurse into children (groups only)
         """
+        if visitor.prune(name, hdf_node):
+            return
+
         # Dispatch node
         if isinstance(hdf_node, h5py.Dataset):
+            register_filters_of(hdf_node)
+            if self._metadata_only:
+                hdf_node = FieldDescriptor(name, hdf_node, self._max_value_bytes)
             visitor.on_field(name, hdf_node)
         else:
             visitor.on_group(name, hdf_node)
@@ -305,27 +744,84 @@ class NexusFileHandler:
         for attr_name, attr_value in hdf_node.attrs.items():
             visitor.on_attribute(name, attr_name, attr_value, hdf_node)
 
-        # Recurse into children — inspect link types explicitly so that broken
-        # soft links and external links can be dispatched to the visitor rather
-        # than crashing (h5py returns None for a broken soft link in .items()).
-        if isinstance(hdf_node, h5py.Group):
-            for child_name in hdf_node:
-                full_name = child_name if not name else f"{name}/{child_name}"
-                link = hdf_node.get(child_name, getlink=True)
-
-                if isinstance(link, h5py.SoftLink):
-                    child = hdf_node.get(child_name)  # None when target is missing
-                    if child is None:
-                        visitor.on_broken_link(full_name, link)
-                        continue
-                    if self._not_yet_visited(root, full_name):
-                        self._full_visit(root, child, full_name, visitor)
-
-                elif isinstance(link, h5py.ExternalLink):
-                    visitor.on_external_link(full_name, link)
-                    self._traverse_external(full_name, link, visitor)
-
-                else:  # HardLink (or any future link type)
-                    child = hdf_node[child_name]
-                    if self._not_yet_visited(root, full_name):
-                        self._full_visit(root, child, full_name, visitor)
+        if not isinstance(hdf_node, h5py.Group):
+            return
+        for child_name in hdf_node:
+            full_name = child_name if not name else f"{name}/{child_name}"
+            if partitions is not None and full_name.count("/") + 1 >= partition_depth:
+                # Subtree is handed to a worker by process_parallel
+                partitions.append(full_name)
+                continue
+            self._visit_child(
+                root,
+                hdf_node,
+                child_name,
+                full_name,
+                visitor,
+                partitions,
+                partition_depth,
+            )
+
+    def _visit_child(
+        self,
+        root: h5py.File,
+        parent: h5py.Group,
+        child_name: str,
+        full_name: str,
+        visitor: NexusVisitor,
+        partitions: list[str] | None = None,
+        partition_depth: int = 0,
+    ) -> None:
+        """Visit the child *child_name* of *parent*, resolving its link type.
+
+        Link types are inspected explicitly so that broken soft links and
+        external links can be dispatched to the visitor rather than crashing
+        (h5py returns None for a broken soft link in .items()).
+        """
+        link = parent.get(child_name, getlink=True)
+
+        if isinstance(link, h5py.SoftLink):
+            child = parent.get(child_name)  # None when target is missing
+            if child is None:
+                visitor.on_broken_link(full_name, link)
+                return
+            if self._not_yet_visited(root, full_name):
+                self._full_visit(
+                    root, child, full_name, visitor, partitions, partition_depth
+                )
+
+        elif isinstance(link, h5py.ExternalLink):
+            visitor.on_external_link(full_name, link)
+            self._traverse_external(root, full_name, link, visitor)
+
+        else:  # HardLink (or any future link type)
+            child = parent[child_name]
+            if self._not_yet_visited(root, full_name):
+                self._full_visit(
+                    root, child, full_name, visitor, partitions, partition_depth
+                )
+
+
+# Per-process state of process_parallel workers: (handler, visitor factory)
+_partition_worker: tuple[NexusFileHandler, Callable[[], NexusVisitor]] | None = None
+
+
+def _init_partition_worker(
+    file_path: str,
+    visitor_factory: Callable[[], NexusVisitor],
+    handler_options: dict[str, Any],
+) -> None:
+    """Create the worker's own file handler for process_parallel."""
+    global _partition_worker
+    _partition_worker = (
+        NexusFileHandler(file_path, **handler_options),
+        visitor_factory,
+    )
+
+
+def _process_partition(partition: str) -> NexusVisitor:
+    """Visit one partition in a worker and return the visitor."""
+    handler, visitor_factory = _partition_worker
+    visitor = visitor_factory()
+    handler._process_partition(partition, visitor)
+    return visitor
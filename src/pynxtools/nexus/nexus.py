@@ -24,7 +24,6 @@ from pynxtools.definitions.dev_tools.utils.nxdl_utils import (
     add_base_classes,
     check_attr_name_nxdl,
     get_best_child,
-    get_hdf_info_parent,
     get_node_concept_path,
     get_node_name,
     get_nx_class,
@@ -36,35 +35,55 @@ from pynxtools.definitions.dev_tools.utils.nxdl_utils import (
     walk_elist,
     write_doc_string,
 )
-from pynxtools.nexus.utils import decode_if_string
+from pynxtools.nexus.descriptors import is_field
+from pynxtools.nexus.schema_resolver import NXClassTable
 
 _logger = logging.getLogger(__file__)
 
 
+_nx_class_tables: dict[h5py.File, NXClassTable] = {}
+
+
+def _nx_class_table(h5file: h5py.File) -> NXClassTable:
+    """Return the shared `NXClassTable` of *h5file* for the legacy lookups.
+
+    The tables of closed files are dropped when a new file is looked up.
+
+    .. deprecated:: Will be removed with the rest of this module when NomadVisitor uses NexusNode.
+    """
+    table = _nx_class_tables.get(h5file)
+    if table is None:
+        for closed in [f for f in _nx_class_tables if not f]:
+            del _nx_class_tables[closed]
+        table = _nx_class_tables[h5file] = NXClassTable(h5file)
+    return table
+
+
+def _class_table_and_path(hdf_info) -> tuple[NXClassTable, str]:
+    """Return the class table of the file of *hdf_info* and the node's path in it.
+
+    .. deprecated:: Will be removed with the rest of this module when NomadVisitor uses NexusNode.
+    """
+    hdf_node = hdf_info["hdf_node"]
+    root = hdf_info.get("hdf_root", hdf_node)
+    return _nx_class_table(root.file), hdf_info.get("hdf_path", hdf_node.name)
+
+
 def get_nxdl_entry(hdf_info):
     """Get the NXDL application definition for an HDF5 node.
 
     .. deprecated:: Will be removed with the rest of this module when NomadVisitor uses NexusNode.
     """
-    entry = hdf_info
-    if (
-        "NX_class" in entry["hdf_node"].attrs.keys()
-        and decode_if_string(entry["hdf_node"].attrs["NX_class"]) == "NXroot"
-    ):
+    class_table, path = _class_table_and_path(hdf_info)
+    if class_table.nx_class(path) == "NXroot":
         return "NXroot"
-    while (
-        isinstance(entry["hdf_node"], h5py.Dataset)
-        or "NX_class" not in entry["hdf_node"].attrs.keys()
-        or decode_if_string(entry["hdf_node"].attrs["NX_class"]) != "NXentry"
-    ):
-        entry = get_hdf_info_parent(entry)
-        if entry["hdf_node"].name == "/":
-            return "NO NXentry found"
-    try:
-        nxdef = entry["hdf_node"]["definition"][()]
-        return nxdef.decode()
-    except KeyError:  # 'NO Definition referenced'
+    entry_path = class_table.entry_for(path)
+    if entry_path is None:
+        return "NO NXentry found"
+    definition = class_table.definition(entry_path)
+    if definition is None:  # 'NO Definition referenced'
         return "NXroot"
+    return definition
 
 
 def get_nx_class_path(hdf_info):
@@ -72,26 +91,8 @@ def get_nx_class_path(hdf_info):
 
     .. deprecated:: Will be removed with the rest of this module when NomadVisitor uses NexusNode.
     """
-    hdf_node = hdf_info["hdf_node"]
-    if hdf_node.name == "/":
-        return ""
-    if isinstance(hdf_node, h5py.Group):
-        return (
-            get_nx_class_path(get_hdf_info_parent(hdf_info))
-            + "/"
-            + (
-                decode_if_string(hdf_node.attrs["NX_class"])
-                if "NX_class" in hdf_node.attrs.keys()
-                else hdf_node.name.split("/")[-1]
-            )
-        )
-    if isinstance(hdf_node, h5py.Dataset):
-        return (
-            get_nx_class_path(get_hdf_info_parent(hdf_info))
-            + "/"
-            + hdf_node.name.split("/")[-1]
-        )
-    return ""
+    class_table, path = _class_table_and_path(hdf_info)
+    return class_table.nx_class_path(path)
 
 
 def _check_deprecation_enum_axis(
@@ -152,17 +153,13 @@ def _get_nxdl_attr_doc(  # pylint: disable=too-many-arguments,too-many-locals
         act_elem = act_elem1
         # NX_class is a compulsory attribute for groups in a nexus file
         # which should match the type of the corresponding NXDL element
-        if (
-            attr == "NX_class"
-            and not isinstance(hdf_node, h5py.Dataset)
-            and elem_index == 0
-        ):
+        if attr == "NX_class" and not is_field(hdf_node) and elem_index == 0:
             elem = None
             _, doc, attr = write_doc_string(_logger, doc, attr)
             new_elem = elem
             break
         # units category is a compulsory attribute for any fields
-        if attr == "units" and isinstance(hdf_node, h5py.Dataset):
+        if attr == "units" and is_field(hdf_node):
             req_str = "<<REQUIRED>>"
             _, act_elem, attr_inheritance_chain, doc, attr = try_find_units(
                 logger, act_elem, attr_inheritance_chain, doc, attr
@@ -175,7 +172,7 @@ def _get_nxdl_attr_doc(  # pylint: disable=too-many-arguments,too-many-locals
                 )
             )
         # default is allowed for groups
-        elif attr == "default" and not isinstance(hdf_node, h5py.Dataset):
+        elif attr == "default" and not is_field(hdf_node):
             req_str = "<<RECOMMENDED>>"
             # try to find if default is defined as a child of the NXDL element
             act_elem = get_nxdl_child(
@@ -290,7 +287,7 @@ def _helper_get_inherited_nodes(hdf_info2, elem_list, path_index, attr):
     elif path_index == len(hdf_path) - 1 and attr:
         act_nexus_type = "attribute"
     else:
-        act_nexus_type = "field" if isinstance(hdf_node, h5py.Dataset) else "group"
+        act_nexus_type = "field" if is_field(hdf_node) else "group"
     # find the best fitting name in all children
     best_fit = -1
     html_name = None
@@ -52,6 +52,7 @@ from typing import Literal
 import h5py
 import numpy as np
 
+from pynxtools.nexus.descriptors import FieldDescriptor, is_field
 from pynxtools.nexus.utils import decode_if_string
 
 
@@ -85,14 +86,14 @@ class NXdataInfo:
 
 
 def classify_field(
-    hdf_node: h5py.Dataset, name: str
+    hdf_node: h5py.Dataset | FieldDescriptor, name: str
 ) -> Literal["signal", "axis"] | None:
     """Return ``'signal'``, ``'axis'``, or ``None`` for *hdf_node*.
 
     Checks v3 parent attributes first, then falls back to v2/v1 own attributes.
-    Returns ``None`` if *hdf_node* is not a dataset or its parent is not NXdata.
+    Returns ``None`` if *hdf_node* is not a field or its parent is not NXdata.
     """
-    if not isinstance(hdf_node, h5py.Dataset):
+    if not is_field(hdf_node):
         return None
     parent = hdf_node.parent
     if parent is None or decode_if_string(parent.attrs.get("NX_class")) != "NXdata":
@@ -21,10 +21,15 @@ Schema resolution: mapping HDF5 nodes to their NexusNode counterparts.
 `NexusSchemaResolver` is visitor-agnostic — any `NexusVisitor` implementation
 can hold one and use it to look up the schema node for a given HDF5 path,
 without reimplementing appdef discovery, tree caching, or path traversal.
+
+`NXClassTable` records the ``NX_class`` attribute of every group and the
+``definition`` of every NXentry of one file as they are first looked up, so
+that deep hierarchies do not re-read the same HDF5 attributes for every node.
 """
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Literal, Optional
 
 import h5py
@@ -33,12 +38,114 @@ from pynxtools.nexus.nexus_tree import NexusNode, generate_tree_from
 from pynxtools.nexus.utils import decode_if_string
 
 
+class NXClassTable:
+    """Path → ``NX_class`` / ``definition`` table of one HDF5 file.
+
+    The ``NX_class`` attribute of a path and the ``definition`` field of an
+    NXentry are read from the file at most once; every later lookup, including
+    lookups of descendants that walk up through the same ancestors, is served
+    from the table.  Paths are absolute HDF5 paths (a missing leading slash is
+    added).
+
+    Parameters
+    ----------
+    h5file:
+        The open HDF5 file the table describes.
+    """
+
+    def __init__(self, h5file: h5py.File) -> None:
+        self._file = h5file
+        self._nx_class: dict[str, str | None] = {}
+        self._entry: dict[str, str | None] = {}
+        self._definition: dict[str, str | None] = {}
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return "/" + path.strip("/")
+
+    def nx_class(self, path: str) -> str | None:
+        """Return the ``NX_class`` of the group at *path*.
+
+        ``None`` is returned for datasets, missing paths and groups without an
+        ``NX_class`` attribute.
+        """
+        path = self._normalize(path)
+        if path not in self._nx_class:
+            nx_class = None
+            try:
+                h5_obj = self._file[path]
+            except KeyError:
+                h5_obj = None
+            if isinstance(h5_obj, h5py.Group) and "NX_class" in h5_obj.attrs:
+                nx_class = decode_if_string(h5_obj.attrs["NX_class"])
+            self._nx_class[path] = nx_class
+        return self._nx_class[path]
+
+    def entry_for(self, path: str) -> str | None:
+        """Return the path of the nearest ``NXentry`` at or above *path*.
+
+        The file root itself is never considered an entry.  Returns ``None``
+        if there is no ``NXentry`` ancestor.
+        """
+        path = self._normalize(path)
+        if path == "/":
+            return None
+        if path not in self._entry:
+            if self.nx_class(path) == "NXentry":
+                self._entry[path] = path
+            else:
+                self._entry[path] = self.entry_for(path.rsplit("/", 1)[0])
+        return self._entry[path]
+
+    def definition(self, entry_path: str) -> str | None:
+        """Return the decoded ``definition`` field of the entry at *entry_path*.
+
+        Returns ``None`` if the entry has no ``definition`` field.
+        """
+        entry_path = self._normalize(entry_path)
+        if entry_path not in self._definition:
+            try:
+                raw = self._file[entry_path]["definition"][()]
+                definition = raw.decode() if isinstance(raw, bytes) else str(raw)
+            except (KeyError, AttributeError):
+                definition = None
+            self._definition[entry_path] = definition
+        return self._definition[entry_path]
+
+    def appdef_for(self, path: str) -> str | None:
+        """Return the application definition governing *path*.
+
+        This is the ``definition`` of the nearest ``NXentry`` ancestor,
+        ``"NXroot"`` if that entry has no ``definition`` field, or ``None`` if
+        there is no ``NXentry`` ancestor.
+        """
+        entry_path = self.entry_for(path)
+        if entry_path is None:
+            return None
+        definition = self.definition(entry_path)
+        return "NXroot" if definition is None else definition.strip()
+
+    def nx_class_path(self, path: str) -> str:
+        """Return *path* with every group segment replaced by its ``NX_class``.
+
+        Segments without an ``NX_class`` (datasets, plain groups) keep their
+        name, e.g. ``"/entry/data/signal"`` → ``"/NXentry/NXdata/signal"``.
+        """
+        parts = [part for part in path.split("/") if part]
+        class_path = ""
+        for idx, name in enumerate(parts):
+            nx_class = self.nx_class("/".join(parts[: idx + 1]))
+            class_path += "/" + (nx_class if nx_class is not None else name)
+        return class_path
+
+
 def resolve_path(
     root: NexusNode,
     path: str,
     node_type: Literal["group", "field", "attribute"] | None = None,
     *,
     h5file: h5py.File | None = None,
+    nx_class_for: Callable[[str], str | None] | None = None,
     hint: Literal["axis", "signal"] | None = None,
     _cache: dict[str, NexusNode | None] | None = None,
 ) -> NexusNode | None:
@@ -67,6 +174,10 @@ def resolve_path(
         giving deterministic disambiguation of variadic groups (e.g.
         ``DETECTOR[NXdetector]`` vs ``MONITOR[NXmonitor]``).  Pass ``None``
         to skip NX_class narrowing (pure schema walk).
+    nx_class_for:
+        Optional callable returning the ``NX_class`` of the group at a given
+        HDF5 path, typically `NXClassTable.nx_class` of a table shared across
+        calls.  Takes precedence over *h5file*.
     hint:
         ``"signal"`` or ``"axis"`` forwarded to ``best_child_for`` for the last
         segment only, to resolve the NXdata signal / axis ambiguity.
@@ -86,6 +197,8 @@ def resolve_path(
 
     segments = [s for s in path.split("/") if s]
     current: NexusNode = root
+    if nx_class_for is None and h5file is not None:
+        nx_class_for = NXClassTable(h5file).nx_class
 
     for i, seg in enumerate(segments):
         partial = "/".join(segments[: i + 1])
@@ -101,14 +214,8 @@ def resolve_path(
         seg_node_type = node_type if is_last else "group"
 
         nx_class: str | None = None
-        if h5file is not None and seg_node_type == "group":
-            try:
-                h5_grp = h5file["/" + partial]
-                if isinstance(h5_grp, h5py.Group):
-                    raw = h5_grp.attrs.get("NX_class", b"")
-                    nx_class = decode_if_string(raw) or None
-            except KeyError:
-                pass
+        if nx_class_for is not None and seg_node_type == "group":
+            nx_class = nx_class_for(partial) or None
 
         seg_hint = hint if is_last else None
         child = current.best_child_for(
@@ -128,8 +235,13 @@ def resolve_path(
 class NexusSchemaResolver:
     """Maps HDF5 nodes to their NexusNode schema counterparts.
 
-    Maintains per-instance caches for appdef trees and path lookups,
-    amortizing repeated schema resolution during a single file traversal.
+    Maintains per-instance caches for appdef trees and path lookups, and one
+    `NXClassTable` per HDF5 file, amortizing repeated schema resolution and
+    attribute reads during a single file traversal.
+    One instance may be shared by several visitors of the same file (see
+    :class:`~pynxtools.nexus.handler.CompositeVisitor`): HDF5-path lookups
+    (:meth:`node_for`) and tree-relative lookups (:meth:`node_for_path`) are
+    cached separately, the latter per tree.
 
     Typical usage inside a ``NexusVisitor``::
 
@@ -145,6 +257,9 @@ class NexusSchemaResolver:
     def __init__(self) -> None:
         self._tree_cache: dict[str, NexusNode | None] = {}
         self._node_cache: dict[str, NexusNode | None] = {}
+        # Tree-relative lookups of node_for_path, keyed by id() of the tree root.
+        self._path_caches: dict[int, dict[str, NexusNode | None]] = {}
+        self._class_tables: dict[h5py.File, NXClassTable] = {}
 
     # ------------------------------------------------------------------
     # Appdef discovery
@@ -157,29 +272,24 @@ class NexusSchemaResolver:
         Returns the ``definition`` field value of the nearest ``NXentry`` ancestor,
         ``"NXroot"`` if no ``definition`` field is present, or
         ``None`` if no ``NXentry`` ancestor exists.
+
+        This one-off lookup does not cache; `node_for` uses the per-file
+        `NXClassTable` from `class_table_for` instead.
         """
-        h5file = hdf_node.file
-        parts = [p for p in hdf_node.name.split("/") if p]
-        for i in range(len(parts), 0, -1):
-            path = "/" + "/".join(parts[:i])
-            try:
-                candidate = h5file[path]
-            except KeyError:
-                continue
-            if not isinstance(candidate, h5py.Group):
-                continue
-            if decode_if_string(candidate.attrs.get("NX_class", b"")) == "NXentry":
-                try:
-                    definition = candidate["definition"][()]
-                    raw = (
-                        definition.decode()
-                        if isinstance(definition, bytes)
-                        else str(definition)
-                    )
-                    return raw.strip()
-                except (KeyError, AttributeError):
-                    return "NXroot"
-        return None
+        return NXClassTable(hdf_node.file).appdef_for(hdf_node.name)
+
+    def class_table_for(self, h5file: h5py.File) -> NXClassTable:
+        """Return (and cache) the `NXClassTable` of *h5file*.
+
+        The tables of closed files are dropped when a new file is looked up, so
+        that a resolver used for many files does not keep them alive.
+        """
+        table = self._class_tables.get(h5file)
+        if table is None:
+            for closed in [f for f in self._class_tables if not f]:
+                del self._class_tables[closed]
+            table = self._class_tables[h5file] = NXClassTable(h5file)
+        return table
 
     # ------------------------------------------------------------------
     # Tree cache
@@ -218,8 +328,9 @@ class NexusSchemaResolver:
             HDF5 path without a leading slash (e.g. ``"entry/instrument/energy"``).
             Pass an empty string to get the tree root.
         hdf_node:
-            The live HDF5 node at *hdf_path*, used to locate the governing
-            appdef and to read ``NX_class`` attributes of intermediate groups.
+            The live HDF5 node (or `FieldDescriptor`) at *hdf_path*, used to
+            locate the governing appdef and to read ``NX_class`` attributes of
+            intermediate groups.
         hint:
             ``"signal"`` or ``"axis"`` — forwarded to the last segment to
             resolve the NXdata signal / axis field ambiguity.
@@ -229,7 +340,8 @@ class NexusSchemaResolver:
         if hdf_path in self._node_cache:
             return self._node_cache[hdf_path]
 
-        appdef = self.appdef_for(hdf_node)
+        class_table = self.class_table_for(hdf_node.file)
+        appdef = class_table.appdef_for(hdf_node.name)
         if appdef is None:
             return None
         tree = self.tree_for(appdef)
@@ -237,13 +349,13 @@ class NexusSchemaResolver:
             return None
 
         node_type: Literal["group", "field"] = (
-            "field" if isinstance(hdf_node, h5py.Dataset) else "group"
+            "group" if isinstance(hdf_node, h5py.Group) else "field"
         )
         return resolve_path(
             tree,
             hdf_path,
             node_type=node_type,
-            h5file=hdf_node.file,
+            nx_class_for=class_table.nx_class,
             hint=hint,
             _cache=self._node_cache,
         )
@@ -271,7 +383,7 @@ class NexusSchemaResolver:
         """Resolve *path* within *tree* without HDF5 file access.
 
         Resolves the parent chain via :func:`resolve_path` (which fills the
-        shared node cache for every intermediate segment), then selects the last
+        per-tree cache for every intermediate segment), then selects the last
         segment via :meth:`~pynxtools.nexus.nexus_tree.NexusNode.best_child_for`.
 
         Suitable for validation use cases where the application definition and
@@ -304,23 +416,20 @@ class NexusSchemaResolver:
         """
         if not path:
             return tree
-        if path in self._node_cache:
-            return self._node_cache[path]
+        cache = self._path_caches.setdefault(id(tree), {})
+        if path in cache:
+            return cache[path]
 
         *parent_parts, last_seg = path.rsplit("/", 1)
         parent_path = parent_parts[0] if parent_parts else ""
 
-        parent = (
-            resolve_path(tree, parent_path, _cache=self._node_cache)
-            if parent_path
-            else tree
-        )
+        parent = resolve_path(tree, parent_path, _cache=cache) if parent_path else tree
         if parent is None:
-            self._node_cache[path] = None
+            cache[path] = None
             return None
 
         node = parent.best_child_for(
             last_seg, node_type=node_type, nx_class=nx_class, hint=hint
         )
-        self._node_cache[path] = node
+        cache[path] = node
         return node
@@ -0,0 +1,369 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Storage profiles which tune HDF5 files to the file system they live on.
+
+A storage profile bundles the chunk cache (`rdcc_*`), the metadata block
+size and the alignment of an `h5py.File` with the target size of chunks
+(see `pynxtools.dataconverter.chunk.prioritized_axes_heuristic`). The
+profile of a path is detected from the file system type of its mount point
+in /proc/mounts and, for local block devices, whether the device is
+rotational. It can be overridden with the environment variable
+PYNXTOOLS_STORAGE_PROFILE or per call.
+
+All HDF5 files which pynxtools opens, i.e. the output file of the writer and
+the files read by the handler, the validation and the virtual datasets, are
+opened via `open_hdf5` with the profile of their path. The filters of
+hdf5plugin are only registered once a dataset needs one of them, see
+`register_filters_of`.
+"""
+
+import logging
+import os
+import sys
+from dataclasses import asdict, dataclass
+from functools import cache, lru_cache
+from typing import Any
+
+import h5py
+
+logger = logging.getLogger("pynxtools")  # pylint: disable=C0103
+
+STORAGE_PROFILE_ENV = "PYNXTOOLS_STORAGE_PROFILE"
+MOUNTS_FILE = "/proc/mounts"
+
+# Use-case-specific configurations to optimize performance for chunked storage.
+# https://github.com/h5py/h5py/blob/master/docs/high/file.rst
+
+# e.g. for h5py v3.15.1 https://github.com/h5py/h5py/blob/fad034c16f595cb24f4393bbd0dcd23c53bc9a33/h5py/tests/test_file2.py#L111
+CHUNK_CONFIG_HFIVEPY: dict[str, int | float] = {
+    "byte_size": 1 * 1024 * 1024,
+    "rdcc_nbytes": 1 * 1024 * 1024,  # 1 MiB before HDF2.0, will be 8 MiB for HDF2.0
+    "rdcc_nslots": 521,
+    "rdcc_w0": 0.75,
+    # HDF5 library defaults, i.e. 2 KiB metadata blocks and no alignment
+    "meta_block_size": 2048,
+    "alignment_threshold": 1,
+    "alignment_interval": 1,
+}
+
+CHUNK_CONFIG_SSD_NVM: dict[str, int | float] = {
+    "byte_size": 1 * 1024 * 1024,
+    "rdcc_nbytes": 128 * 1024 * 1024,
+    "rdcc_nslots": 4093,
+    "rdcc_w0": 0.75,
+    # page-aligned chunks, no need to aggregate metadata on random-access devices
+    "meta_block_size": 4 * 1024,
+    "alignment_threshold": 64 * 1024,
+    "alignment_interval": 4 * 1024,
+}
+CHUNK_CONFIG_HDD: dict[str, int | float] = {
+    "byte_size": 4 * 1024 * 1024,
+    "rdcc_nbytes": 256 * 1024 * 1024,
+    "rdcc_nslots": 1021,
+    "rdcc_w0": 0.75,
+    # aggregate metadata into larger blocks to avoid seeks between small writes,
+    # metadata blocks are not much larger to keep small files small
+    "meta_block_size": 64 * 1024,
+    "alignment_threshold": 1024 * 1024,
+    "alignment_interval": 64 * 1024,
+}
+CHUNK_CONFIG_GPFS: dict[str, int | float] = {
+    "byte_size": 8 * 1024 * 1024,
+    "rdcc_nbytes": 256 * 1024 * 1024,
+    "rdcc_nslots": 521,
+    "rdcc_w0": 0.75,
+    # align large objects to the file system block size (4 MiB by default)
+    "meta_block_size": 64 * 1024,
+    "alignment_threshold": 1024 * 1024,
+    "alignment_interval": 4 * 1024 * 1024,
+}
+
+CHUNK_CONFIG_LUSTRE: dict[str, int | float] = {
+    # set stripe size before creating a file!
+    "byte_size": 8 * 1024 * 1024,
+    "rdcc_nbytes": 256 * 1024 * 1024,
+    "rdcc_nslots": 521,
+    "rdcc_w0": 0.75,
+    # align large objects to the stripe size (1 MiB by default)
+    "meta_block_size": 64 * 1024,
+    "alignment_threshold": 1024 * 1024,
+    "alignment_interval": 1024 * 1024,
+}
+
+CHUNK_CONFIG_DEFAULT = CHUNK_CONFIG_HFIVEPY
+
+
+@cache
+def import_hdf5plugin():
+    """hdf5plugin, imported on first use, which registers its HDF5 filters."""
+    import hdf5plugin
+
+    return hdf5plugin
+
+
+def register_filters_of(dataset: h5py.Dataset) -> None:
+    """
+    Register the filters of hdf5plugin if dataset uses a filter which HDF5
+    does not provide, e.g. blosc2, zstd, lz4 or bitshuffle.
+
+    The filters of the sources of a virtual dataset are only known when it is
+    read, so hdf5plugin is always registered for virtual datasets.
+    """
+    if "hdf5plugin" in sys.modules:
+        return
+    dcpl = dataset.id.get_create_plist()
+    if dcpl.get_layout() == h5py.h5d.VIRTUAL or any(
+        not h5py.h5z.filter_avail(dcpl.get_filter(index)[0])
+        for index in range(dcpl.get_nfilters())
+    ):
+        import_hdf5plugin()
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """The HDF5 settings for one kind of storage.
+
+    Args:
+        name (str): The name of the profile.
+        byte_size (int): The target size of a chunk in bytes.
+        rdcc_nbytes (int): The size of the chunk cache per dataset in bytes.
+        rdcc_nslots (int): The number of hash slots of the chunk cache.
+        rdcc_w0 (float): The preemption policy of the chunk cache.
+        meta_block_size (int): The minimum size of metadata blocks in bytes.
+        alignment_threshold (int): Objects of at least this size are aligned.
+        alignment_interval (int): The alignment of such objects in bytes.
+    """
+
+    name: str
+    byte_size: int
+    rdcc_nbytes: int
+    rdcc_nslots: int
+    rdcc_w0: float
+    meta_block_size: int
+    alignment_threshold: int
+    alignment_interval: int
+
+    @classmethod
+    def from_config(cls, name: str, config: dict[str, int | float]) -> "StorageProfile":
+        """A profile from one of the CHUNK_CONFIG_* dictionaries."""
+        return cls(
+            name=name,
+            byte_size=int(config["byte_size"]),
+            rdcc_nbytes=int(config["rdcc_nbytes"]),
+            rdcc_nslots=int(config["rdcc_nslots"]),
+            rdcc_w0=float(config["rdcc_w0"]),
+            meta_block_size=int(config["meta_block_size"]),
+            alignment_threshold=int(config["alignment_threshold"]),
+            alignment_interval=int(config["alignment_interval"]),
+        )
+
+    def file_kwargs(self) -> dict[str, Any]:
+        """The keyword arguments of `h5py.File` which apply this profile."""
+        kwargs = asdict(self)
+        del kwargs["name"], kwargs["byte_size"]
+        # leave out the HDF5 defaults, which also works with older h5py versions
+        if self.meta_block_size == 2048:
+            del kwargs["meta_block_size"]
+        if self.alignment_interval <= 1:
+            del kwargs["alignment_threshold"], kwargs["alignment_interval"]
+        return kwargs
+
+
+STORAGE_PROFILES: dict[str, StorageProfile] = {
+    name: StorageProfile.from_config(name, config)
+    for name, config in (
+        ("hfivepy", CHUNK_CONFIG_HFIVEPY),
+        ("ssd_nvm", CHUNK_CONFIG_SSD_NVM),
+        ("hdd", CHUNK_CONFIG_HDD),
+        ("gpfs", CHUNK_CONFIG_GPFS),
+        ("lustre", CHUNK_CONFIG_LUSTRE),
+    )
+}
+DEFAULT_STORAGE_PROFILE = next(
+    name
+    for name, profile in STORAGE_PROFILES.items()
+    if profile == StorageProfile.from_config(name, CHUNK_CONFIG_DEFAULT)
+)
+
+# file system types which identify the storage without looking at the device
+_PROFILE_OF_FSTYPE = {
+    "lustre": "lustre",
+    "gpfs": "gpfs",
+    "tmpfs": "ssd_nvm",
+    "ramfs": "ssd_nvm",
+}
+
+
+@dataclass(frozen=True)
+class Mount:
+    """An entry of the mount table.
+
+    Args:
+        device (str): The mounted device, e.g. /dev/sda1 or a server address.
+        mount_point (str): The directory at which the device is mounted.
+        fstype (str): The file system type, e.g. ext4, nfs4 or lustre.
+    """
+
+    device: str
+    mount_point: str
+    fstype: str
+
+
+def _unescape(field: str) -> str:
+    """Replace the octal escapes of /proc/mounts, e.g. \\040 for a space."""
+    if "\\" not in field:
+        return field
+    return field.encode("latin-1").decode("unicode_escape")
+
+
+@lru_cache(maxsize=4)
+def read_mounts(mounts_file: str = MOUNTS_FILE) -> tuple[Mount, ...]:
+    """
+    The entries of a mount table in the format of /proc/mounts.
+
+    The table is read once per mounts_file, call `read_mounts.cache_clear()`
+    after mounting file systems in a running process.
+    """
+    mounts = []
+    try:
+        with open(mounts_file, encoding="utf-8") as table:
+            for line in table:
+                fields = line.split()
+                if len(fields) >= 3:
+                    mounts.append(Mount(*(_unescape(field) for field in fields[:3])))
+    except OSError as exc:
+        logger.debug(f"Unable to read the mount table {mounts_file}: {exc}")
+    return tuple(mounts)
+
+
+def find_mount(path: str | os.PathLike, mounts_file: str = MOUNTS_FILE) -> Mount | None:
+    """The mount entry of the file system on which path is or will be stored."""
+    real_path = os.path.realpath(path)
+    found = None
+    for mount in read_mounts(mounts_file):
+        prefix = mount.mount_point.rstrip("/") + "/"
+        if real_path == mount.mount_point or real_path.startswith(prefix):
+            # the last of several mounts at the same point is visible
+            if found is None or len(mount.mount_point) >= len(found.mount_point):
+                found = mount
+    return found
+
+
+@lru_cache(maxsize=64)
+def is_rotational(device: str) -> bool | None:
+    """
+    Whether a block device is a spinning disk, None if this is unknown.
+
+    Partitions and device mapper devices are resolved via /sys/class/block.
+    """
+    if not device.startswith("/dev/"):
+        return None
+    block = os.path.join("/sys/class/block", os.path.basename(os.path.realpath(device)))
+    block = os.path.realpath(block)
+    # a partition has no queue of its own, it uses the one of its disk
+    for directory in (block, os.path.dirname(block)):
+        try:
+            with open(
+                os.path.join(directory, "queue", "rotational"), encoding="utf-8"
+            ) as flag:
+                return flag.read().strip() == "1"
+        except OSError:
+            continue
+    return None
+
+
+def detect_storage_profile(
+    path: str | os.PathLike, mounts_file: str = MOUNTS_FILE
+) -> str:
+    """
+    The name of the storage profile which fits the file system of path.
+
+    Lustre and GPFS are recognised by their file system type, memory-backed
+    file systems and non-rotational block devices use the "ssd_nvm" profile,
+    rotational ones the "hdd" profile. Everything else, e.g. network or
+    overlay file systems, uses the default profile.
+    """
+    mount = find_mount(path, mounts_file)
+    if mount is None:
+        return DEFAULT_STORAGE_PROFILE
+    if mount.fstype in _PROFILE_OF_FSTYPE:
+        return _PROFILE_OF_FSTYPE[mount.fstype]
+    rotational = is_rotational(mount.device)
+    if rotational is None:
+        return DEFAULT_STORAGE_PROFILE
+    return "hdd" if rotational else "ssd_nvm"
+
+
+def get_storage_profile(
+    path: Any = None, profile: str | StorageProfile | None = None
+) -> StorageProfile:
+    """
+    The storage profile for a file at path.
+
+    Args:
+        path (optional): The path of the file. Objects which are not paths,
+            e.g. file-like objects, use the default profile. Defaults to None.
+        profile (str | StorageProfile | None, optional): An explicit profile
+            or the name of one. None or "auto" use the profile named in the
+            environment variable PYNXTOOLS_STORAGE_PROFILE, if set, or the
+            one detected for path. Defaults to None.
+
+    Raises:
+        ValueError: If there is no profile of the given name.
+    """
+    if isinstance(profile, StorageProfile):
+        return profile
+    if profile in (None, "auto"):
+        profile = os.environ.get(STORAGE_PROFILE_ENV, "auto").strip() or "auto"
+    if profile == "auto":
+        if isinstance(path, (str, os.PathLike)):
+            profile = detect_storage_profile(path)
+        else:
+            profile = DEFAULT_STORAGE_PROFILE
+    try:
+        return STORAGE_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown storage profile {profile!r}, use one of "
+            f"{', '.join(['auto', *STORAGE_PROFILES])}."
+        ) from None
+
+
+def open_hdf5(
+    path: Any,
+    mode: str = "r",
+    profile: str | StorageProfile | None = None,
+    **kwargs,
+) -> h5py.File:
+    """
+    Open an HDF5 file with the storage profile of its path.
+
+    The filters of hdf5plugin are not registered here, call
+    `register_filters_of` before the values of a dataset are read.
+
+    Args:
+        path: The path or file-like object passed to `h5py.File`.
+        mode (str, optional): The mode passed to `h5py.File`. Defaults to "r".
+        profile (str | StorageProfile | None, optional): The storage profile,
+            see `get_storage_profile`. Defaults to None.
+        **kwargs: Further arguments of `h5py.File`, which take precedence over
+            the settings of the profile.
+    """
+    return h5py.File(
+        path, mode, **{**get_storage_profile(path, profile).file_kwargs(), **kwargs}
+    )
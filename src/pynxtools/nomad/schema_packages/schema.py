@@ -30,10 +30,6 @@ from typing import Any, Optional, Union
 import h5py
 import numpy as np
 import orjson
-import pandas as pd
-from ase import Atoms
-from ase.data import atomic_numbers
-from scipy.spatial import cKDTree
 from toposort import toposort_flatten
 
 try:
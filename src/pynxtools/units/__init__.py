@@ -17,16 +17,31 @@
 #
 """A unit registry for NeXus units"""
 
+import functools
 import os
 from typing import Any, Optional
 
-from pint import UnitRegistry
-from pint.errors import DefinitionSyntaxError, DimensionalityError, UndefinedUnitError
 
-try:
-    from nomad.units import ureg
-except ImportError as exc:
-    ureg = UnitRegistry(os.path.join(os.path.dirname(__file__), "default_en.txt"))
+@functools.cache
+def get_ureg():
+    """
+    The unit registry of NOMAD if it is installed, else one with the NeXus
+    units. pint takes long to import, so the registry is created on first use.
+    """
+    try:
+        from nomad.units import ureg
+    except ImportError:
+        from pint import UnitRegistry
+
+        ureg = UnitRegistry(os.path.join(os.path.dirname(__file__), "default_en.txt"))
+    return ureg
+
+
+def __getattr__(name: str):
+    # `ureg` is created on first access
+    if name == "ureg":
+        return get_ureg()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class NXUnitSet:
@@ -140,6 +155,9 @@ class NXUnitSet:
         if nx_unit in cls._default_units:
             return cls._default_units[nx_unit]
 
+        ureg = get_ureg()
+        from pint.errors import DefinitionSyntaxError, UndefinedUnitError
+
         if nx_unit in cls.mapping:
             result = cls.default_unit.get(nx_unit)
         else:
@@ -167,6 +185,9 @@ class NXUnitSet:
         if nx_unit in cls._dimensionalities:
             return cls._dimensionalities[nx_unit]
 
+        ureg = get_ureg()
+        from pint.errors import DefinitionSyntaxError, UndefinedUnitError
+
         definition = cls.mapping.get(nx_unit)
         if definition == "1":
             cls._dimensionalities[nx_unit] = ureg("").dimensionality
@@ -207,6 +228,12 @@ class NXUnitSet:
             bool: True if the actual unit matches the expected dimensionality;
                 False otherwise.
         """
+        ureg = get_ureg()
+        from pint.errors import (
+            DefinitionSyntaxError,
+            DimensionalityError,
+            UndefinedUnitError,
+        )
 
         def is_valid_unit(unit: str):
             """Check if unit is generally valid."""
@@ -21,7 +21,13 @@ REF_DIR = Path(__file__).parent.parent / "data" / "annotator"
 
 
 def _get_log(
-    nxs_file, tmp_path, log_name, *, handler_level=logging.DEBUG, **annotator_kwargs
+    nxs_file,
+    tmp_path,
+    log_name,
+    *,
+    handler_level=logging.DEBUG,
+    handler_kwargs=None,
+    **annotator_kwargs,
 ):
     """Run Annotator on nxs_file without a formatter; return list of lines.
 
@@ -35,7 +41,9 @@ def _get_log(
     handler = logging.FileHandler(log_path, "w", encoding="utf-8")
     handler.setLevel(handler_level)
     logger.addHandler(handler)
-    NexusFileHandler(nxs_file).process(Annotator(logger, **annotator_kwargs))
+    NexusFileHandler(nxs_file, **(handler_kwargs or {})).process(
+        Annotator(logger, **annotator_kwargs)
+    )
 
     return log_path.read_text(encoding="utf-8").splitlines(keepends=True)
 
@@ -94,6 +102,20 @@ def test_nexus(tmp_path):
     _compare_logs(actual, reference)
 
 
+def test_metadata_only_gives_same_annotation(tmp_path):
+    """Fields given as descriptors are annotated like the datasets themselves."""
+    np.set_printoptions(edgeitems=3, threshold=1000, precision=8, linewidth=75)
+    full = _get_log(EXAMPLE_NXS, tmp_path, "full.log")
+    metadata_only = _get_log(
+        EXAMPLE_NXS,
+        tmp_path,
+        "metadata_only.log",
+        handler_kwargs={"metadata_only": True, "max_value_bytes": 2**30},
+    )
+    assert any("[UNIT: NX_ENERGY]" in line for line in metadata_only)
+    _compare_logs(metadata_only, full)
+
+
 def test_d_option(tmp_path):
     """-d mode output for /entry/instrument/analyser/data matches Ref_d_option_test.log."""
     actual = _get_log(
@@ -0,0 +1,76 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the registry of built-in and plugin readers."""
+
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from pynxtools.dataconverter.readers import registry as registry_module
+from pynxtools.dataconverter.readers.example.reader import ExampleReader
+from pynxtools.dataconverter.readers.registry import ENTRY_POINT_GROUP, ReaderRegistry
+
+
+@pytest.fixture
+def plugins(monkeypatch):
+    """The entry points seen by the registry, with counted scans."""
+    plugins = {"scans": 0, "entry_points": []}
+
+    def entry_points(group):
+        assert group == ENTRY_POINT_GROUP
+        plugins["scans"] += 1
+        return list(plugins["entry_points"])
+
+    monkeypatch.setattr(registry_module, "entry_points", entry_points)
+    return plugins
+
+
+def plugin(name: str) -> EntryPoint:
+    return EntryPoint(
+        name=name,
+        value="pynxtools.dataconverter.readers.example.reader:ExampleReader",
+        group=ENTRY_POINT_GROUP,
+    )
+
+
+def test_builtin_readers(plugins):
+    registry = ReaderRegistry()
+    assert {"base", "example", "json_map", "multi"} <= set(registry.builtins)
+    assert registry.get("example") is ExampleReader
+    assert registry.get("example") is registry.get("example")
+    # Built-in readers are found without scanning the plugins
+    assert plugins["scans"] == 0
+    assert "base" not in registry.names()
+
+
+def test_plugin_readers(plugins):
+    plugins["entry_points"].append(plugin("first"))
+    registry = ReaderRegistry()
+    assert "first" in registry.names()
+    assert registry.get("first") is ExampleReader
+
+    plugins["entry_points"].append(plugin("second"))
+    with pytest.raises(ValueError, match="The reader, second, was not found."):
+        registry.get("second")
+    assert plugins["scans"] == 1
+
+    registry.refresh()
+    assert registry.get("second") is ExampleReader
+    assert registry.names() == sorted(registry.names())
+    assert {"first", "second"} <= set(registry.names())
+    assert plugins["scans"] == 2
@@ -0,0 +1,193 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the batch conversion of many jobs."""
+
+import json
+import os
+
+import h5py
+import pytest
+from click.testing import CliRunner
+
+from pynxtools.dataconverter.batch import BatchJob, read_manifest, run_batch, run_job
+from pynxtools.dataconverter.cli import convert
+from pynxtools.dataconverter.convert import ConversionCache
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "../data/dataconverter/readers")
+EXAMPLE_DATA = os.path.join(DATA_DIR, "example", "testdata.json")
+JSON_MAP_DIR = os.path.join(DATA_DIR, "json_map")
+
+
+def json_map_job(output: str) -> BatchJob:
+    return BatchJob(
+        input_file=(os.path.join(JSON_MAP_DIR, "data.json"),),
+        output=output,
+        reader="json_map",
+        nxdl="NXtest",
+        options={"config_file": os.path.join(JSON_MAP_DIR, "data.config.json")},
+    )
+
+
+@pytest.mark.parametrize(
+    "name,content",
+    [
+        pytest.param(
+            "jobs.csv",
+            "input_file,output,skip_verify\na.json;b.json,a.nxs,true\nc.json,c.nxs,\n",
+            id="csv",
+        ),
+        pytest.param(
+            "jobs.jsonl",
+            '{"input_file": ["a.json", "b.json"], "output": "a.nxs", '
+            '"skip-verify": true}\n\n{"input_file": "c.json", "output": "c.nxs"}\n',
+            id="jsonl",
+        ),
+        pytest.param(
+            "jobs.yaml",
+            "defaults:\n  reader: example\njobs:\n"
+            "  - {input_file: [a.json, b.json], output: a.nxs, skip_verify: true}\n"
+            "  - {input_file: c.json, output: c.nxs}\n",
+            id="yaml",
+        ),
+    ],
+)
+def test_read_manifest(tmp_path, name, content):
+    manifest = tmp_path / name
+    manifest.write_text(content)
+    jobs = read_manifest(str(manifest), {"reader": "example", "nxdl": "NXtest"})
+    assert jobs == [
+        BatchJob(
+            ("a.json", "b.json"), "a.nxs", "example", "NXtest", {"skip_verify": True}
+        ),
+        BatchJob(("c.json",), "c.nxs", "example", "NXtest", {}),
+    ]
+
+
+@pytest.mark.parametrize(
+    "name,content",
+    [
+        pytest.param(
+            "jobs.jsonl", '{"output": "a.nxs", "reader": "example"}', id="no-nxdl"
+        ),
+        pytest.param("jobs.txt", "a.json a.nxs", id="format"),
+    ],
+)
+def test_read_invalid_manifest(tmp_path, name, content):
+    manifest = tmp_path / name
+    manifest.write_text(content)
+    with pytest.raises(ValueError):
+        read_manifest(str(manifest))
+
+
+# Shared resources: xarray_saved_small_calibration.h5 and testdata.json
+@pytest.mark.xdist_group(name="shared_resource")
+def test_run_batch_shares_cache(tmp_path):
+    jobs = [
+        BatchJob((EXAMPLE_DATA,), str(tmp_path / f"{idx}.nxs"), "example", "NXtest")
+        for idx in range(3)
+    ]
+    jobs.append(
+        BatchJob(("missing.json",), str(tmp_path / "missing.nxs"), "example", "NXtest")
+    )
+    cache = ConversionCache()
+    results = list(run_batch(jobs, cache=cache))
+
+    assert [result.output for result in results] == [job.output for job in jobs]
+    # The example data is incomplete on purpose
+    assert [result.status for result in results] == ["invalid"] * 3 + ["failed"]
+    assert [result.valid for result in results] == [False] * 3 + [None]
+    assert results[-1].error.startswith("FileNotFoundError")
+    assert set(cache.trees) == set(cache.templates) == {"NXtest"}
+    assert set(cache.readers) == {"example"}
+
+    # A job with a warm cache validates and writes the same as a cold one
+    cold = run_job(
+        BatchJob((EXAMPLE_DATA,), str(tmp_path / "cold.nxs"), "example", "NXtest")
+    )
+
+    # file names and times of the root attributes differ
+    def without_root(messages):
+        return [message for message in messages if "NXroot entry" not in message]
+
+    assert without_root(cold.messages) == without_root(results[2].messages)
+    with (
+        h5py.File(tmp_path / "cold.nxs", "r") as cold_file,
+        h5py.File(tmp_path / "2.nxs", "r") as warm_file,
+    ):
+        cold_names, warm_names = [], []
+        cold_file.visit(cold_names.append)
+        warm_file.visit(warm_names.append)
+        assert cold_names == warm_names
+
+
+def test_run_batch_in_workers(tmp_path):
+    jobs = [json_map_job(str(tmp_path / f"{idx}.nxs")) for idx in range(3)]
+    jobs[1].options["skip_verify"] = True
+    results = list(run_batch(jobs, workers=2))
+
+    assert [result.output for result in results] == [job.output for job in jobs]
+    assert [result.valid for result in results] == [False, None, False]
+    assert all(os.path.exists(job.output) for job in jobs)
+
+
+def test_run_batch_duplicate_output(tmp_path):
+    jobs = [json_map_job(str(tmp_path / "same.nxs")) for _ in range(2)]
+    with pytest.raises(ValueError):
+        list(run_batch(jobs))
+
+
+def test_batch_cli(tmp_path):
+    manifest = tmp_path / "jobs.jsonl"
+    report = tmp_path / "report.jsonl"
+    with open(manifest, "w", encoding="utf-8") as file:
+        for idx in range(2):
+            job = json_map_job(str(tmp_path / f"{idx}.nxs"))
+            file.write(
+                json.dumps(
+                    {
+                        "input_file": list(job.input_file),
+                        "output": job.output,
+                        **job.options,
+                    }
+                )
+                + "\n"
+            )
+
+    result = CliRunner().invoke(
+        convert,
+        [
+            "batch",
+            str(manifest),
+            "--reader",
+            "json_map",
+            "--nxdl",
+            "NXtest",
+            "--workers",
+            "1",
+            "--fail",
+            "--report",
+            str(report),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "2 jobs in" in result.output
+    lines = [json.loads(line) for line in report.read_text().splitlines()]
+    assert [line["status"] for line in lines] == ["invalid", "invalid"]
+    assert all(line["error"].startswith("The data does not match") for line in lines)
+    # --fail prevents writing invalid files
+    assert not os.path.exists(tmp_path / "0.nxs")
@@ -17,10 +17,19 @@
 #
 """Test cases chunking and compression."""
 
+import os
+
+import h5py
 import numpy as np
 import pytest
 
-from pynxtools.dataconverter.chunk import prioritized_axes_heuristic
+from pynxtools.dataconverter.chunk import (
+    access_pattern_priority,
+    load_access_patterns,
+    prioritized_axes_heuristic,
+)
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.writer import Writer
 
 
 @pytest.mark.parametrize(
@@ -96,3 +105,81 @@ def test_prioritized_axes_heuristic_large(
 
 
 # unlimited axis
+
+
+@pytest.mark.parametrize(
+    "ndim, pattern, axes, expected",
+    [
+        (3, None, (), (0, 1, 2)),
+        (3, "image", (), (0, 1, 2)),
+        (3, "spectrum", (), (0, 1, 2)),
+        (2, "rgb-image", (), (0, 1)),
+        (3, [0], (), (1, 2, 0)),
+        (3, [-3, 1], (), (2, 0, 1)),
+        (3, ["energy"], ("kx", "ky", "energy"), (0, 1, 2)),
+        (3, ["time"], ("time", "x", "y"), (1, 2, 0)),
+        (3, ["time"], ("x", "y"), None),
+        (3, [3], (), None),
+    ],
+    ids=[
+        "c-order",
+        "image",
+        "spectrum",
+        "interpretation-exceeds-ndim",
+        "index",
+        "negative-index",
+        "axis-name-last",
+        "axis-name-first",
+        "unknown-axis-name",
+        "invalid-index",
+    ],
+)
+def test_access_pattern_priority(ndim, pattern, axes, expected):
+    assert access_pattern_priority(ndim, pattern, axes) == expected
+
+
+def test_load_access_patterns(tmp_path):
+    hint_file = tmp_path / "NXtest.yaml"
+    hint_file.write_text("/ENTRY/DATA: image\n/ENTRY/DATA/data: [time, 1]\n")
+    assert load_access_patterns(hint_file) == {
+        "/ENTRY/DATA": "image",
+        "/ENTRY/DATA/data": ["time", 1],
+    }
+    assert load_access_patterns(None) == {}
+    with pytest.raises(ValueError, match="Invalid access pattern 'movie'"):
+        load_access_patterns({"/ENTRY/DATA": "movie"})
+
+
+def test_nxdata_signals_are_chunked_along_access_pattern(tmp_path):
+    """Signals of NXdata and datasets with hints are chunked by the heuristic."""
+    data = Template()
+    prefix = "/ENTRY[entry]/DATA[data]"
+    data[f"{prefix}/@signal"] = "intensity"
+    data[f"{prefix}/@auxiliary_signals"] = ["counts"]
+    data[f"{prefix}/@axes"] = ["x", "y", "energy"]
+    data[f"{prefix}/@time_indices"] = 0
+    data[f"{prefix}/intensity"] = np.zeros((64, 128, 256), np.float32)
+    data[f"{prefix}/intensity/@interpretation"] = "image"
+    data[f"{prefix}/counts"] = {"compress": np.zeros((64, 128, 256), np.float32)}
+    data[f"{prefix}/other"] = np.zeros((64, 128, 256), np.float32)
+    data["/ENTRY[entry]/NXODD_name[odd]/float_value"] = np.zeros(
+        (64, 128, 256), np.float32
+    )
+    output_file_path = os.path.join(tmp_path, "chunks.nxs")
+    Writer(
+        data,
+        os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+        output_file_path,
+        storage_profile="hfivepy",
+        access_patterns={
+            "/ENTRY/DATA/counts": ["time"],
+            "/ENTRY/NXODD_name": "spectrum",
+        },
+    ).write()
+
+    with h5py.File(output_file_path, "r") as h5file:
+        assert h5file["/entry/data/intensity"].chunks == (8, 128, 256)
+        assert h5file["/entry/data/counts"].chunks == (64, 8, 256)
+        assert h5file["/entry/odd/float_value"].chunks == (8, 128, 256)
+        # not a signal and without a hint: h5py auto-chunking
+        assert h5file["/entry/data/other"].chunks != (8, 128, 256)
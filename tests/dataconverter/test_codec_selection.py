@@ -0,0 +1,140 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the codec selection of compressed payloads with the filter auto."""
+
+import logging
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from pynxtools.dataconverter.codec_selection import (
+    CodecCandidate,
+    CodecMeasurement,
+    CompressionPolicy,
+    codec_candidates,
+    sample_selections,
+    select_codec,
+)
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.validation import validate_dict_against
+from pynxtools.dataconverter.writer import Writer
+
+from .test_helpers import alter_dict
+from .test_validation import TEMPLATE
+
+MEASUREMENTS = [
+    CodecMeasurement(CodecCandidate("none"), 1.0),
+    CodecMeasurement(CodecCandidate("fast"), 2.0, 800.0),
+    CodecMeasurement(CodecCandidate("balanced"), 3.0, 150.0),
+    CodecMeasurement(CodecCandidate("strong"), 4.0, 20.0),
+]
+
+
+@pytest.mark.parametrize(
+    "text,policy",
+    [
+        pytest.param("ratio", CompressionPolicy("ratio"), id="ratio"),
+        pytest.param(
+            "ratio:250", CompressionPolicy("ratio", min_throughput=250), id="floor"
+        ),
+        pytest.param(
+            "speed:2.5", CompressionPolicy("speed", min_ratio=2.5), id="speed"
+        ),
+    ],
+)
+def test_parse_policy(text, policy):
+    assert CompressionPolicy.parse(text) == policy
+
+
+@pytest.mark.parametrize("text", ["smallest", "ratio:fast"])
+def test_parse_invalid_policy(text):
+    with pytest.raises(ValueError):
+        CompressionPolicy.parse(text)
+
+
+@pytest.mark.parametrize(
+    "policy,selected",
+    [
+        pytest.param(CompressionPolicy("ratio", min_throughput=100), "balanced"),
+        pytest.param(CompressionPolicy("ratio", min_throughput=10), "strong"),
+        pytest.param(CompressionPolicy("ratio", min_throughput=1000), "none"),
+        pytest.param(CompressionPolicy("speed", min_ratio=1.5), "fast"),
+        pytest.param(CompressionPolicy("speed", min_ratio=2.5), "balanced"),
+        pytest.param(CompressionPolicy("speed", min_ratio=10), "none"),
+    ],
+)
+def test_select_codec(policy, selected):
+    assert select_codec(MEASUREMENTS, policy).candidate.name == selected
+
+
+def test_candidates():
+    names = [candidate.name for candidate in codec_candidates(4)]
+    assert names[:3] == ["none", "gzip-1", "gzip-1-shuffle"]
+    assert "gzip-9-shuffle" in names
+    assert not any("-shuffle" in candidate.name for candidate in codec_candidates(1))
+
+
+def test_sample_selections():
+    selections = sample_selections((100, 30), (8, 30), 4)
+    assert len(selections) == 4
+    assert selections[0] == (slice(0, 8), slice(0, 30))
+    assert selections[-1] == (slice(96, 100), slice(0, 30))
+    assert len(sample_selections((10,), (8,), 4)) == 2
+
+
+def test_writer_selects_codecs(tmp_path, caplog):
+    """Compressible data are compressed, noise under a ratio floor is not."""
+    rng = np.random.default_rng(0)
+    steps = np.repeat(np.arange(256, dtype=np.int64), 1024).reshape(256, 1024)
+    noise = rng.random((256, 1024))
+    data = Template()
+    prefix = "/ENTRY[entry]/NXODD_name[odd]"
+    data[f"{prefix}/int_value"] = {"compress": steps, "filter": "auto"}
+    data[f"{prefix}/float_value"] = {"compress": noise, "filter": "auto"}
+    output_file_path = os.path.join(tmp_path, "auto.nxs")
+    with caplog.at_level(logging.INFO):
+        Writer(
+            data,
+            os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+            output_file_path,
+            compression_policy="speed:1.5",
+        ).write()
+    assert "Selected the codec none for float_value" in caplog.text
+
+    with h5py.File(output_file_path, "r") as h5file:
+        int_value = h5file["/entry/odd/int_value"]
+        assert int_value.id.get_create_plist().get_nfilters() > 0
+        assert int_value.id.get_storage_size() < steps.nbytes / 10
+        np.testing.assert_array_equal(int_value[()], steps)
+        float_value = h5file["/entry/odd/float_value"]
+        assert float_value.id.get_create_plist().get_nfilters() == 0
+        assert float_value.chunks is not None
+        np.testing.assert_array_equal(float_value[()], noise)
+
+
+def test_auto_filter_is_valid(caplog):
+    data_dict = alter_dict(
+        TEMPLATE,
+        "/ENTRY[my_entry]/NXODD_name[nxodd_name]/float_value",
+        {"compress": np.arange(10.0), "filter": "auto"},
+    )
+    with caplog.at_level(logging.WARNING):
+        assert validate_dict_against("NXtest", data_dict)
+    assert caplog.text == ""
@@ -0,0 +1,114 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the compact storage of small fields."""
+
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from pynxtools.dataconverter.compact import (
+    CompactPolicy,
+    compact_values,
+    write_compact_dataset,
+)
+from pynxtools.dataconverter.helpers import is_valid_data_type_hdf
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.writer import Writer
+
+
+@pytest.mark.parametrize(
+    "data,dtype",
+    [
+        pytest.param(1.5, np.dtype("float64"), id="float"),
+        pytest.param(np.arange(4, dtype=np.int32), np.dtype("int32"), id="array"),
+        pytest.param(True, np.dtype("bool"), id="bool"),
+        pytest.param("héllo", h5py.string_dtype("utf-8", 6), id="utf-8"),
+        pytest.param(["a", "bcd"], h5py.string_dtype("utf-8", 3), id="strings"),
+        pytest.param(b"raw", np.dtype("S3"), id="bytes"),
+    ],
+)
+def test_compact_values(data, dtype):
+    values, compact_dtype = compact_values(data, CompactPolicy())
+    assert compact_dtype == dtype
+    assert values.shape == np.shape(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(np.zeros(1024), id="too-large"),
+        pytest.param("x" * 300, id="long-string"),
+        pytest.param(np.array([]), id="empty"),
+        pytest.param(np.array([None, "a"], dtype=object), id="mixed"),
+        pytest.param({"a": 1}, id="object"),
+    ],
+)
+def test_not_compact(data):
+    assert compact_values(data, CompactPolicy()) is None
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        CompactPolicy(max_compact_bytes=70000)
+
+
+def test_write_compact_dataset(tmp_path):
+    with h5py.File(tmp_path / "compact.h5", "w") as h5file:
+        scalar = write_compact_dataset(h5file, "scalar", 2.0, CompactPolicy())
+        assert scalar.id.get_create_plist().get_layout() == h5py.h5d.COMPACT
+        assert scalar[()] == 2.0
+        strings = write_compact_dataset(h5file, "strings", ["é", "ab"], CompactPolicy())
+        assert strings.id.get_create_plist().get_layout() == h5py.h5d.COMPACT
+        assert strings.id.get_type().get_cset() == h5py.h5t.CSET_UTF8
+        assert strings.asstr()[()].tolist() == ["é", "ab"]
+        assert is_valid_data_type_hdf(strings, (str,))
+        assert (
+            write_compact_dataset(h5file, "large", np.zeros(1024), CompactPolicy())
+            is None
+        )
+        assert "large" not in h5file
+        with pytest.raises(ValueError):
+            write_compact_dataset(h5file, "scalar", 3.0, CompactPolicy())
+
+
+def test_writer_with_compact_storage(tmp_path):
+    data = Template()
+    prefix = "/ENTRY[entry]/NXODD_name[odd]"
+    data[f"{prefix}/float_value"] = 1.5
+    data[f"{prefix}/float_value/@units"] = "eV"
+    data[f"{prefix}/char_value"] = "a short string"
+    data[f"{prefix}/int_value"] = np.arange(1000)
+    output_file_path = os.path.join(tmp_path, "compact.nxs")
+    Writer(
+        data,
+        os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+        output_file_path,
+        compact_storage=CompactPolicy(max_compact_bytes=1024),
+    ).write()
+
+    with h5py.File(output_file_path, "r") as h5file:
+        odd = h5file["/entry/odd"]
+        float_value = odd["float_value"]
+        assert float_value.id.get_create_plist().get_layout() == h5py.h5d.COMPACT
+        assert float_value.attrs["units"] == "eV"
+        assert odd["char_value"].asstr()[()] == "a short string"
+        assert odd["char_value"].dtype.kind == "S"
+        # larger fields are chunked as before
+        assert odd["int_value"].chunks is not None
@@ -0,0 +1,177 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the filter pipelines and parallel direct chunk compression."""
+
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from pynxtools.dataconverter.compression import (
+    BITSHUFFLE_FILTER_ID,
+    LZ4_FILTER_ID,
+    PARALLEL_COMPRESSION_FILTERS,
+    ZSTD_FILTER_ID,
+    FilterPipeline,
+    auto_chunk_shape,
+    read_chunk,
+    write_compressed_dataset,
+)
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.writer import Writer
+
+ARRAYS = {
+    "float32": np.random.default_rng(0).normal(size=(101, 77)).astype("<f4"),
+    "big_endian_int16": np.arange(33 * 1000, dtype=">i2").reshape(33, 1000) % 50,
+    "uint8": np.arange(5000, dtype=np.uint8) % 3,
+    "complex64": (np.ones((40, 40)) + 1j).astype(np.complex64),
+}
+
+
+def _filter_ids(dataset: h5py.Dataset) -> list[int]:
+    dcpl = dataset.id.get_create_plist()
+    return [dcpl.get_filter(idx)[0] for idx in range(dcpl.get_nfilters())]
+
+
+@pytest.mark.parametrize("codec", ["gzip", "zstd", "lz4"])
+@pytest.mark.parametrize("shuffle", [None, "byte", "bit"])
+@pytest.mark.parametrize("name", list(ARRAYS))
+def test_direct_chunk_writes_roundtrip(tmp_path, codec, shuffle, name):
+    """Chunks encoded in Python are decoded by the registered HDF5 filters."""
+    if codec not in PARALLEL_COMPRESSION_FILTERS:
+        pytest.skip(f"No Python encoder for {codec} installed.")
+    data = ARRAYS[name]
+    chunks = (16,) if data.ndim == 1 else (16, max(1, data.shape[1] // 3))
+    with h5py.File(tmp_path / "roundtrip.h5", "w") as h5file:
+        dataset = write_compressed_dataset(
+            h5file,
+            "data",
+            data,
+            FilterPipeline(codec, 5, shuffle),
+            chunks=chunks,
+            max_workers=2,
+        )
+        assert dataset.chunks == chunks
+        assert dataset.dtype == data.dtype
+        np.testing.assert_array_equal(dataset[()], data)
+
+
+@pytest.mark.parametrize("shuffle", [None, "byte", "bit"])
+def test_deflate_chunks_match_hdf5(tmp_path, shuffle):
+    """Direct chunk writes store the same bytes as the HDF5 filter pipeline."""
+    data = ARRAYS["float32"]
+    pipeline = FilterPipeline("gzip", 4, shuffle)
+    with h5py.File(tmp_path / "deflate.h5", "w") as h5file:
+        direct = write_compressed_dataset(
+            h5file, "direct", data, pipeline, chunks=(30, 20), max_workers=3
+        )
+        reference = write_compressed_dataset(
+            h5file, "reference", data, pipeline, chunks=(30, 20)
+        )
+        for selection in direct.iter_chunks():
+            offset = tuple(dim.start for dim in selection)
+            assert (
+                direct.id.read_direct_chunk(offset)[1]
+                == reference.id.read_direct_chunk(offset)[1]
+            )
+
+
+def test_direct_chunk_writes_from_memmap(tmp_path):
+    """Memory-mapped sources are read chunk by chunk."""
+    source = np.memmap(
+        tmp_path / "source.raw", dtype=np.uint16, mode="w+", shape=(50, 64)
+    )
+    source[:] = np.arange(50 * 64).reshape(50, 64) % 1000
+    source.flush()
+    with h5py.File(tmp_path / "memmap.h5", "w") as h5file:
+        dataset = write_compressed_dataset(
+            h5file,
+            "data",
+            np.memmap(tmp_path / "source.raw", dtype=np.uint16, shape=(50, 64)),
+            FilterPipeline("gzip", 1, "byte"),
+            chunks=(8, 64),
+            max_workers=2,
+        )
+        np.testing.assert_array_equal(dataset[()], source)
+
+
+def test_filter_ids_of_hdf5plugin():
+    hdf5plugin = pytest.importorskip("hdf5plugin")
+    assert ZSTD_FILTER_ID == hdf5plugin.Zstd.filter_id
+    assert LZ4_FILTER_ID == hdf5plugin.LZ4.filter_id
+    assert BITSHUFFLE_FILTER_ID == hdf5plugin.Bitshuffle.filter_id
+
+
+def test_auto_chunk_shape(tmp_path):
+    """The chunks of h5py auto-chunking, without creating the dataset."""
+    data = ARRAYS["big_endian_int16"]
+    with h5py.File(tmp_path / "auto.h5", "w") as h5file:
+        dataset = h5file.create_dataset("data", data=data, chunks=True)
+        assert auto_chunk_shape(data.shape, data.dtype) == dataset.chunks
+
+
+def test_read_chunk_pads_edge_chunks():
+    data = ARRAYS["uint8"]
+    chunk = read_chunk(data, (slice(4992, 5000),), (16,), data.dtype)
+    assert chunk.shape == (16,)
+    np.testing.assert_array_equal(chunk[:8], data[4992:])
+    assert not chunk[8:].any()
+
+
+def test_unknown_pipeline_options():
+    with pytest.raises(ValueError, match="compression filter"):
+        FilterPipeline("bzip2")
+    with pytest.raises(ValueError, match="shuffle mode"):
+        FilterPipeline("gzip", 9, "nibble")
+
+
+def test_writer_compresses_in_parallel(tmp_path):
+    """The writer uses direct chunk writes with compression_workers > 0."""
+    data = np.arange(200 * 300, dtype=np.int32).reshape(200, 300) % 17
+    template = Template()
+    template["/ENTRY[entry]/NXODD_name[odd]/int_value"] = {
+        "compress": data,
+        "filter": "zstd",
+        "strength": 3,
+        "shuffle": "bit",
+    }
+    template["/ENTRY[entry]/NXODD_name[odd]/float_value"] = {
+        "compress": data.astype(np.float64),
+        "strength": 6,
+        "shuffle": "byte",
+    }
+    output_file_path = os.path.join(tmp_path, "parallel.nxs")
+    Writer(
+        template,
+        os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+        output_file_path,
+        compression_workers=2,
+    ).write()
+
+    with h5py.File(output_file_path, "r") as h5file:
+        int_value = h5file["/entry/odd/int_value"]
+        assert _filter_ids(int_value) == [BITSHUFFLE_FILTER_ID, ZSTD_FILTER_ID]
+        np.testing.assert_array_equal(int_value[()], data)
+        float_value = h5file["/entry/odd/float_value"]
+        assert _filter_ids(float_value) == [
+            h5py.h5z.FILTER_SHUFFLE,
+            h5py.h5z.FILTER_DEFLATE,
+        ]
+        assert float_value.compression_opts == 6
+        np.testing.assert_array_equal(float_value[()], data)
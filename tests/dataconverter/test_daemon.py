@@ -0,0 +1,166 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the conversion server and its client."""
+
+import json
+import os
+import stat
+import threading
+
+import pytest
+from click.testing import CliRunner
+
+from pynxtools.dataconverter import client
+from pynxtools.dataconverter.client import (
+    ServerError,
+    default_socket_path,
+    main,
+    send_request,
+)
+from pynxtools.dataconverter.daemon import ConversionServer
+
+JSON_MAP_DIR = os.path.join(
+    os.path.dirname(__file__), "../data/dataconverter/readers/json_map"
+)
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    socket_path = str(tmp_path_factory.mktemp("daemon") / "test.sock")
+    conversion_server = ConversionServer(socket_path, max_jobs_per_worker=2)
+    thread = threading.Thread(target=conversion_server.serve_forever)
+    thread.start()
+    yield socket_path
+    if thread.is_alive():
+        conversion_server.shutdown()
+        thread.join()
+
+
+def convert_arguments(output: str) -> dict:
+    return {
+        "input_file": [os.path.join(JSON_MAP_DIR, "data.json")],
+        "reader": "json_map",
+        "nxdl": "NXtest",
+        "output": output,
+        "config_file": os.path.join(JSON_MAP_DIR, "data.config.json"),
+    }
+
+
+def test_convert(server, tmp_path):
+    # More requests than a worker handles before it is replaced
+    for idx in range(3):
+        result = send_request(
+            "convert", convert_arguments(str(tmp_path / f"{idx}.nxs")), server
+        )
+        # The json_map test data is incomplete on purpose
+        assert result["status"] == "invalid"
+        assert result["valid"] is False
+        assert os.path.exists(result["output"])
+
+    status = send_request("status", socket_path=server)
+    assert status["completed"] >= 3
+    assert status["queued"] == 0
+
+
+def test_validate(server, tmp_path):
+    output = str(tmp_path / "output.nxs")
+    send_request("convert", convert_arguments(output), server)
+    result = send_request("validate", {"file": output}, server)
+    assert result["valid"] is False
+    assert any("NOT valid" in message for message in result["messages"])
+
+
+def test_generate_template(server):
+    template = send_request(
+        "generate-template", {"nxdl": "NXtest", "required": True}, server
+    )
+    assert "/ENTRY[entry]/NXODD_name[nxodd_name]/bool_value" in template
+
+    result = CliRunner().invoke(
+        main, ["--socket", server, "generate-template", "NXtest"]
+    )
+    assert result.exit_code == 0
+    assert json.loads(result.output).keys() >= template.keys()
+
+
+def test_client_exit_codes(server, tmp_path):
+    arguments = [
+        "--socket",
+        server,
+        "convert",
+        os.path.join(JSON_MAP_DIR, "data.json"),
+        "--config",
+        os.path.join(JSON_MAP_DIR, "data.config.json"),
+        "--nxdl",
+        "NXtest",
+        "--output",
+        str(tmp_path / "output.nxs"),
+    ]
+    runner = CliRunner()
+    assert runner.invoke(main, arguments).exit_code == 0
+    assert runner.invoke(main, arguments + ["--fail"]).exit_code == 1
+    result = runner.invoke(
+        main, ["--socket", server, "convert", "missing.json", "--nxdl", "NXtest"]
+    )
+    assert result.exit_code != 0
+    result = runner.invoke(main, ["--socket", server + ".missing", "status"])
+    assert result.exit_code == 1
+    assert "No conversion server" in result.output
+
+
+def test_request_errors(server, tmp_path):
+    with pytest.raises(ServerError, match="Unknown command"):
+        send_request("unknown", socket_path=server)
+    with pytest.raises(ServerError, match="No conversion server"):
+        send_request("status", socket_path=str(tmp_path / "missing.sock"))
+    with pytest.raises(RuntimeError, match="already listens"):
+        ConversionServer(server)
+
+
+def test_shutdown(tmp_path):
+    socket_path = str(tmp_path / "shutdown.sock")
+    # A socket left over by a crashed server is replaced
+    open(socket_path, "w").close()
+    conversion_server = ConversionServer(socket_path)
+    thread = threading.Thread(target=conversion_server.serve_forever)
+    thread.start()
+
+    assert CliRunner().invoke(main, ["--socket", socket_path, "status"]).exit_code == 0
+    assert send_request("shutdown", socket_path=socket_path)["queued"] == 0
+    thread.join(timeout=60)
+    assert not thread.is_alive()
+    assert not os.path.exists(socket_path)
+
+
+def test_default_socket_path(tmp_path, monkeypatch):
+    monkeypatch.setenv(client.SOCKET_ENV, str(tmp_path / "env.sock"))
+    assert default_socket_path() == str(tmp_path / "env.sock")
+    monkeypatch.delenv(client.SOCKET_ENV)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert os.path.dirname(default_socket_path()) == str(tmp_path)
+
+    # Without a runtime directory, the socket is in a private directory
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    monkeypatch.setattr(client.tempfile, "gettempdir", lambda: str(tmp_path))
+    directory = os.path.dirname(default_socket_path())
+    assert os.path.dirname(directory) == str(tmp_path)
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+
+    os.chmod(directory, 0o755)
+    with pytest.raises(ServerError, match="only the user can access"):
+        default_socket_path()
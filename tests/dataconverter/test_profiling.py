@@ -0,0 +1,188 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the per-stage profiling of conversions."""
+
+import json
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from pynxtools.dataconverter import profiling
+from pynxtools.dataconverter.cli import convert
+from pynxtools.dataconverter.convert import profile_conversion
+from pynxtools.dataconverter.profiling import ConversionStats
+
+JSON_MAP_DIR = os.path.join(
+    os.path.dirname(__file__), "../data/dataconverter/readers/json_map"
+)
+
+
+def test_stages_and_phases():
+    stats = ConversionStats()
+    with stats.stage("outer", nxdl="NXtest"):
+        stats.phase("first")
+        stats.add_metric("items", 2)
+        stats.add_metric("items", 3)
+        stats.phase("second")
+        with stats.stage("inner"):
+            pass
+    with stats.stage("after"):
+        pass
+
+    assert [(s.name, s.depth) for s in stats.stages] == [
+        ("outer", 0),
+        ("first", 1),
+        ("second", 1),
+        ("inner", 2),
+        ("after", 0),
+    ]
+    assert stats.stages[0].metrics == {"nxdl": "NXtest"}
+    assert stats.stages[1].metrics == {"items": 5}
+    assert all(s.wall >= 0 and s.cpu >= 0 for s in stats.stages)
+    assert stats.stages[0].wall >= stats.stages[1].wall + stats.stages[2].wall
+    assert stats.total == stats.stages[0].wall + stats.stages[4].wall
+    assert stats.summary()["inner"]["count"] == 1
+
+
+def test_module_functions_without_recording():
+    # Without recording stats, the conversion code is not profiled.
+    with profiling.stage("stage"):
+        profiling.phase("phase")
+        profiling.add_metric("metric", 1)
+
+    stats = ConversionStats()
+    with profiling.recording(stats), profiling.stage("stage"):
+        profiling.phase("phase")
+        profiling.add_metric("metric", 1)
+    assert [s.name for s in stats.stages] == ["stage", "phase"]
+    assert stats.stages[1].metrics == {"metric": 1}
+
+
+def test_write(tmp_path):
+    stats = ConversionStats()
+    with stats.stage("convert", output="out.nxs"):
+        pass
+
+    stats.write(str(tmp_path / "profile.json"))
+    content = json.loads((tmp_path / "profile.json").read_text())
+    assert content["stages"][0]["name"] == "convert"
+    assert content["summary"]["convert"]["count"] == 1
+
+    stats.write(str(tmp_path / "trace.json"), "chrome")
+    (event,) = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert event["ph"] == "X"
+    assert event["dur"] == pytest.approx(stats.stages[0].wall * 1e6)
+    assert event["args"]["output"] == "out.nxs"
+
+    with pytest.raises(ValueError, match="Unknown profile format"):
+        stats.write(str(tmp_path / "profile.txt"), "txt")
+
+
+def test_profile_conversion(tmp_path):
+    stats = profile_conversion(
+        (os.path.join(JSON_MAP_DIR, "data.json"),),
+        "json_map",
+        "NXtest",
+        str(tmp_path / "output.nxs"),
+        config_file=os.path.join(JSON_MAP_DIR, "data.config.json"),
+    )
+
+    names = [stage.name for stage in stats.stages]
+    for name in (
+        "convert",
+        "NXDL load",
+        "read",
+        "read file",
+        "fill_from_config",
+        "validate",
+        "NeXus tree",
+        "write",
+        "HDF5 objects",
+        "close",
+    ):
+        assert name in names
+    assert stats.stages[0].name == "convert"
+    assert stats.stages[0].depth == 0
+    (write,) = [stage for stage in stats.stages if stage.name == "write"]
+    assert write.metrics["bytes_written"] == os.path.getsize(tmp_path / "output.nxs")
+    (read_file,) = [stage for stage in stats.stages if stage.name == "read file"]
+    assert read_file.metrics["extension"] == ".json"
+
+    depths = {stage.name: stage.depth for stage in stats.stages}
+    assert depths["NXDL load"] == depths["transfer data into template"] == 1
+    assert depths["template generation"] == depths["read"] == 2
+    convert_stage = stats.stages[0]
+    children = [stage for stage in stats.stages if stage.depth == 1]
+    assert sum(stage.wall for stage in children) <= convert_stage.wall
+    (nxdl_load,) = [stage for stage in stats.stages if stage.name == "NXDL load"]
+    (transfer,) = [
+        stage for stage in stats.stages if stage.name == "transfer data into template"
+    ]
+    assert nxdl_load.start + nxdl_load.wall <= transfer.start
+
+
+def test_cli_profile(tmp_path):
+    result = CliRunner().invoke(
+        convert,
+        [
+            "run",
+            os.path.join(JSON_MAP_DIR, "data.json"),
+            "--config",
+            os.path.join(JSON_MAP_DIR, "data.config.json"),
+            "--reader",
+            "json_map",
+            "--nxdl",
+            "NXtest",
+            "--output",
+            str(tmp_path / "output.nxs"),
+            "--profile",
+            str(tmp_path / "profile.json"),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    content = json.loads((tmp_path / "profile.json").read_text())
+    assert content["stages"][0]["name"] == "convert"
+    assert "validate" in content["summary"]
+
+
+def test_cli_profile_of_failed_conversion(tmp_path):
+    result = CliRunner().invoke(
+        convert,
+        [
+            "run",
+            os.path.join(JSON_MAP_DIR, "data.json"),
+            "--config",
+            os.path.join(JSON_MAP_DIR, "data.config.json"),
+            "--reader",
+            "json_map",
+            "--nxdl",
+            "NXtest",
+            "--output",
+            str(tmp_path / "output.nxs"),
+            "--fail",
+            "--profile",
+            str(tmp_path / "trace.json"),
+            "--profile-format",
+            "chrome",
+        ],
+    )
+    assert result.exit_code != 0
+    assert not (tmp_path / "output.nxs").exists()
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert "validate" in [event["name"] for event in events]
@@ -0,0 +1,180 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the bounded-memory copies of array sources."""
+
+import logging
+import mmap
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from pynxtools.dataconverter import sources
+from pynxtools.dataconverter.compression import FilterPipeline
+from pynxtools.dataconverter.sources import copy_source, is_array_source, iter_slabs
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.validation import validate_dict_against
+from pynxtools.dataconverter.writer import Writer
+
+from .test_helpers import alter_dict
+from .test_validation import TEMPLATE
+
+
+@pytest.fixture(name="vendor_file")
+def fixture_vendor_file(tmp_path):
+    """A vendor file with a compressed and a contiguous dataset."""
+    path = tmp_path / "vendor.h5"
+    with h5py.File(path, "w") as h5file:
+        values = np.arange(60 * 50, dtype=np.uint16).reshape(60, 50) % 7
+        h5file.create_dataset(
+            "compressed", data=values, chunks=(8, 25), compression="gzip", shuffle=True
+        )
+        h5file.create_dataset("contiguous", data=values.astype(np.float32))
+    return path
+
+
+def test_is_array_source(vendor_file, tmp_path):
+    with h5py.File(vendor_file, "r") as h5file:
+        assert is_array_source(h5file["compressed"])
+    memmap = np.memmap(tmp_path / "raw", dtype=np.uint8, mode="w+", shape=(4,))
+    assert is_array_source(memmap)
+    assert is_array_source(memoryview(b"abc"))
+    for value in (np.zeros(3), b"abc", "abc", [1, 2], 1.0, {"link": "/a"}):
+        assert not is_array_source(value)
+
+
+@pytest.mark.parametrize(
+    "shape,chunks,max_bytes",
+    [
+        pytest.param((100, 7), (8, 7), 8 * 7 * 3, id="rows-of-chunks"),
+        pytest.param((100, 7), (8, 7), 10, id="single-chunks"),
+        pytest.param((9, 8, 7), (2, 3, 7), 1, id="3d-single-chunks"),
+    ],
+)
+def test_iter_slabs_cover_shape(shape, chunks, max_bytes):
+    covered = np.zeros(shape, dtype=int)
+    for selection in iter_slabs(shape, chunks, 1, max_bytes):
+        covered[selection] += 1
+        assert all(dim.start % chunk == 0 for dim, chunk in zip(selection, chunks))
+    assert (covered == 1).all()
+
+
+def test_chunks_are_copied_verbatim(vendor_file, tmp_path, monkeypatch):
+    """Stored chunks with the same pipeline are not decompressed."""
+    with h5py.File(vendor_file, "r") as source_file:
+        source = source_file["compressed"]
+        monkeypatch.setattr(sources, "iter_slabs", pytest.fail)  # no slab copy expected
+        with h5py.File(tmp_path / "out.h5", "w") as h5file:
+            target = copy_source(h5file, "data", source)
+            assert target.chunks == source.chunks
+            assert target.compression == "gzip"
+            assert target.shuffle
+            for selection in target.iter_chunks():
+                offset = tuple(dim.start for dim in selection)
+                assert target.id.read_direct_chunk(
+                    offset
+                ) == source.id.read_direct_chunk(offset)
+            np.testing.assert_array_equal(target[()], source[()])
+
+
+def test_sources_are_copied_in_bounded_slabs(vendor_file, tmp_path):
+    """Sources with a different layout are copied slab by slab."""
+    with h5py.File(vendor_file, "r") as source_file:
+        source = source_file["contiguous"]
+        with h5py.File(tmp_path / "out.h5", "w") as h5file:
+            target = copy_source(
+                h5file,
+                "data",
+                source,
+                chunks=(4, 50),
+                dcpl=FilterPipeline("gzip", 1).create_plist(),
+                max_buffer_bytes=4 * 50 * 4,
+            )
+            assert target.chunks == (4, 50)
+            assert target.compression == "gzip"
+            np.testing.assert_array_equal(target[()], source[()])
+
+            memmap_path = tmp_path / "frames.raw"
+            frames = np.memmap(memmap_path, dtype="<i4", mode="w+", shape=(10, 4, 4))
+            frames[:] = np.arange(160).reshape(10, 4, 4)
+            frames.flush()
+            with open(memmap_path, "rb") as raw:
+                buffer = mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ)
+                target = copy_source(h5file, "buffer", buffer, max_buffer_bytes=64)
+                assert target.shape == (640,)
+                np.testing.assert_array_equal(
+                    target[()].view("<i4").reshape(10, 4, 4), frames
+                )
+                del target
+                buffer.close()
+
+
+def test_writer_copies_sources(vendor_file, tmp_path):
+    """The writer copies forwarded datasets and memory maps without reading them at once."""
+    memmap = np.memmap(tmp_path / "raw", dtype=np.int64, mode="w+", shape=(30,))
+    memmap[:] = np.arange(1, 31)
+    with h5py.File(vendor_file, "r") as source_file:
+        data = Template()
+        prefix = "/ENTRY[entry]/NXODD_name[odd]"
+        data[f"{prefix}/int_value"] = source_file["compressed"]
+        data[f"{prefix}/posint_value"] = memmap
+        data[f"{prefix}/float_value"] = {
+            "compress": source_file["contiguous"],
+            "strength": 4,
+        }
+        output_file_path = os.path.join(tmp_path, "sources.nxs")
+        Writer(
+            Template(data),
+            os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+            output_file_path,
+        ).write()
+
+        with h5py.File(output_file_path, "r") as h5file:
+            int_value = h5file["/entry/odd/int_value"]
+            assert int_value.chunks == (8, 25)
+            assert int_value.compression == "gzip"
+            np.testing.assert_array_equal(int_value[()], source_file["compressed"][()])
+            np.testing.assert_array_equal(h5file["/entry/odd/posint_value"], memmap)
+            float_value = h5file["/entry/odd/float_value"]
+            assert float_value.compression_opts == 4
+            np.testing.assert_array_equal(
+                float_value[()], source_file["contiguous"][()]
+            )
+
+
+def test_validation_of_sources(vendor_file, tmp_path, caplog):
+    """Array sources are validated by their dtype."""
+    prefix = "/ENTRY[my_entry]/NXODD_name[nxodd_name]"
+    memmap = np.memmap(tmp_path / "raw", dtype=np.int64, mode="w+", shape=(30,))
+    memmap[:] = np.arange(30)
+    with h5py.File(vendor_file, "r") as source_file:
+        data_dict = alter_dict(
+            TEMPLATE, f"{prefix}/float_value", source_file["contiguous"]
+        )
+        data_dict[f"{prefix}/int_value"] = {"compress": source_file["compressed"]}
+        with caplog.at_level(logging.WARNING):
+            assert validate_dict_against("NXtest", data_dict)
+        assert caplog.text == ""
+
+        data_dict[f"{prefix}/int_value"] = source_file["contiguous"]
+        data_dict[f"{prefix}/posint_value"] = memmap
+        with caplog.at_level(logging.WARNING):
+            assert not validate_dict_against("NXtest", data_dict)
+        assert f"The value at {prefix}/int_value should be one of" in caplog.text
+        assert f"The value at {prefix}/posint_value should be a positive" in caplog.text
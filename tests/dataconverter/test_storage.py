@@ -0,0 +1,139 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the storage profiles of written files and files built in memory."""
+
+import logging
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from pynxtools.dataconverter.chunk import prioritized_axes_heuristic
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.writer import Writer, estimate_nbytes
+from pynxtools.nexus.storage import STORAGE_PROFILES
+
+
+def test_chunk_byte_target_of_profiles():
+    data = np.zeros((64, 512, 512), dtype=np.uint16)
+    for profile in STORAGE_PROFILES.values():
+        chunks = prioritized_axes_heuristic(
+            data, (0, 1, 2), byte_size=profile.byte_size
+        )
+        assert np.prod(chunks) * data.itemsize <= profile.byte_size
+        assert chunks[1:] == (512, 512)
+    assert prioritized_axes_heuristic(data, (0, 1, 2)) == (2, 512, 512)
+
+
+def test_writer_uses_storage_profile(tmp_path):
+    data = Template()
+    data["/ENTRY[entry]/NXODD_name[odd]/int_value"] = np.arange(4)
+    output_file_path = os.path.join(tmp_path, "profile.nxs")
+    writer = Writer(
+        data,
+        os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+        output_file_path,
+        storage_profile="gpfs",
+    )
+    assert writer.storage_profile is STORAGE_PROFILES["gpfs"]
+    fapl = writer.output_nexus.id.get_access_plist()
+    assert fapl.get_cache()[2] == STORAGE_PROFILES["gpfs"].rdcc_nbytes
+    writer.write()
+
+
+def metadata_heavy_template(n_fields: int = 50) -> Template:
+    """Many scalar fields with units and attributes."""
+    data = Template()
+    prefix = "/ENTRY[entry]/NXODD_name[odd]"
+    data[f"{prefix}/@signal"] = "float_value"
+    data[f"{prefix}/float_value"] = np.arange(10.0)
+    data[f"{prefix}/float_value/@units"] = "eV"
+    for idx in range(n_fields):
+        data[f"/ENTRY[entry]/motors/motor_{idx}"] = float(idx)
+        data[f"/ENTRY[entry]/motors/motor_{idx}/@units"] = "mm"
+    return data
+
+
+def test_writer_builds_file_in_memory(tmp_path):
+    output_file_path = os.path.join(tmp_path, "in_memory.nxs")
+    writer = Writer(
+        metadata_heavy_template(),
+        os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+        output_file_path,
+        in_memory=True,
+    )
+    assert writer.in_memory
+    assert writer.output_nexus.driver == "core"
+    assert not os.path.exists(output_file_path)
+    writer.write()
+
+    with h5py.File(output_file_path, "r") as h5file:
+        assert h5file["/entry/odd"].attrs["NX_class"] == "NXdata"
+        assert h5file["/entry/odd/float_value"].attrs["units"] == "eV"
+        assert h5file["/entry/motors/motor_49"][()] == 49.0
+        assert h5file["/entry/motors/motor_49"].attrs["units"] == "mm"
+
+
+def test_in_memory_falls_back_to_direct_writing(tmp_path, caplog):
+    output_file_path = os.path.join(tmp_path, "direct.nxs")
+    with caplog.at_level(logging.INFO):
+        writer = Writer(
+            metadata_heavy_template(),
+            os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+            output_file_path,
+            in_memory=True,
+            in_memory_threshold=100,
+        )
+    assert not writer.in_memory
+    assert writer.output_nexus.driver != "core"
+    assert "more than the threshold" in caplog.text
+    writer.write()
+
+    with caplog.at_level(logging.INFO):
+        writer = Writer(
+            metadata_heavy_template(),
+            os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+            output_file_path,
+            append=True,
+            in_memory=True,
+        )
+    assert not writer.in_memory
+    writer.output_nexus.close()
+
+
+@pytest.mark.parametrize(
+    "value,nbytes",
+    [
+        pytest.param(np.zeros((4, 8)), 256, id="array"),
+        pytest.param(1.0, 8, id="scalar"),
+        pytest.param({"compress": np.zeros(8, dtype=np.uint16)}, 16, id="compress"),
+        pytest.param({"link": "/entry/data"}, 0, id="link"),
+        pytest.param(
+            {"stream": iter([]), "shape": (None, 4), "dtype": "f4"},
+            float("inf"),
+            id="unknown-stream",
+        ),
+        pytest.param(
+            {"stream": iter([]), "shape": (2, 4), "dtype": "f4"}, 32, id="stream"
+        ),
+        pytest.param(bytearray(12), 12, id="buffer"),
+    ],
+)
+def test_estimate_nbytes(value, nbytes):
+    assert estimate_nbytes(value) == nbytes
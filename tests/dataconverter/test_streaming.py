@@ -0,0 +1,258 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for streaming payloads and appendable payloads of resizable datasets."""
+
+import logging
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from pynxtools.dataconverter.streaming import StreamSpec, write_appendable, write_stream
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.validation import validate_dict_against
+from pynxtools.dataconverter.writer import Writer
+
+from .test_helpers import alter_dict
+from .test_validation import TEMPLATE
+
+FLOAT_VALUE = "/ENTRY[my_entry]/NXODD_name[nxodd_name]/float_value"
+
+
+def _slabs(n_slabs: int, slab_shape: tuple[int, ...], consumed: list | None = None):
+    for idx in range(n_slabs):
+        if consumed is not None:
+            consumed.append(idx)
+        yield np.full(slab_shape, idx, dtype=np.float64)
+
+
+def test_stream_with_unknown_extent(tmp_path):
+    """Slabs are appended along the axis of a resizable, chunked dataset."""
+    with h5py.File(tmp_path / "stream.h5", "w") as h5file:
+        dataset = write_stream(
+            h5file,
+            "data",
+            {
+                "stream": _slabs(7, (3, 5)),
+                "shape": (None, 5),
+                "dtype": np.float32,
+                "chunks": (4, 5),
+            },
+        )
+        assert dataset.shape == (21, 5)
+        assert dataset.maxshape == (None, 5)
+        assert dataset.dtype == np.float32
+        expected = np.repeat(np.arange(7, dtype=np.float32), 3)[:, None]
+        np.testing.assert_array_equal(dataset[()], np.broadcast_to(expected, (21, 5)))
+
+
+def test_stream_of_frames_along_last_axis(tmp_path):
+    """Slabs without the streaming axis count as a single item."""
+    with h5py.File(tmp_path / "frames.h5", "w") as h5file:
+        dataset = write_stream(
+            h5file,
+            "data",
+            {
+                "stream": _slabs(4, (2, 3)),
+                "shape": (2, 3, 4),
+                "dtype": "<i4",
+                "axis": -1,
+                "filter": "gzip",
+                "strength": 4,
+                "shuffle": "byte",
+            },
+        )
+        assert dataset.shape == (2, 3, 4)
+        assert dataset.compression == "gzip"
+        assert dataset.shuffle
+        np.testing.assert_array_equal(dataset[0, 0], np.arange(4))
+
+
+def test_stream_slab_shape_mismatch(tmp_path):
+    with h5py.File(tmp_path / "mismatch.h5", "w") as h5file:
+        with pytest.raises(ValueError, match="cannot be appended along axis"):
+            write_stream(
+                h5file,
+                "data",
+                {"stream": _slabs(2, (3, 4)), "shape": (None, 5), "dtype": float},
+            )
+
+
+def test_stream_declared_extent_mismatch(tmp_path, caplog):
+    with h5py.File(tmp_path / "extent.h5", "w") as h5file:
+        with caplog.at_level(logging.WARNING):
+            write_stream(
+                h5file,
+                "data",
+                {"stream": _slabs(2, (5,)), "shape": (3, 5), "dtype": float},
+            )
+    assert "declared 3 items along axis 0 but provided 2" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "payload,message",
+    [
+        pytest.param({"stream": iter([])}, "shape and dtype", id="missing-shape"),
+        pytest.param(
+            {"stream": iter([]), "shape": (), "dtype": float}, "scalar", id="scalar"
+        ),
+        pytest.param(
+            {"stream": iter([]), "shape": (3,), "dtype": float, "axis": 1},
+            "out of bounds",
+            id="axis-out-of-bounds",
+        ),
+        pytest.param(
+            {"stream": iter([]), "shape": (None, None), "dtype": float},
+            "streaming axis",
+            id="unknown-extent-off-axis",
+        ),
+    ],
+)
+def test_invalid_stream_specs(payload, message):
+    with pytest.raises(ValueError, match=message):
+        StreamSpec.from_payload(payload)
+
+
+def test_validation_uses_declared_dtype(caplog):
+    """Validation checks the declared dtype without consuming the stream."""
+    consumed: list[int] = []
+    data_dict = alter_dict(
+        TEMPLATE,
+        FLOAT_VALUE,
+        {"stream": _slabs(3, (2,), consumed), "shape": (None, 2), "dtype": "f4"},
+    )
+    with caplog.at_level(logging.WARNING):
+        assert validate_dict_against("NXtest", data_dict)
+    assert caplog.text == ""
+
+    data_dict[FLOAT_VALUE] = {
+        "stream": _slabs(3, (2,), consumed),
+        "shape": (None, 2),
+        "dtype": "i8",
+    }
+    with caplog.at_level(logging.WARNING):
+        assert not validate_dict_against("NXtest", data_dict)
+    assert f"The value at {FLOAT_VALUE} should be one of the following" in caplog.text
+    assert not consumed
+
+
+def test_writer_streams_payload(tmp_path):
+    data = Template()
+    data["/ENTRY[entry]/NXODD_name[odd]/float_value"] = {
+        "stream": _slabs(10, (4,)),
+        "shape": (None, 4),
+        "dtype": np.float32,
+        "chunks": (3, 4),
+    }
+    data["/ENTRY[entry]/NXODD_name[odd]/float_value/@units"] = "eV"
+    output_file_path = os.path.join(tmp_path, "stream.nxs")
+    Writer(
+        data,
+        os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+        output_file_path,
+    ).write()
+
+    with h5py.File(output_file_path, "r") as h5file:
+        float_value = h5file["/entry/odd/float_value"]
+        assert float_value.shape == (10, 4)
+        assert float_value.maxshape == (None, 4)
+        assert float_value.chunks == (3, 4)
+        assert float_value.attrs["units"] == "eV"
+        np.testing.assert_array_equal(float_value[:, 0], np.arange(10))
+
+
+def test_append_payload_extends_dataset(tmp_path):
+    """Appendable payloads create resizable datasets and extend them later on."""
+    with h5py.File(tmp_path / "append.h5", "w") as h5file:
+        dataset, existed = write_appendable(
+            h5file, "data", {"append": np.zeros((2, 3)), "axis": 0}
+        )
+        assert not existed
+        assert dataset.maxshape == (None, 3)
+        dataset, existed = write_appendable(
+            h5file, "data", {"append": np.ones(3, dtype=np.int8), "axis": 0}
+        )
+        assert existed
+        assert dataset.dtype == np.float64
+        np.testing.assert_array_equal(dataset[:, 0], [0, 0, 1])
+
+        with pytest.raises(ValueError, match="cannot be appended along axis"):
+            write_appendable(h5file, "data", {"append": np.ones((1, 4))})
+        h5file.create_dataset("fixed", data=np.zeros(3))
+        with pytest.raises(ValueError, match="not created as resizable"):
+            write_appendable(h5file, "fixed", {"append": np.ones(1)})
+
+
+def _write_batch(output_file_path, batch: int, append: bool, with_axis: bool = True):
+    data = Template()
+    prefix = "/ENTRY[entry]/NXODD_name[odd]"
+    data[f"{prefix}/@signal"] = "float_value"
+    data[f"{prefix}/@axes"] = ["int_value"]
+    data[f"{prefix}/float_value"] = {
+        "append": np.full((5, 2), batch, dtype=np.float32),
+        "axis": 0,
+        "chunks": (5, 2),
+    }
+    data[f"{prefix}/float_value/@units"] = "eV"
+    data[f"{prefix}/float_value/@n_batches"] = batch + 1
+    if with_axis:
+        data[f"{prefix}/int_value"] = {"append": np.arange(5) + 5 * batch}
+    Writer(
+        data,
+        os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+        output_file_path,
+        append=append,
+    ).write()
+
+
+def test_writer_appends_batches(tmp_path, caplog):
+    output_file_path = os.path.join(tmp_path, "batches.nxs")
+    for batch in range(3):
+        _write_batch(output_file_path, batch, append=batch > 0)
+
+    with h5py.File(output_file_path, "r") as h5file:
+        float_value = h5file["/entry/odd/float_value"]
+        assert float_value.shape == (15, 2)
+        assert float_value.maxshape == (None, 2)
+        assert float_value.attrs["n_batches"] == 3
+        assert float_value.attrs["units"] == "eV"
+        np.testing.assert_array_equal(float_value[::5, 0], [0, 1, 2])
+        np.testing.assert_array_equal(h5file["/entry/odd/int_value"][()], range(15))
+
+    with caplog.at_level(logging.WARNING):
+        _write_batch(output_file_path, 3, append=True, with_axis=False)
+    assert (
+        "The axis /entry/odd/int_value has 15 values, but the signal "
+        "/entry/odd/float_value has 20 along dimension 0." in caplog.text
+    )
+
+
+def test_validation_of_append_payload(caplog):
+    data_dict = alter_dict(
+        TEMPLATE, FLOAT_VALUE, {"append": np.ones((3, 2), dtype=np.float32)}
+    )
+    with caplog.at_level(logging.WARNING):
+        assert validate_dict_against("NXtest", data_dict)
+    assert caplog.text == ""
+
+    int_value = FLOAT_VALUE.replace("float_value", "int_value")
+    data_dict[int_value] = {"append": np.ones((3, 2), dtype=np.float32)}
+    with caplog.at_level(logging.WARNING):
+        assert not validate_dict_against("NXtest", data_dict)
+    assert f"The value at {int_value} should be one of the following" in caplog.text
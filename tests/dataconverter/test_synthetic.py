@@ -0,0 +1,193 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the synthetic data of application definitions."""
+
+import h5py
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from pynxtools.dataconverter.cli import convert
+from pynxtools.dataconverter.helpers import get_nexus_version
+from pynxtools.dataconverter.synthetic import (
+    generate_synthetic_template,
+    instance_name,
+    write_synthetic_file,
+)
+from pynxtools.dataconverter.validation import (
+    validate_dict_against,
+    validate_hdf_group_against,
+)
+
+SYMBOL_GROUP = "/ENTRY[entry]/symbol_group"
+
+
+def as_comparable(value):
+    return value if isinstance(value, dict) else np.asarray(value).tolist()
+
+
+@pytest.mark.parametrize(
+    "concept,index,expected",
+    [
+        ("ENTRY", 0, "entry"),
+        ("ENTRY", 2, "entry2"),
+        ("NXODD_name", 1, "nxodd1_name"),
+        ("anamethatRENAMES", 0, "anamethatrenames"),
+        ("data", 3, "data"),
+    ],
+)
+def test_instance_name(concept, index, expected):
+    assert instance_name(concept, index) == expected
+
+
+def test_same_seed_gives_same_data():
+    first = generate_synthetic_template("NXtest", seed=3, fraction=0.5)
+    second = generate_synthetic_template("NXtest", seed=3, fraction=0.5)
+    other = generate_synthetic_template("NXtest", seed=4, fraction=0.5)
+
+    assert list(first.keys()) == list(second.keys())
+    for key in first.keys():
+        assert as_comparable(first[key]) == as_comparable(second[key]), key
+    assert any(
+        as_comparable(first[key]) != as_comparable(other.get(key))
+        for key in first.keys()
+    )
+
+
+@pytest.mark.parametrize(
+    "nxdl", ["NXsimple", "NXarpes", "NXmpes", "NXem", "NXapm", "NXellipsometry"]
+)
+@pytest.mark.parametrize("fraction", [0.0, 0.5, 1.0])
+def test_template_is_valid(nxdl, fraction):
+    template = generate_synthetic_template(nxdl, seed=1, fraction=fraction)
+    assert validate_dict_against(nxdl, template)
+
+
+def test_fraction_selects_optional_concepts():
+    required = set(generate_synthetic_template("NXsimple", fraction=0).keys())
+    half = set(generate_synthetic_template("NXsimple", fraction=0.5).keys())
+    full = set(generate_synthetic_template("NXsimple", fraction=1).keys())
+
+    assert len(required) < len(half) < len(full)
+    assert "/ENTRY[entry]/definition" in required
+    assert "/ENTRY[entry]/INSTRUMENT[instrument]/SOURCE[source]/name" not in required
+
+
+def test_invalid_fraction():
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        generate_synthetic_template("NXsimple", fraction=1.5)
+
+
+def test_entries_and_instances():
+    template = generate_synthetic_template("NXtest", n_entries=3, n_instances=2)
+    keys = list(template.keys())
+
+    entries = {key.split("/")[1] for key in keys if key.startswith("/ENTRY[")}
+    assert entries == {"ENTRY[entry]", "ENTRY[entry1]", "ENTRY[entry2]"}
+    for entry in ("entry", "entry2"):
+        assert f"/ENTRY[{entry}]/NXODD_name[nxodd_name]/float_value" in keys
+        assert f"/ENTRY[{entry}]/NXODD_name[nxodd1_name]/float_value" in keys
+
+
+def test_symbol_sizes():
+    template = generate_synthetic_template("NXtest", array_size=5)
+    assert template[f"{SYMBOL_GROUP}/field_a"].shape == (5,)
+    assert template[f"{SYMBOL_GROUP}/field_b"].shape == (5,)
+
+    template = generate_synthetic_template("NXtest", symbol_sizes={"n": 7})
+    assert template[f"{SYMBOL_GROUP}/field_a"].shape == (7,)
+    assert template[f"{SYMBOL_GROUP}/field_b"].shape == (7,)
+
+
+def test_enumerations_and_units():
+    template = generate_synthetic_template("NXtest", n_instances=1)
+    group = "/ENTRY[entry]/NXODD_name[nxodd_name]"
+
+    assert template[f"{group}/type"] in ("1st type", "2nd type", "3rd type", "4th type")
+    assert as_comparable(template[f"{group}/type/@array"]) in ([0, 1, 2], [2, 3, 4])
+    assert template[f"{group}/@signal"] == "data"
+    assert template[f"{group}/float_value/@units"] == "eV"
+    assert template[f"{group}/int_value/@units"] == "m"
+    assert f"{group}/anamethatRENAMES[anamethatrenames]/@units" not in template
+
+
+def test_attributes_filled_by_converter():
+    template = generate_synthetic_template("NXsimple")
+
+    assert template["/ENTRY[entry]/definition"] == "NXsimple"
+    assert template["/ENTRY[entry]/definition/@version"] == get_nexus_version()
+    assert not [key for key in template.keys() if key.startswith("/@")]
+
+
+def test_reserved_suffixes_and_axes():
+    template = generate_synthetic_template("NXtest")
+    group = "/ENTRY[entry]/OPTIONAL_group[optional_group]"
+
+    assert f"{group}/required_field_set" in template
+    assert f"{group}/some_field_set" not in template
+    assert template[f"{group}/@signal"] not in ("required_field", "required_field_set")
+
+    template = generate_synthetic_template("NXapm")
+    group = "/ENTRY[entry]/measurement/pressure_time"
+    assert template[f"{group}/@signal"] == "pressure"
+    assert template[f"{group}/@elapsed_time_indices"] == 0
+    assert (
+        template[f"{group}/elapsed_time"].shape == template[f"{group}/pressure"].shape
+    )
+
+
+@pytest.mark.parametrize(
+    "nxdl", ["NXsimple", "NXarpes", "NXscan", "NXsas", "NXellipsometry"]
+)
+def test_written_file_is_valid(tmp_path, nxdl):
+    output = str(tmp_path / f"{nxdl}.nxs")
+    write_synthetic_file(nxdl, output, seed=2, n_entries=2)
+
+    with h5py.File(output, "r") as h5file:
+        assert set(h5file) == {"entry", "entry1"}
+        for entry in h5file:
+            assert validate_hdf_group_against(nxdl, h5file[entry], output)
+
+
+def test_cli_synth(tmp_path):
+    output = tmp_path / "synthetic.nxs"
+    result = CliRunner().invoke(
+        convert,
+        [
+            "synth",
+            "NXtest",
+            "--output",
+            str(output),
+            "--entries",
+            "2",
+            "--array-size",
+            "4",
+            "--symbol",
+            "n=3",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    with h5py.File(output, "r") as h5file:
+        assert h5file["entry1/nxodd_name/float_value"].shape == (4,)
+        assert h5file["entry/symbol_group/field_a"].shape == (3,)
+
+
+def test_cli_synth_invalid_symbol():
+    result = CliRunner().invoke(convert, ["synth", "NXtest", "--symbol", "n"])
+    assert result.exit_code != 0
+    assert "Expected NAME=SIZE" in result.output
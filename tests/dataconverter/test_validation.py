@@ -16,6 +16,7 @@
 # limitations under the License.
 #
 import logging
+import multiprocessing
 import os
 
 import h5py
@@ -23,6 +24,7 @@ import numpy as np
 import pytest
 from click.testing import CliRunner
 
+from pynxtools.dataconverter import validate_file
 from pynxtools.dataconverter.cli import validate as validate_cmd
 from pynxtools.dataconverter.helpers import get_nxdl_root_and_path
 from pynxtools.dataconverter.template import Template
@@ -2217,9 +2219,18 @@ def format_error_message(msg: str) -> str:
                 "/ENTRY[my_entry]/SAMPLE[sample1]]/changer_position",
                 {"compress": 2, "filter": "zstd", "strength": 3},
             ),
+            [],
+            id="baseclass-compressed-filter-supported-true-zstd",
+        ),
+        pytest.param(
+            alter_dict(
+                TEMPLATE,
+                "/ENTRY[my_entry]/SAMPLE[sample1]]/changer_position",
+                {"compress": 2, "filter": "bzip2", "strength": 3},
+            ),
             [
                 "Compression filter for /ENTRY[my_entry]/SAMPLE[sample1]]/"
-                "changer_position is not any of ['gzip', 'blosc']."
+                "changer_position is not any of ['gzip', 'blosc', 'zstd', 'lz4', 'auto']."
             ],
             id="baseclass-compressed-filter-supported-false",
         ),
@@ -4190,3 +4201,56 @@ def test_validate_valid_external_link(tmp_path, caplog):
 
     broken_msgs = [r.message for r in caplog.records if "Broken link" in r.message]
     assert broken_msgs == []
+
+
+def test_validate_file_entries_in_parallel(tmp_path, caplog):
+    """Validating the entries of a file in a process pool logs as a serial run."""
+    fpath = tmp_path / "entries.nxs"
+    with h5py.File(fpath, "w") as h5w:
+        for idx in range(12):
+            entry = h5w.create_group(f"entry{idx}")
+            entry.attrs["NX_class"] = "NXentry"
+            entry["definition"] = "NXmpes"
+            entry["title"] = f"entry {idx}"
+            if idx % 3 == 0:
+                entry["missing"] = h5py.SoftLink("/nonexistent")
+
+    with caplog.at_level(logging.INFO):
+        serial = validate(str(fpath), workers=1)
+    serial_messages = [record.message for record in caplog.records]
+    caplog.clear()
+    with caplog.at_level(logging.INFO):
+        parallel = validate(str(fpath), workers=4)
+    parallel_messages = [record.message for record in caplog.records]
+
+    assert serial is parallel is False
+    assert any("entry11" in message for message in serial_messages)
+    assert parallel_messages == serial_messages
+
+
+def _log_to_foreign_logger(appdef, data, filename, ignore_undocumented=False):
+    logging.getLogger("foreign").warning("validated %s", data.name)
+    return True
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="The patched validator only reaches forked workers.",
+)
+def test_validate_file_replays_records_of_all_loggers(tmp_path, caplog, monkeypatch):
+    """Records of loggers outside pynxtools are replayed in entry order, too."""
+    fpath = tmp_path / "entries.nxs"
+    with h5py.File(fpath, "w") as h5w:
+        for idx in range(6):
+            entry = h5w.create_group(f"entry{idx}")
+            entry.attrs["NX_class"] = "NXentry"
+            entry["definition"] = "NXmpes"
+    monkeypatch.setattr(
+        validate_file, "validate_hdf_group_against", _log_to_foreign_logger
+    )
+
+    with caplog.at_level(logging.INFO):
+        assert validate(str(fpath), workers=3)
+    foreign = [r.message for r in caplog.records if r.name == "foreign"]
+
+    assert foreign == [f"validated /entry{idx}" for idx in range(6)]
@@ -0,0 +1,152 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the virtual dataset builder."""
+
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from pynxtools.dataconverter.template import Template
+from pynxtools.dataconverter.virtual import VirtualDatasetBuilder, parse_selection
+from pynxtools.dataconverter.writer import Writer
+
+
+@pytest.fixture(name="frame_files")
+def fixture_frame_files(tmp_path):
+    """One file per detector frame with uint16 values."""
+    paths = []
+    for idx in range(5):
+        path = str(tmp_path / f"frame_{idx:03}.h5")
+        with h5py.File(path, "w") as h5file:
+            h5file.create_dataset(
+                "frame", data=np.full((4, 6), idx, dtype=np.uint16), chunks=(2, 6)
+            )
+            h5file.create_dataset("exposure", data=[0.1 * idx])
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize(
+    "selection,expected",
+    [
+        pytest.param("0:100, 0:50", (slice(0, 100), slice(0, 50)), id="slices"),
+        pytest.param("1, ::2, ...", (1, slice(None, None, 2), Ellipsis), id="mixed"),
+        pytest.param(" -3: ", (slice(-3, None),), id="negative-start"),
+        pytest.param(np.index_exp[:, 1], (slice(None), 1), id="index-tuple"),
+        pytest.param(2, (2,), id="integer"),
+    ],
+)
+def test_parse_selection(selection, expected):
+    assert parse_selection(selection) == expected
+
+
+def test_parse_invalid_selection():
+    with pytest.raises(ValueError, match="Invalid selection"):
+        parse_selection("0:1, a")
+
+
+def test_metadata_is_read_once_per_file(frame_files):
+    builder = VirtualDatasetBuilder(max_open_files=2)
+    for _ in range(3):
+        for path in frame_files:
+            metadata = builder.metadata(path, "frame")
+            assert metadata.shape == (4, 6)
+            assert metadata.dtype == np.uint16
+            assert metadata.chunks == (2, 6)
+            builder.metadata(path, "exposure")
+    assert builder.files_opened == len(frame_files)
+    assert len(builder._open_files) == 2  # pylint: disable=protected-access
+    builder.close()
+    assert not builder._open_files  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize(
+    "axis,stack,selection,shape",
+    [
+        pytest.param(0, False, None, (20, 6), id="concatenate-axis-0"),
+        pytest.param(-1, False, None, (4, 30), id="concatenate-last-axis"),
+        pytest.param(0, True, None, (5, 4, 6), id="stack-first-axis"),
+        pytest.param(2, True, None, (4, 6, 5), id="stack-last-axis"),
+        pytest.param(0, True, np.index_exp[1:3, ::2], (5, 2, 3), id="stack-hyperslabs"),
+    ],
+)
+def test_stacked_layouts(tmp_path, frame_files, axis, stack, selection, shape):
+    builder = VirtualDatasetBuilder()
+    layout = builder.stacked_layout(
+        [(path, "frame") for path in frame_files],
+        axis=axis,
+        stack=stack,
+        selection=selection,
+    )
+    builder.close()
+    assert layout.shape == shape
+    assert layout.dtype == np.uint16
+    with h5py.File(tmp_path / "virtual.h5", "w") as h5file:
+        values = h5file.create_virtual_dataset("data", layout)[()]
+    frames = [np.full((4, 6), idx, dtype=np.uint16) for idx in range(5)]
+    if selection is not None:
+        frames = [frame[selection] for frame in frames]
+    combine = np.stack if stack else np.concatenate
+    np.testing.assert_array_equal(values, combine(frames, axis=axis))
+
+
+def test_incompatible_sources(frame_files):
+    builder = VirtualDatasetBuilder()
+    with pytest.raises(ValueError, match="cannot be concatenated"):
+        builder.stacked_layout(
+            [(frame_files[0], "frame"), (frame_files[1], "exposure")]
+        )
+    builder.close()
+
+
+def test_writer_builds_virtual_datasets(tmp_path, frame_files):
+    """Virtual datasets keep the native dtype and open every source file once."""
+    data = Template()
+    prefix = "/ENTRY[entry]/NXODD_name[odd]"
+    data[f"{prefix}/int_value"] = {
+        "link": [f"{path}:/frame" for path in frame_files],
+        "stack": True,
+    }
+    data[f"{prefix}/posint_value"] = {
+        "link": f"{frame_files[2]}:/frame",
+        "shape": "1:3, 0",
+    }
+    data[f"{prefix}/float_value"] = {
+        "link": [f"{path}:/exposure" for path in frame_files],
+    }
+    output_file_path = os.path.join(tmp_path, "virtual.nxs")
+    writer = Writer(
+        data,
+        os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+        output_file_path,
+    )
+    writer.write()
+    assert writer._virtual_builder.files_opened == len(frame_files)  # pylint: disable=protected-access
+
+    with h5py.File(output_file_path, "r") as h5file:
+        int_value = h5file["/entry/odd/int_value"]
+        assert int_value.is_virtual
+        assert int_value.dtype == np.uint16
+        assert int_value.shape == (5, 4, 6)
+        np.testing.assert_array_equal(int_value[:, 0, 0], range(5))
+        np.testing.assert_array_equal(h5file["/entry/odd/posint_value"][()], [2, 2])
+        float_value = h5file["/entry/odd/float_value"]
+        assert float_value.dtype == np.float64
+        np.testing.assert_allclose(float_value[()], np.arange(5) * 0.1)
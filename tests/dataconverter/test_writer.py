@@ -27,14 +27,15 @@ import pytest
 from pynxtools.dataconverter.exceptions import InvalidDictProvided
 from pynxtools.dataconverter.helpers import add_default_root_attributes
 from pynxtools.dataconverter.template import Template
-from pynxtools.dataconverter.writer import Writer
-
-from .test_helpers import (  # pylint: disable=unused-import
-    alter_dict,
-    fixture_filled_test_data,
-    fixture_template,
+from pynxtools.dataconverter.writer import (
+    NodeWrite,
+    Writer,
+    order_links,
+    plan_node_writes,
 )
 
+from .test_helpers import alter_dict, fixture_filled_test_data, fixture_template  # pylint: disable=unused-import
+
 
 @pytest.fixture(name="writer")
 def fixture_writer(filled_test_data, tmp_path):
@@ -196,3 +197,156 @@ def test_overwrite(writer_overwrite, caplog):
         assert sorted(observed_infos) == sorted(expected_infos)  # order does not matter
 
     os.remove(writer_overwrite.output_path)
+
+
+def test_write_plan_is_built_once_per_concept(writer):
+    """The writer resolves every NXDL concept once, from the NexusNode tree."""
+    writer.write()
+    assert writer._nxdl_data is None
+    plan = writer._write_plan["/ENTRY/NXODD_name"]
+    assert plan.concept_type == "group"
+    assert plan.nx_class == "NXdata"
+    assert writer._concept_plan_for("/ENTRY[other]/NXODD_name[nxodd_two_name]") is plan
+    with h5py.File(writer.output_path, "r") as test_nxs:
+        assert test_nxs["/my_entry/nxodd_name"].attrs["NX_class"] == "NXdata"
+
+
+def test_write_plan_for_custom_nxdl_file(filled_test_data, tmp_path):
+    """NXDL files outside of the definitions are resolved from their XML."""
+    custom_nxdl = tmp_path / "NXtest.nxdl.xml"
+    with open(
+        os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"), encoding="utf-8"
+    ) as nxdl:
+        custom_nxdl.write_text(nxdl.read(), encoding="utf-8")
+    output_file_path = os.path.join(tmp_path, "custom.nxs")
+    add_default_root_attributes(filled_test_data, filename=output_file_path)
+    writer = Writer(filled_test_data, str(custom_nxdl), output_file_path)
+    writer.write()
+
+    assert writer._definition_trees["NXtest"] is None
+    assert writer._write_plan["/ENTRY/NXODD_name"].nx_class == "NXdata"
+    with h5py.File(output_file_path, "r") as test_nxs:
+        assert test_nxs["/my_entry/nxodd_name"].attrs["NX_class"] == "NXdata"
+
+
+def test_missing_ancestors_are_created_top_down(tmp_path):
+    """Undocumented groups are created in one pass and reused for later keys."""
+    template = Template()
+    template["/ENTRY[entry]/NXODD_name[odd]/float_value"] = 1.0
+    template["/ENTRY[entry]/extra/deeper/deepest/value"] = np.arange(3)
+    template["/ENTRY[entry]/extra/deeper/deepest/value/@units"] = "m"
+    template["/ENTRY[entry]/extra/deeper/@note"] = "undocumented"
+    output_file_path = os.path.join(tmp_path, "ancestors.nxs")
+    writer = Writer(
+        template,
+        os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+        output_file_path,
+    )
+    writer.write()
+
+    assert "/ENTRY[entry]/extra/deeper/deepest" in writer._nodes
+    assert "/ENTRY[entry]/extra/deeper/deepest/value" in writer._nodes
+    with h5py.File(output_file_path, "r") as test_nxs:
+        assert test_nxs["/entry"].attrs["NX_class"] == "NXentry"
+        assert test_nxs["/entry/odd"].attrs["NX_class"] == "NXdata"
+        assert "NX_class" not in test_nxs["/entry/extra/deeper"].attrs
+        assert test_nxs["/entry/extra/deeper"].attrs["note"] == "undocumented"
+        assert test_nxs["/entry/extra/deeper/deepest/value"].attrs["units"] == "m"
+
+
+def test_index_undocumented_paths():
+    """Every ancestor of an undocumented path is indexed."""
+    prefixes = Writer._index_undocumented_paths(
+        ["/ENTRY[entry]/extra/value", "/ENTRY[entry]/extra/@note", "/other"]
+    )
+    assert prefixes == {
+        "/ENTRY[entry]",
+        "/ENTRY[entry]/extra",
+        "/ENTRY[entry]/extra/value",
+        "/ENTRY[entry]/extra/@note",
+        "/other",
+    }
+
+
+def test_plan_node_writes():
+    """Every object is planned once with its value, units and attributes."""
+    plan = plan_node_writes(
+        {
+            "/ENTRY[entry]/DATA[data]/@signal": "y",
+            "/ENTRY[entry]/DATA[data]/y": np.arange(3),
+            "/ENTRY[entry]/DATA[data]/y/@units": "m",
+            "/ENTRY[entry]/DATA[data]/y/@long_name": "height",
+            "/ENTRY[entry]/DATA[data]/y/@empty": None,
+            "/ENTRY[entry]/DATA[data]/z": None,
+            "/@default": "entry",
+        }
+    )
+    assert list(plan) == [
+        "/ENTRY[entry]/DATA[data]",
+        "/ENTRY[entry]/DATA[data]/y",
+        "/",
+    ]
+    assert plan["/ENTRY[entry]/DATA[data]"].value is None
+    assert plan["/ENTRY[entry]/DATA[data]"].attributes == [
+        ("/ENTRY[entry]/DATA[data]/@signal", "signal", "y")
+    ]
+    signal = plan["/ENTRY[entry]/DATA[data]/y"]
+    assert signal.units == "m"
+    assert signal.attributes == [
+        ("/ENTRY[entry]/DATA[data]/y/@long_name", "long_name", "height")
+    ]
+    assert plan["/"].attributes == [("/@default", "default", "entry")]
+
+
+def test_order_links(caplog):
+    """Links follow the links they point to, others keep their order."""
+    links = [
+        NodeWrite("/ENTRY[entry]/a", {"link": "/entry/b/value"}),
+        NodeWrite("/ENTRY[entry]/external", {"link": "other.nxs:/entry/c"}),
+        NodeWrite("/ENTRY[entry]/b", {"link": "/entry/c"}),
+        NodeWrite("/ENTRY[entry]/c", {"link": "/entry/data"}),
+        NodeWrite("/ENTRY[entry]/d", {"link": ["/entry/a", "/entry/data"]}),
+    ]
+    ordered = order_links(links, "out.nxs")
+    assert [link.path.removeprefix("/ENTRY[entry]/") for link in ordered] == [
+        "c",
+        "b",
+        "a",
+        "external",
+        "d",
+    ]
+    cycle = [
+        NodeWrite("/ENTRY[entry]/a", {"link": "/entry/b"}),
+        NodeWrite("/ENTRY[entry]/b", {"link": "/entry/a"}),
+    ]
+    with caplog.at_level(logging.WARNING):
+        assert len(order_links(cycle, "out.nxs")) == 2
+    assert "cycle of links" in caplog.text
+
+
+def test_links_to_links_are_written(tmp_path):
+    """A link is written after the link it points to, whatever the key order."""
+    template = Template()
+    prefix = "/ENTRY[entry]/NXODD_name[odd]"
+    template[f"{prefix}/int_value"] = {"link": "/entry/odd/posint_value"}
+    template[f"{prefix}/int_value/@units"] = "eV"
+    template[f"{prefix}/posint_value"] = {"link": "/entry/odd/number_value"}
+    template[f"{prefix}/number_value"] = np.arange(3)
+    template[f"{prefix}/number_value/@long_name"] = "number"
+    template[f"{prefix}/@signal"] = "number_value"
+    output_file_path = os.path.join(tmp_path, "links.nxs")
+    writer = Writer(
+        template,
+        os.path.join("src", "pynxtools", "data", "NXtest.nxdl.xml"),
+        output_file_path,
+    )
+    writer.write()
+
+    assert writer._created[f"{prefix}/number_value"].attributes == {"long_name"}
+    with h5py.File(output_file_path, "r") as test_nxs:
+        odd = test_nxs["/entry/odd"]
+        assert odd.attrs["NX_class"] == "NXdata"
+        assert odd.attrs["signal"] == "number_value"
+        np.testing.assert_array_equal(odd["int_value"][()], np.arange(3))
+        assert odd["number_value"].attrs["units"] == "eV"
+        assert odd["number_value"].attrs["long_name"] == "number"
@@ -0,0 +1,118 @@
+"""Unit tests for pynxtools.nexus.descriptors and metadata-only traversal."""
+
+import h5py
+import numpy as np
+import pytest
+
+from pynxtools.nexus.descriptors import FieldDescriptor
+from pynxtools.nexus.handler import NexusFileHandler, NexusVisitor
+
+
+def _make_file(path) -> None:
+    with h5py.File(path, "w") as f:
+        entry = f.create_group("entry")
+        entry.attrs["NX_class"] = "NXentry"
+        entry.create_dataset("title", data="descriptor test")
+        data = entry.create_group("data")
+        data.attrs["NX_class"] = "NXdata"
+        signal = data.create_dataset(
+            "signal",
+            data=np.arange(64 * 64, dtype=np.float32).reshape(64, 64),
+            chunks=(16, 64),
+            compression="gzip",
+            shuffle=True,
+        )
+        signal.attrs["units"] = "counts"
+
+
+# ---------------------------------------------------------------------------
+# FieldDescriptor
+# ---------------------------------------------------------------------------
+
+
+def test_descriptor_exposes_metadata(tmp_path):
+    _make_file(tmp_path / "meta.nxs")
+    with h5py.File(tmp_path / "meta.nxs", "r") as f:
+        desc = FieldDescriptor("entry/data/signal", f["entry/data/signal"])
+
+        assert desc.name == "/entry/data/signal"
+        assert desc.shape == (64, 64)
+        assert desc.ndim == 2
+        assert desc.dtype == np.float32
+        assert desc.nbytes == 64 * 64 * 4
+        assert desc.chunks == (16, 64)
+        assert desc.attrs["units"] == "counts"
+        assert desc.parent.name == "/entry/data"
+        filter_ids = [filter_id for filter_id, _ in desc.filters]
+        assert filter_ids == [h5py.h5z.FILTER_SHUFFLE, h5py.h5z.FILTER_DEFLATE]
+
+
+def test_descriptor_reads_small_values_lazily(tmp_path):
+    _make_file(tmp_path / "small.nxs")
+    with h5py.File(tmp_path / "small.nxs", "r") as f:
+        desc = FieldDescriptor("entry/data/signal", f["entry/data/signal"])
+
+        assert desc.loadable
+        np.testing.assert_array_equal(desc.value, f["entry/data/signal"][()])
+        np.testing.assert_array_equal(desc[...], f["entry/data/signal"][...])
+
+
+def test_descriptor_guards_large_values(tmp_path):
+    _make_file(tmp_path / "large.nxs")
+    with h5py.File(tmp_path / "large.nxs", "r") as f:
+        desc = FieldDescriptor(
+            "entry/data/signal", f["entry/data/signal"], max_value_bytes=1024
+        )
+
+        assert not desc.loadable
+        assert desc.value is None
+        with pytest.raises(ValueError, match="max_value_bytes"):
+            desc[()]
+        # Explicit selections are always read
+        np.testing.assert_array_equal(desc[0, :4], [0, 1, 2, 3])
+
+
+# ---------------------------------------------------------------------------
+# Metadata-only traversal
+# ---------------------------------------------------------------------------
+
+
+class _FieldCollector(NexusVisitor):
+    def __init__(self):
+        self.fields = {}
+        self.field_attr_parents = []
+
+    def on_group(self, hdf_path, hdf_node):
+        pass
+
+    def on_field(self, hdf_path, hdf_node):
+        self.fields[hdf_path] = hdf_node
+
+    def on_attribute(self, hdf_path, attr_name, attr_value, parent):
+        if hdf_path in self.fields:
+            self.field_attr_parents.append(parent)
+
+    def on_complete(self, root):
+        pass
+
+
+def test_handler_dispatches_descriptors_in_metadata_only_mode(tmp_path):
+    _make_file(tmp_path / "handler.nxs")
+    visitor = _FieldCollector()
+    NexusFileHandler(
+        str(tmp_path / "handler.nxs"), metadata_only=True, max_value_bytes=1024
+    ).process(visitor)
+
+    assert set(visitor.fields) == {"entry/title", "entry/data/signal"}
+    assert all(isinstance(f, FieldDescriptor) for f in visitor.fields.values())
+    assert visitor.fields["entry/title"].loadable
+    assert not visitor.fields["entry/data/signal"].loadable
+    assert all(isinstance(p, FieldDescriptor) for p in visitor.field_attr_parents)
+
+
+def test_handler_dispatches_datasets_by_default(tmp_path):
+    _make_file(tmp_path / "default.nxs")
+    visitor = _FieldCollector()
+    with h5py.File(tmp_path / "default.nxs", "r") as f:
+        NexusFileHandler(f, is_open=True).process(visitor)
+        assert all(isinstance(f, h5py.Dataset) for f in visitor.fields.values())
@@ -8,7 +8,12 @@ import h5py
 import numpy as np
 import pytest
 
-from pynxtools.nexus.handler import NexusFileHandler, NexusVisitor
+from pynxtools.nexus.handler import (
+    CompositeVisitor,
+    ExternalFilePool,
+    NexusFileHandler,
+    NexusVisitor,
+)
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -275,3 +280,201 @@ def test_handler_valid_external_link(tmp_path):
     # The external subtree is visited under the main-file path
     assert "entry/ext" in visitor.visited
     assert "entry/ext/value" in visitor.visited
+
+
+# ---------------------------------------------------------------------------
+# Pruning and CompositeVisitor
+# ---------------------------------------------------------------------------
+
+
+class _PruningVisitor(_RecordingVisitor):
+    """Records visited paths but prunes the subtree rooted at *skip*."""
+
+    def __init__(self, skip: str):
+        super().__init__()
+        self.skip = skip
+
+    def prune(self, hdf_path: str, hdf_node) -> bool:
+        return hdf_path == self.skip
+
+
+def test_handler_prune_skips_subtree():
+    """A pruned group is neither dispatched nor recursed into."""
+    f = _make_in_memory_file()
+    visitor = _PruningVisitor("entry/data")
+    NexusFileHandler(f, is_open=True).process(visitor)
+
+    assert "entry" in visitor.visited
+    assert "entry/data" not in visitor.visited
+    assert "entry/data/signal" not in visitor.visited
+    assert ("entry/data", "NX_class") not in visitor.attributes
+    assert visitor.completed
+
+
+def test_composite_visitor_dispatches_to_all():
+    """Every child of a CompositeVisitor sees the same nodes in one traversal."""
+    f = _make_in_memory_file()
+    first, second = _RecordingVisitor(), _RecordingVisitor()
+    NexusFileHandler(f, is_open=True).process(CompositeVisitor([first, second]))
+
+    assert first.visited == second.visited
+    assert first.attributes == second.attributes
+    assert "entry/data/signal" in first.visited
+    assert first.completed and second.completed
+
+
+def test_composite_visitor_prunes_per_child():
+    """A subtree pruned by one child is still dispatched to the others."""
+    f = _make_in_memory_file()
+    f["entry"].create_group("other").create_dataset("value", data=1)
+    pruning = _PruningVisitor("entry/data")
+    recording = _RecordingVisitor()
+    NexusFileHandler(f, is_open=True).process(CompositeVisitor([pruning, recording]))
+
+    assert "entry/data/signal" in recording.visited
+    assert "entry/data" not in pruning.visited
+    assert "entry/data/signal" not in pruning.visited
+    # Pruning ends when the traversal leaves the pruned subtree
+    assert "entry/other/value" in pruning.visited
+    assert pruning.completed and recording.completed
+
+
+def test_composite_visitor_prunes_for_handler_when_all_children_prune():
+    """The handler skips a subtree entirely only when every child prunes it."""
+    f = _make_in_memory_file()
+    composite = CompositeVisitor(
+        [_PruningVisitor("entry/data"), _PruningVisitor("entry/data")]
+    )
+    assert composite.prune("entry/data", f["entry/data"])
+    assert not CompositeVisitor(
+        [_PruningVisitor("entry/data"), _RecordingVisitor()]
+    ).prune("entry/data", f["entry/data"])
+
+
+# ---------------------------------------------------------------------------
+# External file pool
+# ---------------------------------------------------------------------------
+
+
+def _make_linked_files(tmp_path, n_links: int, n_ext_files: int = 1):
+    """Write *n_ext_files* external files and a main file with *n_links* links to them."""
+    ext_names = []
+    for idx in range(n_ext_files):
+        name = f"ext_{idx}.h5"
+        with h5py.File(tmp_path / name, "w") as f:
+            f.create_dataset("frame", data=np.arange(3))
+        ext_names.append(name)
+
+    main_file = tmp_path / "main.nxs"
+    with h5py.File(main_file, "w") as f:
+        for idx in range(n_links):
+            # Relative file names: resolved against the main file's directory
+            f[f"entry/frame_{idx}"] = h5py.ExternalLink(
+                ext_names[idx % n_ext_files], "/frame"
+            )
+    return main_file
+
+
+def test_handler_reuses_pooled_external_files(tmp_path, monkeypatch):
+    """A file targeted by many external links is opened once per process() call."""
+    main_file = _make_linked_files(tmp_path, n_links=20)
+    monkeypatch.chdir(os.path.dirname(EXAMPLE_NXS))
+
+    visitor = _LinkVisitor()
+    handler = NexusFileHandler(str(main_file))
+    handler.process(visitor)
+
+    assert visitor.broken_links == []
+    assert all(f"entry/frame_{idx}" in visitor.visited for idx in range(20))
+    assert handler.external_file_stats.opened == 1
+    assert handler.external_file_stats.hits == 19
+    assert handler.external_file_stats.evicted == 0
+
+
+def test_handler_evicts_least_recently_used_external_files(tmp_path):
+    """The external file pool never keeps more than its configured size open."""
+    main_file = _make_linked_files(tmp_path, n_links=6, n_ext_files=3)
+
+    visitor = _LinkVisitor()
+    handler = NexusFileHandler(str(main_file), max_external_files=2)
+    handler.process(visitor)
+
+    assert visitor.broken_links == []
+    # Links cycle through ext_0, ext_1, ext_2 - with two slots every access misses
+    assert handler.external_file_stats.opened == 6
+    assert handler.external_file_stats.hits == 0
+    assert handler.external_file_stats.evicted == 4
+
+
+def test_external_file_pool_pins_files_in_use(tmp_path):
+    """Files being traversed are not evicted, even when the pool is full."""
+    main_file = _make_linked_files(tmp_path, n_links=2, n_ext_files=2)
+    pool = ExternalFilePool(max_open=1)
+    first = pool.acquire(pool.resolve("ext_0.h5", str(main_file)))
+    second = pool.acquire(pool.resolve("ext_1.h5", str(main_file)))
+
+    assert first.id.valid and second.id.valid
+    pool.release(str(tmp_path / "ext_1.h5"))
+    pool.release(str(tmp_path / "ext_0.h5"))
+    assert pool.stats.evicted == 1
+    pool.close()
+
+
+# ---------------------------------------------------------------------------
+# Process-parallel traversal
+# ---------------------------------------------------------------------------
+
+
+class _MergingVisitor(_RecordingVisitor):
+    """Recording visitor that supports process_parallel (module level to pickle)."""
+
+    def merge(self, other: NexusVisitor) -> None:
+        self.visited.extend(other.visited)
+        self.attributes.extend(other.attributes)
+
+
+def _make_multi_entry_file(path) -> None:
+    with h5py.File(path, "w") as f:
+        f.attrs["NX_class"] = "NXroot"
+        for i in range(3):
+            entry = f.create_group(f"entry{i}")
+            entry.attrs["NX_class"] = "NXentry"
+            data = entry.create_group("data")
+            data.attrs["NX_class"] = "NXdata"
+            data.create_dataset("signal", data=np.arange(5) * i)
+            entry["linked"] = h5py.SoftLink(f"/entry{i}/data/signal")
+
+
+@pytest.mark.parametrize("partition_depth", [1, 2])
+def test_process_parallel_matches_serial_traversal(tmp_path, partition_depth):
+    """Merged results of partitioned traversal equal the serial traversal."""
+    fpath = tmp_path / "multi.nxs"
+    _make_multi_entry_file(fpath)
+
+    serial = _MergingVisitor()
+    NexusFileHandler(str(fpath)).process(serial)
+    merged = NexusFileHandler(str(fpath)).process_parallel(
+        _MergingVisitor, partition_depth=partition_depth, max_workers=2
+    )
+
+    assert merged.completed
+    # Ancestors are replayed to every partition, hence compare as sets
+    assert set(merged.visited) == set(serial.visited)
+    assert set(merged.attributes) == set(serial.attributes)
+
+
+def test_process_parallel_requires_merge(tmp_path):
+    """Visitors without a merge implementation are rejected."""
+    fpath = tmp_path / "multi.nxs"
+    _make_multi_entry_file(fpath)
+
+    with pytest.raises(NotImplementedError, match="process_parallel"):
+        NexusFileHandler(str(fpath)).process_parallel(_RecordingVisitor, max_workers=1)
+
+
+def test_process_parallel_rejects_open_file():
+    """Partitions are read through per-worker handles, so a path is required."""
+    f = _make_in_memory_file()
+    with pytest.raises(ValueError):
+        NexusFileHandler(f, is_open=True).process_parallel(_MergingVisitor)
+    f.close()
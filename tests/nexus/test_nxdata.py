@@ -4,6 +4,7 @@ import h5py
 import numpy as np
 import pytest
 
+from pynxtools.nexus.descriptors import FieldDescriptor
 from pynxtools.nexus.nxdata import (
     NXdataInfo,
     classify_field,
@@ -26,6 +27,15 @@ def test_classify_field_signal_v3(tmp_path):
         assert classify_field(ds, "I") == "signal"
 
 
+def test_classify_field_descriptor(tmp_path):
+    with h5py.File(tmp_path / "classify_field_descriptor.nxs", "w") as f:
+        g = f.create_group("entry/data")
+        g.attrs["NX_class"] = "NXdata"
+        g.attrs["signal"] = "I"
+        ds = g.create_dataset("I", data=np.zeros(10))
+        assert classify_field(FieldDescriptor("entry/data/I", ds), "I") == "signal"
+
+
 def test_classify_field_axis_v3_from_axes_array(tmp_path):
     with h5py.File(tmp_path / "classify_field_axis_v3_from_axes_array.nxs", "w") as f:
         g = f.create_group("entry/data")
@@ -22,7 +22,11 @@ import numpy as np
 import pytest
 
 from pynxtools.nexus.nexus_tree import generate_tree_from
-from pynxtools.nexus.schema_resolver import NexusSchemaResolver, resolve_path
+from pynxtools.nexus.schema_resolver import (
+    NexusSchemaResolver,
+    NXClassTable,
+    resolve_path,
+)
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -180,6 +184,62 @@ class TestAppdefFor:
         assert NexusSchemaResolver.appdef_for(nxtest_h5["/"]) is None
 
 
+# ---------------------------------------------------------------------------
+# NXClassTable — per-file NX_class / definition lookups
+# ---------------------------------------------------------------------------
+
+
+class TestNXClassTable:
+    def test_nx_class_lookups(self, nxtest_h5):
+        table = NXClassTable(nxtest_h5)
+        assert table.nx_class("/") == "NXroot"
+        assert table.nx_class("ENTRY/NXODD_name") == "NXdata"
+        assert table.nx_class("/ENTRY/NXODD_name/float_value") is None
+        assert table.nx_class("ENTRY/missing") is None
+
+    def test_entry_and_appdef(self, nxtest_h5):
+        table = NXClassTable(nxtest_h5)
+        assert table.entry_for("ENTRY/NXODD_name/float_value") == "/ENTRY"
+        assert table.appdef_for("ENTRY/NXODD_name/float_value") == "NXtest"
+        assert table.entry_for("/") is None
+        assert table.appdef_for("/") is None
+
+    def test_nx_class_path(self, nxtest_h5):
+        table = NXClassTable(nxtest_h5)
+        assert (
+            table.nx_class_path("/ENTRY/NXODD_name/float_value")
+            == "/NXentry/NXdata/float_value"
+        )
+        assert table.nx_class_path("/") == ""
+
+    def test_attributes_are_read_once(self, nxtest_h5):
+        table = NXClassTable(nxtest_h5)
+        table.appdef_for("ENTRY/NXODD_name/float_value")
+        # Changes in the file are not seen: lookups are served from the table
+        nxtest_h5["ENTRY/NXODD_name"].attrs["NX_class"] = "NXcollection"
+        del nxtest_h5["ENTRY/definition"]
+        assert table.nx_class("ENTRY/NXODD_name") == "NXdata"
+        assert table.appdef_for("ENTRY/NXODD_name") == "NXtest"
+
+    def test_resolver_keeps_one_table_per_file(self, nxtest_h5):
+        resolver = NexusSchemaResolver()
+        table = resolver.class_table_for(nxtest_h5)
+        assert resolver.class_table_for(nxtest_h5) is table
+        node = resolver.node_for(
+            "ENTRY/NXODD_name/float_value", nxtest_h5["ENTRY/NXODD_name/float_value"]
+        )
+        assert node is not None
+        assert table.nx_class("ENTRY/NXODD_name") == "NXdata"
+
+    def test_resolver_drops_tables_of_closed_files(self, nxtest_h5):
+        resolver = NexusSchemaResolver()
+        other = h5py.File("__other__", "w", driver="core", backing_store=False)
+        resolver.class_table_for(other)
+        other.close()
+        resolver.class_table_for(nxtest_h5)
+        assert list(resolver._class_tables) == [nxtest_h5]
+
+
 # ---------------------------------------------------------------------------
 # NexusSchemaResolver.tree_for
 # ---------------------------------------------------------------------------
@@ -297,3 +357,23 @@ class TestAttrNodeFor:
         resolver = NexusSchemaResolver()
         node = resolver.attr_node_for("ENTRY/ghost", "version", nxtest_h5["ENTRY"])
         assert node is None
+
+
+# ---------------------------------------------------------------------------
+# Sharing one resolver between HDF5-path and tree-relative lookups
+# ---------------------------------------------------------------------------
+
+
+def test_node_for_path_cache_is_isolated_per_tree(nxtest_h5):
+    """node_for_path results must not leak into node_for lookups (and vice versa)."""
+    resolver = NexusSchemaResolver()
+    tree = resolver.tree_for("NXtest")
+    entry = tree.search_add_child_for("ENTRY")
+
+    # Below the ENTRY node, "ENTRY" name-fits some variadic child group ...
+    relative = resolver.node_for_path(entry, "ENTRY", node_type="group")
+    # ... whereas the HDF5 path "ENTRY" must still resolve to the NXentry group.
+    node = resolver.node_for("ENTRY", nxtest_h5["ENTRY"])
+    assert node is not None
+    assert node is not relative
+    assert node.nx_class == "NXentry"
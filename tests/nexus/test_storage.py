@@ -0,0 +1,166 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the detection and application of storage profiles."""
+
+import os
+import subprocess
+import sys
+
+import h5py
+import numpy as np
+import pytest
+
+import pynxtools
+from pynxtools.nexus import storage
+from pynxtools.nexus.storage import (
+    STORAGE_PROFILES,
+    detect_storage_profile,
+    find_mount,
+    get_storage_profile,
+    import_hdf5plugin,
+    open_hdf5,
+)
+
+MOUNTS = """\
+/dev/sda2 / ext4 rw,relatime 0 0
+tmpfs /dev/shm tmpfs rw,nosuid,nodev 0 0
+/dev/sdb1 /data xfs rw,relatime 0 0
+/dev/nvme0n1p1 /data/fast ext4 rw,relatime 0 0
+10.0.0.1@tcp:/scratch /lustre/scratch lustre rw,flock 0 0
+gpfs0 /gpfs/home gpfs rw,relatime 0 0
+server:/export /mnt/my\\040share nfs4 rw,relatime 0 0
+"""
+
+
+@pytest.fixture(name="mounts_file")
+def fixture_mounts_file(tmp_path, monkeypatch):
+    """A mount table with a spinning disk /dev/sdb and an NVMe disk."""
+    path = tmp_path / "mounts"
+    path.write_text(MOUNTS)
+    rotational = {"/dev/sda2": False, "/dev/sdb1": True, "/dev/nvme0n1p1": False}
+    monkeypatch.setattr(storage, "is_rotational", rotational.get)
+    monkeypatch.delenv(storage.STORAGE_PROFILE_ENV, raising=False)
+    storage.read_mounts.cache_clear()
+    yield str(path)
+    storage.read_mounts.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "path,mount_point,profile",
+    [
+        pytest.param("/home/user/out.nxs", "/", "ssd_nvm", id="root-ssd"),
+        pytest.param("/data/run_1/out.nxs", "/data", "hdd", id="hdd"),
+        pytest.param("/data/fast/out.nxs", "/data/fast", "ssd_nvm", id="nested-nvme"),
+        pytest.param("/datafile.nxs", "/", "ssd_nvm", id="not-a-prefix"),
+        pytest.param("/dev/shm/out.nxs", "/dev/shm", "ssd_nvm", id="tmpfs"),
+        pytest.param(
+            "/lustre/scratch/out.nxs", "/lustre/scratch", "lustre", id="lustre"
+        ),
+        pytest.param("/gpfs/home/out.nxs", "/gpfs/home", "gpfs", id="gpfs"),
+        pytest.param("/mnt/my share/out.nxs", "/mnt/my share", "hfivepy", id="nfs"),
+    ],
+)
+def test_detect_storage_profile(mounts_file, path, mount_point, profile):
+    assert find_mount(path, mounts_file).mount_point == mount_point
+    assert detect_storage_profile(path, mounts_file) == profile
+
+
+def test_profile_overrides(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "detect_storage_profile", lambda path: "hdd")
+    monkeypatch.delenv(storage.STORAGE_PROFILE_ENV, raising=False)
+    path = tmp_path / "out.nxs"
+    assert get_storage_profile(path).name == "hdd"
+    assert get_storage_profile(path, "lustre").name == "lustre"
+    assert get_storage_profile(None).name == storage.DEFAULT_STORAGE_PROFILE
+    monkeypatch.setenv(storage.STORAGE_PROFILE_ENV, "gpfs")
+    assert get_storage_profile(path).name == "gpfs"
+    assert get_storage_profile(path, "auto").name == "gpfs"
+    assert get_storage_profile(path, STORAGE_PROFILES["hdd"]).name == "hdd"
+    with pytest.raises(ValueError, match="Unknown storage profile 'tape'"):
+        get_storage_profile(path, "tape")
+
+
+@pytest.mark.parametrize("name", list(STORAGE_PROFILES))
+def test_profiles_are_applied(tmp_path, name):
+    profile = STORAGE_PROFILES[name]
+    with open_hdf5(tmp_path / "out.h5", "w", profile=name) as h5file:
+        fapl = h5file.id.get_access_plist()
+        assert fapl.get_cache()[1:] == (
+            profile.rdcc_nslots,
+            profile.rdcc_nbytes,
+            profile.rdcc_w0,
+        )
+        assert fapl.get_meta_block_size() == profile.meta_block_size
+        assert fapl.get_alignment() == (
+            profile.alignment_threshold,
+            profile.alignment_interval,
+        )
+
+
+def _read_in_subprocess(path) -> str:
+    """Read all fields of path with the handler in a fresh interpreter."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [
+            os.path.dirname(os.path.dirname(pynxtools.__file__)),
+            env.get("PYTHONPATH", ""),
+        ]
+    )
+    code = f"""
+import sys
+from pynxtools.nexus.handler import NexusFileHandler, NexusVisitor
+
+class Reader(NexusVisitor):
+    def on_group(self, hdf_path, hdf_node):
+        pass
+
+    def on_field(self, hdf_path, hdf_node):
+        print(hdf_path, hdf_node[()].sum())
+
+    def on_attribute(self, hdf_path, attr_name, attr_value, parent):
+        pass
+
+    def on_complete(self, root):
+        print("hdf5plugin" in sys.modules)
+
+NexusFileHandler({str(path)!r}).process(Reader())
+"""
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    ).stdout
+
+
+def test_hdf5plugin_is_registered_on_demand(tmp_path):
+    path = tmp_path / "filters.h5"
+    with h5py.File(path, "w") as h5file:
+        h5file.create_dataset("gzip", data=np.arange(100), compression="gzip")
+    assert _read_in_subprocess(path).splitlines() == ["gzip 4950", "False"]
+
+    with h5py.File(path, "a") as h5file:
+        h5file.create_dataset(
+            "zstd", data=np.arange(100), **import_hdf5plugin().Zstd(clevel=3)
+        )
+    assert _read_in_subprocess(path).splitlines() == [
+        "gzip 4950",
+        "zstd 4950",
+        "True",
+    ]
@@ -0,0 +1,102 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Heavy imports and import-time budgets of the command line entry points."""
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+import pynxtools
+
+# Modules which take long to import and are only needed by some commands
+HEAVY_MODULES = (
+    "setuptools",
+    "blosc2",
+    "hdf5plugin",
+    "pint",
+    "xarray",
+    "pandas",
+    "scipy",
+)
+
+# Budgets in ms, several times the import time on a laptop. They are only
+# checked if the environment variable PYNXTOOLS_IMPORT_BUDGETS is set.
+BUDGETS_ENV = "PYNXTOOLS_IMPORT_BUDGETS"
+ENTRY_POINT_BUDGETS = {
+    "pynxtools": 100,
+    "pynxtools.cli": 150,
+    "pynxtools.dataconverter.client": 150,
+    "pynxtools.nexus.cli": 150,
+    "pynxtools.dataconverter.cli": 600,
+    "pynxtools.dataconverter.writer": 900,
+    "pynxtools.dataconverter.convert": 900,
+    "pynxtools.annotator.cli": 800,
+    "pynxtools.eln_mapper.cli": 800,
+}
+
+IMPORT_TIME = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)")
+
+
+def import_times(module: str) -> dict[str, int]:
+    """The cumulative import time in us of each module imported by `module`."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [
+            os.path.dirname(os.path.dirname(pynxtools.__file__)),
+            env.get("PYTHONPATH", ""),
+        ]
+    )
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    ).stderr
+    return {
+        match.group(3): int(match.group(1))
+        for match in map(IMPORT_TIME.match, stderr.splitlines())
+        if match
+    }
+
+
+@pytest.mark.parametrize("module", ENTRY_POINT_BUDGETS)
+def test_no_heavy_imports(module):
+    times = import_times(module)
+    heavy = sorted(
+        name
+        for name in times
+        if any(name == h or name.startswith(f"{h}.") for h in HEAVY_MODULES)
+    )
+    assert not heavy, f"import {module} imports {heavy}"
+
+
+@pytest.mark.skipif(
+    not os.environ.get(BUDGETS_ENV),
+    reason=f"Import-time budgets depend on the machine, set {BUDGETS_ENV}=1.",
+)
+@pytest.mark.parametrize("module,budget", ENTRY_POINT_BUDGETS.items())
+def test_import_time(module, budget):
+    # The fastest of a few runs, which is the least affected by other processes
+    milliseconds = min(import_times(module)[module] for _ in range(3)) / 1000
+    assert milliseconds < budget, (
+        f"import {module} takes {milliseconds:.0f} ms, the budget is {budget} ms"
+    )